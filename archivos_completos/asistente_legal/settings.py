@@ -88,3 +88,61 @@ DEFAULT_AUTO_FIELD = 'django.db.models.BigAutoField'
 LOGIN_URL = '/login/'
 LOGIN_REDIRECT_URL = '/dashboard/'
 LOGOUT_REDIRECT_URL = '/login/'
+
+# Fuente TrueType para los PDF generados con ReportLab (se registra una vez por proceso).
+# Si es None se busca Times New Roman / Liberation Serif y, si no existe, se usa Times-Roman.
+PDF_FUENTE_LEGAL = None
+# PDF_FUENTE_LEGAL = {
+#     'normal': r'C:\Windows\Fonts\times.ttf',
+#     'bold': r'C:\Windows\Fonts\timesbd.ttf',
+#     'italic': r'C:\Windows\Fonts\timesi.ttf',
+#     'boldItalic': r'C:\Windows\Fonts\timesbi.ttf',
+# }
+
+# Motor de PDF por tipo de documento: 'nativo' renderiza el template directo a PDF con
+# ReportLab; 'docx' genera el DOCX y lo convierte (docx2pdf o texto plano de respaldo).
+# El pagaré se convierte desde su template ('docx'): su 'nativo' es un layout ReportLab propio, con
+# la tabla en una LongTable, cuyo texto no es el del template.
+PDF_MOTOR_POR_TIPO = {
+    'acta_asamblea': 'nativo',
+    'acta_consejo': 'nativo',
+    'pagare': 'docx',
+}
+
+# Los documentos generados se escriben en un SpooledTemporaryFile que pasa a disco al
+# superar este tamaño (bytes) y se entregan con FileResponse (ver documentos/descargas.py).
+DOCUMENTOS_SPOOL_MAX_BYTES = 1024 * 1024
+
+# Importa los generadores y compila los templates DOCX al arrancar gunicorn (hook when_ready en el
+# proceso maestro); con preload_app los workers heredan ese trabajo (ver gunicorn.conf.py).
+DOCUMENTOS_PRECALENTAR = True
+
+# Procesos con que se generan los documentos del paquete de cierre (documentos/paquete.py). Con 1 se generan
+# en el mismo proceso; más de 1 levanta un pool por cada descarga, así que en la vista web solo conviene si
+# los workers de gunicorn dejan CPUs libres.
+DOCUMENTOS_PAQUETE_TRABAJADORES = 1
+
+# Segundos que se guardan en caché los reportes de cartera de pagarés (documentos/cartera.py).
+# La clave cambia al modificar cualquier pagaré del usuario, así que no sirve datos viejos.
+DOCUMENTOS_CARTERA_CACHE_SEGUNDOS = 300
+
+# Filas por bloque al exportar listas y cuotas a CSV/XLSX (documentos/exportacion.py): lo que se lee de la
+# base en cada consulta del iterator y lo que se envía en cada bloque del CSV.
+DOCUMENTOS_EXPORTACION_CHUNK = 2000
+
+# Escenarios máximos por petición de simulación de pagarés (documentos/simulacion.py).
+DOCUMENTOS_SIMULACION_MAX_ESCENARIOS = 1000
+
+# Política de redondeo del interés en las tablas de amortización (documentos/amortizacion.py):
+# 'por_fila', 'acarreo' o 'ajuste_final'. Los importes se calculan en centavos enteros.
+DOCUMENTOS_AMORTIZACION_REDONDEO = 'por_fila'
+
+# Calendario de pagos (documentos/calendario.py). Ajuste de fechas que caen en día inhábil: 'ninguno',
+# 'siguiente', 'siguiente_modificado' o 'anterior'. Devengo del interés: 'dias' (días reales entre pagos
+# sobre base_intereses del pagaré, real/360 o real/365) o 'periodo' (tasa anual entre periodos del año).
+# 'ninguno' y 'periodo' dan las tablas de siempre; cambiarlos altera fechas e importes de las tablas que se
+# generen desde entonces (las ya guardadas no se tocan salvo con `manage.py reconstruir_tablas --todas`).
+DOCUMENTOS_CALENDARIO_AJUSTE = 'ninguno'
+DOCUMENTOS_CALENDARIO_DEVENGO = 'periodo'
+# Días inhábiles adicionales a los de ley y bancarios ('AAAA-MM-DD').
+DOCUMENTOS_DIAS_INHABILES = []
@@ -1,5 +1,119 @@
-from django.contrib import admin
-from .models import ActaAsamblea, ActaSesionConsejo, TipoDocumento
+"""
+Admin de los documentos.
+
+Las listas del admin están pensadas para tablas grandes:
+- list_select_related('usuario') evita una consulta por fila al mostrar el usuario;
+- show_full_result_count = False quita el COUNT(*) sin filtros que el admin
+  hace en cada búsqueda;
+- EstimatedCountPaginator usa el conteo estimado de PostgreSQL (pg_class) para
+  la lista sin filtros en lugar de recorrer la tabla;
+- las acciones masivas (cambio de estado, regenerar artefactos) trabajan con
+  QuerySet.update() y bulk_update por lotes, no con un save() por objeto.
+
+Los filtros de la lista y el orden por defecto están respaldados por los
+índices de cada modelo (Meta.indexes).
+"""
+
+from django.contrib import admin, messages
+from django.core.paginator import Paginator
+from django.db import connections
+from django.utils import timezone
+from django.utils.functional import cached_property
+
+from .cartera import reconstruir_tablas
+from .estatutos_sociedad import EstatutosSociedad
+from .literales import recalcular_literales
+from .models import (
+    ActaAsamblea, ActaSesionConsejo, ContratoCredito, ContratoPrendaAcciones,
+    ConvenioModificatorio, CuotaAmortizacion, EjecucionVencimientos, Pagare,
+    TipoDocumento,
+)
+
+
+# Por debajo de este estimado se cuenta exacto: en tablas chicas es barato
+CONTEO_ESTIMADO_MINIMO = 10000
+
+
+class EstimatedCountPaginator(Paginator):
+    """
+    Paginador que, para la lista completa de una tabla en PostgreSQL, toma el
+    número de filas de las estadísticas (pg_class.reltuples) en lugar de un
+    COUNT(*). Con filtros, búsqueda, otra base de datos o tablas chicas, cuenta
+    exacto.
+    """
+
+    @cached_property
+    def count(self):
+        estimado = self._conteo_estimado()
+        if estimado is not None:
+            return estimado
+        return super().count
+
+    def _conteo_estimado(self):
+        queryset = self.object_list
+        query = getattr(queryset, 'query', None)
+        if query is None or query.where or query.distinct:
+            return None
+        conexion = connections[queryset.db]
+        if conexion.vendor != 'postgresql':
+            return None
+        with conexion.cursor() as cursor:
+            cursor.execute(
+                'SELECT reltuples::bigint FROM pg_class WHERE oid = %s::regclass',
+                [queryset.model._meta.db_table],
+            )
+            fila = cursor.fetchone()
+        if not fila or fila[0] < CONTEO_ESTIMADO_MINIMO:
+            return None
+        return int(fila[0])
+
+
+def _accion_cambiar_estado(estado, etiqueta):
+    def accion(modeladmin, request, queryset):
+        campos = {'estado': estado}
+        if modeladmin.campo_actualizacion:
+            # update() no pasa por auto_now
+            campos[modeladmin.campo_actualizacion] = timezone.now()
+        actualizados = queryset.exclude(estado=estado).update(**campos)
+        modeladmin.message_user(request, f"{actualizados} registros cambiados a '{etiqueta}'", messages.SUCCESS)
+
+    accion.__name__ = f'cambiar_estado_a_{estado}'
+    accion.short_description = f"Cambiar estado a '{etiqueta}'"
+    return accion
+
+
+class DocumentoAdmin(admin.ModelAdmin):
+    """
+    Base de los documentos con usuario y estado: cada usuario ve solo los suyos
+    (el superusuario ve todos) y hay una acción de cambio de estado por cada
+    opción del campo `estado`.
+    """
+
+    list_select_related = ('usuario',)
+    show_full_result_count = False
+    paginator = EstimatedCountPaginator
+    list_per_page = 50
+    campo_actualizacion = 'fecha_actualizacion'
+
+    def get_actions(self, request):
+        actions = super().get_actions(request)
+        if self.has_change_permission(request):
+            for estado, etiqueta in self.model._meta.get_field('estado').choices:
+                accion = _accion_cambiar_estado(estado, etiqueta)
+                actions[accion.__name__] = (accion, accion.__name__, accion.short_description)
+        return actions
+
+    def save_model(self, request, obj, form, change):
+        if not change:  # Si es un nuevo objeto
+            obj.usuario = request.user
+        super().save_model(request, obj, form, change)
+
+    def get_queryset(self, request):
+        qs = super().get_queryset(request)
+        if request.user.is_superuser:
+            return qs
+        return qs.filter(usuario=request.user)
+
 
 @admin.register(TipoDocumento)
 class TipoDocumentoAdmin(admin.ModelAdmin):
@@ -8,32 +122,33 @@ class TipoDocumentoAdmin(admin.ModelAdmin):
     search_fields = ['nombre']
 
 @admin.register(ActaAsamblea)
-class ActaAsambleaAdmin(admin.ModelAdmin):
+class ActaAsambleaAdmin(DocumentoAdmin):
     list_display = [
-        'razon_social', 'tipo_asamblea', 'fecha', 'presidente', 
-        'secretario', 'estado', 'creada_en'
+        'razon_social', 'tipo_asamblea', 'fecha', 'presidente',
+        'secretario', 'estado', 'usuario', 'creada_en'
     ]
     list_filter = [
-        'tipo_asamblea', 'estado', 'fecha', 'creada_en', 
+        'tipo_asamblea', 'estado', 'fecha', 'creada_en',
         'convocatoria_omitida', 'metodo_votacion_general'
     ]
     search_fields = [
-        'razon_social', 'presidente', 'secretario', 'escrutador', 
+        'razon_social', 'presidente', 'secretario', 'escrutador',
         'comisario', 'caracter'
     ]
     date_hierarchy = 'fecha'
     ordering = ['-fecha', '-creada_en']
-    
+    campo_actualizacion = 'actualizada_en'
+
     fieldsets = (
         ('Información Básica', {
             'fields': (
-                'usuario', 'razon_social', 'tipo_asamblea', 'caracter', 
+                'usuario', 'razon_social', 'tipo_asamblea', 'caracter',
                 'fecha', 'hora_inicio', 'hora_cierre', 'lugar'
             )
         }),
         ('Participación y Convocatoria', {
             'fields': (
-                'porcentaje_capital_presente', 'convocatoria_omitida', 
+                'porcentaje_capital_presente', 'convocatoria_omitida',
                 'fundamento_convocatoria', 'metodo_votacion_general'
             )
         }),
@@ -58,29 +173,18 @@ class ActaAsambleaAdmin(admin.ModelAdmin):
             'classes': ('collapse',)
         }),
     )
-    
+
     readonly_fields = ['creada_en', 'actualizada_en']
-    
-    def save_model(self, request, obj, form, change):
-        if not change:  # Si es un nuevo objeto
-            obj.usuario = request.user
-        super().save_model(request, obj, form, change)
-    
-    def get_queryset(self, request):
-        qs = super().get_queryset(request)
-        if request.user.is_superuser:
-            return qs
-        return qs.filter(usuario=request.user)
 
 
 @admin.register(ActaSesionConsejo)
-class ActaSesionConsejoAdmin(admin.ModelAdmin):
+class ActaSesionConsejoAdmin(DocumentoAdmin):
     list_display = [
-        'razon_social', 'fecha', 'presidente', 'secretario', 
-        'porcentaje_miembros_presentes', 'estado', 'creada_en'
+        'razon_social', 'fecha', 'presidente', 'secretario',
+        'porcentaje_miembros_presentes', 'estado', 'usuario', 'creada_en'
     ]
     list_filter = [
-        'estado', 'fecha', 'creada_en', 'convocatoria_realizada', 
+        'estado', 'fecha', 'creada_en', 'convocatoria_realizada',
         'metodo_instalacion'
     ]
     search_fields = [
@@ -88,17 +192,18 @@ class ActaSesionConsejoAdmin(admin.ModelAdmin):
     ]
     date_hierarchy = 'fecha'
     ordering = ['-fecha', '-creada_en']
-    
+    campo_actualizacion = 'actualizada_en'
+
     fieldsets = (
         ('Información Básica', {
             'fields': (
-                'usuario', 'razon_social', 'fecha', 'hora_inicio', 
+                'usuario', 'razon_social', 'fecha', 'hora_inicio',
                 'hora_cierre', 'lugar'
             )
         }),
         ('Convocatoria y Quórum', {
             'fields': (
-                'convocatoria_realizada', 'porcentaje_miembros_presentes', 
+                'convocatoria_realizada', 'porcentaje_miembros_presentes',
                 'metodo_instalacion'
             )
         }),
@@ -109,7 +214,7 @@ class ActaSesionConsejoAdmin(admin.ModelAdmin):
         }),
         ('Datos Estructurados (JSON)', {
             'fields': (
-                'asistentes_json', 'invitados_json', 'orden_dia_json', 
+                'asistentes_json', 'invitados_json', 'orden_dia_json',
                 'resoluciones_json', 'delegados_json', 'anexos_json'
             ),
             'classes': ('collapse',),
@@ -117,21 +222,121 @@ class ActaSesionConsejoAdmin(admin.ModelAdmin):
         }),
         ('Estado y Cache', {
             'fields': (
-                'estado', 'acta_html_cache'
+                'estado', 'html_cache'
             ),
             'classes': ('collapse',)
         }),
     )
-    
+
     readonly_fields = ['creada_en', 'actualizada_en']
-    
-    def save_model(self, request, obj, form, change):
-        if not change:  # Si es un nuevo objeto
-            obj.usuario = request.user
-        super().save_model(request, obj, form, change)
-    
+
+
+@admin.register(Pagare)
+class PagareAdmin(DocumentoAdmin):
+    list_display = [
+        'id', 'deudor_nombre', 'acreedor_nombre', 'monto_numeric', 'fecha_emision',
+        'periodicidad', 'estado', 'usuario', 'fecha_creacion'
+    ]
+    list_filter = ['estado', 'tipo_pago', 'periodicidad', 'fecha_emision']
+    search_fields = ['deudor_nombre', 'acreedor_nombre', 'deudor_rfc', 'concepto']
+    date_hierarchy = 'fecha_emision'
+    ordering = ['-fecha_emision', '-fecha_creacion']
+    actions = ['regenerar_artefactos']
+    readonly_fields = ['fecha_creacion', 'fecha_actualizacion']
+
+    @admin.action(description='Regenerar literales y tabla de amortización', permissions=['change'])
+    def regenerar_artefactos(self, request, queryset):
+        revisados, literales = recalcular_literales(queryset)
+        _, tablas, manuales = reconstruir_tablas(queryset, forzar=True)
+        self.message_user(
+            request,
+            f'{revisados} pagarés revisados: {literales} con literales actualizadas, '
+            f'{tablas} tablas regeneradas, {manuales} tablas capturadas a mano sin cambios',
+            messages.SUCCESS,
+        )
+
+
+@admin.register(CuotaAmortizacion)
+class CuotaAmortizacionAdmin(admin.ModelAdmin):
+    list_display = ['pagare', 'numero', 'fecha', 'total', 'saldo', 'estado', 'fecha_pago_real']
+    list_filter = ['estado', 'fecha']
+    list_select_related = ('pagare',)
+    raw_id_fields = ['pagare']
+    show_full_result_count = False
+    paginator = EstimatedCountPaginator
+    ordering = ['pagare', 'numero']
+
     def get_queryset(self, request):
         qs = super().get_queryset(request)
         if request.user.is_superuser:
             return qs
-        return qs.filter(usuario=request.user)
+        return qs.filter(pagare__usuario=request.user)
+
+
+@admin.register(EjecucionVencimientos)
+class EjecucionVencimientosAdmin(admin.ModelAdmin):
+    list_display = [
+        'fecha_corte', 'iniciada_en', 'duracion', 'cuotas_vencidas',
+        'pagares_actualizados', 'pagares_vencidos', 'simulacion'
+    ]
+    list_filter = ['simulacion', 'fecha_corte']
+    date_hierarchy = 'fecha_corte'
+
+    def has_add_permission(self, request):
+        return False
+
+    def has_change_permission(self, request, obj=None):
+        return False
+
+
+@admin.register(ContratoCredito)
+class ContratoCreditoAdmin(DocumentoAdmin):
+    list_display = [
+        'id', 'acreditado_razon_social_original', 'acreditante_razon_social',
+        'fecha_contrato', 'estado', 'usuario', 'fecha_creacion'
+    ]
+    list_filter = ['estado', 'fecha_contrato']
+    search_fields = ['acreditado_razon_social_original', 'acreditante_razon_social']
+    date_hierarchy = 'fecha_contrato'
+    ordering = ['-fecha_contrato', '-fecha_creacion']
+    actions = ['regenerar_artefactos']
+    readonly_fields = ['fecha_creacion', 'fecha_actualizacion']
+
+    @admin.action(description='Regenerar literales', permissions=['change'])
+    def regenerar_artefactos(self, request, queryset):
+        revisados, literales = recalcular_literales(queryset)
+        self.message_user(
+            request, f'{revisados} contratos revisados: {literales} con literales actualizadas', messages.SUCCESS,
+        )
+
+
+@admin.register(ContratoPrendaAcciones)
+class ContratoPrendaAccionesAdmin(DocumentoAdmin):
+    list_display = ['id', 'deudor_nombre', 'acreedor_nombre', 'fecha_contrato', 'estado', 'usuario', 'fecha_creacion']
+    list_filter = ['estado', 'fecha_contrato']
+    search_fields = ['deudor_nombre', 'acreedor_nombre', 'numero_fideicomiso']
+    date_hierarchy = 'fecha_contrato'
+    ordering = ['-fecha_contrato', '-fecha_creacion']
+    readonly_fields = ['fecha_creacion', 'fecha_actualizacion']
+
+
+@admin.register(ConvenioModificatorio)
+class ConvenioModificatorioAdmin(DocumentoAdmin):
+    list_display = [
+        'id', 'estudiante_nombre', 'inversionista_razon_social', 'fecha_convenio',
+        'estado', 'usuario', 'fecha_creacion'
+    ]
+    list_filter = ['estado', 'fecha_convenio']
+    search_fields = ['estudiante_nombre', 'inversionista_razon_social']
+    date_hierarchy = 'fecha_convenio'
+    ordering = ['-fecha_convenio', '-fecha_creacion']
+    readonly_fields = ['fecha_creacion', 'fecha_actualizacion']
+
+
+@admin.register(EstatutosSociedad)
+class EstatutosSociedadAdmin(DocumentoAdmin):
+    list_display = ['denominacion', 'forma_legal', 'estado', 'usuario', 'fecha_creacion']
+    list_filter = ['estado', 'forma_legal']
+    search_fields = ['denominacion']
+    ordering = ['-fecha_creacion']
+    readonly_fields = ['fecha_creacion', 'fecha_actualizacion']
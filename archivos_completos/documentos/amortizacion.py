@@ -0,0 +1,232 @@
+"""
+Cálculo de la tabla de amortización (sistema francés con pago constante).
+
+Es el motor de Pagare.generar_tabla_amortizacion_automatica y de la simulación
+de escenarios (documentos/simulacion.py): los importes de cada cuota salen de
+aquí y el modelo solo agrega fechas y estado, así que lo que se simula es lo
+mismo que se imprime en el pagaré.
+
+Todo se calcula en centavos enteros. La tasa por periodo se toma como fracción
+exacta (numerador/denominador) y el interés de cada cuota es saldo × numerador
+/ denominador, redondeado según la política de redondeo. Solo la cuota fija
+(que lleva una potencia) se calcula una vez por tabla con Decimal. Así, en
+toda tabla:
+- la suma del capital es exactamente el monto y el último saldo es 0.00;
+- el total de cada fila es exactamente capital + interés + IVA + gastos + IVA;
+- el resultado es el mismo en cualquier plataforma.
+La última cuota lleva el capital pendiente, por lo que su total difiere de la
+cuota fija por lo que acumula el redondeo de esta a centavos.
+
+Con `dias` (días de cada periodo, de documentos/calendario.py) el interés se
+devenga por días reales sobre `base` (real/360 o real/365): la tasa de cada
+periodo es tasa × días / base y la cuota fija es la que amortiza el monto con
+esas tasas. Sin `dias`, la tasa es la anual entre los periodos del año.
+
+Políticas de redondeo del interés (DOCUMENTOS_AMORTIZACION_REDONDEO):
+- 'por_fila': cada interés se redondea a centavos por separado (mitad hacia arriba);
+- 'acarreo': la fracción de centavo que se redondea en una fila pasa a la siguiente,
+  así que la suma de intereses difiere del total exacto en menos de medio centavo;
+- 'ajuste_final': los intereses se truncan y las fracciones acumuladas se suman,
+  redondeadas, al interés de la última cuota.
+"""
+
+from decimal import ROUND_HALF_UP, Decimal, localcontext
+
+from django.conf import settings
+
+
+IVA = 0.16
+# IVA como fracción exacta para el cálculo en centavos
+IVA_NUMERADOR = 16
+IVA_DENOMINADOR = 100
+
+# Costo de administración por periodo cuando el pagaré no lo indica (o es 0)
+GASTOS_ADMON_POR_DEFECTO = 350.00
+
+PERIODOS_POR_ANIO = {
+    'mensual': 12,
+    'quincenal': 24,
+    'semanal': 52,
+    'diario': 360,
+}
+
+CENTAVO = Decimal('0.01')
+
+# Días por año para el devengo por días cuando el pagaré no indica base
+BASE_POR_DEFECTO = 360
+
+
+def normalizar_periodicidad(periodicidad):
+    """Periodicidad con tabla propia; las demás se amortizan como mensuales"""
+    periodicidad = (periodicidad or 'mensual').lower()
+    return periodicidad if periodicidad in PERIODOS_POR_ANIO else 'mensual'
+
+
+def costo_admon_por_periodo(gastos_admon):
+    return float(gastos_admon) if gastos_admon else GASTOS_ADMON_POR_DEFECTO
+
+
+def centavos(valor):
+    """Importe (Decimal, float, int o texto) en centavos enteros, redondeando mitad hacia arriba"""
+    if valor in (None, ''):
+        return 0
+    return int(Decimal(str(valor)).quantize(CENTAVO, rounding=ROUND_HALF_UP) * 100)
+
+
+def a_pesos(cantidad):
+    """Centavos a float para la tabla JSON; su repr siempre tiene a lo más dos decimales"""
+    return cantidad / 100
+
+
+def _redondear(numerador, denominador):
+    """numerador / denominador redondeado al entero, mitad hacia arriba (denominador > 0)"""
+    cociente, resto = divmod(numerador, denominador)
+    return cociente + (1 if 2 * resto >= denominador else 0)
+
+
+def _iva(cantidad):
+    return _redondear(cantidad * IVA_NUMERADOR, IVA_DENOMINADOR)
+
+
+class RedondeoPorFila:
+    """Cada interés se redondea a centavos por separado"""
+
+    def interes(self, numerador, denominador, ultima):
+        return _redondear(numerador, denominador)
+
+
+class RedondeoAcarreo:
+    """La fracción redondeada en una fila se suma al interés de la siguiente"""
+
+    def __init__(self):
+        self.resto = 0
+
+    def interes(self, numerador, denominador, ultima):
+        numerador += self.resto
+        interes = _redondear(numerador, denominador)
+        self.resto = numerador - interes * denominador
+        return interes
+
+
+class RedondeoAjusteFinal:
+    """Intereses truncados; las fracciones acumuladas van al interés de la última cuota"""
+
+    def __init__(self):
+        self.resto = 0
+
+    def interes(self, numerador, denominador, ultima):
+        interes, resto = divmod(numerador, denominador)
+        self.resto += resto
+        if ultima:
+            interes += _redondear(self.resto, denominador)
+        return interes
+
+
+POLITICAS_REDONDEO = {
+    'por_fila': RedondeoPorFila,
+    'acarreo': RedondeoAcarreo,
+    'ajuste_final': RedondeoAjusteFinal,
+}
+POLITICA_POR_DEFECTO = 'por_fila'
+
+
+def politica_redondeo(nombre=None):
+    """Nueva instancia de la política `nombre` o de DOCUMENTOS_AMORTIZACION_REDONDEO"""
+    nombre = nombre or getattr(settings, 'DOCUMENTOS_AMORTIZACION_REDONDEO', None) or POLITICA_POR_DEFECTO
+    try:
+        return POLITICAS_REDONDEO[nombre]()
+    except KeyError:
+        raise ValueError(f"Política de redondeo desconocida '{nombre}': use {', '.join(POLITICAS_REDONDEO)}")
+
+
+def tasa_por_periodo(tasa_anual_pct, periodicidad):
+    """Tasa por periodo como fracción exacta (numerador, denominador)"""
+    numerador, denominador = Decimal(str(tasa_anual_pct)).as_integer_ratio()
+    return numerador, denominador * 100 * PERIODOS_POR_ANIO[normalizar_periodicidad(periodicidad)]
+
+
+def tasas_por_dias(tasa_anual_pct, dias, base):
+    """Tasa de cada periodo como fracción exacta: tasa × días / (100 × base)"""
+    numerador, denominador = Decimal(str(tasa_anual_pct)).as_integer_ratio()
+    denominador *= 100 * int(base)
+    return [(numerador * d, denominador) for d in dias]
+
+
+def cuota_fija(monto_centavos, num_pagos, numerador, denominador):
+    """
+    Cuota (capital + interés + IVA del interés) constante en centavos, con la
+    tasa efectiva i*(1+IVA): es lo único que se calcula con Decimal, una vez.
+    """
+    if numerador == 0:
+        return _redondear(monto_centavos, num_pagos)
+    with localcontext() as contexto:
+        contexto.prec = 40
+        i_eff = Decimal(numerador * (IVA_DENOMINADOR + IVA_NUMERADOR)) / Decimal(denominador * IVA_DENOMINADOR)
+        factor = (1 + i_eff) ** num_pagos
+        cuota = monto_centavos * i_eff * factor / (factor - 1)
+        return int(cuota.to_integral_value(rounding=ROUND_HALF_UP))
+
+
+def cuota_fija_variable(monto_centavos, tasas):
+    """
+    Cuota constante que amortiza el monto con una tasa distinta por periodo:
+    monto / Σ_k Π_{j<=k} 1 / (1 + i_j*(1+IVA)).
+    """
+    if not any(numerador for numerador, _ in tasas):
+        return _redondear(monto_centavos, len(tasas))
+    with localcontext() as contexto:
+        contexto.prec = 40
+        factor_iva = Decimal(IVA_DENOMINADOR + IVA_NUMERADOR) / IVA_DENOMINADOR
+        descuento = Decimal(1)
+        suma = Decimal(0)
+        for numerador, denominador in tasas:
+            descuento /= 1 + Decimal(numerador) / denominador * factor_iva
+            suma += descuento
+        return int((monto_centavos / suma).to_integral_value(rounding=ROUND_HALF_UP))
+
+
+def calcular_cuotas(monto, num_pagos, tasa_anual_pct, periodicidad, gastos_admon, politica=None,
+                    dias=None, base=None):
+    """
+    Importes de la tabla en centavos enteros. Con `dias` (uno por pago) el
+    interés se devenga por días reales sobre `base` días por año.
+
+    Returns:
+        (pago_total, costo_admon, iva_costo_admon, filas) con una tupla
+        (capital, saldo, interes, iva_interes, total) por periodo; pago_total es
+        el de las cuotas fijas (todas menos, quizá, la última)
+    """
+    P = centavos(monto)
+    n = int(num_pagos)
+    redondeo = politica_redondeo(politica)
+
+    # Gastos por periodo (si se guardara el TOTAL del crédito, sería / n)
+    costo_admon = centavos(costo_admon_por_periodo(gastos_admon))
+    iva_costo_admon = _iva(costo_admon)
+    gastos = costo_admon + iva_costo_admon
+
+    if dias is None:
+        numerador, denominador = tasa_por_periodo(tasa_anual_pct, periodicidad)
+        tasas = [(numerador, denominador)] * n
+        cuota = cuota_fija(P, n, numerador, denominador)
+    else:
+        tasas = tasas_por_dias(tasa_anual_pct, dias[:n], base or BASE_POR_DEFECTO)
+        cuota = cuota_fija_variable(P, tasas)
+
+    filas = []
+    saldo = P
+    for k, (numerador, denominador) in enumerate(tasas, start=1):
+        ultima = k == n
+        interes = redondeo.interes(saldo * numerador, denominador, ultima)
+        iva_interes = _iva(interes)
+        # La última cuota liquida el saldo; las demás amortizan lo que deja la cuota fija. Con
+        # tasas por días, si un periodo largo genera más interés que la cuota, el faltante se
+        # capitaliza (capital negativo), como supone la cuota calculada con esas tasas.
+        capital = cuota - interes - iva_interes
+        if dias is None:
+            capital = max(capital, 0)
+        capital = saldo if ultima else min(capital, saldo)
+        saldo -= capital
+        filas.append((capital, saldo, interes, iva_interes, capital + interes + iva_interes + gastos))
+
+    return cuota + gastos, costo_admon, iva_costo_admon, filas
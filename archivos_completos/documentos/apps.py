@@ -4,3 +4,9 @@ from django.apps import AppConfig
 class DocumentosConfig(AppConfig):
     default_auto_field = 'django.db.models.BigAutoField'
     name = 'documentos'
+
+    def ready(self):
+        # Registra el system check que compila y revisa los templates DOCX al arrancar.
+        # El precalentamiento no va aquí: lo hace gunicorn antes del fork (ver gunicorn.conf.py),
+        # así migrate, shell o los comandos de cron no leen los templates.
+        from . import plantillas  # noqa: F401
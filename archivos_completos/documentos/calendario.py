@@ -0,0 +1,191 @@
+"""
+Calendario de pagos y conteo de días para la tabla de amortización.
+
+Calcula de una vez, para toda la tabla, el vector de fechas de pago de
+cualquier periodicidad (mensual, quincenal, semanal y diario) ajustadas a
+día hábil, y el vector de días de cada periodo con el que se devengan los
+intereses en base real/360 o real/365 (`base_intereses` del pagaré).
+
+Días inhábiles: los de descanso obligatorio de la Ley Federal del Trabajo
+(art. 74) más los inhábiles bancarios de la CNBV (Jueves y Viernes Santo,
+2 de noviembre y 12 de diciembre), sábados y domingos. Se calculan por año
+una sola vez; DOCUMENTOS_DIAS_INHABILES agrega fechas sueltas (asuetos
+decretados, cierres de la oficina).
+
+Ajuste de fechas que caen en día inhábil (DOCUMENTOS_CALENDARIO_AJUSTE):
+- 'ninguno' (por defecto): la fecha se deja como está;
+- 'siguiente': el día hábil siguiente;
+- 'siguiente_modificado': el siguiente, salvo que cambie de mes (entonces el anterior);
+- 'anterior': el día hábil anterior.
+
+Cada fecha se calcula desde la de emisión (fecha + k meses, no la anterior
++ 1 mes), así que un ajuste no se arrastra a los periodos siguientes. Con
+periodicidad diaria y cualquier ajuste distinto de 'ninguno', los pagos son los
+días hábiles consecutivos posteriores a la emisión: recorrer cada día natural al
+hábil anterior o siguiente repetiría fechas, así que el sentido del ajuste no aplica.
+"""
+
+from calendar import monthrange
+from datetime import date, timedelta
+from functools import lru_cache
+
+from dateutil.easter import easter
+from dateutil.relativedelta import MO, relativedelta
+from django.conf import settings
+
+
+AJUSTES = ('ninguno', 'siguiente', 'siguiente_modificado', 'anterior')
+# Por defecto las fechas y el interés son los de siempre (fecha + k periodos, tasa anual entre periodos):
+# el calendario cambia los importes y fechas de toda tabla, así que se activa en settings
+AJUSTE_POR_DEFECTO = 'ninguno'
+
+# 'dias': interés por días reales entre pagos / base_intereses; 'periodo': tasa anual / periodos por año
+DEVENGOS = ('dias', 'periodo')
+DEVENGO_POR_DEFECTO = 'periodo'
+
+
+def _dias_inhabiles_adicionales():
+    return frozenset(
+        date.fromisoformat(str(fecha)) for fecha in getattr(settings, 'DOCUMENTOS_DIAS_INHABILES', None) or ()
+    )
+
+
+@lru_cache(maxsize=None)
+def _feriados_del_anio(anio):
+    feriados = {
+        date(anio, 1, 1),                                   # Año Nuevo
+        date(anio, 2, 1) + relativedelta(weekday=MO(1)),    # Constitución, primer lunes de febrero
+        date(anio, 3, 1) + relativedelta(weekday=MO(3)),    # Natalicio de Benito Juárez, tercer lunes de marzo
+        date(anio, 5, 1),                                   # Día del Trabajo
+        date(anio, 9, 16),                                  # Independencia
+        date(anio, 11, 1) + relativedelta(weekday=MO(3)),   # Revolución, tercer lunes de noviembre
+        date(anio, 12, 25),                                 # Navidad
+        # Inhábiles bancarios (CNBV)
+        easter(anio) - timedelta(days=3),                   # Jueves Santo
+        easter(anio) - timedelta(days=2),                   # Viernes Santo
+        date(anio, 11, 2),
+        date(anio, 12, 12),
+    }
+    # Transmisión del Poder Ejecutivo Federal, cada seis años
+    if anio >= 2024 and (anio - 2024) % 6 == 0:
+        feriados.add(date(anio, 10, 1))
+    elif anio <= 2018 and (2018 - anio) % 6 == 0:
+        feriados.add(date(anio, 12, 1))
+    return frozenset(feriados)
+
+
+def dias_inhabiles(anio):
+    """Días feriados del año (sin contar sábados y domingos)"""
+    return _feriados_del_anio(anio) | {fecha for fecha in _dias_inhabiles_adicionales() if fecha.year == anio}
+
+
+class Calendario:
+    """
+    Consulta de días hábiles con los feriados cargados por año conforme se
+    necesitan; una instancia sirve para toda una tabla (o un lote de tablas).
+    """
+
+    def __init__(self):
+        self._adicionales = _dias_inhabiles_adicionales()
+        self._anios = set()
+        self._inhabiles = set(self._adicionales)
+
+    def es_habil(self, fecha):
+        if fecha.weekday() >= 5:
+            return False
+        if fecha.year not in self._anios:
+            self._anios.add(fecha.year)
+            self._inhabiles |= _feriados_del_anio(fecha.year)
+        return fecha not in self._inhabiles
+
+    def siguiente_habil(self, fecha):
+        while not self.es_habil(fecha):
+            fecha += timedelta(days=1)
+        return fecha
+
+    def anterior_habil(self, fecha):
+        while not self.es_habil(fecha):
+            fecha -= timedelta(days=1)
+        return fecha
+
+    def ajustar(self, fecha, ajuste):
+        if ajuste == 'ninguno':
+            return fecha
+        if ajuste == 'anterior':
+            return self.anterior_habil(fecha)
+        siguiente = self.siguiente_habil(fecha)
+        if ajuste == 'siguiente_modificado' and siguiente.month != fecha.month:
+            return self.anterior_habil(fecha)
+        return siguiente
+
+
+def ajuste_configurado(ajuste=None):
+    ajuste = ajuste or getattr(settings, 'DOCUMENTOS_CALENDARIO_AJUSTE', None) or AJUSTE_POR_DEFECTO
+    if ajuste not in AJUSTES:
+        raise ValueError(f"Ajuste de calendario desconocido '{ajuste}': use {', '.join(AJUSTES)}")
+    return ajuste
+
+
+def devengo_configurado(devengo=None):
+    devengo = devengo or getattr(settings, 'DOCUMENTOS_CALENDARIO_DEVENGO', None) or DEVENGO_POR_DEFECTO
+    if devengo not in DEVENGOS:
+        raise ValueError(f"Devengo desconocido '{devengo}': use {', '.join(DEVENGOS)}")
+    return devengo
+
+
+def sumar_meses(fecha, meses):
+    """fecha + meses, con el día limitado al último del mes (31/01 + 1 = 28/02), como relativedelta"""
+    indice = fecha.year * 12 + fecha.month - 1 + meses
+    anio, mes = divmod(indice, 12)
+    mes += 1
+    return date(anio, mes, min(fecha.day, monthrange(anio, mes)[1]))
+
+
+def _fechas_sin_ajuste(fecha_inicio, num_pagos, periodicidad):
+    if periodicidad == 'quincenal':
+        return [fecha_inicio + timedelta(days=15 * k) for k in range(1, num_pagos + 1)]
+    if periodicidad == 'semanal':
+        return [fecha_inicio + timedelta(weeks=k) for k in range(1, num_pagos + 1)]
+    if periodicidad == 'diario':
+        return [fecha_inicio + timedelta(days=k) for k in range(1, num_pagos + 1)]
+    # Sin relativedelta: construirlo por cada pago domina el costo de una tabla larga
+    return [sumar_meses(fecha_inicio, k) for k in range(1, num_pagos + 1)]
+
+
+def fechas_de_pago(fecha_inicio, num_pagos, periodicidad, ajuste=None, calendario=None):
+    """
+    Fechas de los `num_pagos` pagos a partir de `fecha_inicio`, ajustadas a
+    día hábil. `periodicidad` ya normalizada (ver amortizacion.normalizar_periodicidad).
+    Con periodicidad 'diario' todo ajuste salvo 'ninguno' da los días hábiles
+    consecutivos (siempre el siguiente hábil), sea 'siguiente', 'anterior' o
+    'siguiente_modificado'.
+    """
+    ajuste = ajuste_configurado(ajuste)
+    if ajuste == 'ninguno':
+        return _fechas_sin_ajuste(fecha_inicio, num_pagos, periodicidad)
+    calendario = calendario or Calendario()
+    if periodicidad == 'diario':
+        # Días hábiles consecutivos: ajustar días naturales repetiría fechas
+        fechas = []
+        fecha = fecha_inicio
+        for _ in range(num_pagos):
+            fecha = calendario.siguiente_habil(fecha + timedelta(days=1))
+            fechas.append(fecha)
+        return fechas
+    return [calendario.ajustar(fecha, ajuste) for fecha in _fechas_sin_ajuste(fecha_inicio, num_pagos, periodicidad)]
+
+
+def dias_por_periodo(fecha_inicio, fechas):
+    """Días naturales de cada periodo: de la fecha anterior (o la de inicio) a la del pago"""
+    dias = []
+    anterior = fecha_inicio
+    for fecha in fechas:
+        dias.append((fecha - anterior).days)
+        anterior = fecha
+    return dias
+
+
+def calendario_de_pagos(fecha_inicio, num_pagos, periodicidad, ajuste=None, calendario=None):
+    """(fechas, dias): vector de fechas de pago y días devengados en cada periodo"""
+    fechas = fechas_de_pago(fecha_inicio, num_pagos, periodicidad, ajuste, calendario)
+    return fechas, dias_por_periodo(fecha_inicio, fechas)
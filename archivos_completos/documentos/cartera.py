@@ -0,0 +1,454 @@
+"""
+Analítica de la cartera de pagarés.
+
+Pagare.calcular_saldo_pendiente y calcular_total_pagado recorren el JSON de un
+solo pagaré en Python. Para toda la cartera de un usuario las cuotas se
+mantienen normalizadas en CuotaAmortizacion (se reescriben al guardar el
+pagaré) y los saldos, flujos por mes, devengos de interés e IVA y tramos de
+morosidad se calculan con agregados SQL, una consulta por reporte.
+
+datos_cartera() junta los reportes para el tablero y los guarda en la caché de
+Django; la clave cambia cuando cambia algún pagaré o sus cuotas, o al cambiar
+el día, así que no hace falta invalidarla a mano.
+"""
+
+import hashlib
+import json
+from datetime import date, datetime, timedelta
+from decimal import Decimal, InvalidOperation
+
+from django.conf import settings
+from django.core.cache import cache
+from django.db import transaction
+from django.db.models import Case, CharField, Count, Max, Min, Q, Sum, Value, When
+from django.db.models.functions import TruncMonth
+from django.utils import timezone
+
+from .models import CuotaAmortizacion, Pagare
+
+
+CENTAVO = Decimal('0.01')
+CERO = Decimal('0.00')
+
+FORMATOS_FECHA = ('%d/%m/%Y', '%Y-%m-%d')
+
+CACHE_SEGUNDOS_POR_DEFECTO = 300
+
+# (días mínimos, días máximos o None, etiqueta)
+TRAMOS_MOROSIDAD = (
+    (1, 30, '1-30'),
+    (31, 60, '31-60'),
+    (61, 90, '61-90'),
+    (91, None, '91+'),
+)
+
+PENDIENTE = ~Q(estado='pagado')
+PAGADA = Q(estado='pagado')
+# Las mismas condiciones vistas desde Pagare
+PENDIENTE_CUOTAS = ~Q(cuotas__estado='pagado')
+
+CAMPOS_IMPORTE = ('capital', 'saldo', 'costo_admon', 'iva_costo_admon', 'interes', 'iva_interes', 'total')
+
+
+def _importe(valor):
+    if valor in (None, ''):
+        return CERO
+    try:
+        return Decimal(str(valor)).quantize(CENTAVO)
+    except InvalidOperation:
+        return CERO
+
+
+def _redondear(fila):
+    """Lleva a centavos los Decimal de una fila (SQLite suma sin respetar decimal_places)"""
+    for clave, valor in fila.items():
+        if isinstance(valor, Decimal):
+            fila[clave] = valor.quantize(CENTAVO)
+    return fila
+
+
+def _fecha(valor):
+    """Fecha de la tabla JSON: 'dd/mm/aaaa' (tabla automática) o ISO (agregar_cuota)"""
+    if not valor:
+        return None
+    if isinstance(valor, date):
+        return valor
+    for formato in FORMATOS_FECHA:
+        try:
+            return datetime.strptime(str(valor), formato).date()
+        except ValueError:
+            continue
+    return None
+
+
+# Datos del pagaré de los que depende la tabla automática
+CAMPOS_TABLA = (
+    'monto_numeric', 'num_pagos', 'tasa_interes_ordinario', 'periodicidad', 'fecha_emision',
+    'gastos_admon', 'base_intereses',
+)
+# Ajustes del motor que también cambian la tabla. No entran en la huella: una tabla guardada
+# no cambia por editar settings, solo con `manage.py reconstruir_tablas --todas`
+AJUSTES_TABLA = (
+    'DOCUMENTOS_AMORTIZACION_REDONDEO', 'DOCUMENTOS_CALENDARIO_AJUSTE', 'DOCUMENTOS_CALENDARIO_DEVENGO',
+    'DOCUMENTOS_DIAS_INHABILES',
+)
+
+
+def _valor_huella(valor):
+    # Decimal('350') del formulario y Decimal('350.00') de la base son el mismo dato
+    if isinstance(valor, (Decimal, float, int)) and not isinstance(valor, bool):
+        return repr(float(valor))
+    if isinstance(valor, date):
+        return valor.isoformat()
+    return str(valor or '')
+
+
+def huella_tabla(pagare):
+    """SHA-256 de los datos del pagaré con que se genera su tabla automática"""
+    datos = [_valor_huella(getattr(pagare, campo)) for campo in CAMPOS_TABLA]
+    return hashlib.sha256(json.dumps(datos).encode()).hexdigest()
+
+
+def huella_ajustes_tabla():
+    """Ajustes del motor con que se generaría hoy una tabla (para cachés y ETag, no para regenerar)"""
+    return [repr(getattr(settings, ajuste, None)) for ajuste in AJUSTES_TABLA]
+
+
+def firma_tabla(tabla):
+    """Firma del contenido de una tabla JSON, para saber si cambió desde que se leyó"""
+    return hashlib.sha256(json.dumps(tabla, sort_keys=True, default=str).encode()).hexdigest()
+
+
+# Tablas guardadas sin huella (anteriores a ella): se reconocen como automáticas si coinciden
+# con la que genera el motor con el calendario configurado o con el de antes del calendario
+# (sin ajuste a día hábil ni devengo por días)
+VARIANTES_SIN_HUELLA = ({}, {'ajuste': 'ninguno', 'devengo': 'periodo'})
+# El motor anterior (float) difería hasta en un centavo en la cuota, y ese centavo crece
+# con el saldo en las filas siguientes: solo se compara lo que no arrastra redondeos
+TOLERANCIA_SIN_HUELLA = Decimal('0.01')
+
+
+def _cerca(a, b):
+    return abs(_importe(a) - _importe(b)) <= TOLERANCIA_SIN_HUELLA
+
+
+def _coincide_con_generada(tabla, generada):
+    """Mismas cuotas, fechas y gastos; misma cuota fija y mismo interés en la primera"""
+    if not generada or len(tabla) != len(generada):
+        return False
+    for guardada, calculada in zip(tabla, generada):
+        if guardada.get('numero') != calculada['numero'] or _fecha(guardada.get('fecha')) != _fecha(calculada['fecha']):
+            return False
+        if not (_cerca(guardada.get('costo_admon'), calculada['costo_admon'])
+                and _cerca(guardada.get('iva_costo_admon'), calculada['iva_costo_admon'])):
+            return False
+    # La última cuota cierra el saldo y puede diferir; las demás pagan la cuota fija
+    cuota = generada[0]['total']
+    return (_cerca(tabla[0].get('interes'), generada[0]['interes'])
+            and all(_cerca(fila.get('total'), cuota) for fila in tabla[:-1]))
+
+
+def tabla_automatica(pagare):
+    """
+    La tabla guardada se generó automáticamente (o no hay): se puede regenerar.
+    Sin huella puede ser una tabla capturada a mano o una automática guardada
+    antes de la huella; se distinguen comparándola con la que genera el motor.
+    """
+    tabla = pagare.tabla_amortizacion
+    if pagare.tabla_amortizacion_huella or not tabla:
+        return True
+    # agregar_cuota no escribe la etapa: una fila sin ella es captura manual
+    if not all(isinstance(fila, dict) and 'etapa' in fila for fila in tabla):
+        return False
+    return any(
+        _coincide_con_generada(tabla, pagare.generar_tabla_amortizacion_automatica(**variante))
+        for variante in VARIANTES_SIN_HUELLA
+    )
+
+
+def materializar_tabla(pagare, forzar=False):
+    """
+    Guarda en el pagaré (sin escribir en la base) la tabla automática si no
+    tiene o si cambiaron los datos del pagaré con que se generó, o siempre con
+    `forzar`. Una tabla guardada queda fija: cambiar los ajustes del motor no la
+    regenera, y una automática anterior a la huella solo la recibe. Conserva el
+    estado y la fecha de pago de las cuotas que ya lo tenían. Las tablas
+    capturadas a mano no se tocan.
+
+    Returns:
+        True si la tabla se regeneró
+    """
+    if not tabla_automatica(pagare):
+        return False
+    huella = huella_tabla(pagare)
+    if not forzar:
+        if pagare.tabla_amortizacion and not pagare.tabla_amortizacion_huella:
+            # Coincide con la generada con estos datos: se conserva tal cual
+            pagare.tabla_amortizacion_huella = huella
+            return False
+        if huella == pagare.tabla_amortizacion_huella:
+            return False
+
+    anteriores = {
+        fila.get('numero'): fila for fila in pagare.tabla_amortizacion or ()
+        if (fila.get('estado') or 'pendiente') != 'pendiente'
+    }
+    tabla = pagare.generar_tabla_amortizacion_automatica()
+    for fila in tabla:
+        anterior = anteriores.get(fila['numero'])
+        if anterior:
+            fila['estado'] = anterior['estado']
+            fila['fecha_pago_real'] = anterior.get('fecha_pago_real')
+    pagare.tabla_amortizacion = tabla
+    pagare.tabla_amortizacion_huella = huella
+    return True
+
+
+def tabla_del_pagare(pagare):
+    """
+    Tabla de amortización vigente: la guardada o, si no hay, la automática que
+    se imprime en el documento (ver generar_docx_pagare). Desde que la tabla se
+    guarda al guardar el pagaré, el cálculo aquí solo ocurre con pagarés sin
+    guardar o anteriores a la huella (ver `manage.py reconstruir_tablas`).
+    """
+    if pagare.tabla_amortizacion:
+        return pagare.tabla_amortizacion
+    if pagare.monto_numeric and pagare.num_pagos:
+        return pagare.generar_tabla_amortizacion_automatica()
+    return []
+
+
+def cuotas_de_tabla(pagare, tabla, modelo=CuotaAmortizacion):
+    """
+    CuotaAmortizacion sin guardar a partir de las filas JSON. `modelo` permite
+    pasar el modelo histórico desde una migración de datos.
+    """
+    cuotas = []
+    for posicion, fila in enumerate(tabla, start=1):
+        cuotas.append(modelo(
+            pagare=pagare,
+            numero=fila.get('numero') or posicion,
+            fecha=_fecha(fila.get('fecha')),
+            estado=fila.get('estado') or 'pendiente',
+            fecha_pago_real=_fecha(fila.get('fecha_pago_real')),
+            **{campo: _importe(fila.get(campo)) for campo in CAMPOS_IMPORTE},
+        ))
+    return cuotas
+
+
+def reconstruir_tablas(queryset, lote=200, forzar=False, simulacion=False):
+    """
+    Regenera por lotes las tablas automáticas cuyos datos cambiaron sin pasar
+    por save() (un QuerySet.update()), o todas con `forzar`, que es la única
+    forma de aplicar a las tablas guardadas un cambio de los ajustes del motor.
+    Las automáticas anteriores a la huella la reciben sin regenerarse (salvo
+    con `forzar`); las capturadas a mano no se tocan. Una transacción por lote
+    con bulk_update de los pagarés y sus cuotas normalizadas, sin pasar por save();
+    los regenerados reciben fecha_actualizacion (Last-Modified de las descargas).
+
+    Returns:
+        (revisados, regeneradas, manuales)
+    """
+    lote = max(1, lote)
+    revisados = regeneradas = manuales = 0
+    pendientes = []
+    con_huella = []
+
+    def guardar():
+        if not simulacion:
+            cuotas = []
+            ahora = timezone.now()
+            for pagare in pendientes:
+                pagare.fecha_actualizacion = ahora
+                cuotas.extend(cuotas_de_tabla(pagare, pagare.tabla_amortizacion))
+            with transaction.atomic():
+                Pagare.objects.bulk_update(
+                    pendientes, ['tabla_amortizacion', 'tabla_amortizacion_huella', 'fecha_actualizacion'],
+                )
+                Pagare.objects.bulk_update(con_huella, ['tabla_amortizacion_huella'])
+                CuotaAmortizacion.objects.filter(pagare__in=pendientes).delete()
+                CuotaAmortizacion.objects.bulk_create(cuotas, batch_size=1000)
+        return len(pendientes)
+
+    campos = ('pk', 'tabla_amortizacion', 'tabla_amortizacion_huella') + CAMPOS_TABLA
+    for pagare in queryset.select_related(None).only(*campos).order_by('pk').iterator(chunk_size=lote):
+        revisados += 1
+        if not tabla_automatica(pagare):
+            manuales += 1
+            continue
+        huella = pagare.tabla_amortizacion_huella
+        if materializar_tabla(pagare, forzar=forzar):
+            pendientes.append(pagare)
+        elif pagare.tabla_amortizacion_huella != huella:
+            con_huella.append(pagare)
+        if len(pendientes) + len(con_huella) >= lote:
+            regeneradas += guardar()
+            pendientes, con_huella = [], []
+    if pendientes or con_huella:
+        regeneradas += guardar()
+    return revisados, regeneradas, manuales
+
+
+def sincronizar_cuotas(pagare):
+    """Reescribe las cuotas normalizadas del pagaré a partir de su tabla JSON"""
+    cuotas = cuotas_de_tabla(pagare, tabla_del_pagare(pagare))
+    with transaction.atomic():
+        CuotaAmortizacion.objects.filter(pagare=pagare).delete()
+        CuotaAmortizacion.objects.bulk_create(cuotas)
+    return len(cuotas)
+
+
+def _cuotas_del_usuario(usuario):
+    return CuotaAmortizacion.objects.filter(pagare__usuario=usuario)
+
+
+def resumen(usuario, hoy):
+    """Totales de la cartera: saldo de capital, cobrado, vencido y devengos de interés e IVA"""
+    vencida = PENDIENTE & Q(fecha__lt=hoy)
+    devengada = Q(fecha__lte=hoy)
+    totales = _cuotas_del_usuario(usuario).aggregate(
+        capital_pendiente=Sum('capital', filter=PENDIENTE),
+        total_pendiente=Sum('total', filter=PENDIENTE),
+        total_pagado=Sum('total', filter=PAGADA),
+        total_vencido=Sum('total', filter=vencida),
+        capital_vencido=Sum('capital', filter=vencida),
+        interes_devengado=Sum('interes', filter=devengada),
+        iva_interes_devengado=Sum('iva_interes', filter=devengada),
+        interes_cobrado=Sum('interes', filter=PAGADA),
+        iva_interes_cobrado=Sum('iva_interes', filter=PAGADA),
+        interes_por_devengar=Sum('interes', filter=PENDIENTE & Q(fecha__gt=hoy)),
+        iva_interes_por_devengar=Sum('iva_interes', filter=PENDIENTE & Q(fecha__gt=hoy)),
+        cuotas_vencidas=Count('id', filter=vencida),
+    )
+    totales = {clave: valor if valor is not None else CERO for clave, valor in totales.items()}
+
+    pagares = Pagare.objects.filter(usuario=usuario).aggregate(
+        num_pagares=Count('id'),
+        monto_original=Sum('monto_numeric'),
+    )
+    # Sin tabla (faltan monto o número de pagos) el saldo es el monto completo, como en calcular_saldo_pendiente
+    sin_cuotas = Pagare.objects.filter(usuario=usuario, cuotas__isnull=True).aggregate(
+        num=Count('id'), monto=Sum('monto_numeric'),
+    )
+    totales.update(
+        num_pagares=pagares['num_pagares'],
+        monto_original=pagares['monto_original'] or CERO,
+        pagares_sin_tabla=sin_cuotas['num'],
+    )
+    totales['capital_pendiente'] += sin_cuotas['monto'] or CERO
+    return _redondear(totales)
+
+
+def flujos_por_mes(usuario):
+    """Flujo esperado por mes de las cuotas no pagadas (las vencidas quedan en su mes original)"""
+    filas = list(
+        _cuotas_del_usuario(usuario)
+        .filter(PENDIENTE, fecha__isnull=False)
+        .annotate(mes=TruncMonth('fecha'))
+        .values('mes')
+        .annotate(
+            cuotas=Count('id'),
+            capital=Sum('capital'),
+            interes=Sum('interes'),
+            iva_interes=Sum('iva_interes'),
+            costo_admon=Sum('costo_admon'),
+            iva_costo_admon=Sum('iva_costo_admon'),
+            total=Sum('total'),
+        )
+        .order_by('mes')
+    )
+    for fila in filas:
+        _redondear(fila)
+        fila['gastos'] = fila['costo_admon'] + fila['iva_costo_admon']
+    return filas
+
+
+def _tramo(hoy):
+    """Expresión con la etiqueta del tramo de morosidad según los días de atraso de la cuota"""
+    casos = []
+    for minimo, maximo, etiqueta in TRAMOS_MOROSIDAD:
+        condicion = Q(fecha__lte=hoy - timedelta(days=minimo))
+        if maximo is not None:
+            condicion &= Q(fecha__gte=hoy - timedelta(days=maximo))
+        casos.append(When(condicion, then=Value(etiqueta)))
+    return Case(*casos, output_field=CharField())
+
+
+def morosidad(usuario, hoy):
+    """Cuotas vencidas no pagadas por tramo de días de atraso, con todos los tramos aunque estén vacíos"""
+    filas = (
+        _cuotas_del_usuario(usuario)
+        .filter(PENDIENTE, fecha__lt=hoy)
+        .annotate(tramo=_tramo(hoy))
+        .order_by()
+        .values('tramo')
+        .annotate(
+            cuotas=Count('id'),
+            pagares=Count('pagare', distinct=True),
+            capital=Sum('capital'),
+            total=Sum('total'),
+        )
+    )
+    por_tramo = {fila['tramo']: _redondear(fila) for fila in filas}
+    return [
+        por_tramo.get(etiqueta, {'tramo': etiqueta, 'cuotas': 0, 'pagares': 0, 'capital': CERO, 'total': CERO})
+        for _, _, etiqueta in TRAMOS_MOROSIDAD
+    ]
+
+
+def por_pagare(usuario, hoy):
+    """Saldo, vencido, próximo pago y días de atraso de cada pagaré"""
+    vencida = PENDIENTE_CUOTAS & Q(cuotas__fecha__lt=hoy)
+    filas = list(
+        Pagare.objects.filter(usuario=usuario)
+        .annotate(
+            num_cuotas=Count('cuotas'),
+            cuotas_pendientes=Count('cuotas', filter=PENDIENTE_CUOTAS),
+            saldo_capital=Sum('cuotas__capital', filter=PENDIENTE_CUOTAS),
+            total_vencido=Sum('cuotas__total', filter=vencida),
+            vencida_mas_antigua=Min('cuotas__fecha', filter=vencida),
+            proximo_pago=Min('cuotas__fecha', filter=PENDIENTE_CUOTAS & Q(cuotas__fecha__gte=hoy)),
+        )
+        .values(
+            'id', 'deudor_nombre', 'fecha_emision', 'monto_numeric', 'estado',
+            'num_cuotas', 'cuotas_pendientes', 'saldo_capital', 'total_vencido', 'vencida_mas_antigua', 'proximo_pago',
+        )
+        .order_by('-fecha_emision', 'id')
+    )
+    for fila in filas:
+        if fila['num_cuotas']:
+            fila['saldo_capital'] = fila['saldo_capital'] or CERO
+        else:
+            # Sin tabla el saldo es el monto completo, como en calcular_saldo_pendiente
+            fila['saldo_capital'] = fila['monto_numeric'] or CERO
+        fila['total_vencido'] = fila['total_vencido'] or CERO
+        antigua = fila['vencida_mas_antigua']
+        fila['dias_atraso'] = (hoy - antigua).days if antigua else 0
+        _redondear(fila)
+    return filas
+
+
+def _version(usuario):
+    """Cambia cuando se crea, modifica o elimina un pagaré o se reescriben sus cuotas"""
+    pagares = Pagare.objects.filter(usuario=usuario).aggregate(num=Count('id'), ultima=Max('fecha_actualizacion'))
+    ultima_cuota = _cuotas_del_usuario(usuario).aggregate(ultima=Max('id'))['ultima']
+    ultima = pagares['ultima'].isoformat() if pagares['ultima'] else ''
+    return f"{pagares['num']}-{ultima}-{ultima_cuota or 0}"
+
+
+def datos_cartera(usuario, hoy=None):
+    """Todos los reportes de la cartera del usuario, memorizados en la caché de Django"""
+    hoy = hoy or date.today()
+    clave = f'cartera_pagares:{usuario.pk}:{hoy.isoformat()}:{_version(usuario)}'
+    segundos = getattr(settings, 'DOCUMENTOS_CARTERA_CACHE_SEGUNDOS', CACHE_SEGUNDOS_POR_DEFECTO)
+
+    def calcular():
+        return {
+            'hoy': hoy,
+            'resumen': resumen(usuario, hoy),
+            'flujos': flujos_por_mes(usuario),
+            'morosidad': morosidad(usuario, hoy),
+            'pagares': por_pagare(usuario, hoy),
+        }
+
+    return cache.get_or_set(clave, calcular, segundos)
@@ -0,0 +1,103 @@
+"""
+GET condicional (ETag / Last-Modified) para las vistas descargar_*.
+
+El ETag es fuerte y se deriva del contenido del registro (todos sus campos
+salvo las marcas de tiempo automáticas), de lo que el documento calcula fuera
+de esos campos (la tabla automática del pagaré y los ajustes del motor que la
+generan), de la huella del template DOCX, del formato y, para PDF, del motor
+configurado. Last-Modified es la fecha más reciente entre la actualización del
+registro y la del template; las acciones masivas que cambian el documento sin
+save() (admin, recalcular_literales, reconstruir_tablas) también la mueven. Si el cliente
+ya tiene esa versión se responde 304 sin generar el documento.
+"""
+
+import hashlib
+from functools import wraps
+
+from django.utils.cache import get_conditional_response
+from django.utils.http import http_date, quote_etag
+
+from .cartera import huella_ajustes_tabla, huella_tabla
+from .pdf_nativo import motor_pdf
+from .plantillas import plantilla_compilada
+
+
+# Se incrementa cuando cambia la forma en que los generadores producen los documentos
+VERSION_GENERADORES = '1'
+
+CAMPOS_ACTUALIZACION = ('actualizada_en', 'fecha_actualizacion')
+
+
+def huella_registro(obj):
+    """SHA-256 de los valores de los campos del registro, sin las marcas de tiempo automáticas"""
+    digest = hashlib.sha256()
+    for campo in obj._meta.concrete_fields:
+        if getattr(campo, 'auto_now', False) or getattr(campo, 'auto_now_add', False):
+            continue
+        digest.update(campo.attname.encode())
+        digest.update(b'\x00')
+        digest.update(repr(campo.value_to_string(obj)).encode())
+        digest.update(b'\x00')
+    return digest.hexdigest()
+
+
+def huellas_derivadas(obj, tipo):
+    """Lo que el documento imprime sin ser un campo del registro"""
+    if tipo == 'pagare':
+        # Sin tabla guardada se imprime la automática, que también depende de settings
+        return [huella_tabla(obj), *huella_ajustes_tabla()]
+    return []
+
+
+def etag_documento(obj, tipo, formato):
+    plantilla = plantilla_compilada(tipo)
+    partes = [VERSION_GENERADORES, tipo, formato, plantilla.huella, huella_registro(obj), *huellas_derivadas(obj, tipo)]
+    if formato == 'pdf':
+        partes.append(motor_pdf(tipo))
+    return hashlib.sha256('|'.join(partes).encode()).hexdigest()
+
+
+def ultima_modificacion(obj, tipo):
+    """Timestamp de la última modificación del registro o del template"""
+    marcas = [plantilla_compilada(tipo).modificada]
+    for campo in CAMPOS_ACTUALIZACION:
+        valor = getattr(obj, campo, None)
+        if valor is not None:
+            marcas.append(valor.timestamp())
+    return int(max(marcas))
+
+
+def descarga_condicional(modelo, tipo, formato):
+    """
+    Decorador de vistas descargar_*(request, pk): responde 304 si el cliente
+    tiene la versión vigente y agrega ETag, Last-Modified y Cache-Control a la
+    descarga. Va debajo de @login_required; sin sesión o si el registro no es
+    del usuario se deja a la vista responder.
+    """
+    def decorador(vista):
+        @wraps(vista)
+        def envoltura(request, pk, *args, **kwargs):
+            if request.method not in ('GET', 'HEAD') or not request.user.is_authenticated:
+                return vista(request, pk, *args, **kwargs)
+            obj = modelo.objects.filter(pk=pk, usuario=request.user).first()
+            if obj is None:
+                return vista(request, pk, *args, **kwargs)
+            try:
+                etag = quote_etag(etag_documento(obj, tipo, formato))
+                modificado = ultima_modificacion(obj, tipo)
+            except FileNotFoundError:
+                return vista(request, pk, *args, **kwargs)
+
+            respuesta = get_conditional_response(request, etag=etag, last_modified=modificado)
+            if respuesta is not None:
+                return respuesta
+
+            respuesta = vista(request, pk, *args, **kwargs)
+            # Solo la descarga lleva validadores; redirecciones y errores no se deben revalidar
+            if respuesta.status_code == 200:
+                respuesta.headers.setdefault('ETag', etag)
+                respuesta.headers.setdefault('Last-Modified', http_date(modificado))
+                respuesta.headers.setdefault('Cache-Control', 'private, no-cache')
+            return respuesta
+        return envoltura
+    return decorador
@@ -0,0 +1,66 @@
+"""
+Entrega de documentos generados sin copias completas en memoria.
+
+Los generadores escriben el DOCX o el PDF directamente en un
+SpooledTemporaryFile: se mantiene en memoria mientras mide menos de
+DOCUMENTOS_SPOOL_MAX_BYTES y pasa a un archivo en disco al superarlo, de modo
+que la memoria por petición queda acotada sin importar el tamaño del documento.
+Las vistas lo entregan con FileResponse, que lo envía por bloques y lo cierra al
+terminar la respuesta.
+"""
+
+import shutil
+import tempfile
+
+from django.conf import settings
+from django.http import FileResponse
+
+
+MIME_DOCX = 'application/vnd.openxmlformats-officedocument.wordprocessingml.document'
+MIME_PDF = 'application/pdf'
+MIME_ZIP = 'application/zip'
+
+SPOOL_MAX_BYTES_POR_DEFECTO = 1024 * 1024
+
+
+def archivo_temporal():
+    """Archivo binario en memoria que se pasa a disco al superar DOCUMENTOS_SPOOL_MAX_BYTES"""
+    limite = getattr(settings, 'DOCUMENTOS_SPOOL_MAX_BYTES', None) or SPOOL_MAX_BYTES_POR_DEFECTO
+    return tempfile.SpooledTemporaryFile(max_size=limite, mode='w+b')
+
+
+def guardar_docx(doc):
+    """Guarda un Document (python-docx o docxtpl) en un archivo temporal posicionado al inicio"""
+    archivo = archivo_temporal()
+    doc.save(archivo)
+    archivo.seek(0)
+    return archivo
+
+
+def copiar_a_temporal(origen):
+    """Copia por bloques un archivo abierto o una ruta a un archivo temporal posicionado al inicio"""
+    archivo = archivo_temporal()
+    if isinstance(origen, str):
+        with open(origen, 'rb') as fuente:
+            shutil.copyfileobj(fuente, archivo)
+    else:
+        shutil.copyfileobj(origen, archivo)
+    archivo.seek(0)
+    return archivo
+
+
+def respuesta_descarga(archivo, nombre, content_type):
+    """FileResponse de descarga; Content-Length se calcula del archivo y FileResponse lo cierra al final"""
+    return FileResponse(archivo, as_attachment=True, filename=nombre, content_type=content_type)
+
+
+def respuesta_docx(archivo, nombre):
+    return respuesta_descarga(archivo, nombre, MIME_DOCX)
+
+
+def respuesta_pdf(archivo, nombre):
+    return respuesta_descarga(archivo, nombre, MIME_PDF)
+
+
+def respuesta_zip(archivo, nombre):
+    return respuesta_descarga(archivo, nombre, MIME_ZIP)
@@ -10,22 +10,7 @@ from docx.enum.text import WD_ALIGN_PARAGRAPH
 from docx.oxml.shared import OxmlElement, qn
 from docx.shared import Pt, Cm
 
-
-def to_roman(num):
-    """Convert an integer to Roman numerals (I, II, III, IV, V, etc.)"""
-    if num <= 0:
-        return ""
-    
-    val = [1000, 900, 500, 400, 100, 90, 50, 40, 10, 9, 5, 4, 1]
-    syms = ["M", "CM", "D", "CD", "C", "XC", "L", "XL", "X", "IX", "V", "IV", "I"]
-    roman = ''
-    i = 0
-    while num > 0:
-        for _ in range(num // val[i]):
-            roman += syms[i]
-            num -= val[i]
-        i += 1
-    return roman
+from .formatting import to_roman
 
 
 def build_ordenes_con_resoluciones(orden_dia_json, resoluciones_json=None):
@@ -0,0 +1,154 @@
+"""
+Reemplazo de placeholders en párrafos DOCX conservando los runs.
+
+Word suele partir un placeholder en varios runs ('{{fe' + 'cha}}'). En lugar de
+vaciar todos los runs del párrafo y poner el texto completo en el primero (lo que
+pierde negritas, cursivas y fuentes de los demás), se localiza cada placeholder
+por su posición dentro del texto concatenado de los ``w:t`` y solo se editan los
+nodos que abarca: el valor queda en el run donde empieza el placeholder, los
+runs intermedios se vacían y el último conserva el texto que sigue al cierre.
+Los párrafos sin placeholders no se modifican.
+
+reemplazar_en_documento recorre una sola vez cada parte con texto del paquete
+(cuerpo, encabezados y pies de página), con todos sus párrafos, incluidos los de
+tablas anidadas y cuadros de texto, sin pasar por ``row.cells`` de python-docx.
+"""
+
+import re
+from bisect import bisect_right
+from functools import lru_cache
+from itertools import accumulate
+
+from docx.oxml.ns import qn
+from docx.text.paragraph import Paragraph
+
+from .placeholders import PARTES_CON_TEXTO
+
+
+W_P = qn('w:p')
+XML_SPACE = '{http://www.w3.org/XML/1998/namespace}space'
+
+# Textos del párrafo en orden de documento, incluidos los runs dentro de hipervínculos
+XPATH_TEXTOS = './w:r/w:t | ./w:hyperlink/w:r/w:t'
+
+
+@lru_cache(maxsize=64)
+def patron_placeholders(claves):
+    """Regex que encuentra cualquiera de los placeholders (los más largos primero)"""
+    return re.compile('|'.join(re.escape(c) for c in sorted(claves, key=len, reverse=True)))
+
+
+def _asignar_texto(nodo, texto):
+    nodo.text = texto
+    if texto != texto.strip():
+        nodo.set(XML_SPACE, 'preserve')
+
+
+def reemplazar_en_parrafo(paragraph, reemplazos):
+    """
+    Sustituye los placeholders de `reemplazos` en un párrafo de python-docx
+    editando solo los ``w:t`` que ocupa cada placeholder.
+
+    Returns:
+        número de placeholders reemplazados
+    """
+    return _reemplazar_en_p(paragraph._p, reemplazos)
+
+
+def _reemplazar_en_p(p, reemplazos):
+    if not reemplazos:
+        return 0
+    nodos = p.xpath(XPATH_TEXTOS)
+    if not nodos:
+        return 0
+    textos = [nodo.text or '' for nodo in nodos]
+    completo = ''.join(textos)
+    coincidencias = list(patron_placeholders(tuple(reemplazos)).finditer(completo))
+    if not coincidencias:
+        return 0
+
+    # Desplazamiento de inicio de cada w:t dentro del texto del párrafo
+    inicios = [0, *accumulate(len(texto) for texto in textos)][:-1]
+    originales = list(textos)
+
+    # De atrás hacia adelante: las posiciones de las coincidencias previas siguen siendo válidas
+    for coincidencia in reversed(coincidencias):
+        valor = reemplazos[coincidencia.group()]
+        valor = '' if valor is None else str(valor)
+        primero = bisect_right(inicios, coincidencia.start()) - 1
+        ultimo = bisect_right(inicios, coincidencia.end() - 1) - 1
+        desde = coincidencia.start() - inicios[primero]
+        hasta = coincidencia.end() - inicios[ultimo]
+        if primero == ultimo:
+            textos[primero] = textos[primero][:desde] + valor + textos[primero][hasta:]
+        else:
+            textos[primero] = textos[primero][:desde] + valor
+            for intermedio in range(primero + 1, ultimo):
+                textos[intermedio] = ''
+            textos[ultimo] = textos[ultimo][hasta:]
+
+    for nodo, original, texto in zip(nodos, originales, textos):
+        if texto != original:
+            _asignar_texto(nodo, texto)
+    return len(coincidencias)
+
+
+def partes_con_texto(doc):
+    """
+    Partes del paquete que contienen texto editable, cada una una sola vez:
+    documento principal, encabezados y pies de página (los compartidos entre
+    secciones son la misma parte). python-docx no carga notas al pie ni notas
+    finales como XML, así que no se incluyen.
+    """
+    for parte in doc.part.package.iter_parts():
+        if hasattr(parte, 'element') and PARTES_CON_TEXTO.match(str(parte.partname).lstrip('/')):
+            yield parte
+
+
+def _historias(doc):
+    """
+    (elemento XML, padre) del cuerpo y de cada encabezado y pie con definición
+    propia, cada parte una sola vez. El padre es el objeto de python-docx de esa
+    historia (el Document o el _Header/_Footer), de modo que `paragraph.part` y
+    `paragraph.style` funcionan. Los encabezados enlazados a la sección anterior
+    se omiten: consultarlos agregaría una definición vacía al documento.
+    """
+    yield doc.element, doc
+    vistas = set()
+    for seccion in doc.sections:
+        for historia in (
+            seccion.header, seccion.first_page_header, seccion.even_page_header,
+            seccion.footer, seccion.first_page_footer, seccion.even_page_footer,
+        ):
+            if historia.is_linked_to_previous or historia.part in vistas:
+                continue
+            vistas.add(historia.part)
+            yield historia.part.element, historia
+
+
+def parrafos_del_documento(doc):
+    """
+    Todos los párrafos del cuerpo (incluidas tablas y tablas anidadas), de los
+    encabezados y de los pies, cada uno exactamente una vez y con su historia
+    como padre. La lista de cada historia se toma antes de entregarla, así que
+    se pueden insertar párrafos nuevos.
+    """
+    for elemento, padre in _historias(doc):
+        for p in list(elemento.iter(W_P)):
+            yield Paragraph(p, padre)
+
+
+def reemplazar_en_documento(doc, reemplazos):
+    """
+    Sustituye los placeholders en todo el documento en un solo recorrido.
+
+    Returns:
+        número total de placeholders reemplazados
+    """
+    if not reemplazos:
+        return 0
+    total = 0
+    for parte in partes_con_texto(doc):
+        for p in parte.element.iter(W_P):
+            total += _reemplazar_en_p(p, reemplazos)
+    return total
@@ -0,0 +1,201 @@
+"""
+Escritura masiva de filas en tablas DOCX.
+
+En lugar de llamar ``table.add_row()`` por cada fila y dar formato run por run,
+se prepara una sola vez una fila plantilla ya formateada (una celda = un párrafo
+= un run = un ``w:t``) y cada fila nueva es una copia de su XML con el texto
+sustituido. Todas las filas se agregan a la tabla en una sola operación.
+"""
+
+from copy import deepcopy
+
+from docx.oxml.ns import qn
+from docx.oxml.shared import OxmlElement
+from docx.shared import Pt
+from docx.table import _Cell, _Row
+
+
+W_T = qn('w:t')
+W_TCPR = qn('w:tcPr')
+W_PPR = qn('w:pPr')
+W_RPR = qn('w:rPr')
+
+# Identificadores de párrafo de Word 2010+; deben ser únicos, así que no se copian
+ATRIBUTOS_UNICOS = (
+    '{http://schemas.microsoft.com/office/word/2010/wordml}paraId',
+    '{http://schemas.microsoft.com/office/word/2010/wordml}textId',
+)
+
+# Orden de los hijos de w:trPr según el esquema OOXML
+ORDEN_TRPR = tuple(qn(tag) for tag in (
+    'w:cnfStyle', 'w:divId', 'w:gridBefore', 'w:gridAfter', 'w:wBefore', 'w:wAfter', 'w:cantSplit',
+    'w:trHeight', 'w:tblHeader', 'w:tblCellSpacing', 'w:jc', 'w:hidden', 'w:ins', 'w:del', 'w:trPrChange',
+))
+
+# Elementos de w:tblPr que van después de w:tblBorders según el esquema OOXML
+SIGUIENTES_TBLBORDERS = {
+    qn(tag) for tag in ('w:shd', 'w:tblLayout', 'w:tblCellMar', 'w:tblLook', 'w:tblCaption', 'w:tblDescription')
+}
+
+
+def quitar_filas(tabla, desde=1):
+    """Quita de una vez todas las filas a partir de `desde` (por defecto conserva el encabezado)"""
+    tbl = tabla._tbl
+    for tr in tbl.tr_lst[desde:]:
+        tbl.remove(tr)
+
+
+def fila_plantilla(tabla, indice=None, fuente=None, tamano=None, alineacion=None, negrita=None):
+    """
+    Prepara la fila plantilla, desprendida de la tabla.
+
+    Si `indice` apunta a una fila existente se toma como modelo, conservando
+    sus propiedades de fila y de celda (anchos, sombreado, bordes); si no, se
+    usa una fila nueva. Cada celda queda con un único run con el formato indicado.
+    """
+    tbl = tabla._tbl
+    if indice is not None and indice < len(tbl.tr_lst):
+        tr = deepcopy(tbl.tr_lst[indice])
+        fila = _Row(tr, tabla)
+    else:
+        fila = tabla.add_row()
+        tr = fila._tr
+        tbl.remove(tr)
+
+    # Una vez por w:tc: con celdas combinadas (gridSpan) fila.cells repite la celda
+    for celda in (_Cell(tc, tabla) for tc in tr.tc_lst):
+        celda.text = '0'  # Deja exactamente un párrafo con un run y un w:t
+        for paragraph in celda.paragraphs:
+            if alineacion is not None:
+                paragraph.alignment = alineacion
+            for run in paragraph.runs:
+                if fuente:
+                    run.font.name = fuente
+                if tamano:
+                    run.font.size = Pt(tamano)
+                if negrita is not None:
+                    run.bold = negrita
+
+    for elemento in tr.iter():
+        for atributo in ATRIBUTOS_UNICOS:
+            elemento.attrib.pop(atributo, None)
+    return tr
+
+
+def _normalizar_celdas(plantilla):
+    """
+    Copia de la fila plantilla con cada w:tc reducido a un párrafo con un run y
+    un w:t (se conservan las propiedades de celda, párrafo y run del primero).
+    Así una celda vacía, partida en varios runs o con varios párrafos recibe
+    exactamente un valor y los textos no se recorren de columna.
+
+    Returns:
+        (w:tr normalizado, número de celdas)
+    """
+    tr = deepcopy(plantilla)
+    celdas = tr.tc_lst
+    for tc in celdas:
+        p = tc.p_lst[0] if tc.p_lst else tc.add_p()
+        for hijo in list(tc):
+            if hijo is not p and hijo.tag != W_TCPR:
+                tc.remove(hijo)
+        r = p.r_lst[0] if p.r_lst else p.add_r()
+        for hijo in list(p):
+            if hijo is not r and hijo.tag != W_PPR:
+                p.remove(hijo)
+        for hijo in list(r):
+            if hijo.tag != W_RPR:
+                r.remove(hijo)
+        t = OxmlElement('w:t')
+        t.set(qn('xml:space'), 'preserve')
+        r.append(t)
+    return tr, len(celdas)
+
+
+def agregar_filas(tabla, plantilla, filas):
+    """
+    Agrega todas las filas en una sola pasada: cada una es una copia de la
+    fila plantilla con un valor por celda (w:tc), en orden.
+
+    Args:
+        tabla: docx.table.Table destino
+        plantilla: elemento w:tr regresado por fila_plantilla()
+        filas: iterable de secuencias de textos (una por celda)
+
+    Returns:
+        Número de filas agregadas
+
+    Raises:
+        ValueError: si una fila no trae un valor por cada celda de la plantilla
+    """
+    plantilla, celdas = _normalizar_celdas(plantilla)
+    nuevas = []
+    for numero, valores in enumerate(filas, start=1):
+        valores = tuple(valores)
+        if len(valores) != celdas:
+            raise ValueError(
+                f'La fila {numero} tiene {len(valores)} valores y la fila plantilla {celdas} celdas'
+            )
+        tr = deepcopy(plantilla)
+        # Tras normalizar hay exactamente un w:t por celda, en orden
+        for t, valor in zip(tr.iter(W_T), valores):
+            t.text = valor
+        nuevas.append(tr)
+    tabla._tbl.extend(nuevas)
+    return len(nuevas)
+
+
+def _marcar_fila(tr, nombre, activo=True):
+    """Agrega (o quita) la propiedad vacía `nombre` ('w:cantSplit') de w:trPr respetando el orden del esquema"""
+    tag = qn(nombre)
+    trPr = tr.get_or_add_trPr()
+    for anterior in trPr.findall(tag):
+        trPr.remove(anterior)
+    if not activo:
+        return
+    nuevo = OxmlElement(nombre)
+    siguientes = ORDEN_TRPR[ORDEN_TRPR.index(tag) + 1:]
+    for hermano in trPr.iterchildren():
+        if hermano.tag in siguientes:
+            hermano.addprevious(nuevo)
+            break
+    else:
+        trPr.append(nuevo)
+
+
+def paginar_tabla(tabla, plantilla, encabezados=1):
+    """
+    Prepara una tabla larga para partirse en páginas: las primeras `encabezados`
+    filas se repiten al inicio de cada página (w:tblHeader) y ninguna fila se
+    parte entre dos páginas (w:cantSplit). Se aplica a la fila plantilla antes de
+    agregar_filas(), así que cada fila copiada ya lo trae.
+    """
+    for tr in tabla._tbl.tr_lst[:encabezados]:
+        _marcar_fila(tr, 'w:cantSplit')
+        _marcar_fila(tr, 'w:tblHeader')
+    _marcar_fila(plantilla, 'w:cantSplit')
+    _marcar_fila(plantilla, 'w:tblHeader', activo=False)
+
+
+def aplicar_cuadricula(tabla, grosor='4', color='000000'):
+    """Aplica bordes sencillos a toda la tabla (contorno y líneas interiores)"""
+    tblPr = tabla._tbl.tblPr
+    for anterior in tblPr.findall(qn('w:tblBorders')):
+        tblPr.remove(anterior)
+
+    tblBorders = OxmlElement('w:tblBorders')
+    for border_type in ('top', 'left', 'bottom', 'right', 'insideH', 'insideV'):
+        border = OxmlElement(f'w:{border_type}')
+        border.set(qn('w:val'), 'single')
+        border.set(qn('w:sz'), grosor)
+        border.set(qn('w:space'), '0')
+        border.set(qn('w:color'), color)
+        tblBorders.append(border)
+
+    # Respetar el orden del esquema de w:tblPr (Word rechaza elementos fuera de orden)
+    for hermano in tblPr.iterchildren():
+        if hermano.tag in SIGUIENTES_TBLBORDERS:
+            hermano.addprevious(tblBorders)
+            break
+    else:
+        tblPr.append(tblBorders)
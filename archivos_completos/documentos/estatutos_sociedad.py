@@ -157,6 +157,11 @@ class EstatutosSociedad(models.Model):
         verbose_name = "Estatutos Sociales"
         verbose_name_plural = "Estatutos Sociales"
         ordering = ['-fecha_creacion']
+        # Listas por usuario y filtros del admin
+        indexes = [
+            models.Index(fields=['usuario', '-fecha_creacion'], name='estatutos_usuario_fecha_idx'),
+            models.Index(fields=['estado', '-fecha_creacion'], name='estatutos_estado_fecha_idx'),
+        ]
     
     def __str__(self):
         return f"{self.denominacion} {self.forma_legal}"
@@ -0,0 +1,185 @@
+"""
+Exportación de listas y tablas de amortización a CSV o XLSX en memoria constante.
+
+Las filas salen de la base con values_list().iterator(chunk_size=...), sin
+construir instancias del modelo ni cargar el queryset completo. El CSV se envía
+con StreamingHttpResponse en bloques de DOCUMENTOS_EXPORTACION_CHUNK filas,
+conforme se leen. El XLSX se escribe con openpyxl en modo write-only (cada fila
+va a un archivo temporal al agregarla) dentro de un archivo_temporal() y se
+entrega con FileResponse; el ZIP del libro solo puede cerrarse al final, así
+que se arma completo antes de enviarlo, pero sin guardarlo en memoria.
+
+La tabla de un solo pagaré se exporta de su tabla vigente (filas_objetos), que
+es la que se imprime en el documento; solo la de toda la cartera lee
+CuotaAmortizacion.
+
+Las listas se exportan agregando ExportarListaMixin a un ListView y
+?exportar=csv o ?exportar=xlsx a su URL: se exporta get_queryset() completo,
+sin paginar, con las etiquetas de los campos como encabezados.
+"""
+
+import csv
+import io
+from datetime import date, datetime
+
+from django.conf import settings
+from django.core.exceptions import FieldDoesNotExist
+from django.db import models
+from django.http import Http404, StreamingHttpResponse
+from django.utils import timezone
+from django.utils.text import slugify
+
+from .descargas import archivo_temporal, respuesta_descarga
+
+try:
+    from openpyxl import Workbook
+    from openpyxl.cell.cell import ILLEGAL_CHARACTERS_RE
+    OPENPYXL_AVAILABLE = True
+except ImportError:
+    OPENPYXL_AVAILABLE = False
+
+
+MIME_CSV = 'text/csv; charset=utf-8'
+MIME_XLSX = 'application/vnd.openxmlformats-officedocument.spreadsheetml.sheet'
+
+FORMATOS = ('csv', 'xlsx')
+
+CHUNK_POR_DEFECTO = 2000
+
+# Columnas que no aportan a una lista (además del HTML generado): JSON y el usuario
+CAMPOS_EXCLUIDOS = (models.JSONField, models.ForeignKey)
+
+# (encabezado, campo de CuotaAmortizacion)
+COLUMNAS_AMORTIZACION = (
+    ('Número', 'numero'), ('Fecha', 'fecha'), ('Capital', 'capital'), ('Saldo', 'saldo'),
+    ('Costo admon', 'costo_admon'), ('IVA costo admon', 'iva_costo_admon'), ('Interés', 'interes'),
+    ('IVA interés', 'iva_interes'), ('Total', 'total'), ('Estado', 'estado'), ('Fecha de pago', 'fecha_pago_real'),
+)
+COLUMNAS_PAGARE_CUOTA = (('Pagaré', 'pagare_id'), ('Deudor', 'pagare__deudor_nombre'))
+
+
+def tamano_chunk():
+    return getattr(settings, 'DOCUMENTOS_EXPORTACION_CHUNK', None) or CHUNK_POR_DEFECTO
+
+
+def columnas_de_modelo(modelo):
+    """
+    (etiqueta, campo) de las columnas concretas del modelo que tiene sentido
+    listar; las formas literales se omiten porque se derivan de otra columna.
+    """
+    literales = getattr(modelo, 'LITERALES', {})
+    return [
+        (str(campo.verbose_name), campo.name)
+        for campo in modelo._meta.concrete_fields
+        if not isinstance(campo, CAMPOS_EXCLUIDOS) and 'html' not in campo.name and campo.name not in literales
+    ]
+
+
+def _convertidores(modelo, campos):
+    """Por columna, el diccionario valor -> etiqueta de los campos con choices (o None)"""
+    convertidores = []
+    for nombre in campos:
+        try:
+            campo = modelo._meta.get_field(nombre)
+        except FieldDoesNotExist:
+            # Campos de modelos relacionados ('pagare__deudor_nombre') o el attname de una FK
+            campo = None
+        convertidores.append(dict(campo.flatchoices) if campo is not None and campo.choices else None)
+    return convertidores
+
+
+def filas_queryset(queryset, columnas):
+    """Genera las filas del queryset como tuplas, leyendo la base por bloques"""
+    campos = [campo for _, campo in columnas]
+    convertidores = _convertidores(queryset.model, campos)
+    for fila in queryset.values_list(*campos).iterator(chunk_size=tamano_chunk()):
+        if any(convertidores):
+            fila = tuple(
+                convertidor.get(valor, valor) if convertidor else valor
+                for convertidor, valor in zip(convertidores, fila)
+            )
+        yield fila
+
+
+def filas_objetos(objetos, columnas):
+    """Genera las filas de instancias ya construidas (p. ej. cuotas sin guardar) como tuplas"""
+    campos = [campo for _, campo in columnas]
+    for objeto in objetos:
+        yield tuple(getattr(objeto, campo) for campo in campos)
+
+
+def _valor(valor):
+    """Valor apto para CSV y XLSX: fechas en hora local sin zona, textos sin caracteres de control"""
+    if isinstance(valor, datetime):
+        if timezone.is_aware(valor):
+            valor = timezone.localtime(valor)
+        return valor.replace(tzinfo=None)
+    if isinstance(valor, str) and OPENPYXL_AVAILABLE:
+        return ILLEGAL_CHARACTERS_RE.sub('', valor)
+    return valor
+
+
+def bloques_csv(encabezados, filas, chunk=None):
+    """Genera el CSV en bloques de `chunk` filas, con BOM para que Excel reconozca UTF-8"""
+    chunk = chunk or tamano_chunk()
+    buffer = io.StringIO()
+    writer = csv.writer(buffer)
+    buffer.write('\ufeff')
+    writer.writerow(encabezados)
+    for numero, fila in enumerate(filas, start=1):
+        writer.writerow(['' if valor is None else _valor(valor) for valor in fila])
+        if numero % chunk == 0:
+            yield buffer.getvalue()
+            buffer.seek(0)
+            buffer.truncate()
+    yield buffer.getvalue()
+
+
+def escribir_xlsx(encabezados, filas, titulo='Hoja1'):
+    """Libro XLSX write-only en un archivo temporal posicionado al inicio"""
+    if not OPENPYXL_AVAILABLE:
+        raise Http404("La exportación a XLSX requiere openpyxl")
+    libro = Workbook(write_only=True)
+    hoja = libro.create_sheet(title=titulo[:31])
+    hoja.append(list(encabezados))
+    for fila in filas:
+        hoja.append([_valor(valor) for valor in fila])
+    archivo = archivo_temporal()
+    libro.save(archivo)
+    archivo.seek(0)
+    return archivo
+
+
+def respuesta_exportacion(columnas, filas, formato, nombre):
+    """Respuesta de descarga de las filas en el formato pedido ('csv' o 'xlsx')"""
+    encabezados = [encabezado for encabezado, _ in columnas]
+    archivo = f'{nombre}_{date.today().strftime("%Y%m%d")}.{formato}'
+    if formato == 'csv':
+        response = StreamingHttpResponse(bloques_csv(encabezados, filas), content_type=MIME_CSV)
+        response['Content-Disposition'] = f'attachment; filename="{archivo}"'
+        return response
+    if formato == 'xlsx':
+        return respuesta_descarga(escribir_xlsx(encabezados, filas, nombre), archivo, MIME_XLSX)
+    raise Http404("Formato de exportación no soportado")
+
+
+def exportar_queryset(queryset, formato, nombre, columnas=None):
+    columnas = columnas or columnas_de_modelo(queryset.model)
+    return respuesta_exportacion(columnas, filas_queryset(queryset, columnas), formato, nombre)
+
+
+class ExportarListaMixin:
+    """
+    Agrega a un ListView la descarga de su queryset completo con ?exportar=csv
+    o ?exportar=xlsx. `columnas_exportacion` fija las columnas (etiqueta, campo);
+    por defecto se usan las del modelo.
+    """
+    columnas_exportacion = None
+
+    def get(self, request, *args, **kwargs):
+        formato = request.GET.get('exportar')
+        if formato in FORMATOS:
+            queryset = self.get_queryset()
+            nombre = slugify(queryset.model._meta.verbose_name_plural)
+            return exportar_queryset(queryset, formato, nombre, self.columnas_exportacion)
+        return super().get(request, *args, **kwargs)
@@ -0,0 +1,157 @@
+"""
+Formateo en español legal de fechas, montos y numerales.
+
+Antes cada generador tenía su copia de formatear_fecha (strftime con nombres de
+mes en inglés y una cadena de replace, dependiente del locale del servidor),
+llamaba a num2words sin memoria y había dos to_roman. Aquí todo es
+independiente del locale y se memoriza: los mismos valores (las fechas de un
+contrato, las tasas de un pagaré, los números del orden del día) se repiten
+entre peticiones, así que cada conversión se calcula una sola vez por proceso.
+"""
+
+from datetime import datetime
+from decimal import Decimal, InvalidOperation, ROUND_HALF_UP
+from functools import lru_cache
+
+from num2words import num2words
+
+
+MESES = (
+    'enero', 'febrero', 'marzo', 'abril', 'mayo', 'junio',
+    'julio', 'agosto', 'septiembre', 'octubre', 'noviembre', 'diciembre',
+)
+
+VALORES_ROMANOS = (
+    (1000, 'M'), (900, 'CM'), (500, 'D'), (400, 'CD'), (100, 'C'), (90, 'XC'),
+    (50, 'L'), (40, 'XL'), (10, 'X'), (9, 'IX'), (5, 'V'), (4, 'IV'), (1, 'I'),
+)
+
+CENTAVO = Decimal('0.01')
+
+
+def _solo_fecha(fecha):
+    """Las datetime se reducen a su fecha para compartir entradas de la caché"""
+    return fecha.date() if isinstance(fecha, datetime) else fecha
+
+
+@lru_cache(maxsize=2048)
+def _fecha_larga(fecha, relleno):
+    dia = f'{fecha.day:02d}' if relleno else str(fecha.day)
+    return f'{dia} de {MESES[fecha.month - 1]} de {fecha.year}'
+
+
+def formatear_fecha(fecha, vacio='[FECHA]', relleno=True):
+    """
+    Fecha como '05 de marzo de 2025'.
+
+    Args:
+        fecha: date o datetime (None regresa `vacio`)
+        vacio: texto para fechas vacías
+        relleno: si el día lleva cero a la izquierda ('05' en lugar de '5')
+    """
+    if not fecha:
+        return vacio
+    return _fecha_larga(_solo_fecha(fecha), relleno)
+
+
+@lru_cache(maxsize=2048)
+def _fecha_en_letra(fecha):
+    dia = num2words(fecha.day, lang='es').capitalize()
+    anio = num2words(fecha.year, lang='es')
+    return f'{dia} de {MESES[fecha.month - 1]} de {anio}'
+
+
+def fecha_a_texto(fecha):
+    """Fecha en letra: 'Cinco de marzo de dos mil veinticinco'"""
+    if not fecha:
+        return ''
+    return _fecha_en_letra(_solo_fecha(fecha))
+
+
+@lru_cache(maxsize=4096)
+def _en_letra(clase, texto):
+    # La caché se indexa por el texto del número: Decimal('24.0') == Decimal('24')
+    # pero num2words no siempre los escribe igual
+    return num2words(clase(texto), lang='es')
+
+
+def numero_en_letra(numero, capitalizar=False):
+    """Número en letra tal como lo escribe num2words ('veinticuatro punto cinco')"""
+    texto = _en_letra(type(numero), str(numero))
+    return texto.capitalize() if capitalizar else texto
+
+
+def numero_a_texto(numero):
+    """Número en letra tratándolo como float; regresa el texto original si no es numérico"""
+    if numero is None:
+        return ''
+    try:
+        return numero_en_letra(float(numero))
+    except (TypeError, ValueError, OverflowError, InvalidOperation, NotImplementedError):
+        return str(numero)
+
+
+@lru_cache(maxsize=2048)
+def _monto_en_letra(monto, moneda, moneda_singular, sufijo):
+    entero = int(monto)
+    centavos = int((monto - entero) * 100)
+    palabras = num2words(entero, lang='es')
+    if palabras.endswith('uno'):
+        palabras = palabras[:-1]  # 'un peso', 'veintiún pesos'... apócope ante sustantivo
+        if palabras.endswith('veintiun'):
+            palabras = palabras[:-2] + 'ún'
+    nombre = moneda_singular if entero == 1 else moneda
+    if palabras.endswith(('millón', 'millones')):
+        nombre = f'de {nombre}'
+    return f'{palabras} {nombre} {centavos:02d}/100 {sufijo}'.strip()
+
+
+def monto_en_letra(monto, moneda='pesos', moneda_singular='peso', sufijo='M.N.', capitalizar=True):
+    """
+    Monto en letra con centavos en fracción: 'Ciento cincuenta mil pesos 00/100 M.N.'
+
+    Los centavos se redondean a dos decimales (mitad hacia arriba). Para el
+    formato largo usar sufijo='Moneda Nacional'.
+    """
+    if monto is None or monto == '':
+        return ''
+    monto = Decimal(str(monto)).quantize(CENTAVO, rounding=ROUND_HALF_UP)
+    texto = _monto_en_letra(monto, moneda, moneda_singular, sufijo)
+    return texto[0].upper() + texto[1:] if capitalizar else texto
+
+
+def porcentaje(valor, decimales=None, vacio=''):
+    """Porcentaje como '24.00%'; sin `decimales` se respeta la representación del valor"""
+    if valor is None or valor == '':
+        return vacio
+    if decimales is None:
+        return f'{valor}%'
+    return f'{Decimal(str(valor)):.{decimales}f}%'
+
+
+def porcentaje_en_letra(valor, capitalizar=False):
+    """Porcentaje en letra: 'veinticuatro por ciento'"""
+    if valor is None or valor == '':
+        return ''
+    return f'{numero_en_letra(valor, capitalizar)} por ciento'
+
+
+@lru_cache(maxsize=512)
+def ordinal(numero, femenino=False):
+    """Ordinal en letra: 'primero', 'segunda', 'décimo tercero'..."""
+    texto = num2words(numero, lang='es', to='ordinal')
+    if femenino:
+        texto = ' '.join(p[:-1] + 'a' if p.endswith('o') else p for p in texto.split())
+    return texto
+
+
+@lru_cache(maxsize=512)
+def to_roman(num):
+    """Convierte un número entero a numeración romana (I, II, III, IV...); '' para cero o negativos"""
+    if num <= 0:
+        return ''
+    romano = []
+    for valor, simbolo in VALORES_ROMANOS:
+        cantidad, num = divmod(num, valor)
+        romano.append(simbolo * cantidad)
+    return ''.join(romano)
@@ -0,0 +1,262 @@
+"""
+Importación masiva de pagarés desde hojas de cálculo (XLSX o CSV).
+
+Las filas se leen en streaming (openpyxl en modo read_only, csv.reader), así
+que el archivo nunca se carga completo en memoria. Cada fila se valida con
+PagareForm, las mismas reglas que la captura en PagareCreateView, y las válidas
+se acumulan en lotes que se guardan con bulk_create: un INSERT por lote para los
+pagarés y otro para sus cuotas (CuotaAmortizacion), calculadas con la tabla
+automática. Como bulk_create no pasa por save(), las formas literales, la
+tabla y las cuotas se calculan aquí mismo. Los errores se reportan por número
+de fila.
+
+La primera fila del archivo son los encabezados: el nombre del campo
+(`deudor_nombre`) o su etiqueta (`Nombre completo del Deudor`), sin importar
+mayúsculas ni acentos. Las celdas vacías toman el valor por defecto del modelo,
+como en el formulario de captura.
+"""
+
+import csv
+import re
+import time
+import unicodedata
+from datetime import datetime
+from pathlib import Path
+
+from django.db import transaction
+
+from .cartera import cuotas_de_tabla, materializar_tabla
+from .forms import PagareForm
+from .models import CuotaAmortizacion, Pagare
+
+try:
+    from openpyxl import load_workbook
+    OPENPYXL_AVAILABLE = True
+except ImportError:
+    OPENPYXL_AVAILABLE = False
+
+
+EXTENSIONES_XLSX = ('.xlsx', '.xlsm')
+EXTENSIONES_CSV = ('.csv', '.txt')
+
+VALORES_VERDADEROS = {'si', 's', 'x', '1', 'true', 'verdadero', 'yes'}
+
+LOTE_POR_DEFECTO = 500
+
+
+def normalizar(texto):
+    """'Nombre completo del Deudor ' -> 'nombre_completo_del_deudor'"""
+    texto = unicodedata.normalize('NFKD', str(texto or '')).encode('ascii', 'ignore').decode('ascii')
+    return re.sub(r'[^a-z0-9]+', '_', texto.lower()).strip('_')
+
+
+def _columnas_pagare():
+    """Encabezado normalizado -> campo de PagareForm (por nombre y por etiqueta)"""
+    columnas = {}
+    for nombre in PagareForm._meta.fields:
+        campo = Pagare._meta.get_field(nombre)
+        columnas[normalizar(campo.verbose_name)] = nombre
+        columnas[normalizar(nombre)] = nombre
+    return columnas
+
+
+def _opciones_pagare():
+    """Campo con choices -> {valor o etiqueta normalizados: valor}"""
+    opciones = {}
+    for nombre in PagareForm._meta.fields:
+        campo = Pagare._meta.get_field(nombre)
+        if campo.choices:
+            opciones[nombre] = {}
+            for valor, etiqueta in campo.choices:
+                opciones[nombre][normalizar(etiqueta)] = valor
+                opciones[nombre][normalizar(valor)] = valor
+    return opciones
+
+
+COLUMNAS_PAGARE = _columnas_pagare()
+OPCIONES_PAGARE = _opciones_pagare()
+CAMPOS_BOOLEANOS = {
+    nombre for nombre in PagareForm._meta.fields
+    if Pagare._meta.get_field(nombre).get_internal_type() == 'BooleanField'
+}
+# Lo que el formulario de captura ya trae precargado (estado 'borrador', moneda, base 360...)
+VALORES_POR_DEFECTO = {
+    nombre: Pagare._meta.get_field(nombre).get_default()
+    for nombre in PagareForm._meta.fields
+    if Pagare._meta.get_field(nombre).has_default()
+}
+
+
+def _filas_xlsx(ruta, hoja=None):
+    if not OPENPYXL_AVAILABLE:
+        raise ValueError('Para importar archivos XLSX se requiere openpyxl (pip install openpyxl)')
+    libro = load_workbook(ruta, read_only=True, data_only=True)
+    try:
+        if hoja:
+            if hoja not in libro.sheetnames:
+                raise ValueError(f"La hoja '{hoja}' no existe; hojas: {', '.join(libro.sheetnames)}")
+            filas = libro[hoja].iter_rows(values_only=True)
+        else:
+            filas = libro.worksheets[0].iter_rows(values_only=True)
+        encabezados = next(filas, None) or ()
+        yield list(encabezados)
+        for fila in filas:
+            yield list(fila)
+    finally:
+        # En modo read_only el archivo queda abierto hasta cerrar el libro
+        libro.close()
+
+
+def _filas_csv(ruta):
+    with open(ruta, newline='', encoding='utf-8-sig') as archivo:
+        muestra = archivo.read(4096)
+        archivo.seek(0)
+        try:
+            dialecto = csv.Sniffer().sniff(muestra, delimiters=',;\t')
+        except csv.Error:
+            dialecto = csv.excel
+        yield from csv.reader(archivo, dialecto)
+
+
+def leer_filas(ruta, hoja=None):
+    """
+    Genera las filas del archivo como listas de celdas; la primera son los
+    encabezados. No carga el archivo completo en memoria.
+    """
+    extension = Path(ruta).suffix.lower()
+    if extension in EXTENSIONES_XLSX:
+        return _filas_xlsx(ruta, hoja)
+    if extension in EXTENSIONES_CSV:
+        return _filas_csv(ruta)
+    raise ValueError(f"Formato no soportado '{extension}': use XLSX o CSV")
+
+
+def _valor(campo, celda):
+    """Convierte la celda al valor que espera el formulario; None si está vacía"""
+    if celda is None:
+        return None
+    if isinstance(celda, str):
+        celda = celda.strip()
+        if not celda:
+            return None
+    if campo in CAMPOS_BOOLEANOS:
+        if isinstance(celda, str):
+            return normalizar(celda) in VALORES_VERDADEROS
+        return bool(celda)
+    if campo in OPCIONES_PAGARE:
+        return OPCIONES_PAGARE[campo].get(normalizar(celda), celda)
+    if isinstance(celda, datetime):
+        return celda.date()
+    if isinstance(celda, float):
+        # Excel guarda los números como float: 1500.0 -> '1500', 12.3 -> '12.3'
+        return str(int(celda)) if celda.is_integer() else repr(celda)
+    return celda
+
+
+def _datos_fila(mapeo, fila):
+    """Diccionario para PagareForm; None si la fila está vacía"""
+    datos = {}
+    for posicion, campo in mapeo:
+        if posicion < len(fila):
+            valor = _valor(campo, fila[posicion])
+            if valor is not None:
+                datos[campo] = valor
+    if not datos:
+        return None
+    # Las celdas vacías toman el default del modelo, como el formulario precargado
+    return {**VALORES_POR_DEFECTO, **datos}
+
+
+class ResultadoImportacion:
+    """Conteos y errores por fila de una importación"""
+
+    def __init__(self, simulacion=False):
+        self.simulacion = simulacion
+        self.filas = 0
+        self.creados = 0
+        self.cuotas = 0
+        self.errores = []  # (fila, campo, mensaje)
+        self.columnas_ignoradas = []
+        self.duracion = 0.0
+
+    @property
+    def filas_con_error(self):
+        return len({fila for fila, _, _ in self.errores})
+
+    def agregar_errores(self, numero_fila, errores):
+        for campo, mensajes in errores.items():
+            for mensaje in mensajes:
+                self.errores.append((numero_fila, campo, mensaje))
+
+
+def _guardar_lote(pagares, resultado):
+    """Inserta el lote de pagarés y sus cuotas con bulk_create en una transacción"""
+    if resultado.simulacion:
+        resultado.creados += len(pagares)
+        resultado.cuotas += sum(len(pagare.tabla_amortizacion) for pagare in pagares)
+        return
+    with transaction.atomic():
+        Pagare.objects.bulk_create(pagares)
+        cuotas = []
+        for pagare in pagares:
+            cuotas.extend(cuotas_de_tabla(pagare, pagare.tabla_amortizacion))
+        CuotaAmortizacion.objects.bulk_create(cuotas, batch_size=1000)
+    resultado.creados += len(pagares)
+    resultado.cuotas += len(cuotas)
+
+
+def importar_pagares(ruta, usuario, lote=LOTE_POR_DEFECTO, simulacion=False, hoja=None):
+    """
+    Importa los pagarés de un archivo XLSX o CSV para `usuario`.
+
+    Las filas inválidas no detienen la importación: se reportan en
+    `resultado.errores` con su número de fila (la de encabezados es la 1).
+    Cada lote se guarda en su propia transacción.
+
+    Returns:
+        ResultadoImportacion
+    """
+    resultado = ResultadoImportacion(simulacion)
+    inicio = time.perf_counter()
+    lote = max(1, lote)
+
+    filas = leer_filas(ruta, hoja)
+    encabezados = next(filas, None)
+    if not encabezados:
+        raise ValueError('El archivo está vacío')
+
+    mapeo = []
+    for posicion, encabezado in enumerate(encabezados):
+        campo = COLUMNAS_PAGARE.get(normalizar(encabezado))
+        if campo:
+            mapeo.append((posicion, campo))
+        elif encabezado not in (None, ''):
+            resultado.columnas_ignoradas.append(str(encabezado))
+    if not mapeo:
+        raise ValueError('Ningún encabezado corresponde a un campo del pagaré')
+
+    pendientes = []
+    for numero_fila, fila in enumerate(filas, start=2):
+        datos = _datos_fila(mapeo, fila)
+        if datos is None:
+            continue
+        resultado.filas += 1
+
+        form = PagareForm(data=datos)
+        if not form.is_valid():
+            resultado.agregar_errores(numero_fila, form.errors)
+            continue
+
+        pagare = form.save(commit=False)
+        pagare.usuario = usuario
+        pagare.actualizar_literales()
+        materializar_tabla(pagare)
+        pendientes.append(pagare)
+        if len(pendientes) >= lote:
+            _guardar_lote(pendientes, resultado)
+            pendientes = []
+    if pendientes:
+        _guardar_lote(pendientes, resultado)
+
+    resultado.duracion = time.perf_counter() - inicio
+    return resultado
@@ -0,0 +1,119 @@
+"""
+Formas literales (en letra) guardadas junto a los campos numéricos y de fecha.
+
+Los modelos que heredan de LiteralesMixin declaran en LITERALES qué columna se
+calcula a partir de qué campo; las columnas se recalculan en cada save() y los
+generadores sólo las leen con literal(), sin llamar a num2words por documento.
+Los registros existentes se llenan al migrar (0019_llenar_literales); los
+cambiados con QuerySet.update() se recalculan con `manage.py recalcular_literales`.
+"""
+
+from django.db import transaction
+from django.utils import timezone
+
+from .formatting import fecha_a_texto, numero_en_letra
+
+
+def en_letra(valor):
+    """Número en letra capitalizado ('Veinticuatro'); vacío si el valor es nulo o cero"""
+    return numero_en_letra(valor, capitalizar=True) if valor else ''
+
+
+def en_letra_con_cero(valor):
+    """Como en_letra, pero el cero sí se escribe ('Cero')"""
+    return numero_en_letra(valor, capitalizar=True) if valor is not None else ''
+
+
+def en_letra_minusculas(valor):
+    """Número en letra sin capitalizar; vacío si el valor es nulo o cero"""
+    return numero_en_letra(valor) if valor else ''
+
+
+def fecha_en_letra(valor):
+    """Fecha en letra ('Cinco de marzo de dos mil veinticinco')"""
+    return fecha_a_texto(valor)
+
+
+class LiteralesMixin:
+    """
+    Desnormaliza formas literales al guardar.
+
+    LITERALES = {'columna_literal': ('campo_origen', funcion)}
+    """
+
+    LITERALES = {}
+
+    def calcular_literales(self):
+        """Regresa {columna: valor} con las formas literales que corresponden a los valores actuales"""
+        return {
+            campo: funcion(getattr(self, origen))
+            for campo, (origen, funcion) in self.LITERALES.items()
+        }
+
+    def actualizar_literales(self):
+        """Asigna las formas literales y regresa la lista de columnas que cambiaron"""
+        cambiados = []
+        for campo, valor in self.calcular_literales().items():
+            if getattr(self, campo) != valor:
+                setattr(self, campo, valor)
+                cambiados.append(campo)
+        return cambiados
+
+    def literal(self, campo):
+        """
+        Forma literal guardada; si está vacía (objeto sin guardar o registro aún
+        no recalculado) se calcula al vuelo sin modificar el objeto.
+        """
+        valor = getattr(self, campo)
+        if valor:
+            return valor
+        origen, funcion = self.LITERALES[campo]
+        return funcion(getattr(self, origen))
+
+    def save(self, *args, **kwargs):
+        cambiados = self.actualizar_literales()
+        update_fields = kwargs.get('update_fields')
+        if update_fields is not None and cambiados:
+            kwargs['update_fields'] = set(update_fields) | set(cambiados)
+        super().save(*args, **kwargs)
+
+
+def recalcular_literales(queryset, lote=500, simulacion=False):
+    """
+    Recalcula las literales de los registros del queryset por lotes y guarda
+    con bulk_update solo los que cambiaron, sin pasar por save(). Los que
+    cambiaron reciben también la fecha de actualización (auto_now), porque su
+    documento ya no es el mismo (Last-Modified de las descargas).
+
+    Returns:
+        (revisados, actualizados)
+    """
+    modelo = queryset.model
+    origenes = {origen for origen, _ in modelo.LITERALES.values()}
+    campos = list(modelo.LITERALES)
+    actualizacion = [campo.attname for campo in modelo._meta.concrete_fields if getattr(campo, 'auto_now', False)]
+    lote = max(1, lote)
+
+    revisados = actualizados = 0
+    pendientes = []
+
+    def guardar():
+        if not simulacion:
+            ahora = timezone.now()
+            for objeto in pendientes:
+                for campo in actualizacion:
+                    setattr(objeto, campo, ahora)
+            with transaction.atomic():
+                modelo.objects.bulk_update(pendientes, campos + actualizacion)
+        return len(pendientes)
+
+    for objeto in queryset.select_related(None).only('pk', *origenes, *campos).order_by('pk').iterator(chunk_size=lote):
+        revisados += 1
+        if objeto.actualizar_literales():
+            pendientes.append(objeto)
+        if len(pendientes) >= lote:
+            actualizados += guardar()
+            pendientes = []
+    if pendientes:
+        actualizados += guardar()
+    return revisados, actualizados
@@ -0,0 +1,382 @@
+"""
+Mide el tiempo de las partes costosas de la generación de documentos.
+
+Cada escenario compara la implementación actual contra la anterior (cuando
+aplica) y reporta el promedio por iteración, para verificar que una
+optimización realmente ahorra tiempo por petición.
+"""
+
+import contextlib
+import io
+import os
+import time
+from datetime import date
+from decimal import ROUND_HALF_UP, Decimal
+
+from django.conf import settings
+from django.core.management.base import BaseCommand, CommandError
+from docx import Document
+from docx.shared import Pt
+from num2words import num2words
+from reportlab.lib.enums import TA_CENTER, TA_JUSTIFY, TA_LEFT
+from reportlab.lib.styles import getSampleStyleSheet, ParagraphStyle
+from reportlab.lib.units import cm
+
+from documentos.amortizacion import (
+    IVA, PERIODOS_POR_ANIO, POLITICAS_REDONDEO, calcular_cuotas, costo_admon_por_periodo, normalizar_periodicidad,
+)
+from documentos.calendario import calendario_de_pagos
+from documentos.models import ActaAsamblea, ActaSesionConsejo, Pagare
+from documentos.pdf_generator import (
+    convertir_docx_a_pdf,
+    generar_docx_acta_asamblea,
+    generar_docx_acta_consejo,
+    generar_pdf_nativo_acta_asamblea,
+    generar_docx_pagare,
+    generar_pdf_nativo_acta_consejo,
+    generar_pdf_pagare,
+)
+from documentos.pdf_styles import fuente_legal, obtener_estilos
+from documentos.docx_tablas import agregar_filas, fila_plantilla, quitar_filas
+from documentos import formatting
+from documentos.mapeos import constructor_contexto
+from documentos.docx_reemplazos import reemplazar_en_documento
+from documentos.placeholders import placeholders_de_plantilla
+from documentos.plantillas import ruta_plantilla
+
+
+RUTA_PLANTILLA_PAGARE = os.path.join(
+    settings.BASE_DIR.parent, 'DOCUMENTOS OLEA ABOGADOS', 'Pagarés', 'PAGARE_PLACE.docx'
+)
+
+
+def medir(funcion, iteraciones):
+    """Ejecuta la función n veces y regresa el promedio en milisegundos"""
+    inicio = time.perf_counter()
+    for _ in range(iteraciones):
+        funcion()
+    return (time.perf_counter() - inicio) * 1000 / iteraciones
+
+
+def pagare_de_prueba(num_pagos=12):
+    """Pagaré en memoria (sin guardar) con datos representativos"""
+    pagare = Pagare(
+        lugar_emision='Ciudad de México',
+        fecha_emision=date(2025, 1, 15),
+        monto_numeric=Decimal('150000.00'),
+        monto_literal='CIENTO CINCUENTA MIL PESOS 00/100 M.N.',
+        deudor_nombre='JUAN PÉREZ LÓPEZ',
+        acreedor_nombre='FINANCIERA EJEMPLO, S.A. DE C.V.',
+        num_pagos=num_pagos,
+        periodicidad='mensual',
+        tasa_interes_ordinario=Decimal('24.00'),
+        tasa_interes_moratorio=Decimal('36.00'),
+    )
+    pagare.tabla_amortizacion = pagare.generar_tabla_amortizacion_automatica()
+    return pagare
+
+
+def _estilos_por_peticion():
+    """Réplica de cómo se construían los estilos del pagaré y del acta de consejo en cada petición"""
+    styles = getSampleStyleSheet()
+    return [
+        ParagraphStyle('CustomTitle', parent=styles['Heading1'], alignment=TA_CENTER,
+                       fontSize=14, fontName='Times-Bold', spaceBefore=6, spaceAfter=6),
+        ParagraphStyle('CustomNormal', parent=styles['Normal'], alignment=TA_JUSTIFY,
+                       fontSize=11, fontName='Times-Roman', leading=16, spaceAfter=12),
+        ParagraphStyle('SectionTitle', parent=styles['Heading2'], alignment=TA_CENTER,
+                       fontSize=12, fontName='Times-Bold', spaceBefore=12, spaceAfter=12),
+        ParagraphStyle('AgendaItem', parent=styles['Normal'], alignment=TA_LEFT,
+                       fontSize=11, fontName='Times-Roman', leftIndent=1.5*cm,
+                       firstLineIndent=-0.5*cm, spaceBefore=8, spaceAfter=8),
+        ParagraphStyle('ResolutionTitle', parent=styles['Normal'], alignment=TA_CENTER,
+                       fontSize=11, fontName='Times-Bold', spaceBefore=12, spaceAfter=6),
+        ParagraphStyle('ResolutionText', parent=styles['Normal'], alignment=TA_JUSTIFY,
+                       fontSize=11, fontName='Times-Roman', leftIndent=2*cm, spaceAfter=8),
+        ParagraphStyle('PagareTitle', parent=styles['Heading1'], fontSize=14, spaceAfter=20,
+                       alignment=TA_CENTER, fontName='Times-Bold'),
+        ParagraphStyle('PagareSubtitle', parent=styles['Heading2'], fontSize=12, spaceAfter=12,
+                       alignment=TA_CENTER, fontName='Times-Bold'),
+        ParagraphStyle('PagareJustified', parent=styles['Normal'], fontSize=11, spaceAfter=12,
+                       alignment=TA_JUSTIFY, fontName='Times-Roman', leading=14),
+        ParagraphStyle('PagareCenter', parent=styles['Normal'], fontSize=11, spaceAfter=12,
+                       alignment=TA_CENTER, fontName='Times-Roman'),
+    ]
+
+
+def escenario_estilos_pdf(iteraciones):
+    """Estilos ReportLab: construcción por petición contra registro compartido"""
+    # Primera petición del proceso: registra la fuente TrueType y construye los estilos
+    fuente_legal.cache_clear()
+    obtener_estilos.cache_clear()
+    primera = medir(obtener_estilos, 1)
+
+    pagare = pagare_de_prueba()
+    return [
+        ('registro inicial (una vez por proceso)', primera),
+        ('estilos por petición', medir(_estilos_por_peticion, iteraciones)),
+        ('registro compartido', medir(obtener_estilos, iteraciones)),
+        ('generar_pdf_pagare completo', medir(lambda: generar_pdf_pagare(pagare).close(), max(1, iteraciones // 10))),
+    ]
+
+
+def escenario_pdf_actas(iteraciones):
+    """PDF de actas: DOCX + conversión contra motor nativo (usa la primera acta de cada tipo en la BD)"""
+    resultados = []
+    repeticiones = max(1, iteraciones // 20)
+    casos = [
+        ('consejo', ActaSesionConsejo.objects.first(), generar_docx_acta_consejo, generar_pdf_nativo_acta_consejo),
+        ('asamblea', ActaAsamblea.objects.first(), generar_docx_acta_asamblea, generar_pdf_nativo_acta_asamblea),
+    ]
+    for nombre, acta, generar_docx, generar_nativo in casos:
+        if acta is None:
+            continue
+        resultados.append((f'{nombre}: DOCX + conversión', medir(lambda: convertir_docx_a_pdf(generar_docx(acta)), repeticiones)))
+        resultados.append((f'{nombre}: motor nativo', medir(lambda: generar_nativo(acta), repeticiones)))
+    return resultados
+
+
+def _filas_amortizacion(n):
+    return [
+        [str(k), '1,234.56', '98,765.43', '1,234.56', '350.00', '56.00',
+         '987.65', '158.02', '2,786.23', '15/01/2026', 'Etapa de Estudios']
+        for k in range(1, n + 1)
+    ]
+
+
+def _llenar_por_fila(tabla, filas):
+    """Réplica del llenado anterior: quitar filas una a una, add_row() y formato run por run"""
+    for i in range(len(tabla.rows) - 1, 0, -1):
+        if i < len(tabla.rows):
+            tabla._element.remove(tabla.rows[i]._element)
+    for valores in filas:
+        new_row = tabla.add_row()
+        for col_idx, data in enumerate(valores):
+            if col_idx < len(new_row.cells):
+                new_row.cells[col_idx].text = data
+                for paragraph in new_row.cells[col_idx].paragraphs:
+                    paragraph.alignment = 1
+                    for run in paragraph.runs:
+                        run.font.name = 'Arial Narrow'
+                        run.font.size = Pt(10)
+
+
+def _llenar_masivo(tabla, filas):
+    plantilla = fila_plantilla(tabla, indice=1, fuente='Arial Narrow', tamano=10, alineacion=1)
+    quitar_filas(tabla, desde=1)
+    agregar_filas(tabla, plantilla, filas)
+
+
+def escenario_tabla_amortizacion(iteraciones, num_filas=500):
+    """Tabla de amortización DOCX de 500 filas: add_row() por fila contra escritor masivo"""
+    if not os.path.exists(RUTA_PLANTILLA_PAGARE):
+        return []
+    filas = _filas_amortizacion(num_filas)
+    repeticiones = max(1, iteraciones // 40)
+
+    def llenar(funcion):
+        doc = Document(RUTA_PLANTILLA_PAGARE)
+        funcion(doc.tables[0], filas)
+
+    pagare = pagare_de_prueba(num_filas)
+    with contextlib.redirect_stdout(io.StringIO()):  # El generador imprime mensajes DEBUG
+        completo = medir(lambda: generar_docx_pagare(pagare), repeticiones)
+    return [
+        ('carga del template (referencia)', medir(lambda: Document(RUTA_PLANTILLA_PAGARE), repeticiones)),
+        (f'{num_filas} filas con add_row()', medir(lambda: llenar(_llenar_por_fila), repeticiones)),
+        (f'{num_filas} filas con docx_tablas', medir(lambda: llenar(_llenar_masivo), repeticiones)),
+        (f'generar_docx_pagare ({num_filas} cuotas)', completo),
+    ]
+
+
+def _calcular_cuotas_decimal(monto, num_pagos, tasa_anual_pct, periodicidad, gastos_admon):
+    """Réplica del cálculo con Decimal: importes cuantizados a centavos en cada fila"""
+    centavo = Decimal('0.01')
+    iva = Decimal(str(IVA))
+    P = Decimal(str(monto))
+    n = int(num_pagos)
+    i = Decimal(str(tasa_anual_pct)) / 100 / PERIODOS_POR_ANIO[normalizar_periodicidad(periodicidad)]
+    costo_admon = Decimal(str(costo_admon_por_periodo(gastos_admon))).quantize(centavo)
+    gastos = costo_admon + (costo_admon * iva).quantize(centavo, ROUND_HALF_UP)
+    i_eff = i * (1 + iva)
+    if i_eff:
+        factor = (1 + i_eff) ** n
+        cuota = (P * i_eff * factor / (factor - 1)).quantize(centavo, ROUND_HALF_UP)
+    else:
+        cuota = (P / n).quantize(centavo, ROUND_HALF_UP)
+    filas = []
+    saldo = P
+    for k in range(1, n + 1):
+        interes = (saldo * i).quantize(centavo, ROUND_HALF_UP)
+        iva_interes = (interes * iva).quantize(centavo, ROUND_HALF_UP)
+        capital = saldo if k == n else min(max(cuota - interes - iva_interes, 0), saldo)
+        saldo -= capital
+        filas.append((capital, saldo, interes, iva_interes, capital + interes + iva_interes + gastos))
+    return cuota + gastos, filas
+
+
+def escenario_motor_amortizacion(iteraciones, num_pagos=360):
+    """Importes de una tabla de 360 cuotas: Decimal por fila contra centavos enteros (cada política y devengo por días)"""
+    argumentos = (Decimal('2500000.00'), num_pagos, Decimal('18.50'), 'mensual', Decimal('350.00'))
+    _, dias = calendario_de_pagos(date(2025, 1, 15), num_pagos, 'mensual')
+    resultados = [('Decimal por fila', medir(lambda: _calcular_cuotas_decimal(*argumentos), iteraciones))]
+    for politica in POLITICAS_REDONDEO:
+        resultados.append((f'centavos, {politica}', medir(lambda: calcular_cuotas(*argumentos, politica=politica), iteraciones)))
+    resultados.append(('centavos, por_fila, días reales',
+                       medir(lambda: calcular_cuotas(*argumentos, politica='por_fila', dias=dias), iteraciones)))
+    pagare = pagare_de_prueba(num_pagos)
+    resultados.append(('tabla JSON con fechas (modelo)', medir(pagare.generar_tabla_amortizacion_automatica, iteraciones)))
+    return resultados
+
+
+def _formatear_fecha_anterior(fecha):
+    """Réplica del formatear_fecha copiado en los generadores (strftime + replace de meses)"""
+    if not fecha:
+        return "[FECHA]"
+    fecha_str = fecha.strftime("%d de %B de %Y")
+    meses = {
+        'January': 'enero', 'February': 'febrero', 'March': 'marzo',
+        'April': 'abril', 'May': 'mayo', 'June': 'junio',
+        'July': 'julio', 'August': 'agosto', 'September': 'septiembre',
+        'October': 'octubre', 'November': 'noviembre', 'December': 'diciembre'
+    }
+    for eng, esp in meses.items():
+        fecha_str = fecha_str.replace(eng, esp)
+    return fecha_str
+
+
+def _to_roman_anterior(num):
+    val = [1000, 900, 500, 400, 100, 90, 50, 40, 10, 9, 5, 4, 1]
+    syms = ["M", "CM", "D", "CD", "C", "XC", "L", "XL", "X", "IX", "V", "IV", "I"]
+    roman = ''
+    i = 0
+    while num > 0:
+        for _ in range(num // val[i]):
+            roman += syms[i]
+            num -= val[i]
+        i += 1
+    return roman
+
+
+def escenario_formateo(iteraciones):
+    """Formateo de un juego de placeholders (fechas, números en letra, romanos): helpers anteriores contra documentos.formatting"""
+    fechas = [date(2025, mes, dia) for mes in range(1, 13) for dia in (1, 15, 28)]
+    numeros = [Decimal('24.00'), Decimal('36.00'), 360, 30, 12, Decimal('5000.00')]
+    romanos = range(1, 21)
+
+    def anterior():
+        for fecha in fechas:
+            _formatear_fecha_anterior(fecha)
+        for numero in numeros:
+            num2words(numero, lang='es').capitalize()
+        for numero in romanos:
+            _to_roman_anterior(numero)
+
+    def actual():
+        for fecha in fechas:
+            formatting.formatear_fecha(fecha)
+        for numero in numeros:
+            formatting.numero_en_letra(numero, capitalizar=True)
+        for numero in romanos:
+            formatting.to_roman(numero)
+
+    return [
+        ('helpers anteriores', medir(anterior, iteraciones)),
+        ('formatting (memorizado)', medir(actual, iteraciones)),
+        ('monto_en_letra', medir(lambda: formatting.monto_en_letra(Decimal('150000.00')), iteraciones)),
+    ]
+
+
+def escenario_contexto(iteraciones):
+    """Diccionario de reemplazos del pagaré: mapeo completo contra compilado para el template"""
+    pagare = pagare_de_prueba()
+    completo = constructor_contexto('pagare')
+    filtrado = constructor_contexto('pagare', RUTA_PLANTILLA_PAGARE)
+    return [
+        (f'mapeo completo ({len(completo)} placeholders)', medir(lambda: completo(pagare), iteraciones)),
+        (f'compilado para el template ({len(filtrado)})', medir(lambda: filtrado(pagare), iteraciones)),
+    ]
+
+
+def _reemplazar_en_parrafo_anterior(paragraph, replacements):
+    """Réplica del replace_in_paragraph anterior: texto completo al primer run"""
+    full_text = paragraph.text
+    if not any(placeholder in full_text for placeholder in replacements):
+        return
+    new_text = full_text
+    for placeholder, value in replacements.items():
+        if placeholder in new_text:
+            new_text = new_text.replace(placeholder, str(value))
+    if new_text != full_text:
+        for run in paragraph.runs:
+            run.text = ""
+        if paragraph.runs:
+            paragraph.runs[0].text = new_text
+        else:
+            paragraph.add_run(new_text)
+
+
+def _reemplazar_por_colecciones(doc, replacements):
+    """Réplica del recorrido anterior: doc.paragraphs, row.cells de cada tabla y cada header/footer"""
+    for paragraph in doc.paragraphs:
+        _reemplazar_en_parrafo_anterior(paragraph, replacements)
+    for table in doc.tables:
+        for row in table.rows:
+            for cell in row.cells:
+                for paragraph in cell.paragraphs:
+                    _reemplazar_en_parrafo_anterior(paragraph, replacements)
+    for section in doc.sections:
+        for parte in (section.header, section.footer):
+            for paragraph in parte.paragraphs:
+                _reemplazar_en_parrafo_anterior(paragraph, replacements)
+
+
+def escenario_reemplazo(iteraciones):
+    """Sustitución en el template del convenio (el de más placeholders): recorrido por colecciones contra un solo recorrido"""
+    ruta = ruta_plantilla('convenio_modificatorio')
+    if not os.path.exists(ruta):
+        return []
+    reemplazos = {placeholder: 'VALOR DE PRUEBA' for placeholder in placeholders_de_plantilla(ruta)}
+    repeticiones = max(1, iteraciones // 20)
+    return [
+        ('carga del template (referencia)', medir(lambda: Document(ruta), repeticiones)),
+        ('colecciones + párrafo reconstruido', medir(lambda: _reemplazar_por_colecciones(Document(ruta), reemplazos), repeticiones)),
+        ('reemplazar_en_documento', medir(lambda: reemplazar_en_documento(Document(ruta), reemplazos), repeticiones)),
+    ]
+
+
+ESCENARIOS = {
+    'estilos_pdf': escenario_estilos_pdf,
+    'pdf_actas': escenario_pdf_actas,
+    'tabla_amortizacion': escenario_tabla_amortizacion,
+    'motor_amortizacion': escenario_motor_amortizacion,
+    'formateo': escenario_formateo,
+    'contexto': escenario_contexto,
+    'reemplazo': escenario_reemplazo,
+}
+
+
+class Command(BaseCommand):
+    help = 'Mide el tiempo de generación de documentos por escenario'
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            'escenarios', nargs='*',
+            help=f"Escenarios a ejecutar (por defecto todos): {', '.join(ESCENARIOS)}",
+        )
+        parser.add_argument(
+            '--iteraciones', type=int, default=200,
+            help='Número de repeticiones por medición',
+        )
+
+    def handle(self, *args, **options):
+        nombres = options['escenarios'] or list(ESCENARIOS)
+        desconocidos = [n for n in nombres if n not in ESCENARIOS]
+        if desconocidos:
+            raise CommandError(f"Escenarios desconocidos: {', '.join(desconocidos)}")
+
+        iteraciones = max(1, options['iteraciones'])
+        for nombre in nombres:
+            self.stdout.write(self.style.MIGRATE_HEADING(f'{nombre} ({iteraciones} iteraciones)'))
+            for etiqueta, milisegundos in ESCENARIOS[nombre](iteraciones):
+                self.stdout.write(f'  {etiqueta:<40} {milisegundos:10.3f} ms')
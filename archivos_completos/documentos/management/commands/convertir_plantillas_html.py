@@ -0,0 +1,194 @@
+"""
+Convierte en lote los DOCX de la biblioteca de plantillas a HTML usando Mammoth.
+
+Recorre un directorio, convierte cada archivo .docx en procesos paralelos, omite
+los archivos cuyo contenido no cambió desde la última corrida (por hash SHA-256)
+y escribe un manifiesto ``index.json`` con los tiempos de cada conversión.
+"""
+
+import hashlib
+import json
+import os
+import time
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from datetime import datetime
+from pathlib import Path
+
+from django.conf import settings
+from django.core.management.base import BaseCommand, CommandError
+
+# Importación condicional de mammoth
+try:
+    import mammoth
+    MAMMOTH_AVAILABLE = True
+except ImportError:
+    MAMMOTH_AVAILABLE = False
+
+
+NOMBRE_MANIFIESTO = 'index.json'
+
+PLANTILLA_HTML = """<!DOCTYPE html>
+<html lang="es">
+<head>
+<meta charset="utf-8">
+<title>{titulo}</title>
+</head>
+<body>
+{contenido}
+</body>
+</html>
+"""
+
+
+def calcular_hash(ruta, tam_bloque=1024 * 1024):
+    """Calcula el SHA-256 del contenido de un archivo leyendo por bloques"""
+    sha = hashlib.sha256()
+    with open(ruta, 'rb') as archivo:
+        for bloque in iter(lambda: archivo.read(tam_bloque), b''):
+            sha.update(bloque)
+    return sha.hexdigest()
+
+
+def convertir_archivo(origen, destino):
+    """
+    Convierte un DOCX a HTML. Se ejecuta dentro de un proceso trabajador, por lo
+    que no depende de Django y regresa solo datos serializables.
+    """
+    inicio = time.perf_counter()
+    try:
+        with open(origen, 'rb') as docx_file_handle:
+            result = mammoth.convert_to_html(docx_file_handle)
+
+        os.makedirs(os.path.dirname(destino), exist_ok=True)
+        with open(destino, 'w', encoding='utf-8') as html_file:
+            html_file.write(PLANTILLA_HTML.format(
+                titulo=os.path.splitext(os.path.basename(origen))[0],
+                contenido=result.value,
+            ))
+
+        return {
+            'estado': 'convertido',
+            'segundos': round(time.perf_counter() - inicio, 4),
+            'mensajes': [str(msg) for msg in result.messages],
+        }
+    except Exception as e:
+        return {
+            'estado': 'error',
+            'segundos': round(time.perf_counter() - inicio, 4),
+            'mensajes': [str(e)],
+        }
+
+
+class Command(BaseCommand):
+    help = 'Convierte en paralelo todos los DOCX de un directorio a HTML y genera un manifiesto index.json'
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            'directorio', nargs='?',
+            default=os.path.join(settings.BASE_DIR.parent, 'DOCUMENTOS OLEA ABOGADOS'),
+            help='Directorio raíz con los archivos DOCX (por defecto "DOCUMENTOS OLEA ABOGADOS")',
+        )
+        parser.add_argument(
+            '--salida',
+            default=os.path.join(settings.MEDIA_ROOT, 'plantillas_html'),
+            help='Directorio donde se escriben los HTML y el manifiesto',
+        )
+        parser.add_argument(
+            '--trabajadores', type=int, default=os.cpu_count() or 1,
+            help='Número de procesos de conversión',
+        )
+        parser.add_argument(
+            '--forzar', action='store_true',
+            help='Convierte todos los archivos aunque su hash no haya cambiado',
+        )
+
+    def handle(self, *args, **options):
+        if not MAMMOTH_AVAILABLE:
+            raise CommandError('La biblioteca Mammoth no está instalada. Instálala con "pip install mammoth".')
+
+        raiz = Path(options['directorio']).resolve()
+        salida = Path(options['salida']).resolve()
+        if not raiz.is_dir():
+            raise CommandError(f'Directorio no encontrado: {raiz}')
+
+        inicio_total = time.perf_counter()
+        ruta_manifiesto = salida / NOMBRE_MANIFIESTO
+        anteriores = self._cargar_manifiesto(ruta_manifiesto)
+
+        entradas = []
+        pendientes = []
+        omitidos_doc = 0
+        for origen in sorted(raiz.rglob('*')):
+            if not origen.is_file() or origen.name.startswith('~$'):
+                continue  # Archivos de bloqueo de Word
+            if salida in origen.parents:
+                continue
+            extension = origen.suffix.lower()
+            if extension == '.doc':
+                omitidos_doc += 1
+                continue
+            if extension != '.docx':
+                continue
+
+            relativo = origen.relative_to(raiz).as_posix()
+            destino = salida / Path(relativo).with_suffix('.html')
+            entrada = {
+                'origen': relativo,
+                'destino': destino.relative_to(salida).as_posix(),
+                'sha256': calcular_hash(origen),
+                'bytes': origen.stat().st_size,
+            }
+
+            previa = anteriores.get(relativo)
+            if (not options['forzar'] and previa and previa.get('estado') != 'error'
+                    and previa.get('sha256') == entrada['sha256'] and destino.exists()):
+                entrada.update(estado='sin_cambios', segundos=previa.get('segundos', 0),
+                               mensajes=previa.get('mensajes', []))
+            else:
+                pendientes.append((entrada, str(origen), str(destino)))
+            entradas.append(entrada)
+
+        if pendientes:
+            trabajadores = max(1, min(options['trabajadores'], len(pendientes)))
+            with ProcessPoolExecutor(max_workers=trabajadores) as executor:
+                futuros = {
+                    executor.submit(convertir_archivo, origen, destino): entrada
+                    for entrada, origen, destino in pendientes
+                }
+                for futuro in as_completed(futuros):
+                    entrada = futuros[futuro]
+                    entrada.update(futuro.result())
+                    if entrada['estado'] == 'error':
+                        self.stderr.write(self.style.ERROR(f"  ✗ {entrada['origen']}: {entrada['mensajes'][0]}"))
+                    elif options['verbosity'] > 1:
+                        self.stdout.write(f"  ✓ {entrada['origen']} ({entrada['segundos']:.3f}s)")
+
+        manifiesto = {
+            'generado_en': datetime.now().isoformat(timespec='seconds'),
+            'origen': str(raiz),
+            'total_segundos': round(time.perf_counter() - inicio_total, 4),
+            'archivos': entradas,
+        }
+        salida.mkdir(parents=True, exist_ok=True)
+        with open(ruta_manifiesto, 'w', encoding='utf-8') as archivo:
+            json.dump(manifiesto, archivo, ensure_ascii=False, indent=2)
+
+        conteo = {}
+        for entrada in entradas:
+            conteo[entrada['estado']] = conteo.get(entrada['estado'], 0) + 1
+        self.stdout.write(self.style.SUCCESS(
+            f"{conteo.get('convertido', 0)} convertidos, {conteo.get('sin_cambios', 0)} sin cambios, "
+            f"{conteo.get('error', 0)} con error en {manifiesto['total_segundos']:.2f}s. Manifiesto: {ruta_manifiesto}"
+        ))
+        if omitidos_doc:
+            self.stdout.write(f'{omitidos_doc} archivos .doc omitidos (Mammoth solo soporta .docx).')
+
+    def _cargar_manifiesto(self, ruta):
+        """Regresa las entradas del manifiesto previo indexadas por ruta de origen"""
+        if not ruta.exists():
+            return {}
+        try:
+            with open(ruta, encoding='utf-8') as archivo:
+                return {e['origen']: e for e in json.load(archivo).get('archivos', [])}
+        except (ValueError, KeyError, TypeError):
+            return {}
@@ -0,0 +1,84 @@
+"""
+Importa pagarés en bloque desde una hoja de cálculo XLSX o CSV.
+
+La primera fila lleva los encabezados (nombre del campo o etiqueta del
+formulario de pagaré). Las filas se validan con PagareForm y se guardan por
+lotes con bulk_create junto con sus cuotas; las filas con errores se omiten y
+se listan al final o en el CSV indicado con --errores.
+
+    python manage.py importar_pagares cartera.xlsx --usuario operaciones --errores errores.csv
+"""
+
+import csv
+
+from django.contrib.auth.models import User
+from django.core.management.base import BaseCommand, CommandError
+
+from documentos.importacion import LOTE_POR_DEFECTO, importar_pagares
+
+
+ERRORES_EN_CONSOLA = 50
+
+
+class Command(BaseCommand):
+    help = 'Importa pagarés desde un archivo XLSX o CSV validando cada fila con las reglas del formulario'
+
+    def add_arguments(self, parser):
+        parser.add_argument('archivo', help='Ruta del archivo .xlsx o .csv')
+        parser.add_argument(
+            '--usuario', required=True,
+            help='Nombre de usuario al que se asignan los pagarés',
+        )
+        parser.add_argument(
+            '--hoja',
+            help='Hoja del libro XLSX (por defecto la primera)',
+        )
+        parser.add_argument(
+            '--lote', type=int, default=LOTE_POR_DEFECTO,
+            help='Pagarés por lote de escritura',
+        )
+        parser.add_argument(
+            '--errores',
+            help='Escribe los errores por fila en este archivo CSV',
+        )
+        parser.add_argument(
+            '--dry-run', action='store_true',
+            help='Solo valida las filas; no guarda nada',
+        )
+
+    def handle(self, *args, **options):
+        try:
+            usuario = User.objects.get(username=options['usuario'])
+        except User.DoesNotExist:
+            raise CommandError(f"El usuario '{options['usuario']}' no existe")
+
+        try:
+            resultado = importar_pagares(
+                options['archivo'], usuario, options['lote'], options['dry_run'], options['hoja'],
+            )
+        except (OSError, ValueError) as e:
+            raise CommandError(f'Error al importar pagarés: {e}')
+
+        if resultado.columnas_ignoradas:
+            self.stdout.write(self.style.WARNING(
+                f"Columnas ignoradas: {', '.join(resultado.columnas_ignoradas)}"
+            ))
+
+        if options['errores']:
+            with open(options['errores'], 'w', newline='', encoding='utf-8-sig') as archivo:
+                escritor = csv.writer(archivo)
+                escritor.writerow(['fila', 'campo', 'mensaje'])
+                escritor.writerows(resultado.errores)
+        else:
+            for fila, campo, mensaje in resultado.errores[:ERRORES_EN_CONSOLA]:
+                self.stderr.write(f'Fila {fila}, {campo}: {mensaje}')
+            if len(resultado.errores) > ERRORES_EN_CONSOLA:
+                self.stderr.write(
+                    f'... {len(resultado.errores) - ERRORES_EN_CONSOLA} errores más (use --errores para verlos todos)'
+                )
+
+        prefijo = '[simulación] ' if resultado.simulacion else ''
+        self.stdout.write(self.style.SUCCESS(
+            f'{prefijo}{resultado.filas} filas: {resultado.creados} pagarés importados con {resultado.cuotas} cuotas, '
+            f'{resultado.filas_con_error} filas con errores ({resultado.duracion:.2f} s)'
+        ))
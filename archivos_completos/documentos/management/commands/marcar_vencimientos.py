@@ -0,0 +1,44 @@
+"""
+Marca como vencidas las cuotas pendientes cuya fecha ya pasó y pasa a 'vencido'
+los pagarés emitidos o firmados que las tienen. Cada corrida queda registrada en
+EjecucionVencimientos. Se programa una vez al día, por ejemplo con cron:
+
+    5 0 * * * cd /ruta/al/proyecto && python manage.py marcar_vencimientos
+"""
+
+from datetime import date
+
+from django.core.management.base import BaseCommand, CommandError
+
+from documentos.vencimientos import marcar_vencimientos
+
+
+class Command(BaseCommand):
+    help = 'Marca cuotas y pagarés vencidos y registra la corrida'
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--fecha', type=date.fromisoformat,
+            help='Fecha de corte AAAA-MM-DD (por defecto hoy); vencen las cuotas anteriores a ella',
+        )
+        parser.add_argument(
+            '--lote', type=int, default=200,
+            help='Pagarés por lote de escritura',
+        )
+        parser.add_argument(
+            '--dry-run', action='store_true',
+            help='Solo cuenta lo que se marcaría; la corrida se registra como simulación',
+        )
+
+    def handle(self, *args, **options):
+        try:
+            ejecucion = marcar_vencimientos(options['fecha'], options['lote'], options['dry_run'])
+        except Exception as e:
+            raise CommandError(f'Error al marcar vencimientos: {e}')
+
+        prefijo = '[simulación] ' if ejecucion.simulacion else ''
+        self.stdout.write(self.style.SUCCESS(
+            f'{prefijo}Corte {ejecucion.fecha_corte}: {ejecucion.cuotas_vencidas} cuotas vencidas en '
+            f'{ejecucion.pagares_actualizados} pagarés, {ejecucion.pagares_vencidos} pasaron a vencido '
+            f'({ejecucion.duracion:.2f} s)'
+        ))
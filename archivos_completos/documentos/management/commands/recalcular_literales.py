@@ -0,0 +1,53 @@
+"""
+Llena (o vuelve a calcular) las formas literales guardadas de pagarés y
+contratos de crédito.
+
+La migración 0019 ya llena los registros creados antes de que existieran las
+columnas literales; este comando es para los modificados con QuerySet.update()
+(que no pasa por save()). Se actualizan por lotes con bulk_update; los que
+cambian reciben fecha_actualizacion.
+"""
+
+from django.core.management.base import BaseCommand, CommandError
+
+from documentos.literales import recalcular_literales
+from documentos.models import ContratoCredito, Pagare
+
+
+MODELOS = {
+    'pagare': Pagare,
+    'contrato_credito': ContratoCredito,
+}
+
+
+class Command(BaseCommand):
+    help = 'Recalcula las formas literales (en letra) guardadas de pagarés y contratos de crédito'
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            'modelos', nargs='*',
+            help=f"Modelos a procesar (por defecto todos): {', '.join(MODELOS)}",
+        )
+        parser.add_argument(
+            '--lote', type=int, default=500,
+            help='Registros por lote de lectura y escritura',
+        )
+        parser.add_argument(
+            '--dry-run', action='store_true',
+            help='Solo reporta cuántos registros cambiarían',
+        )
+
+    def handle(self, *args, **options):
+        nombres = options['modelos'] or list(MODELOS)
+        desconocidos = [n for n in nombres if n not in MODELOS]
+        if desconocidos:
+            raise CommandError(f"Modelos desconocidos: {', '.join(desconocidos)}")
+
+        lote = max(1, options['lote'])
+        for nombre in nombres:
+            revisados, actualizados = recalcular_literales(
+                MODELOS[nombre].objects.all(), lote, options['dry_run'],
+            )
+            self.stdout.write(self.style.SUCCESS(
+                f'{nombre}: {actualizados} de {revisados} registros con literales actualizadas'
+            ))
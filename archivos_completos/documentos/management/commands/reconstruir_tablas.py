@@ -0,0 +1,50 @@
+"""
+Regenera las tablas de amortización automáticas que quedaron desactualizadas.
+
+Una tabla guardada queda fija: save() solo la regenera si cambian los datos del
+pagaré con que se generó. Este comando regenera las que quedaron con una huella
+que no corresponde a esos datos (un QuerySet.update() de la tasa) y, con
+--todas, todas las automáticas con los ajustes actuales del motor: es la única
+forma de aplicar a pagarés ya guardados un cambio de DOCUMENTOS_AMORTIZACION_REDONDEO
+o del calendario. Una tabla sin huella cuenta como automática si coincide con la
+que genera el motor (ver cartera.tabla_automatica) y sin --todas solo recibe la
+huella; si no coincide, es captura manual y no se toca. Se escribe por lotes:
+una transacción por lote con bulk_update de los pagarés (con su fecha_actualizacion)
+y sus cuotas normalizadas.
+
+    python manage.py reconstruir_tablas --dry-run
+    python manage.py reconstruir_tablas --todas --dry-run
+"""
+
+from django.core.management.base import BaseCommand
+
+from documentos.cartera import reconstruir_tablas
+from documentos.models import Pagare
+
+
+class Command(BaseCommand):
+    help = 'Regenera las tablas de amortización automáticas cuyos datos o ajustes cambiaron'
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--lote', type=int, default=200,
+            help='Pagarés por lote de lectura y escritura',
+        )
+        parser.add_argument(
+            '--todas', action='store_true',
+            help='Regenera todas las tablas automáticas con los ajustes actuales del motor, aunque su huella esté al día',
+        )
+        parser.add_argument(
+            '--dry-run', action='store_true',
+            help='Solo reporta cuántas tablas se regenerarían',
+        )
+
+    def handle(self, *args, **options):
+        revisados, regeneradas, manuales = reconstruir_tablas(
+            Pagare.objects.all(), options['lote'], options['todas'], options['dry_run'],
+        )
+        prefijo = '[simulación] ' if options['dry_run'] else ''
+        self.stdout.write(self.style.SUCCESS(
+            f'{prefijo}{revisados} pagarés revisados: {regeneradas} tablas regeneradas, '
+            f'{manuales} capturadas a mano (o sin huella y distintas de la automática) sin cambios'
+        ))
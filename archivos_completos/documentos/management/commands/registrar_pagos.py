@@ -0,0 +1,65 @@
+"""
+Registra en un solo lote los pagos de cuotas de un archivo CSV con columnas
+pagare, cuota, estado y fecha_pago_real (AAAA-MM-DD; vacía en un pago toma la
+de hoy). Todos los pagos se aplican en una transacción o ninguno.
+
+    python manage.py registrar_pagos pagos_marzo.csv --usuario operaciones
+"""
+
+import csv
+
+from django.contrib.auth.models import User
+from django.core.management.base import BaseCommand, CommandError
+
+from documentos.pagos import registrar_pagos
+
+
+COLUMNAS = ('pagare', 'cuota', 'estado', 'fecha_pago_real')
+ERRORES_EN_CONSOLA = 50
+
+
+class Command(BaseCommand):
+    help = 'Registra pagos de cuotas por lote desde un CSV (pagare, cuota, estado, fecha_pago_real)'
+
+    def add_arguments(self, parser):
+        parser.add_argument('archivo', help='Ruta del archivo .csv')
+        parser.add_argument(
+            '--usuario',
+            help='Solo acepta pagarés de este usuario',
+        )
+        parser.add_argument(
+            '--dry-run', action='store_true',
+            help='Solo valida y calcula los saldos; no guarda nada',
+        )
+
+    def handle(self, *args, **options):
+        usuario = None
+        if options['usuario']:
+            try:
+                usuario = User.objects.get(username=options['usuario'])
+            except User.DoesNotExist:
+                raise CommandError(f"El usuario '{options['usuario']}' no existe")
+
+        try:
+            with open(options['archivo'], newline='', encoding='utf-8-sig') as archivo:
+                lector = csv.DictReader(archivo)
+                faltantes = set(COLUMNAS) - set(lector.fieldnames or ())
+                if faltantes:
+                    raise CommandError(f"Faltan columnas: {', '.join(sorted(faltantes))}")
+                pagos = [tuple((fila[columna] or '').strip() for columna in COLUMNAS) for fila in lector]
+        except OSError as e:
+            raise CommandError(f'No se pudo leer el archivo: {e}')
+
+        resultado = registrar_pagos(pagos, usuario, options['dry_run'])
+
+        if not resultado.ok:
+            for posicion, mensaje in resultado.errores[:ERRORES_EN_CONSOLA]:
+                # +2: encabezados y numeración desde 1
+                self.stderr.write(f'Fila {posicion + 2}: {mensaje}')
+            raise CommandError(f'{len(resultado.errores)} pagos inválidos; no se registró ninguno')
+
+        prefijo = '[simulación] ' if resultado.simulacion else ''
+        self.stdout.write(self.style.SUCCESS(
+            f'{prefijo}{resultado.aplicados} pagos registrados en {resultado.pagares} pagarés, '
+            f'{resultado.liquidados} liquidados ({resultado.duracion:.2f} s)'
+        ))
@@ -0,0 +1,74 @@
+"""
+Revisa los templates DOCX contra los mapeos de placeholders.
+
+Para cada tipo de documento reporta los placeholders sin mapeo (se quedarían
+sin reemplazar en la descarga), los declarados en el mapeo que el template ya
+no usa y los que están partidos entre varios runs de Word.
+"""
+
+import json
+
+from django.core.management.base import BaseCommand, CommandError
+
+from documentos.plantillas import RUTAS_PLANTILLAS, revisar_plantillas
+
+
+class Command(BaseCommand):
+    help = 'Revisa los placeholders de los templates DOCX contra documentos/mapeos.py'
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            'tipos', nargs='*',
+            help=f"Tipos de documento a revisar (por defecto todos): {', '.join(RUTAS_PLANTILLAS)}",
+        )
+        parser.add_argument(
+            '--json', action='store_true',
+            help='Imprime el reporte en JSON',
+        )
+        parser.add_argument(
+            '--estricto', action='store_true',
+            help='Termina con error si algún template tiene placeholders sin mapeo o no existe',
+        )
+
+    def handle(self, *args, **options):
+        tipos = options['tipos'] or list(RUTAS_PLANTILLAS)
+        desconocidos = [t for t in tipos if t not in RUTAS_PLANTILLAS]
+        if desconocidos:
+            raise CommandError(f"Tipos desconocidos: {', '.join(desconocidos)}")
+
+        compiladas, faltantes = revisar_plantillas(tipos)
+
+        if options['json']:
+            reporte = {
+                'plantillas': [plantilla.como_dict() for plantilla in compiladas],
+                'faltantes': [{'tipo': tipo, 'ruta': ruta} for tipo, ruta in faltantes],
+            }
+            self.stdout.write(json.dumps(reporte, ensure_ascii=False, indent=2))
+        else:
+            for plantilla in compiladas:
+                self.reportar(plantilla, detallado=options['verbosity'] > 1)
+            for tipo, ruta in faltantes:
+                self.stdout.write(self.style.ERROR(f'{tipo}: template no encontrado ({ruta})'))
+
+        con_errores = [p.tipo for p in compiladas if not p.correcta] + [tipo for tipo, _ in faltantes]
+        if options['estricto'] and con_errores:
+            raise CommandError(f"Templates con problemas: {', '.join(con_errores)}")
+
+    def reportar(self, plantilla, detallado=False):
+        estilo = self.style.SUCCESS if plantilla.correcta else self.style.WARNING
+        self.stdout.write(estilo(
+            f'{plantilla.tipo}: {len(plantilla.placeholders)} placeholders, '
+            f'{len(plantilla.sin_mapeo)} sin mapeo, {len(plantilla.sin_uso)} sin uso, '
+            f'{len(plantilla.partidos)} partidos entre runs'
+        ))
+        self.listar('Sin mapeo', plantilla.sin_mapeo)
+        self.listar('Partidos entre runs', plantilla.partidos)
+        if detallado:
+            self.listar('Sin uso en el template', plantilla.sin_uso)
+
+    def listar(self, titulo, placeholders):
+        if not placeholders:
+            return
+        self.stdout.write(f'  {titulo}:')
+        for placeholder in sorted(placeholders):
+            self.stdout.write(f'    {placeholder}')
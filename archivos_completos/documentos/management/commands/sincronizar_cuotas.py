@@ -0,0 +1,55 @@
+"""
+Llena (o vuelve a escribir) las cuotas normalizadas de los pagarés.
+
+La migración 0018 ya llena las cuotas de los pagarés que existían al crearse
+CuotaAmortizacion; este comando es para los pagarés cuya tabla se modificó con
+QuerySet.update() (que no pasa por save()). Se sincronizan por lotes: una
+transacción por lote que borra sus cuotas y las vuelve a crear con bulk_create,
+sin tocar fecha_actualizacion.
+"""
+
+from django.core.management.base import BaseCommand
+from django.db import transaction
+
+from documentos.cartera import cuotas_de_tabla, tabla_del_pagare
+from documentos.models import CuotaAmortizacion, Pagare
+
+
+class Command(BaseCommand):
+    help = 'Sincroniza CuotaAmortizacion con la tabla de amortización JSON de cada pagaré'
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--lote', type=int, default=200,
+            help='Pagarés por lote de lectura y escritura',
+        )
+        parser.add_argument(
+            '--dry-run', action='store_true',
+            help='Solo reporta cuántas cuotas se escribirían',
+        )
+
+    def handle(self, *args, **options):
+        lote = max(1, options['lote'])
+        pagares = cuotas = 0
+        pendientes = []
+        for pagare in Pagare.objects.order_by('pk').iterator(chunk_size=lote):
+            pendientes.append(pagare)
+            if len(pendientes) >= lote:
+                cuotas += self.sincronizar(pendientes, options['dry_run'])
+                pagares += len(pendientes)
+                pendientes = []
+        if pendientes:
+            cuotas += self.sincronizar(pendientes, options['dry_run'])
+            pagares += len(pendientes)
+
+        self.stdout.write(self.style.SUCCESS(f'{pagares} pagarés, {cuotas} cuotas sincronizadas'))
+
+    def sincronizar(self, pagares, dry_run):
+        cuotas = []
+        for pagare in pagares:
+            cuotas.extend(cuotas_de_tabla(pagare, tabla_del_pagare(pagare)))
+        if not dry_run:
+            with transaction.atomic():
+                CuotaAmortizacion.objects.filter(pagare__in=pagares).delete()
+                CuotaAmortizacion.objects.bulk_create(cuotas, batch_size=1000)
+        return len(cuotas)
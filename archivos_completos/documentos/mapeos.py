@@ -0,0 +1,558 @@
+"""
+Mapeos campo → placeholder de cada tipo de documento.
+
+Cada lista declara, en el orden en que se aplican los reemplazos, el
+placeholder del template, el campo (o función) de origen, las transformaciones
+y el texto para valores vacíos. Ver documentos/placeholders.py.
+"""
+
+import json
+
+from .placeholders import (
+    Campo,
+    construir_contexto,
+    constructor_contexto,
+    en_letra,
+    en_letra_capitalizada,
+    fecha,
+    fecha_sin_relleno,
+    hora,
+    literal,
+    mayusculas,
+    miles,
+    miles_sin_decimales,
+    moneda,
+    mostrar,
+    porcentaje,
+    registrar,
+    si_no,
+    texto,
+)
+
+
+def directos(plantilla, *campos, vacio=''):
+    """Campos que se copian tal cual: directos('{{%s}}', 'lugar', 'presidente')"""
+    return [Campo(plantilla % campo, campo, vacio=vacio) for campo in campos]
+
+
+# ---------------------------------------------------------------------------
+# Pagaré
+# ---------------------------------------------------------------------------
+
+registrar('pagare', [
+    Campo('{{lugar_emision}}', 'lugar_emision', vacio='[LUGAR_EMISION]'),
+    Campo('{{fecha_emision}}', 'fecha_emision', fecha, vacio='[FECHA_EMISION]'),
+    Campo('{{nombre_acreedor}}', 'acreedor_nombre', vacio='[NOMBRE_ACREEDOR]'),
+    Campo('{{NOMBRE_ACREEDOR}}', 'acreedor_nombre', mayusculas, vacio='[NOMBRE_ACREEDOR]'),
+    Campo('{{rfc_acreedor}}', 'acreedor_rfc', vacio='[RFC_ACREEDOR]'),
+    Campo('{{domicilio_acreedor}}', 'acreedor_domicilio', vacio='[DOMICILIO_ACREEDOR]'),
+    Campo('{{nombre_deudor}}', 'deudor_nombre', vacio='[NOMBRE_DEUDOR]'),
+    Campo('{{NOMBRE_DEUDOR}}', 'deudor_nombre', mayusculas, vacio='[NOMBRE_DEUDOR]'),
+    Campo('{{rfc_deudor}}', 'deudor_rfc', vacio='[RFC_DEUDOR]'),
+    Campo('{{representante_deudor}}', 'deudor_representante', vacio='[REPRESENTANTE_DEUDOR]'),
+    Campo('{{domicilio_deudor}}', 'deudor_domicilio', vacio='[DOMICILIO_DEUDOR]'),
+    Campo('{{monto_principal}}', 'monto_numeric', moneda, vacio='[MONTO_PRINCIPAL]'),
+    Campo('{{moneda}}', 'moneda', vacio='[MONEDA]'),
+    Campo('{{concepto_pagare}}', 'concepto', vacio='[CONCEPTO_PAGARE]'),
+    Campo('{{monto_principal_texto}}', 'monto_literal', vacio='[MONTO_PRINCIPAL_TEXTO]'),
+    Campo('{{tipo_pago}}', mostrar('tipo_pago'), vacio='[TIPO_PAGO]'),
+    Campo('{{numero_pagos}}', 'num_pagos', texto, vacio='[NUMERO_PAGOS]'),
+    Campo('{{numero_pagos_letra}}', literal('num_pagos_letra')),
+    Campo('{{periodicidad}}', mostrar('periodicidad'), vacio='[PERIODICIDAD]'),
+    Campo('{{lugar_pago}}', 'lugar_pago', vacio='[LUGAR_PAGO]'),
+    Campo('{{forma_pago}}', 'forma_pago', vacio='[FORMA_PAGO]'),
+    Campo('{{tasa_interes_ordinario}}', 'tasa_interes_ordinario', porcentaje, vacio='[TASA_INTERES_ORDINARIO]'),
+    Campo('{{tasa_interes_ordinario_letra}}', literal('tasa_interes_ordinario_letra'), vacio='[TASA_INTERES_ORDINARIO_LETRA]'),
+    Campo('{{tasa_interes_moratorio}}', 'tasa_interes_moratorio', porcentaje, vacio='[TASA_INTERES_MORATORIO]'),
+    Campo('{{tasa_interes_moratorio_letra}}', literal('tasa_interes_moratorio_letra'), vacio='[TASA_INTERES_MORATORIO_LETRA]'),
+    Campo('{{base_calculo_dias}}', 'base_intereses', texto, vacio='[BASE_CALCULO_DIAS]'),
+    Campo('{{base_calculo_dias_letra}}', literal('base_intereses_letra'), vacio='[BASE_CALCULO_DIAS_LETRA]'),
+    Campo('{{gastos_administracion}}', 'gastos_admon', moneda, vacio='[GASTOS_ADMINISTRACION]'),
+    Campo('{{gastos_administracion_letra}}', literal('gastos_admon_letra'), vacio='[GASTOS_ADMINISTRACION_LETRA]'),
+    Campo('{{permitir_prepago}}', 'prepago_permitido', si_no, vacio='No'),
+    Campo('{{dias_aviso_prepago}}', 'dias_aviso_prepago', texto, vacio='[DIAS_AVISO_PREPAGO]'),
+    Campo('{{dias_aviso_prepago_letra}}', literal('dias_aviso_prepago_letra'), vacio='[DIAS_AVISO_PREPAGO_LETRA]'),
+    Campo('{{condicion_prepago}}', 'condicion_prepago', vacio='[CONDICION_PREPAGO]'),
+    Campo('{{tiene_garantia_aval}}', 'tiene_garantia', si_no, vacio='No'),
+    Campo('{{nombre_aval}}', 'aval_nombre', vacio='[NOMBRE_AVAL]'),
+    Campo('{{NOMBRE_AVAL}}', 'aval_nombre', mayusculas, vacio='[NOMBRE_AVAL]'),
+    Campo('{{descripcion_garantia}}', 'descripcion_garantia', vacio='[DESCRIPCION_GARANTIA]'),
+    Campo('{{domicilio_aval}}', 'aval_domicilio', vacio='[DOMICILIO_AVAL]'),
+    Campo('{{jurisdiccion}}', 'jurisdiccion', vacio='[JURISDICCION]'),
+    Campo('{{ley_aplicable}}', 'ley_aplicable', vacio='[LEY_APLICABLE]'),
+    Campo('{{eventos_incumplimiento}}', 'eventos_incumplimiento', vacio='[EVENTOS_INCUMPLIMIENTO]'),
+    Campo('{{clausula_aceleracion}}', 'clausula_aceleracion', vacio='[CLAUSULA_ACELERACION]'),
+])
+
+
+# ---------------------------------------------------------------------------
+# Contrato de Crédito
+# ---------------------------------------------------------------------------
+
+registrar('contrato_credito', [
+    # Datos Generales del Contrato
+    Campo('{{fecha_contrato}}', 'fecha_contrato', fecha, vacio='[FECHA]'),
+    Campo('{{fecha_contrato_texto}}', literal('fecha_contrato_texto')),
+    *directos('{{%s}}', 'lugar_contrato'),
+
+    # Parte Acreditante
+    *directos('{{%s}}', 'acreditante_razon_social'),
+    Campo('{{ACREDITANTE_RAZON_SOCIAL}}', 'acreditante_razon_social', mayusculas),
+    *directos('{{%s}}', 'acreditante_forma_legal', 'acreditante_representante'),
+    Campo('{{ACREDITANTE_REPRESENTANTE}}', 'acreditante_representante', mayusculas),
+
+    # Constitución original del acreditante
+    *directos('{{%s}}', 'acreditante_deed_constitucion_numero'),
+    Campo('{{acreditante_deed_constitucion_fecha}}', 'acreditante_deed_constitucion_fecha', fecha, vacio='[FECHA]'),
+    *directos('{{%s}}', 'acreditante_notario_constitucion', 'acreditante_registro_constitucion_folio'),
+
+    # Cambio a S.A.P.I. del acreditante
+    *directos('{{%s}}', 'acreditante_deed_prom_inv_numero'),
+    Campo('{{acreditante_deed_prom_inv_fecha}}', 'acreditante_deed_prom_inv_fecha', fecha, vacio='[FECHA]'),
+    *directos('{{%s}}', 'acreditante_notario_prom_inv', 'acreditante_registro_prom_inv_folio'),
+
+    # Poder del representante del acreditante
+    *directos('{{%s}}', 'acreditante_deed_poder_numero'),
+    Campo('{{acreditante_deed_poder_fecha}}', 'acreditante_deed_poder_fecha', fecha, vacio='[FECHA]'),
+    *directos('{{%s}}', 'acreditante_notario_poder'),
+
+    # Parte Acreditado
+    *directos('{{%s}}', 'acreditado_razon_social_original'),
+    Campo('{{ACREDITADO_RAZON_SOCIAL_ORIGINAL}}', 'acreditado_razon_social_original', mayusculas),
+
+    # Constitución original del acreditado
+    *directos('{{%s}}', 'acreditado_deed_constitucion_original_numero'),
+    Campo('{{acreditado_deed_constitucion_original_fecha}}', 'acreditado_deed_constitucion_original_fecha', fecha, vacio='[FECHA]'),
+    *directos('{{%s}}', 'acreditado_notario_constitucion_original', 'acreditado_registro_constitucion_original_folio'),
+
+    # Cambio de denominación social del acreditado
+    *directos('{{%s}}', 'acreditado_deed_denominacion_cambio_numero'),
+    Campo('{{acreditado_deed_denominacion_cambio_fecha}}', 'acreditado_deed_denominacion_cambio_fecha', fecha, vacio='[FECHA]'),
+    *directos('{{%s}}', 'acreditado_notario_denominacion_cambio', 'acreditado_registro_denominacion_cambio_folio'),
+
+    # Poder del representante del acreditado
+    *directos('{{%s}}', 'acreditado_deed_poder_numero'),
+    Campo('{{acreditado_deed_poder_fecha}}', 'acreditado_deed_poder_fecha', fecha, vacio='[FECHA]'),
+    *directos('{{%s}}', 'acreditado_notario_poder'),
+
+    # Resoluciones del consejo del acreditado
+    Campo('{{acreditado_resoluciones_unani_fecha}}', 'acreditado_resoluciones_unani_fecha', fecha, vacio='[FECHA]'),
+
+    # Términos del Crédito
+    Campo('{{monto_credito}}', 'monto_credito', moneda),
+    *directos('{{%s}}', 'monto_credito_texto'),
+    Campo('{{MONTO_CREDITO_TEXTO}}', 'monto_credito_texto', mayusculas),
+    Campo('{{numero_disposiciones}}', 'numero_disposiciones', texto),
+
+    # Disposiciones del crédito
+    Campo('{{disposicion1_fecha}}', 'disposicion1_fecha', fecha, vacio='[FECHA]'),
+    Campo('{{disposicion1_importe}}', 'disposicion1_importe', moneda),
+    Campo('{{disposicion1_importe_texto}}', literal('disposicion1_importe_texto')),
+    Campo('{{disposicion2_fecha}}', 'disposicion2_fecha', fecha, vacio='[FECHA]'),
+    Campo('{{disposicion2_fecha_texto}}', literal('disposicion2_fecha_texto')),
+    Campo('{{disposicion2_importe}}', 'disposicion2_importe', moneda),
+    Campo('{{disposicion3_fecha}}', 'disposicion3_fecha', fecha, vacio='[FECHA]'),
+    Campo('{{disposicion3_fecha_texto}}', literal('disposicion3_fecha_texto')),
+    Campo('{{disposicion3_importe}}', 'disposicion3_importe', moneda),
+
+    # Fechas de vencimiento y pagos
+    Campo('{{plazo_credito_fecha_vencimiento}}', 'plazo_credito_fecha_vencimiento', fecha, vacio='[FECHA]'),
+    Campo('{{pagos_intereses_fecha1}}', 'pagos_intereses_fecha1', fecha, vacio='[FECHA]'),
+    Campo('{{pagos_intereses_fecha2}}', 'pagos_intereses_fecha2', fecha, vacio='[FECHA]'),
+    Campo('{{pagos_intereses_fecha3}}', 'pagos_intereses_fecha3', fecha, vacio='[FECHA]'),
+    Campo('{{pago_principal_fecha}}', 'pago_principal_fecha', fecha, vacio='[FECHA]'),
+
+    # Tasas de interés
+    Campo('{{tasa_interes_ordinaria}}', 'tasa_interes_ordinaria', porcentaje),
+    Campo('{{tasa_interes_moratoria}}', 'tasa_interes_moratoria', porcentaje),
+
+    # Información bancaria, domicilios, jurisdicción
+    *directos('{{%s}}', 'banco_cuenta_numero', 'banco_nombre', 'banco_titular', 'banco_clabe',
+              'domicilio_acreditante', 'domicilio_acreditado', 'jurisdiccion', 'ley_aplicable'),
+
+    # Información del Aval
+    *directos('{{%s}}', 'aval_nombre'),
+    Campo('{{AVAL_NOMBRE}}', 'aval_nombre', mayusculas),
+    *directos('{{%s}}', 'aval_domicilio'),
+])
+
+
+# ---------------------------------------------------------------------------
+# Convenio Modificatorio
+# ---------------------------------------------------------------------------
+
+registrar('convenio_modificatorio', [
+    # Datos Generales
+    Campo('{{fecha_convenio}}', 'fecha_convenio', fecha, vacio='[FECHA]'),
+    Campo('{{FECHA_CONVENIO}}', 'fecha_convenio', fecha, mayusculas, vacio='[FECHA]'),
+    *directos('{{%s}}', 'lugar_convenio'),
+
+    # Inversionista (F101)
+    *directos('{{%s}}', 'inversionista_razon_social'),
+    Campo('{{INVERSIONISTA_RAZON_SOCIAL}}', 'inversionista_razon_social', mayusculas),
+    Campo('{{ABREVIATURA INVERSIONISTA}}', 'inversionista_razon_social', lambda valor: valor[:3].upper()),
+    *directos('{{%s}}', 'inversionista_representante'),
+    Campo('{{INVERSIONISTA_REPRESENTANTE}}', 'inversionista_representante', mayusculas),
+    *directos('{{%s}}', 'inversionista_constitucion_escritura'),
+    Campo('{{inversionista_constitucion_fecha}}', 'inversionista_constitucion_fecha', fecha, vacio='[FECHA]'),
+    *directos('{{%s}}', 'inversionista_notario_constitucion', 'inversionista_registro_constitucion',
+              'inversionista_poder_escritura'),
+    Campo('{{inversionista_poder_fecha}}', 'inversionista_poder_fecha', fecha, vacio='[FECHA]'),
+    *directos('{{%s}}', 'inversionista_poder_notario'),
+
+    # Antecedente: Contrato de Inversión Original
+    Campo('{{contrato_original_fecha}}', 'contrato_original_fecha', fecha, vacio='[FECHA]'),
+
+    # Estudiante
+    *directos('{{%s}}', 'estudiante_nombre'),
+    Campo('{{ESTUDIANTE_NOMBRE}}', 'estudiante_nombre', mayusculas),
+    *directos('{{%s}}', 'estudiante_estado_civil', 'estudiante_nacionalidad', 'estudiante_ocupacion'),
+    Campo('{{ESTUDIANTE_OCUPACION}}', 'estudiante_ocupacion', mayusculas),
+    *directos('{{%s}}', 'estudiante_rfc'),
+    Campo('{{ESTUDIANTE_RFC}}', 'estudiante_rfc', mayusculas),
+    *directos('{{%s}}', 'estudiante_curp'),
+    Campo('{{ESTUDIANTE_CURP}}', 'estudiante_curp', mayusculas),
+    Campo('{{adeudo_principal_anterior}}', 'adeudo_principal_anterior', moneda),
+    *directos('{{%s}}', 'adeudo_principal_anterior_texto'),
+    Campo('{{credito_original}}', 'credito_original', moneda),
+    Campo('{{credito_original_texto}}', 'credito_original', en_letra, cero=True),
+
+    # Obligados Solidarios
+    *directos('{{%s}}', 'luis_nombre'),
+    Campo('{{LUIS_NOMBRE}}', 'luis_nombre', mayusculas),
+    *directos('{{%s}}', 'luis_estado_civil', 'luis_ocupacion', 'luis_rfc'),
+    Campo('{{LUIS_RFC}}', 'luis_rfc', mayusculas),
+    *directos('{{%s}}', 'luis_curp'),
+    Campo('{{LUIS_CURP}}', 'luis_curp', mayusculas),
+
+    *directos('{{%s}}', 'lizette_nombre'),
+    Campo('{{LIZETTE_NOMBRE}}', 'lizette_nombre', mayusculas),
+    *directos('{{%s}}', 'lizette_estado_civil', 'lizette_ocupacion', 'lizette_rfc', 'lizette_curp'),
+
+    # Aumento de la Inversión (Inversión II)
+    Campo('{{aumento_monto}}', 'aumento_monto', moneda),
+    *directos('{{%s}}', 'aumento_monto_texto'),
+
+    # Reconocimiento y Pagaré II
+    Campo('{{inversion_total}}', 'inversion_total', moneda),
+    *directos('{{%s}}', 'inversion_total_texto'),
+    Campo('{{adeudo_actualizado}}', 'adeudo_actualizado', moneda),
+    Campo('{{adeudo_actualizado_texto}}', 'adeudo_actualizado', en_letra, cero=True),
+    Campo('{{pagare_ii_fecha}}', 'pagare_ii_fecha', fecha, vacio='[FECHA]'),
+    Campo('{{pagare_i_devuelto}}', 'pagare_i_devuelto', si_no, vacio='No'),
+
+    # Periodo de Disposición
+    Campo('{{dispo_periodo_inicio}}', 'dispo_periodo_inicio', fecha, vacio='[FECHA]'),
+    Campo('{{dispo_periodo_fin}}', 'dispo_periodo_fin', fecha, vacio='[FECHA]'),
+
+    # Términos Financieros
+    Campo('{{cat_anual}}', 'cat_anual', porcentaje),
+    Campo('{{tasa_interes_mensual}}', 'tasa_interes_mensual', porcentaje),
+    Campo('{{tasa_moratoria_mensual}}', 'tasa_moratoria_mensual', porcentaje),
+
+    # Pagos en Etapa de Estudios
+    Campo('{{pagos_estudios_num1}}', 'pagos_estudios_num1', texto),
+    Campo('{{pagos_estudios_imp1}}', 'pagos_estudios_imp1', moneda),
+    Campo('{{pagos_estudios_num2}}', 'pagos_estudios_num2', texto),
+    Campo('{{pagos_estudios_num2_texto}}', 'pagos_estudios_num2', en_letra, cero=True),
+    Campo('{{pagos_estudios_imp2}}', 'pagos_estudios_imp2', moneda),
+
+    # Pagos en Etapa de Egreso
+    Campo('{{pagos_egreso_num}}', 'pagos_egreso_num', texto),
+    Campo('{{PAGOS_EGRESO_NUM_TEXTO}}', 'pagos_egreso_num', en_letra, cero=True),
+    Campo('{{pagos_egreso_imp}}', 'pagos_egreso_imp', moneda),
+    Campo('{{pago_egreso_ultimo}}', 'pago_egreso_ultimo', moneda),
+
+    # Cuenta para pagos
+    *directos('{{%s}}', 'cuenta_numero', 'cuenta_banco', 'cuenta_titular', 'cuenta_clabe'),
+
+    # Documentos a entregar (Cláusula Novena)
+    *[
+        Campo(f'{{{{{campo}}}}}', campo, si_no, vacio='No')
+        for campo in (
+            'entrego_acta_nacimiento', 'entrego_identificacion_oficial', 'entrego_reporte_buro',
+            'entrego_rfc', 'entrego_curp', 'entrego_comprobante_domicilio', 'entrego_comprobante_ingresos',
+        )
+    ],
+
+    # Beneficio por Cursos de Capacitación y Confidencialidad
+    Campo('{{cursos_requeridos}}', 'cursos_requeridos', texto),
+    *directos('{{%s}}', 'beneficio_descripcion'),
+    Campo('{{confidencialidad_years}}', 'confidencialidad_years', texto),
+])
+
+
+# ---------------------------------------------------------------------------
+# Estatutos Sociales
+# ---------------------------------------------------------------------------
+
+registrar('estatutos_sociedad', [
+    *directos('{{%s}}', 'denominacion'),
+    Campo('{{DENOMINACION}}', 'denominacion', mayusculas),
+    *directos('{{%s}}', 'forma_legal', 'domicilio', 'nacionalidad', 'objeto_social'),
+    Campo('{{capital_fijo_monto}}', 'capital_fijo_monto', moneda),
+    *directos('{{%s}}', 'capital_fijo_texto'),
+    Campo('{{acciones_serie_a}}', 'acciones_serie_a', miles_sin_decimales),
+    Campo('{{acciones_serie_a_texto}}', 'acciones_serie_a', en_letra_capitalizada),
+])
+
+
+# ---------------------------------------------------------------------------
+# Contrato de Prenda sobre Acciones (contexto de docxtpl, sin llaves)
+# ---------------------------------------------------------------------------
+
+registrar('contrato_prenda', [
+    # Datos Generales
+    Campo('fecha_contrato', 'fecha_contrato', fecha_sin_relleno),
+    *directos('%s', 'lugar_contrato'),
+
+    # Fideicomiso y proyecto
+    *directos('%s', 'numero_fideicomiso'),
+    Campo('fecha_fideicomiso', 'fecha_fideicomiso', fecha_sin_relleno),
+    Campo('fecha_aprobacion_proyecto', 'fecha_aprobacion_proyecto', fecha_sin_relleno),
+    *directos('%s', 'descripcion_proyecto'),
+
+    # Deudor Prendario
+    *directos('%s', 'deudor_nombre'),
+    Campo('DEUDOR_NOMBRE', 'deudor_nombre', mayusculas),
+    *directos('%s', 'deudor_constitucion_escritura_num'),
+    Campo('deudor_constitucion_fecha', 'deudor_constitucion_fecha', fecha_sin_relleno),
+    *directos('%s', 'deudor_constitucion_notario', 'deudor_constitucion_registro',
+              'deudor_adopcion_sapi_escritura_num'),
+    Campo('deudor_adopcion_sapi_fecha', 'deudor_adopcion_sapi_fecha', fecha_sin_relleno),
+    *directos('%s', 'deudor_adopcion_sapi_notario', 'deudor_adopcion_sapi_registro', 'deudor_representante'),
+    Campo('DEUDOR_REPRESENTANTE', 'deudor_representante', mayusculas),
+
+    # Acciones
+    Campo('acciones_pledged_cantidad', 'acciones_pledged_cantidad', miles),
+    *directos('%s', 'acciones_pledged_texto'),
+    Campo('ACCIONES_PLEDGED_TEXTO', 'acciones_pledged_texto', mayusculas),
+
+    # Acreedor Prendario
+    *directos('%s', 'acreedor_nombre'),
+    Campo('ACREEDOR_NOMBRE', 'acreedor_nombre', mayusculas),
+    *directos('%s', 'acreedor_constitucion_escritura_num'),
+    Campo('acreedor_constitucion_fecha', 'acreedor_constitucion_fecha', fecha_sin_relleno),
+    *directos('%s', 'acreedor_constitucion_notario', 'acreedor_constitucion_registro'),
+
+    # Cambios de denominación social del acreedor
+    *[
+        campo
+        for n in (1, 2, 3)
+        for campo in (
+            *directos('%s', f'acreedor_denominacion{n}_escritura_num'),
+            Campo(f'acreedor_denominacion{n}_fecha', f'acreedor_denominacion{n}_fecha', fecha_sin_relleno),
+            *directos('%s', f'acreedor_denominacion{n}_notario', f'acreedor_denominacion{n}_registro'),
+        )
+    ],
+
+    # Delegado Fiduciario
+    *directos('%s', 'delegado_fiduciario'),
+    Campo('DELEGADO_FIDUCIARIO', 'delegado_fiduciario', mayusculas),
+    *directos('%s', 'delegado_fiduciario_escritura_num'),
+    Campo('delegado_fiduciario_fecha', 'delegado_fiduciario_fecha', fecha_sin_relleno),
+    *directos('%s', 'delegado_fiduciario_notario', 'delegado_fiduciario_registro'),
+
+    # Fideicomitente
+    *directos('%s', 'fideicomitente_nombre'),
+    Campo('FIDEICOMITENTE_NOMBRE', 'fideicomitente_nombre', mayusculas),
+    *directos('%s', 'fideicomitente_constitucion_escritura_num'),
+    Campo('fideicomitente_constitucion_fecha', 'fideicomitente_constitucion_fecha', fecha_sin_relleno),
+    *directos('%s', 'fideicomitente_constitucion_notario', 'fideicomitente_constitucion_registro',
+              'fideicomitente_representante'),
+    Campo('FIDEICOMITENTE_REPRESENTANTE', 'fideicomitente_representante', mayusculas),
+    *directos('%s', 'fideicomitente_rep_escritura_num'),
+    Campo('fideicomitente_rep_fecha', 'fideicomitente_rep_fecha', fecha_sin_relleno),
+    *directos('%s', 'fideicomitente_rep_notario', 'fideicomitente_rep_registro'),
+
+    # Domicilios
+    *directos('%s', 'domicilio_deudor', 'domicilio_acreedor', 'domicilio_fideicomitente'),
+    Campo('estado_civil', lambda contrato: 'soltero'),
+])
+
+
+# ---------------------------------------------------------------------------
+# Acta de Sesión de Consejo
+# ---------------------------------------------------------------------------
+
+FEMENINOS = {"licenciada", "ingeniera", "abogada", "contadora", "doctora", "arquitecta"}
+MASCULINOS = {"licenciado", "ingeniero", "abogado", "contador", "doctor", "arquitecto"}
+
+
+def _cargar_json(valor):
+    return json.loads(valor) if isinstance(valor, str) else valor
+
+
+def _invitados(acta):
+    """Lista cruda de invitados del acta ([] si el JSON no es válido)"""
+    if not acta.invitados_json:
+        return []
+    try:
+        invitados = _cargar_json(acta.invitados_json)
+    except Exception as e:
+        print(f"DEBUG: Error processing invitados_json: {e}")
+        return []
+    return invitados if isinstance(invitados, list) else []
+
+
+def _nombres_invitados(acta):
+    nombres = []
+    for inv in _invitados(acta):
+        if isinstance(inv, dict) and 'nombre' in inv:
+            nombre = inv.get('nombre', '').strip()
+            if nombre:
+                nombres.append(nombre)
+    return nombres
+
+
+def formatear_invitado(inv):
+    """
+    Devuelve 'el ingeniero Juan Pérez', 'la licenciada Ana Ruiz' o solo 'Juan Pérez (Contador Público)'.
+    Si no hay cargo/título, solo usa el nombre.
+    """
+    nombre = inv.get("nombre", "").strip()
+    cargo = (inv.get("cargo") or "").strip().lower()
+
+    if cargo in FEMENINOS:
+        return f"la {cargo} {nombre}"
+    elif cargo in MASCULINOS:
+        return f"el {cargo} {nombre}"
+    elif cargo:
+        # Cargo sin género marcado: lo dejamos pospuesto y entre paréntesis
+        return f"{nombre} ({inv.get('cargo')})"
+    else:
+        return nombre or "Invitado"
+
+
+def unir_conjuncion(nombres):
+    """['A'] -> 'A'; ['A','B'] -> 'A y B'; ['A','B','C'] -> 'A, B y C'"""
+    if not nombres:
+        return ""
+    if len(nombres) == 1:
+        return nombres[0]
+    if len(nombres) == 2:
+        return f"{nombres[0]} y {nombres[1]}"
+    return f"{', '.join(nombres[:-1])} y {nombres[-1]}"
+
+
+def oracion_invitados(acta):
+    """
+    Oración completa de invitados, en singular o plural:
+      1 -> 'Se hace constar la presencia a la sesión de la licenciada Ana Ruiz, quien comparece en calidad de invitada.'
+      2+-> 'Se hace constar la presencia a la sesión de Juan y Ana, quienes comparecen en calidad de invitados.'
+    """
+    lista = [formatear_invitado(i) for i in _invitados(acta) if i.get("nombre")]
+    if not lista:
+        return ""
+    if len(lista) == 1:
+        invitadx = "invitada" if lista[0].startswith("la ") else "invitado"
+        return f"Se hace constar la presencia a la sesión de {lista[0]}, quien comparece en calidad de {invitadx}."
+    return f"Se hace constar la presencia a la sesión de {unir_conjuncion(lista)}, quienes comparecen en calidad de invitados."
+
+
+def invitado(indice):
+    """Origen del nombre del invitado n; si no existe se deja el placeholder"""
+    def leer(acta):
+        nombres = _nombres_invitados(acta)
+        return nombres[indice] if len(nombres) > indice else f"{{{{INVITADO_{indice + 1}}}}}"
+    return leer
+
+
+def _abreviatura_consejo(acta):
+    abreviatura = (getattr(acta, 'abreviatura_sociedad', '') or '').strip()
+    if abreviatura:
+        return abreviatura.upper()
+    return acta.razon_social[:3].upper() if acta.razon_social else None
+
+
+def _texto_convocatoria(acta):
+    if acta.convocatoria_realizada:
+        return (
+            "a la cual fueron debidamente convocados según consta en la convocatoria "
+            "que se adjunta a la presente como Anexo Dos."
+        )
+    return "a la cual asistieron sin necesidad de convocatoria formal, dejando constancia de lo anterior."
+
+
+def _texto_resoluciones(acta):
+    if not acta.resoluciones_json:
+        return None
+    try:
+        resoluciones = _cargar_json(acta.resoluciones_json)
+        if not isinstance(resoluciones, list):
+            return str(resoluciones)
+        lineas = []
+        for resolucion in resoluciones:
+            if isinstance(resolucion, dict):
+                if resolucion.get('texto', ''):
+                    lineas.append(f"{resolucion['texto']}")
+            else:
+                lineas.append(f"{str(resolucion)}")
+        return '\n\n'.join(lineas)
+    except Exception as e:
+        print(f"DEBUG: Error processing resoluciones_json: {e}")
+        return "[Error al procesar resoluciones]"
+
+
+def _texto_o_defecto(campo, defecto):
+    def leer(acta):
+        return (getattr(acta, campo, '') or '').strip() or defecto
+    return leer
+
+
+registrar('acta_consejo', [
+    Campo("{{SOCIEDAD}}", 'razon_social', vacio="[SOCIEDAD]"),
+    Campo("{{RAZON_SOCIAL}}", 'razon_social', vacio="[RAZON_SOCIAL]"),
+    Campo("{{ABREVIATURA SOCIEDAD}}", _abreviatura_consejo, vacio="CAS"),
+    Campo("{{FECHA}}", 'fecha', fecha, vacio="[FECHA]"),
+    Campo("{{HORA}}", 'hora_inicio', hora, vacio="[HORA]"),
+    Campo("{{CIUDAD}}", _texto_o_defecto('ciudad', "Ciudad de México")),
+    Campo("{{LUGAR}}", 'lugar', vacio="[LUGAR]"),
+    Campo("{{DOMICILIO_SOCIAL}}", 'lugar', vacio="[DOMICILIO SOCIAL]"),
+    Campo("{{PLATAFORMA_REMOTA}}", _texto_o_defecto('plataforma_remota', "Zoom")),
+    Campo("{{INVITADO_1}}", invitado(0)),
+    Campo("{{INVITADO_2}}", invitado(1)),
+    Campo("{{INVITADO_3}}", invitado(2)),
+    Campo("{{ORACION_INVITADOS}}", oracion_invitados),
+    Campo("{{PRESIDENTE}}", 'presidente', vacio="[PRESIDENTE]"),
+    Campo("{{SECRETARIO}}", 'secretario', vacio="[SECRETARIO]"),
+    Campo("{{HORA_CIERRE}}", 'hora_cierre', hora, vacio="[HORA CIERRE]"),
+    Campo("{{CONVOCATORIA_TEXTO}}", _texto_convocatoria),
+    Campo("{{RESOLUCIONES}}", _texto_resoluciones, vacio="[No hay resoluciones registradas]"),
+])
+
+
+# ---------------------------------------------------------------------------
+# Acta de Asamblea
+# ---------------------------------------------------------------------------
+
+PALABRAS_SIN_INICIAL = {"S", "S.A.", "S.A", "DE", "C.V.", "C.V", "RL", "R.L.", "R.L"}
+
+
+def _abreviatura_asamblea(acta):
+    if not acta.razon_social:
+        return None
+    return "".join(p[0] for p in acta.razon_social.strip().split() if p.upper() not in PALABRAS_SIN_INICIAL).upper()
+
+
+registrar('acta_asamblea', [
+    Campo("{{razon_social}}", 'razon_social', vacio="[RAZÓN SOCIAL]"),
+    Campo("{{RAZON_SOCIAL}}", 'razon_social', mayusculas, vacio="[RAZÓN SOCIAL]"),
+    Campo("{{ABREVIATURA_SOCIEDAD}}", _abreviatura_asamblea, vacio="CAS"),
+    Campo("{{tipo_asamblea}}", lambda acta: acta.get_tipo_asamblea_display()),
+    Campo("{{TIPO_ASAMBLEA}}", mostrar('tipo_asamblea'), mayusculas, vacio="[TIPO DE ASAMBLEA]"),
+    Campo("{{caracter}}", 'caracter', vacio="[CARÁCTER]"),
+    Campo("{{CARACTER}}", 'caracter', mayusculas, vacio="[CARÁCTER]"),
+    Campo("{{fecha}}", 'fecha', fecha, vacio="[FECHA]"),
+    Campo("{{hora_inicio}}", 'hora_inicio', hora, vacio="[HORA DE INICIO]"),
+    Campo("{{hora_cierre}}", 'hora_cierre', hora, vacio="[HORA DE CIERRE]"),
+    Campo("{{lugar}}", 'lugar', vacio="[LUGAR]"),
+    Campo("{{porcentage_capital_presente}}", 'porcentaje_capital_presente', porcentaje, vacio="[PORCENTAJE CAPITAL PRESENTE]"),
+    Campo("{{presidente}}", 'presidente', vacio="[PRESIDENTE]"),
+    Campo("{{secretario}}", 'secretario', vacio="[SECRETARIO]"),
+    Campo("{{escrutador}}", 'escrutador', vacio="[ESCRUTADOR]"),
+    Campo("{{comisario}}", 'comisario', vacio="[COMISARIO]"),
+])
+
+
+__all__ = ['construir_contexto', 'constructor_contexto']
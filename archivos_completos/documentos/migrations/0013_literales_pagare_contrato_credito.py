@@ -0,0 +1,63 @@
+# Generated by Django 5.2.18 on 2026-10-19 13:07
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('documentos', '0012_conveniomodificatorio_credito_original'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='contratocredito',
+            name='disposicion1_importe_texto',
+            field=models.CharField(blank=True, default='', editable=False, max_length=300),
+        ),
+        migrations.AddField(
+            model_name='contratocredito',
+            name='disposicion2_fecha_texto',
+            field=models.CharField(blank=True, default='', editable=False, max_length=200),
+        ),
+        migrations.AddField(
+            model_name='contratocredito',
+            name='disposicion3_fecha_texto',
+            field=models.CharField(blank=True, default='', editable=False, max_length=200),
+        ),
+        migrations.AddField(
+            model_name='contratocredito',
+            name='fecha_contrato_texto',
+            field=models.CharField(blank=True, default='', editable=False, max_length=200),
+        ),
+        migrations.AddField(
+            model_name='pagare',
+            name='base_intereses_letra',
+            field=models.CharField(blank=True, default='', editable=False, max_length=200, verbose_name='Base de cálculo en letra'),
+        ),
+        migrations.AddField(
+            model_name='pagare',
+            name='dias_aviso_prepago_letra',
+            field=models.CharField(blank=True, default='', editable=False, max_length=200, verbose_name='Días de aviso en letra'),
+        ),
+        migrations.AddField(
+            model_name='pagare',
+            name='gastos_admon_letra',
+            field=models.CharField(blank=True, default='', editable=False, max_length=300, verbose_name='Gastos de administración en letra'),
+        ),
+        migrations.AddField(
+            model_name='pagare',
+            name='num_pagos_letra',
+            field=models.CharField(blank=True, default='', editable=False, max_length=200, verbose_name='Número de pagos en letra'),
+        ),
+        migrations.AddField(
+            model_name='pagare',
+            name='tasa_interes_moratorio_letra',
+            field=models.CharField(blank=True, default='', editable=False, max_length=200, verbose_name='Tasa moratoria en letra'),
+        ),
+        migrations.AddField(
+            model_name='pagare',
+            name='tasa_interes_ordinario_letra',
+            field=models.CharField(blank=True, default='', editable=False, max_length=200, verbose_name='Tasa ordinaria en letra'),
+        ),
+    ]
@@ -0,0 +1,39 @@
+# Generated by Django 5.2.18 on 2026-10-19 13:28
+
+import django.db.models.deletion
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('documentos', '0013_literales_pagare_contrato_credito'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='CuotaAmortizacion',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('numero', models.PositiveIntegerField(verbose_name='Número de cuota')),
+                ('fecha', models.DateField(blank=True, null=True, verbose_name='Fecha de pago')),
+                ('capital', models.DecimalField(decimal_places=2, default=0, max_digits=12, verbose_name='Capital')),
+                ('saldo', models.DecimalField(decimal_places=2, default=0, max_digits=12, verbose_name='Saldo insoluto')),
+                ('costo_admon', models.DecimalField(decimal_places=2, default=0, max_digits=12, verbose_name='Costo de administración')),
+                ('iva_costo_admon', models.DecimalField(decimal_places=2, default=0, max_digits=12, verbose_name='IVA del costo de administración')),
+                ('interes', models.DecimalField(decimal_places=2, default=0, max_digits=12, verbose_name='Interés')),
+                ('iva_interes', models.DecimalField(decimal_places=2, default=0, max_digits=12, verbose_name='IVA del interés')),
+                ('total', models.DecimalField(decimal_places=2, default=0, max_digits=12, verbose_name='Pago total')),
+                ('estado', models.CharField(default='pendiente', max_length=20, verbose_name='Estado')),
+                ('fecha_pago_real', models.DateField(blank=True, null=True, verbose_name='Fecha de pago real')),
+                ('pagare', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='cuotas', to='documentos.pagare')),
+            ],
+            options={
+                'verbose_name': 'Cuota de amortización',
+                'verbose_name_plural': 'Cuotas de amortización',
+                'ordering': ['pagare', 'numero'],
+                'indexes': [models.Index(fields=['estado', 'fecha'], name='cuota_estado_fecha_idx')],
+                'constraints': [models.UniqueConstraint(fields=('pagare', 'numero'), name='cuota_unica_por_pagare')],
+            },
+        ),
+    ]
@@ -0,0 +1,33 @@
+# Generated by Django 5.2.18 on 2026-10-19 13:30
+
+import django.utils.timezone
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('documentos', '0014_cuotas_amortizacion'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='EjecucionVencimientos',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('fecha_corte', models.DateField(verbose_name='Fecha de corte')),
+                ('iniciada_en', models.DateTimeField(default=django.utils.timezone.now, verbose_name='Iniciada en')),
+                ('duracion', models.FloatField(default=0, verbose_name='Duración (segundos)')),
+                ('cuotas_vencidas', models.PositiveIntegerField(default=0, verbose_name='Cuotas marcadas como vencidas')),
+                ('pagares_actualizados', models.PositiveIntegerField(default=0, verbose_name='Pagarés con cuotas vencidas')),
+                ('pagares_vencidos', models.PositiveIntegerField(default=0, verbose_name='Pagarés que pasaron a vencido')),
+                ('simulacion', models.BooleanField(default=False, verbose_name='Simulación (sin guardar cambios)')),
+                ('error', models.TextField(blank=True, verbose_name='Error')),
+            ],
+            options={
+                'verbose_name': 'Ejecución de vencimientos',
+                'verbose_name_plural': 'Ejecuciones de vencimientos',
+                'ordering': ['-iniciada_en'],
+            },
+        ),
+    ]
@@ -0,0 +1,18 @@
+# Generated by Django 5.2.18 on 2026-10-19 13:57
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('documentos', '0015_ejecucion_vencimientos'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='pagare',
+            name='tabla_amortizacion_huella',
+            field=models.CharField(blank=True, default='', editable=False, max_length=64, verbose_name='Huella de la tabla de amortización'),
+        ),
+    ]
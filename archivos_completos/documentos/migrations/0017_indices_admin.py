@@ -0,0 +1,107 @@
+# Generated by Django 5.2.18 on 2026-10-19 13:59
+
+from django.conf import settings
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('documentos', '0016_tabla_amortizacion_huella'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='actaasamblea',
+            index=models.Index(fields=['usuario', '-fecha'], name='asamblea_usuario_fecha_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='actaasamblea',
+            index=models.Index(fields=['estado', '-fecha'], name='asamblea_estado_fecha_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='actaasamblea',
+            index=models.Index(fields=['-fecha', '-creada_en'], name='asamblea_orden_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='actaasamblea',
+            index=models.Index(fields=['tipo_asamblea'], name='asamblea_tipo_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='actaasamblea',
+            index=models.Index(fields=['creada_en'], name='asamblea_creada_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='actasesionconsejo',
+            index=models.Index(fields=['usuario', '-fecha'], name='consejo_usuario_fecha_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='actasesionconsejo',
+            index=models.Index(fields=['estado', '-fecha'], name='consejo_estado_fecha_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='actasesionconsejo',
+            index=models.Index(fields=['-fecha', '-creada_en'], name='consejo_orden_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='actasesionconsejo',
+            index=models.Index(fields=['creada_en'], name='consejo_creada_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='contratocredito',
+            index=models.Index(fields=['usuario', '-fecha_contrato'], name='credito_usuario_fecha_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='contratocredito',
+            index=models.Index(fields=['estado', '-fecha_contrato'], name='credito_estado_fecha_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='contratocredito',
+            index=models.Index(fields=['-fecha_contrato', '-fecha_creacion'], name='credito_orden_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='contratoprendaacciones',
+            index=models.Index(fields=['usuario', '-fecha_contrato'], name='prenda_usuario_fecha_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='contratoprendaacciones',
+            index=models.Index(fields=['estado', '-fecha_contrato'], name='prenda_estado_fecha_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='contratoprendaacciones',
+            index=models.Index(fields=['-fecha_contrato', '-fecha_creacion'], name='prenda_orden_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='conveniomodificatorio',
+            index=models.Index(fields=['usuario', '-fecha_convenio'], name='convenio_usuario_fecha_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='conveniomodificatorio',
+            index=models.Index(fields=['estado', '-fecha_convenio'], name='convenio_estado_fecha_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='conveniomodificatorio',
+            index=models.Index(fields=['-fecha_convenio', '-fecha_creacion'], name='convenio_orden_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='estatutossociedad',
+            index=models.Index(fields=['usuario', '-fecha_creacion'], name='estatutos_usuario_fecha_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='estatutossociedad',
+            index=models.Index(fields=['estado', '-fecha_creacion'], name='estatutos_estado_fecha_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='pagare',
+            index=models.Index(fields=['usuario', '-fecha_emision'], name='pagare_usuario_fecha_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='pagare',
+            index=models.Index(fields=['estado', '-fecha_emision'], name='pagare_estado_fecha_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='pagare',
+            index=models.Index(fields=['-fecha_emision', '-fecha_creacion'], name='pagare_orden_idx'),
+        ),
+    ]
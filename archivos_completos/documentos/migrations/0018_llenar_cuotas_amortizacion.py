@@ -0,0 +1,53 @@
+from django.db import migrations
+
+LOTE = 200
+
+
+def llenar_cuotas(apps, schema_editor):
+    """
+    Llena CuotaAmortizacion con la tabla vigente de cada pagaré existente, por
+    lotes y con bulk_create. Un pagaré sin tabla guardada toma la automática,
+    que se calcula con el modelo actual porque el histórico no tiene métodos.
+    """
+    from documentos.cartera import cuotas_de_tabla
+    from documentos.models import Pagare as PagareActual
+
+    Pagare = apps.get_model('documentos', 'Pagare')
+    CuotaAmortizacion = apps.get_model('documentos', 'CuotaAmortizacion')
+    campos_actuales = {campo.attname for campo in PagareActual._meta.concrete_fields}
+    campos = [campo.attname for campo in Pagare._meta.concrete_fields if campo.attname in campos_actuales]
+
+    def tabla(pagare):
+        if pagare.tabla_amortizacion:
+            return pagare.tabla_amortizacion
+        if pagare.monto_numeric and pagare.num_pagos:
+            actual = PagareActual(**{campo: getattr(pagare, campo) for campo in campos})
+            return actual.generar_tabla_amortizacion_automatica()
+        return []
+
+    def guardar(pagares):
+        cuotas = []
+        for pagare in pagares:
+            cuotas.extend(cuotas_de_tabla(pagare, tabla(pagare), modelo=CuotaAmortizacion))
+        CuotaAmortizacion.objects.filter(pagare__in=pagares).delete()
+        CuotaAmortizacion.objects.bulk_create(cuotas, batch_size=1000)
+
+    pendientes = []
+    for pagare in Pagare.objects.order_by('pk').iterator(chunk_size=LOTE):
+        pendientes.append(pagare)
+        if len(pendientes) >= LOTE:
+            guardar(pendientes)
+            pendientes = []
+    if pendientes:
+        guardar(pendientes)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('documentos', '0017_indices_admin'),
+    ]
+
+    operations = [
+        migrations.RunPython(llenar_cuotas, migrations.RunPython.noop),
+    ]
@@ -0,0 +1,62 @@
+from django.db import migrations
+
+from documentos.literales import en_letra, en_letra_con_cero, en_letra_minusculas, fecha_en_letra
+
+LOTE = 500
+
+# LITERALES de cada modelo al crear las columnas (0013); copia fija para que la migración
+# no dependa de cómo evolucione el modelo
+LITERALES = {
+    'Pagare': {
+        'num_pagos_letra': ('num_pagos', en_letra_con_cero),
+        'tasa_interes_ordinario_letra': ('tasa_interes_ordinario', en_letra),
+        'tasa_interes_moratorio_letra': ('tasa_interes_moratorio', en_letra),
+        'base_intereses_letra': ('base_intereses', en_letra),
+        'gastos_admon_letra': ('gastos_admon', en_letra),
+        'dias_aviso_prepago_letra': ('dias_aviso_prepago', en_letra),
+    },
+    'ContratoCredito': {
+        'fecha_contrato_texto': ('fecha_contrato', fecha_en_letra),
+        'disposicion1_importe_texto': ('disposicion1_importe', en_letra_minusculas),
+        'disposicion2_fecha_texto': ('disposicion2_fecha', fecha_en_letra),
+        'disposicion3_fecha_texto': ('disposicion3_fecha', fecha_en_letra),
+    },
+}
+
+
+def llenar_literales(apps, schema_editor):
+    """
+    Llena las formas literales de los registros existentes, por lotes y con
+    bulk_update solo de los que cambian, sin tocar la fecha de actualización:
+    el documento no cambia, antes se calculaban al vuelo.
+    """
+    for nombre, literales in LITERALES.items():
+        modelo = apps.get_model('documentos', nombre)
+        campos = list(literales)
+        origenes = {origen for origen, _ in literales.values()}
+        pendientes = []
+        for objeto in modelo.objects.only('pk', *origenes, *campos).order_by('pk').iterator(chunk_size=LOTE):
+            cambio = False
+            for campo, (origen, funcion) in literales.items():
+                valor = funcion(getattr(objeto, origen))
+                if getattr(objeto, campo) != valor:
+                    setattr(objeto, campo, valor)
+                    cambio = True
+            if cambio:
+                pendientes.append(objeto)
+            if len(pendientes) >= LOTE:
+                modelo.objects.bulk_update(pendientes, campos)
+                pendientes = []
+        if pendientes:
+            modelo.objects.bulk_update(pendientes, campos)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('documentos', '0018_llenar_cuotas_amortizacion'),
+    ]
+
+    operations = [
+        migrations.RunPython(llenar_literales, migrations.RunPython.noop),
+    ]
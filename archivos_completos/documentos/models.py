@@ -1,3 +1,5 @@
+from datetime import date
+
 from django.db import models
 from django.contrib.auth.models import User
 from django.urls import reverse
@@ -6,6 +8,13 @@ from django.core.validators import MinValueValidator, MaxValueValidator
 
 # Importamos el modelo EstatutosSociedad
 from .estatutos_sociedad import EstatutosSociedad
+from .literales import (
+    LiteralesMixin,
+    en_letra,
+    en_letra_con_cero,
+    en_letra_minusculas,
+    fecha_en_letra,
+)
 
 class TipoDocumento(models.Model):
     nombre = models.CharField(max_length=100)
@@ -82,6 +91,14 @@ class ActaAsamblea(models.Model):
         verbose_name = "Acta de Asamblea"
         verbose_name_plural = "Actas de Asambleas"
         ordering = ['-fecha', '-creada_en']
+        # Listas por usuario, filtros del admin y orden por defecto
+        indexes = [
+            models.Index(fields=['usuario', '-fecha'], name='asamblea_usuario_fecha_idx'),
+            models.Index(fields=['estado', '-fecha'], name='asamblea_estado_fecha_idx'),
+            models.Index(fields=['-fecha', '-creada_en'], name='asamblea_orden_idx'),
+            models.Index(fields=['tipo_asamblea'], name='asamblea_tipo_idx'),
+            models.Index(fields=['creada_en'], name='asamblea_creada_idx'),
+        ]
 
     def __str__(self):
         return f"{self.get_tipo_asamblea_display()} {self.razon_social} {self.fecha}"
@@ -228,6 +245,13 @@ class ActaSesionConsejo(models.Model):
         verbose_name = "Acta de Sesión de Consejo"
         verbose_name_plural = "Actas de Sesiones de Consejo"
         ordering = ['-fecha', '-creada_en']
+        # Listas por usuario, filtros del admin y orden por defecto
+        indexes = [
+            models.Index(fields=['usuario', '-fecha'], name='consejo_usuario_fecha_idx'),
+            models.Index(fields=['estado', '-fecha'], name='consejo_estado_fecha_idx'),
+            models.Index(fields=['-fecha', '-creada_en'], name='consejo_orden_idx'),
+            models.Index(fields=['creada_en'], name='consejo_creada_idx'),
+        ]
 
     def __str__(self):
         return f"Sesión {self.fecha} — {self.razon_social}"
@@ -254,7 +278,7 @@ class ActaSesionConsejo(models.Model):
         return None
 
 
-class Pagare(models.Model):
+class Pagare(LiteralesMixin, models.Model):
     # 1. Encabezado
     lugar_emision = models.CharField("Lugar de emisión", max_length=200)
     fecha_emision = models.DateField("Fecha de emisión")
@@ -324,6 +348,17 @@ class Pagare(models.Model):
     # 11. Tabla de amortización (datos integrados)
     tabla_amortizacion = models.JSONField("Tabla de amortización", null=True, blank=True, 
                                         help_text="Formato: [{\"numero\": 1, \"fecha\": \"2025-08-01\", \"capital\": 1000.00, \"saldo\": 9000.00, \"costo_admon\": 50.00, \"iva_costo_admon\": 8.00, \"interes\": 100.00, \"iva_interes\": 16.00, \"total\": 1174.00, \"estado\": \"pendiente\", \"fecha_pago_real\": null}]")
+    # Huella de los datos con que se generó la tabla automática (ver documentos/cartera.py); vacía si la
+    # tabla se capturó a mano, en cuyo caso no se regenera
+    tabla_amortizacion_huella = models.CharField("Huella de la tabla de amortización", max_length=64, blank=True, default="", editable=False)
+
+    # 12. Formas literales (se recalculan al guardar, ver LITERALES)
+    num_pagos_letra = models.CharField("Número de pagos en letra", max_length=200, blank=True, default="", editable=False)
+    tasa_interes_ordinario_letra = models.CharField("Tasa ordinaria en letra", max_length=200, blank=True, default="", editable=False)
+    tasa_interes_moratorio_letra = models.CharField("Tasa moratoria en letra", max_length=200, blank=True, default="", editable=False)
+    base_intereses_letra = models.CharField("Base de cálculo en letra", max_length=200, blank=True, default="", editable=False)
+    gastos_admon_letra = models.CharField("Gastos de administración en letra", max_length=300, blank=True, default="", editable=False)
+    dias_aviso_prepago_letra = models.CharField("Días de aviso en letra", max_length=200, blank=True, default="", editable=False)
 
     # Campos de control
     usuario = models.ForeignKey(User, on_delete=models.CASCADE, related_name='pagares')
@@ -343,9 +378,59 @@ class Pagare(models.Model):
         verbose_name = "Pagaré"
         verbose_name_plural = "Pagarés"
         ordering = ['-fecha_emision', '-fecha_creacion']
+        # Listas por usuario, filtros del admin y orden por defecto
+        indexes = [
+            models.Index(fields=['usuario', '-fecha_emision'], name='pagare_usuario_fecha_idx'),
+            models.Index(fields=['estado', '-fecha_emision'], name='pagare_estado_fecha_idx'),
+            models.Index(fields=['-fecha_emision', '-fecha_creacion'], name='pagare_orden_idx'),
+        ]
+
+    LITERALES = {
+        'num_pagos_letra': ('num_pagos', en_letra_con_cero),
+        'tasa_interes_ordinario_letra': ('tasa_interes_ordinario', en_letra),
+        'tasa_interes_moratorio_letra': ('tasa_interes_moratorio', en_letra),
+        'base_intereses_letra': ('base_intereses', en_letra),
+        'gastos_admon_letra': ('gastos_admon', en_letra),
+        'dias_aviso_prepago_letra': ('dias_aviso_prepago', en_letra),
+    }
 
     def __str__(self):
         return f"Pagaré #{self.id} - {self.deudor_nombre}"
+
+    def save(self, *args, **kwargs):
+        from .cartera import firma_tabla, materializar_tabla, sincronizar_cuotas
+
+        update_fields = kwargs.get('update_fields')
+        nuevo = self._state.adding
+        if update_fields is None:
+            # La tabla automática se guarda ya calculada; solo se recalcula si cambiaron sus datos
+            materializar_tabla(self)
+        super().save(*args, **kwargs)
+        # Las cuotas normalizadas (CuotaAmortizacion) siguen a la tabla JSON para los reportes de cartera;
+        # solo se reescriben si la tabla cambió desde que se leyó (no al cambiar un literal o el estado)
+        if update_fields is None or 'tabla_amortizacion' in update_fields:
+            firma = firma_tabla(self.tabla_amortizacion)
+            if nuevo or firma != getattr(self, '_firma_tabla', None):
+                sincronizar_cuotas(self)
+            self._firma_tabla = firma
+
+    @classmethod
+    def from_db(cls, db, field_names, values):
+        instancia = super().from_db(db, field_names, values)
+        instancia._firmar_tabla()
+        return instancia
+
+    def refresh_from_db(self, using=None, fields=None, **kwargs):
+        super().refresh_from_db(using=using, fields=fields, **kwargs)
+        if fields is None or 'tabla_amortizacion' in fields:
+            self._firmar_tabla()
+
+    def _firmar_tabla(self):
+        """Recuerda la firma de la tabla tal como está en la base (si se leyó)"""
+        from .cartera import firma_tabla
+
+        if 'tabla_amortizacion' not in self.get_deferred_fields():
+            self._firma_tabla = firma_tabla(self.tabla_amortizacion)
     
     def get_absolute_url(self):
         return reverse('documentos:detalle_pagare', kwargs={'pk': self.pk})
@@ -363,34 +448,48 @@ class Pagare(models.Model):
     
     def agregar_cuota(self, numero, fecha, capital, saldo, costo_admon=0, iva_costo_admon=0, 
                      interes=0, iva_interes=0, estado='pendiente', fecha_pago_real=None):
-        """Agrega una cuota a la tabla de amortización"""
+        """Agrega una cuota a la tabla de amortización (importes redondeados a centavos)"""
+        from .amortizacion import a_pesos, centavos
+
         if self.tabla_amortizacion is None:
             self.tabla_amortizacion = []
             
-        total = capital + costo_admon + iva_costo_admon + interes + iva_interes
+        importes = [centavos(valor) for valor in (capital, costo_admon, iva_costo_admon, interes, iva_interes)]
         
         nueva_cuota = {
             "numero": numero,
             "fecha": fecha.isoformat() if isinstance(fecha, date) else fecha,
-            "capital": float(capital),
-            "saldo": float(saldo),
-            "costo_admon": float(costo_admon),
-            "iva_costo_admon": float(iva_costo_admon),
-            "interes": float(interes),
-            "iva_interes": float(iva_interes),
-            "total": float(total),
+            "capital": a_pesos(importes[0]),
+            "saldo": a_pesos(centavos(saldo)),
+            "costo_admon": a_pesos(importes[1]),
+            "iva_costo_admon": a_pesos(importes[2]),
+            "interes": a_pesos(importes[3]),
+            "iva_interes": a_pesos(importes[4]),
+            "total": a_pesos(sum(importes)),
             "estado": estado,
             "fecha_pago_real": fecha_pago_real.isoformat() if fecha_pago_real and isinstance(fecha_pago_real, date) else fecha_pago_real
         }
         
         self.tabla_amortizacion.append(nueva_cuota)
+        # La tabla pasa a ser capturada a mano: save() ya no la regenera
+        self.tabla_amortizacion_huella = ""
         self.save()
         
     def actualizar_estado_cuota(self, numero_cuota, nuevo_estado, fecha_pago_real=None):
-        """Actualiza el estado de una cuota específica"""
+        """Actualiza el estado de una cuota específica.
+        Para varias cuotas o pagarés use documentos.pagos.registrar_pagos (una transacción)."""
         if not self.tabla_amortizacion:
             return False
-            
+
+        if self.pk:
+            # Bloquea el pagaré y solo actualiza la cuota, sin reescribir todas las normalizadas
+            from .pagos import registrar_pagos
+            resultado = registrar_pagos([(self.pk, numero_cuota, nuevo_estado, fecha_pago_real)])
+            if not resultado.ok:
+                return False
+            self.refresh_from_db(fields=['tabla_amortizacion', 'estado', 'fecha_actualizacion'])
+            return True
+
         for i, cuota in enumerate(self.tabla_amortizacion):
             if cuota["numero"] == numero_cuota:
                 self.tabla_amortizacion[i]["estado"] = nuevo_estado
@@ -427,114 +526,49 @@ class Pagare(models.Model):
         ultima_cuota_pagada = max(cuotas_pagadas, key=lambda x: x["numero"])
         return ultima_cuota_pagada["saldo"]
     
-    def generar_tabla_amortizacion_automatica(self):
+    def generar_tabla_amortizacion_automatica(self, ajuste=None, devengo=None):
         """Tabla de amortización (Sistema Francés) con PAGO TOTAL CONSTANTE
-        incluyendo IVA del interés.
-        - La cuota fija 'cuota_base_eff' se calcula con una tasa efectiva i*(1+IVA).
-        - En cada periodo: capital = cuota_base_eff - (interés + IVA_interés).
-        - El Pago Total = cuota_base_eff + gastos + IVA_gastos (constante).
-        - En la última cuota se ajusta capital por redondeos para cerrar saldo=0.00.
+        incluyendo IVA del interés. Las fechas y los días de cada periodo salen
+        de documentos/calendario.py; los importes, en centavos exactos, de
+        documentos/amortizacion.py (calcular_cuotas). Con el devengo 'dias'
+        (`devengo` o DOCUMENTOS_CALENDARIO_DEVENGO) el interés es por días reales
+        sobre base_intereses; `ajuste` toma el lugar de DOCUMENTOS_CALENDARIO_AJUSTE.
         """
-        from datetime import timedelta
-        from dateutil.relativedelta import relativedelta
+        from .amortizacion import a_pesos, calcular_cuotas, normalizar_periodicidad
+        from .calendario import calendario_de_pagos, devengo_configurado
 
         # Requisitos mínimos
         if not all([self.monto_numeric, self.num_pagos, self.tasa_interes_ordinario, self.fecha_emision]):
             return []
 
-        # Parámetros base
-        P = float(self.monto_numeric)
         n = int(self.num_pagos)
-        tasa_anual = float(self.tasa_interes_ordinario) / 100.0
         fecha_inicio = self.fecha_emision
-
-        # Periodicidad -> tasa por periodo y delta de fecha
-        per = (self.periodicidad or "mensual").lower()
-        if per == "quincenal":
-            i = tasa_anual / 24.0
-            delta = timedelta(days=15)
-        elif per == "semanal":
-            i = tasa_anual / 52.0
-            delta = timedelta(weeks=1)
-        else:  # mensual (default)
-            i = tasa_anual / 12.0
-            delta = relativedelta(months=1)
-
-        # IVA
-        IVA = 0.16
-
-        # Gastos por periodo (si guardas TOTAL del crédito, cambia a / n)
-        costo_admon = float(self.gastos_admon) if getattr(self, "gastos_admon", None) else 350.00
-        # Si self.gastos_admon fuera TOTAL del crédito:
-        # costo_admon = (float(self.gastos_admon) / n) if getattr(self, "gastos_admon", None) else 350.00
-        iva_costo_admon = round(costo_admon * IVA, 2)
-
-        # --- CUOTA que incluye IVA del interés ---
-        # Usamos tasa efectiva por periodo: i_eff = i * (1 + IVA)
-        i_eff = i * (1.0 + IVA)
-
-        if i_eff > 0:
-            cuota_base_eff = P * (i_eff * (1 + i_eff) ** n) / ((1 + i_eff) ** n - 1)
-        else:
-            cuota_base_eff = P / n
-
-        # Pago total fijo (incluye gastos + IVA gastos)
-        pago_total_const = round(cuota_base_eff + costo_admon + iva_costo_admon, 2)
+        per = normalizar_periodicidad(self.periodicidad)
+        fechas, dias = calendario_de_pagos(fecha_inicio, n, per, ajuste)
+        if devengo_configurado(devengo) == "periodo":
+            dias = None
+        _, costo_admon, iva_costo_admon, filas = calcular_cuotas(
+            self.monto_numeric, n, self.tasa_interes_ordinario, per, getattr(self, "gastos_admon", None),
+            dias=dias, base=self.base_intereses,
+        )
 
         tabla = []
-        saldo = P
-        residuo_cap = 0.0  # acumula centavos por redondeo
-
-        for k in range(1, n + 1):
-            # Fecha de pago
-            if per == "quincenal":
-                fecha_pago = fecha_inicio + timedelta(days=15 * k)
-            elif per == "semanal":
-                fecha_pago = fecha_inicio + timedelta(weeks=k)
-            else:
-                fecha_pago = fecha_inicio + relativedelta(months=k)
-
-            # Interés del periodo (sin IVA)
-            interes = saldo * i
-            iva_interes = interes * IVA
-
-            # Capital como residuo de la CUOTA EFECTIVA (que ya considera IVA del interés)
-            capital_teorico = cuota_base_eff - (interes + iva_interes)
-            capital = round(capital_teorico, 2)
-            residuo_cap += (capital_teorico - capital)
-
-            # En la última cuota: ajustar capital para cerrar saldo = 0.00 (sin tocar el pago total)
-            if k == n:
-                ajuste = saldo - capital
-                capital = round(capital + ajuste + residuo_cap, 2)
-
-            # Redondeos para la fila
-            interes = round(interes, 2)
-            iva_interes = round(iva_interes, 2)
-
-            # Pago total (constante por diseño)
-            total = pago_total_const
-
-            # Nuevo saldo
-            nuevo_saldo = round(max(0.0, saldo - capital), 2)
-
+        for k, (fecha_pago, (capital, saldo, interes, iva_interes, total)) in enumerate(zip(fechas, filas), start=1):
             tabla.append({
                 "numero": k,
                 "fecha": fecha_pago.strftime("%d/%m/%Y"),
-                "capital": capital,
-                "saldo": nuevo_saldo,
-                "costo_admon": round(costo_admon, 2),
-                "iva_costo_admon": round(iva_costo_admon, 2),
-                "interes": interes,
-                "iva_interes": iva_interes,
-                "total": total,  # constante e incluye IVA del interés
+                "capital": a_pesos(capital),
+                "saldo": a_pesos(saldo),
+                "costo_admon": a_pesos(costo_admon),
+                "iva_costo_admon": a_pesos(iva_costo_admon),
+                "interes": a_pesos(interes),
+                "iva_interes": a_pesos(iva_interes),
+                "total": a_pesos(total),  # constante salvo, por centavos, la última cuota
                 "estado": "pendiente",
                 "fecha_pago_real": None,
                 "etapa": "Etapa de Estudios" if k <= n * 0.8 else "Etapa de Egreso",
             })
 
-            saldo = nuevo_saldo
-
         return tabla
 
         """Genera automáticamente la tabla de amortización basada en los datos del pagaré"""
@@ -631,7 +665,69 @@ class Pagare(models.Model):
         # return tabla
 
 
-class ContratoCredito(models.Model):
+class CuotaAmortizacion(models.Model):
+    """
+    Copia normalizada de una fila de Pagare.tabla_amortizacion.
+
+    La tabla JSON del pagaré sigue siendo la fuente; estas filas se reescriben
+    al guardar el pagaré (ver documentos/cartera.py) para poder agregar saldos,
+    flujos y morosidad de toda la cartera en SQL.
+    """
+    ESTADO_CHOICES = [
+        ('pendiente', 'Pendiente'),
+        ('pagado', 'Pagado'),
+        ('vencido', 'Vencido'),
+    ]
+
+    pagare = models.ForeignKey(Pagare, on_delete=models.CASCADE, related_name='cuotas')
+    numero = models.PositiveIntegerField("Número de cuota")
+    fecha = models.DateField("Fecha de pago", null=True, blank=True)
+    capital = models.DecimalField("Capital", max_digits=12, decimal_places=2, default=0)
+    saldo = models.DecimalField("Saldo insoluto", max_digits=12, decimal_places=2, default=0)
+    costo_admon = models.DecimalField("Costo de administración", max_digits=12, decimal_places=2, default=0)
+    iva_costo_admon = models.DecimalField("IVA del costo de administración", max_digits=12, decimal_places=2, default=0)
+    interes = models.DecimalField("Interés", max_digits=12, decimal_places=2, default=0)
+    iva_interes = models.DecimalField("IVA del interés", max_digits=12, decimal_places=2, default=0)
+    total = models.DecimalField("Pago total", max_digits=12, decimal_places=2, default=0)
+    estado = models.CharField("Estado", max_length=20, default='pendiente')
+    fecha_pago_real = models.DateField("Fecha de pago real", null=True, blank=True)
+
+    class Meta:
+        verbose_name = "Cuota de amortización"
+        verbose_name_plural = "Cuotas de amortización"
+        ordering = ['pagare', 'numero']
+        constraints = [
+            models.UniqueConstraint(fields=['pagare', 'numero'], name='cuota_unica_por_pagare'),
+        ]
+        indexes = [
+            models.Index(fields=['estado', 'fecha'], name='cuota_estado_fecha_idx'),
+        ]
+
+    def __str__(self):
+        return f"Cuota {self.numero} del pagaré #{self.pagare_id}"
+
+
+class EjecucionVencimientos(models.Model):
+    """Bitácora de cada corrida de `manage.py marcar_vencimientos` (ver documentos/vencimientos.py)"""
+    fecha_corte = models.DateField("Fecha de corte")
+    iniciada_en = models.DateTimeField("Iniciada en", default=timezone.now)
+    duracion = models.FloatField("Duración (segundos)", default=0)
+    cuotas_vencidas = models.PositiveIntegerField("Cuotas marcadas como vencidas", default=0)
+    pagares_actualizados = models.PositiveIntegerField("Pagarés con cuotas vencidas", default=0)
+    pagares_vencidos = models.PositiveIntegerField("Pagarés que pasaron a vencido", default=0)
+    simulacion = models.BooleanField("Simulación (sin guardar cambios)", default=False)
+    error = models.TextField("Error", blank=True)
+
+    class Meta:
+        verbose_name = "Ejecución de vencimientos"
+        verbose_name_plural = "Ejecuciones de vencimientos"
+        ordering = ['-iniciada_en']
+
+    def __str__(self):
+        return f"Vencimientos al {self.fecha_corte} ({self.cuotas_vencidas} cuotas)"
+
+
+class ContratoCredito(LiteralesMixin, models.Model):
     # --- Datos Generales del Contrato ---
     fecha_contrato = models.DateField(help_text="Fecha en que se firma el contrato")
     lugar_contrato = models.CharField(max_length=100, default="Ciudad de México")
@@ -691,6 +787,12 @@ class ContratoCredito(models.Model):
     pagos_intereses_fecha3 = models.DateField()
     # Pago de principal
     pago_principal_fecha = models.DateField(help_text="Fecha de pago de principal")  # Cláusula Quinta & Sexta
+
+    # Formas literales (se recalculan al guardar, ver LITERALES)
+    fecha_contrato_texto = models.CharField(max_length=200, blank=True, default="", editable=False)
+    disposicion1_importe_texto = models.CharField(max_length=300, blank=True, default="", editable=False)
+    disposicion2_fecha_texto = models.CharField(max_length=200, blank=True, default="", editable=False)
+    disposicion3_fecha_texto = models.CharField(max_length=200, blank=True, default="", editable=False)
     
     # Tasas de interés
     tasa_interes_ordinaria = models.DecimalField(max_digits=5, decimal_places=2, help_text="Tasa anual (%) de interés ordinario")  # 25%
@@ -733,7 +835,20 @@ class ContratoCredito(models.Model):
         verbose_name = "Contrato de Crédito"
         verbose_name_plural = "Contratos de Crédito"
         ordering = ['-fecha_contrato', '-fecha_creacion']
+        # Listas por usuario, filtros del admin y orden por defecto
+        indexes = [
+            models.Index(fields=['usuario', '-fecha_contrato'], name='credito_usuario_fecha_idx'),
+            models.Index(fields=['estado', '-fecha_contrato'], name='credito_estado_fecha_idx'),
+            models.Index(fields=['-fecha_contrato', '-fecha_creacion'], name='credito_orden_idx'),
+        ]
     
+    LITERALES = {
+        'fecha_contrato_texto': ('fecha_contrato', fecha_en_letra),
+        'disposicion1_importe_texto': ('disposicion1_importe', en_letra_minusculas),
+        'disposicion2_fecha_texto': ('disposicion2_fecha', fecha_en_letra),
+        'disposicion3_fecha_texto': ('disposicion3_fecha', fecha_en_letra),
+    }
+
     def __str__(self):
         return f"Contrato {self.id} - {self.acreditado_razon_social_original} / {self.acreditante_razon_social}"
     
@@ -852,6 +967,12 @@ class ContratoPrendaAcciones(models.Model):
         verbose_name = "Contrato de Prenda sobre Acciones"
         verbose_name_plural = "Contratos de Prenda sobre Acciones"
         ordering = ['-fecha_contrato', '-fecha_creacion']
+        # Listas por usuario, filtros del admin y orden por defecto
+        indexes = [
+            models.Index(fields=['usuario', '-fecha_contrato'], name='prenda_usuario_fecha_idx'),
+            models.Index(fields=['estado', '-fecha_contrato'], name='prenda_estado_fecha_idx'),
+            models.Index(fields=['-fecha_contrato', '-fecha_creacion'], name='prenda_orden_idx'),
+        ]
     
     def __str__(self):
         return f"PrendaAcciones {self.id} – {self.deudor_nombre} / {self.acreedor_nombre}"
@@ -986,6 +1107,12 @@ class ConvenioModificatorio(models.Model):
         verbose_name = "Convenio Modificatorio"
         verbose_name_plural = "Convenios Modificatorios"
         ordering = ['-fecha_convenio', '-fecha_creacion']
+        # Listas por usuario, filtros del admin y orden por defecto
+        indexes = [
+            models.Index(fields=['usuario', '-fecha_convenio'], name='convenio_usuario_fecha_idx'),
+            models.Index(fields=['estado', '-fecha_convenio'], name='convenio_estado_fecha_idx'),
+            models.Index(fields=['-fecha_convenio', '-fecha_creacion'], name='convenio_orden_idx'),
+        ]
     
     def __str__(self):
         return f"Convenio {self.id} – {self.estudiante_nombre} / {self.inversionista_razon_social}"
@@ -0,0 +1,199 @@
+"""
+Registro de pagos de cuotas por lote.
+
+Pagare.actualizar_estado_cuota lee, modifica y guarda la tabla JSON completa
+por cada cuota (y save() reescribe todas sus CuotaAmortizacion), así que un mes
+de pagos de la cartera son miles de escrituras y dos capturas simultáneas sobre
+el mismo pagaré pueden pisarse. registrar_pagos() recibe todos los pagos del
+lote, (pagaré, cuota, estado, fecha_pago_real), y en una sola transacción:
+
+- bloquea los pagarés afectados con select_for_update (en orden de id, para que
+  dos lotes no se bloqueen mutuamente) y los lee una sola vez;
+- aplica todos los cambios de cada pagaré a su tabla JSON en memoria;
+- recalcula una vez por pagaré lo derivado: su estado ('pagado' al liquidar
+  todas las cuotas, 'vencido' si queda alguna vencida), total pagado y saldo;
+- guarda pagarés y cuotas normalizadas con bulk_update (un UPDATE por lote).
+
+El lote es todo o nada: si algún pago es inválido (pagaré ajeno o inexistente,
+cuota que no está en la tabla, estado desconocido) no se guarda ninguno y los
+errores se reportan por posición.
+"""
+
+import time
+from datetime import date, datetime
+
+from django.db import transaction
+from django.utils import timezone
+
+from .cartera import cuotas_de_tabla, materializar_tabla, tabla_del_pagare
+from .models import CuotaAmortizacion, Pagare
+from .vencimientos import ESTADOS_QUE_VENCEN
+
+
+ESTADOS_CUOTA = tuple(valor for valor, _ in CuotaAmortizacion.ESTADO_CHOICES)
+
+
+def _fecha(valor):
+    if valor in (None, ''):
+        return None
+    if isinstance(valor, datetime):
+        return valor.date()
+    if isinstance(valor, date):
+        return valor
+    return date.fromisoformat(str(valor))
+
+
+def _entero(valor):
+    if isinstance(valor, bool):
+        raise ValueError
+    return int(valor)
+
+
+class ResultadoPagos:
+    """Conteos, saldos recalculados y errores de un lote de pagos"""
+
+    def __init__(self, simulacion=False):
+        self.simulacion = simulacion
+        self.pagos = 0
+        self.aplicados = 0
+        self.pagares = 0
+        self.liquidados = 0
+        self.saldos = {}  # pagaré -> {'estado', 'total_pagado', 'saldo_pendiente'}
+        self.errores = []  # (posición en el lote, mensaje)
+        self.duracion = 0.0
+
+    @property
+    def ok(self):
+        return not self.errores
+
+
+def _validar(pagos, resultado):
+    """{pagaré: {cuota: (estado, fecha_pago_real, posición)}} de los pagos bien formados"""
+    hoy = date.today()
+    por_pagare = {}
+    for posicion, pago in enumerate(pagos):
+        resultado.pagos += 1
+        try:
+            pagare_id, numero, estado, fecha_pago_real = pago
+        except (TypeError, ValueError):
+            resultado.errores.append((posicion, 'Se esperaba (pagaré, cuota, estado, fecha_pago_real)'))
+            continue
+        try:
+            pagare_id, numero = _entero(pagare_id), _entero(numero)
+        except (TypeError, ValueError):
+            resultado.errores.append((posicion, 'El pagaré y la cuota deben ser números enteros'))
+            continue
+        if estado not in ESTADOS_CUOTA:
+            resultado.errores.append((posicion, f"Estado '{estado}' inválido: use {', '.join(ESTADOS_CUOTA)}"))
+            continue
+        try:
+            fecha_pago_real = _fecha(fecha_pago_real)
+        except (TypeError, ValueError):
+            resultado.errores.append((posicion, 'fecha_pago_real debe tener el formato AAAA-MM-DD'))
+            continue
+        # Solo una cuota pagada lleva fecha de pago; si no se indica, es la de hoy
+        fecha_pago_real = (fecha_pago_real or hoy) if estado == 'pagado' else None
+        # Si el lote repite una cuota, cuenta el último pago
+        por_pagare.setdefault(pagare_id, {})[numero] = (estado, fecha_pago_real, posicion)
+    return por_pagare
+
+
+def _estado_pagare(pagare, tabla):
+    estados = {fila.get('estado') or 'pendiente' for fila in tabla}
+    if estados == {'pagado'}:
+        return 'pagado'
+    if 'vencido' in estados and pagare.estado in ESTADOS_QUE_VENCEN:
+        return 'vencido'
+    if pagare.estado == 'pagado':
+        # Se revirtió un pago de un pagaré liquidado
+        return 'vencido' if 'vencido' in estados else 'firmado'
+    return pagare.estado
+
+
+def registrar_pagos(pagos, usuario=None, simulacion=False):
+    """
+    Aplica un lote de pagos (pagaré, cuota, estado, fecha_pago_real) en una
+    transacción. Con `usuario`, solo sobre sus pagarés.
+
+    Returns:
+        ResultadoPagos; si tiene errores, no se guardó nada
+    """
+    resultado = ResultadoPagos(simulacion)
+    inicio = time.perf_counter()
+    por_pagare = _validar(pagos, resultado)
+
+    with transaction.atomic():
+        pagares = Pagare.objects.select_for_update().filter(pk__in=por_pagare).order_by('pk')
+        if usuario is not None:
+            pagares = pagares.filter(usuario=usuario)
+        pagares = {pagare.pk: pagare for pagare in pagares}
+
+        for pagare_id, cambios in por_pagare.items():
+            if pagare_id not in pagares:
+                for _, _, posicion in cambios.values():
+                    resultado.errores.append((posicion, f'El pagaré {pagare_id} no existe'))
+                continue
+            if not pagares[pagare_id].tabla_amortizacion:
+                # Se guarda la automática con su huella; una tabla ya guardada no se regenera al pagar
+                materializar_tabla(pagares[pagare_id])
+            tabla = [dict(fila) for fila in tabla_del_pagare(pagares[pagare_id])]
+            filas = {fila.get('numero') or posicion: fila for posicion, fila in enumerate(tabla, start=1)}
+            for numero, (estado, fecha_pago_real, posicion) in cambios.items():
+                if numero not in filas:
+                    resultado.errores.append((posicion, f'El pagaré {pagare_id} no tiene la cuota {numero}'))
+                    continue
+                filas[numero]['estado'] = estado
+                filas[numero]['fecha_pago_real'] = fecha_pago_real.isoformat() if fecha_pago_real else None
+                resultado.aplicados += 1
+            pagares[pagare_id].tabla_amortizacion = tabla
+
+        if resultado.errores:
+            resultado.aplicados = 0
+            resultado.errores.sort()
+            resultado.duracion = time.perf_counter() - inicio
+            return resultado
+
+        # Derivados: una vez por pagaré, con la tabla ya actualizada en memoria
+        ahora = timezone.now()
+        for pagare in pagares.values():
+            estado = _estado_pagare(pagare, pagare.tabla_amortizacion)
+            if estado == 'pagado' and pagare.estado != 'pagado':
+                resultado.liquidados += 1
+            pagare.estado = estado
+            pagare.fecha_actualizacion = ahora
+            resultado.saldos[pagare.pk] = {
+                'estado': estado,
+                'total_pagado': round(pagare.calcular_total_pagado(), 2),
+                'saldo_pendiente': pagare.calcular_saldo_pendiente(),
+            }
+        resultado.pagares = len(pagares)
+
+        if not simulacion:
+            _guardar(list(pagares.values()), por_pagare)
+
+    resultado.duracion = time.perf_counter() - inicio
+    return resultado
+
+
+def _guardar(pagares, por_pagare):
+    # bulk_update no pasa por Pagare.save(): las cuotas normalizadas se actualizan aquí mismo
+    Pagare.objects.bulk_update(
+        pagares, ['tabla_amortizacion', 'tabla_amortizacion_huella', 'estado', 'fecha_actualizacion'],
+    )
+
+    cuotas = list(CuotaAmortizacion.objects.filter(pagare__in=pagares).only('id', 'pagare_id', 'numero'))
+    sincronizados = {cuota.pagare_id for cuota in cuotas}
+    actualizadas = []
+    for cuota in cuotas:
+        cambio = por_pagare[cuota.pagare_id].get(cuota.numero)
+        if cambio:
+            cuota.estado, cuota.fecha_pago_real, _ = cambio
+            actualizadas.append(cuota)
+    CuotaAmortizacion.objects.bulk_update(actualizadas, ['estado', 'fecha_pago_real'], batch_size=1000)
+
+    # Pagarés cuyas cuotas aún no se habían normalizado (anteriores a sincronizar_cuotas)
+    nuevas = []
+    for pagare in pagares:
+        if pagare.pk not in sincronizados:
+            nuevas.extend(cuotas_de_tabla(pagare, pagare.tabla_amortizacion))
+    CuotaAmortizacion.objects.bulk_create(nuevas, batch_size=1000)
@@ -0,0 +1,341 @@
+"""
+Paquete de cierre: varios documentos de un mismo financiamiento en una sola descarga.
+
+Un cierre suele necesitar el Contrato de Crédito, uno o varios Pagarés, el
+Contrato de Prenda, el Convenio Modificatorio y el Acta de Consejo que los
+autoriza. construir_paquete() recibe esos registros, los genera (en procesos
+si se piden varios trabajadores, como convertir_plantillas_html) y regresa un ZIP con el DOCX y
+el PDF de cada documento, un PDF combinado con todos ellos (requiere pypdf) y
+un manifiesto.
+
+Cada documento se genera una sola vez: el PDF se obtiene del mismo DOCX que
+va al ZIP (o del motor nativo para actas y pagarés, ver pdf_nativo.motor_pdf). Los
+registros se cargan con una consulta por tipo antes de repartir el trabajo,
+los procesos heredan los templates ya compilados (ver documentos.plantillas)
+y las fechas y montos en letra se memorizan por proceso (ver
+documentos.formatting).
+
+Las partes (acreedor, deudor, acreditante, sociedad...) se repiten entre los
+documentos de un cierre, cada modelo con sus propios campos. resolver_partes()
+las reúne una sola vez en el proceso principal, identificando cada parte por su
+nombre normalizado, y a cada documento le pasa los datos que le faltan
+(domicilio, RFC, representante) tomados de los otros documentos del paquete;
+los procesos reciben esos datos ya resueltos junto con el registro.
+"""
+
+import copy
+import json
+import re
+import time
+import unicodedata
+import zipfile
+from concurrent.futures import ProcessPoolExecutor
+from io import BytesIO
+
+from django.conf import settings
+from django.db import connections
+
+from .descargas import archivo_temporal
+from .docx_contrato_credito_generator import generar_docx_contrato_credito
+from .docx_convenio_generator import generar_docx_convenio_modificatorio
+from .docx_estatutos_generator import generar_docx_estatutos_sociedad
+from .docx_prenda_generator import generar_docx_prenda
+from .estatutos_sociedad import EstatutosSociedad
+from .models import ActaAsamblea, ActaSesionConsejo, ContratoCredito, ContratoPrendaAcciones, ConvenioModificatorio, Pagare
+from .pdf_generator import (
+    convertir_docx_a_pdf, generar_docx_acta_asamblea, generar_docx_acta_consejo, generar_docx_pagare,
+    generar_pdf_nativo_acta_asamblea, generar_pdf_nativo_acta_consejo, generar_pdf_pagare,
+)
+from .pdf_nativo import motor_pdf
+
+# pypdf (requirements.txt) une los PDF; si no está instalado el ZIP lleva solo los PDF individuales
+try:
+    from pypdf import PdfWriter
+    PYPDF_AVAILABLE = True
+except ImportError:
+    PYPDF_AVAILABLE = False
+
+
+NOMBRE_PDF_COMBINADO = 'paquete_cierre.pdf'
+
+# Partes de cada tipo de documento: {rol: {dato: campo del modelo}}; 'nombre' identifica a la parte
+PARTES_POR_TIPO = {
+    'acta_consejo': {'sociedad': {'nombre': 'razon_social'}},
+    'acta_asamblea': {'sociedad': {'nombre': 'razon_social'}},
+    'contrato_credito': {
+        'acreditante': {
+            'nombre': 'acreditante_razon_social', 'representante': 'acreditante_representante',
+            'domicilio': 'domicilio_acreditante',
+        },
+        'acreditado': {'nombre': 'acreditado_razon_social_original', 'domicilio': 'domicilio_acreditado'},
+    },
+    'pagare': {
+        'acreedor': {'nombre': 'acreedor_nombre', 'domicilio': 'acreedor_domicilio', 'rfc': 'acreedor_rfc'},
+        'deudor': {
+            'nombre': 'deudor_nombre', 'domicilio': 'deudor_domicilio', 'rfc': 'deudor_rfc',
+            'representante': 'deudor_representante',
+        },
+    },
+    'contrato_prenda': {
+        'deudor': {'nombre': 'deudor_nombre', 'representante': 'deudor_representante', 'domicilio': 'domicilio_deudor'},
+        'acreedor': {'nombre': 'acreedor_nombre', 'domicilio': 'domicilio_acreedor'},
+    },
+    'convenio_modificatorio': {
+        'inversionista': {'nombre': 'inversionista_razon_social', 'representante': 'inversionista_representante'},
+        'estudiante': {'nombre': 'estudiante_nombre', 'rfc': 'estudiante_rfc'},
+    },
+}
+
+
+class TipoPaquete:
+    """Cómo se carga, se nombra y se genera un tipo de documento dentro del paquete"""
+
+    __slots__ = ('tipo', 'modelo', 'campo_fecha', 'generar_docx', 'generar_pdf_nativo')
+
+    def __init__(self, tipo, modelo, campo_fecha, generar_docx, generar_pdf_nativo=None):
+        self.tipo = tipo
+        self.modelo = modelo
+        self.campo_fecha = campo_fecha
+        self.generar_docx = generar_docx
+        self.generar_pdf_nativo = generar_pdf_nativo
+
+    def nombre(self, obj):
+        """Nombre base de los archivos, igual al de las descargas individuales"""
+        fecha = getattr(obj, self.campo_fecha, None)
+        return f'{self.tipo}_{obj.pk}_{fecha.strftime("%Y%m%d") if fecha else "sin_fecha"}'
+
+
+# En el orden en que aparecen en el ZIP y en el PDF combinado
+TIPOS_PAQUETE = {
+    tipo.tipo: tipo for tipo in (
+        TipoPaquete('acta_consejo', ActaSesionConsejo, 'fecha', generar_docx_acta_consejo, generar_pdf_nativo_acta_consejo),
+        TipoPaquete('acta_asamblea', ActaAsamblea, 'fecha', generar_docx_acta_asamblea, generar_pdf_nativo_acta_asamblea),
+        TipoPaquete('contrato_credito', ContratoCredito, 'fecha_contrato', generar_docx_contrato_credito),
+        TipoPaquete('pagare', Pagare, 'fecha_emision', generar_docx_pagare, generar_pdf_pagare),
+        TipoPaquete('contrato_prenda', ContratoPrendaAcciones, 'fecha_contrato', generar_docx_prenda),
+        TipoPaquete('convenio_modificatorio', ConvenioModificatorio, 'fecha_convenio', generar_docx_convenio_modificatorio),
+        TipoPaquete('estatutos_sociedad', EstatutosSociedad, 'fecha_creacion', generar_docx_estatutos_sociedad),
+    )
+}
+
+
+def documentos_del_paquete(usuario, seleccion):
+    """
+    Carga los registros seleccionados del usuario con una consulta por tipo.
+
+    Args:
+        seleccion: diccionario {tipo: [pk, ...]}
+
+    Returns:
+        lista de (TipoPaquete, registro) en el orden de TIPOS_PAQUETE
+
+    Raises:
+        KeyError si un tipo no es parte del paquete; Modelo.DoesNotExist si
+        algún registro no existe o no es del usuario
+    """
+    documentos = []
+    for tipo, pks in seleccion.items():
+        if tipo not in TIPOS_PAQUETE:
+            raise KeyError(f"'{tipo}' no es un tipo de documento del paquete de cierre")
+    for tipo, tipo_paquete in TIPOS_PAQUETE.items():
+        pks = {int(pk) for pk in seleccion.get(tipo, ())}
+        if not pks:
+            continue
+        registros = list(tipo_paquete.modelo.objects.filter(usuario=usuario, pk__in=pks).order_by('pk'))
+        if len(registros) != len(pks):
+            faltantes = pks - {registro.pk for registro in registros}
+            raise tipo_paquete.modelo.DoesNotExist(
+                f"No se encontraron los registros {sorted(faltantes)} de '{tipo}'"
+            )
+        documentos.extend((tipo_paquete, registro) for registro in registros)
+    return documentos
+
+
+def _clave_parte(nombre):
+    """Nombre normalizado: sin acentos, puntuación ni mayúsculas ('Finanzas, S.A.P.I.' == 'FINANZAS SAPI')"""
+    nombre = unicodedata.normalize('NFKD', str(nombre)).encode('ascii', 'ignore').decode()
+    return ' '.join(re.sub(r'[^\w\s]', '', nombre).casefold().split())
+
+
+def _vacio(valor):
+    return valor is None or not str(valor).strip()
+
+
+def resolver_partes(documentos):
+    """
+    Reúne una sola vez las partes de todos los documentos del paquete.
+
+    Cada dato de una parte (domicilio, RFC, representante) toma el primer valor
+    no vacío en el orden del paquete; a cada documento le corresponden solo los
+    datos que tiene vacíos, así que lo capturado en cada registro no cambia.
+
+    Returns:
+        (partes, completar): las partes para el manifiesto y, por documento
+        (en el orden de `documentos`), el diccionario {campo: valor} a completar
+    """
+    partes = {}
+    for tipo_paquete, obj in documentos:
+        for rol, campos in PARTES_POR_TIPO.get(tipo_paquete.tipo, {}).items():
+            nombre = getattr(obj, campos['nombre'], None)
+            if _vacio(nombre):
+                continue
+            parte = partes.setdefault(_clave_parte(nombre), {'nombre': nombre, 'documentos': []})
+            parte['documentos'].append(f'{tipo_paquete.nombre(obj)} ({rol})')
+            for dato, campo in campos.items():
+                valor = getattr(obj, campo, None)
+                if dato != 'nombre' and dato not in parte and not _vacio(valor):
+                    parte[dato] = valor
+
+    completar = []
+    for tipo_paquete, obj in documentos:
+        faltantes = {}
+        for campos in PARTES_POR_TIPO.get(tipo_paquete.tipo, {}).values():
+            nombre = getattr(obj, campos['nombre'], None)
+            parte = None if _vacio(nombre) else partes[_clave_parte(nombre)]
+            for dato, campo in campos.items():
+                if parte and dato in parte and _vacio(getattr(obj, campo, None)):
+                    faltantes[campo] = parte[dato]
+        completar.append(faltantes)
+    return list(partes.values()), completar
+
+
+def _generar_documento(tipo, obj, datos_partes=None):
+    """
+    DOCX y PDF de un documento como bytes; corre en un proceso del pool (o en
+    línea con un solo trabajador). `datos_partes` son los campos vacíos del
+    registro ya resueltos por resolver_partes() en el proceso principal.
+    """
+    tipo_paquete = TIPOS_PAQUETE[tipo]
+    if datos_partes:
+        obj = copy.copy(obj)  # No tocar el registro del proceso principal
+        for campo, valor in datos_partes.items():
+            setattr(obj, campo, valor)
+    with tipo_paquete.generar_docx(obj) as docx:
+        if tipo_paquete.generar_pdf_nativo and motor_pdf(tipo) == 'nativo':
+            pdf = tipo_paquete.generar_pdf_nativo(obj)
+        else:
+            pdf = convertir_docx_a_pdf(docx)
+        with pdf:
+            docx.seek(0)
+            return docx.read(), pdf.read()
+
+
+def _agregar_al_zip(paquete, nombre, contenido, compresion=zipfile.ZIP_DEFLATED):
+    entrada = zipfile.ZipInfo(nombre, date_time=time.localtime()[:6])
+    entrada.compress_type = compresion
+    paquete.writestr(entrada, contenido)
+
+
+def _pdf_combinado(pdfs):
+    """Une los PDF en uno solo, en el orden recibido"""
+    combinado = PdfWriter()
+    for pdf in pdfs:
+        combinado.append(BytesIO(pdf))
+    archivo = archivo_temporal()
+    combinado.write(archivo)
+    archivo.seek(0)
+    return archivo
+
+
+# Conexiones a la base heredadas del proceso principal (ver _iniciar_trabajador)
+_conexiones_heredadas = []
+
+
+def _iniciar_trabajador():
+    """
+    Inicializador de cada proceso del pool. Las conexiones heredadas comparten el
+    socket con las del proceso principal, que pueden estar a mitad de una petición
+    o de una transacción: el hijo no las usa ni las cierra (cerrarlas cerraría
+    también las del principal), solo conserva la referencia para que no se
+    finalicen, y si consulta la base abre las suyas.
+    """
+    for conexion in connections.all(initialized_only=True):
+        if conexion.connection is not None:
+            _conexiones_heredadas.append(conexion.connection)
+            conexion.connection = None
+
+
+def _resultados(documentos, completar, trabajadores):
+    """
+    Generador de (resultado, error) en el orden de `documentos`. Con más de un
+    trabajador reparte los documentos en procesos: la generación es CPU en Python
+    y los hilos no avanzan en paralelo por el GIL.
+    """
+    if trabajadores <= 1:
+        for (tipo_paquete, obj), datos_partes in zip(documentos, completar):
+            try:
+                yield _generar_documento(tipo_paquete.tipo, obj, datos_partes), None
+            except Exception as e:
+                yield None, e
+        return
+
+    with ProcessPoolExecutor(max_workers=trabajadores, initializer=_iniciar_trabajador) as executor:
+        futuros = [
+            executor.submit(_generar_documento, tipo_paquete.tipo, obj, datos_partes)
+            for (tipo_paquete, obj), datos_partes in zip(documentos, completar)
+        ]
+        for futuro in futuros:
+            try:
+                yield futuro.result(), None
+            except Exception as e:
+                yield None, e
+
+
+def construir_paquete(documentos, trabajadores=None):
+    """
+    Genera todos los documentos (en paralelo si hay más de un trabajador) y los empaqueta.
+
+    Args:
+        documentos: lista de (TipoPaquete, registro), ver documentos_del_paquete
+        trabajadores: procesos de generación (por defecto DOCUMENTOS_PAQUETE_TRABAJADORES,
+            o 1: en el mismo proceso, sin levantar un pool por petición web)
+
+    Returns:
+        (archivo temporal con el ZIP posicionado al inicio, manifiesto); los
+        documentos que no se pudieron generar y los avisos (p. ej. pypdf no
+        instalado) quedan en el manifiesto, que también va en el ZIP
+    """
+    if trabajadores is None:
+        trabajadores = getattr(settings, 'DOCUMENTOS_PAQUETE_TRABAJADORES', None) or 1
+    trabajadores = max(1, min(trabajadores, len(documentos)))
+
+    partes, completar = resolver_partes(documentos)
+    manifiesto = {'documentos': [], 'partes': partes, 'pdf_combinado': None, 'avisos': []}
+    pdfs = []
+    archivo = archivo_temporal()
+    with zipfile.ZipFile(archivo, 'w', compression=zipfile.ZIP_DEFLATED) as paquete:
+        # En el orden del paquete para que el ZIP y el PDF combinado sean estables
+        resultados = _resultados(documentos, completar, trabajadores)
+        for (tipo_paquete, obj), datos_partes, (resultado, error) in zip(documentos, completar, resultados):
+            nombre = tipo_paquete.nombre(obj)
+            entrada = {'tipo': tipo_paquete.tipo, 'id': obj.pk, 'descripcion': str(obj)}
+            if datos_partes:
+                entrada['datos_de_partes'] = sorted(datos_partes)
+            if error is not None:
+                print(f"DEBUG: Error generando {nombre} para el paquete: {error}")
+                entrada['error'] = str(error)
+                manifiesto['documentos'].append(entrada)
+                continue
+
+            docx, pdf = resultado
+            # El DOCX ya es un ZIP comprimido: se guarda tal cual
+            _agregar_al_zip(paquete, f'docx/{nombre}.docx', docx, zipfile.ZIP_STORED)
+            _agregar_al_zip(paquete, f'pdf/{nombre}.pdf', pdf)
+            pdfs.append(pdf)
+            entrada.update({'docx': f'docx/{nombre}.docx', 'pdf': f'pdf/{nombre}.pdf'})
+            manifiesto['documentos'].append(entrada)
+
+        if pdfs and PYPDF_AVAILABLE:
+            with _pdf_combinado(pdfs) as combinado:
+                _agregar_al_zip(paquete, NOMBRE_PDF_COMBINADO, combinado.read())
+            manifiesto['pdf_combinado'] = NOMBRE_PDF_COMBINADO
+        elif pdfs:
+            manifiesto['avisos'].append('PDF combinado no disponible: pypdf no está instalado (ver requirements.txt)')
+        errores = sum(1 for entrada in manifiesto['documentos'] if 'error' in entrada)
+        if errores:
+            manifiesto['avisos'].append(f'{errores} documento(s) no se pudieron generar; ver su campo "error"')
+
+        paquete.writestr('manifiesto.json', json.dumps(manifiesto, ensure_ascii=False, indent=2))
+
+    archivo.seek(0)
+    return archivo, manifiesto
@@ -1,13 +1,14 @@
 import json
 import os
+from datetime import datetime
 from io import BytesIO
 from .estatutos_sociedad import EstatutosSociedad
 from .models import ActaAsamblea, ActaSesionConsejo, Pagare, ContratoCredito, ContratoPrendaAcciones, ConvenioModificatorio
 from .forms_estatutos_fixed import EstatutosSociedadForm
-from .docx_estatutos_generator import descargar_docx_estatutos_sociedad
-from .docx_convenio_generator import descargar_docx_convenio_modificatorio
+from .docx_contrato_credito_generator import generar_docx_contrato_credito
+from .docx_estatutos_generator import generar_docx_estatutos_sociedad
+from .docx_convenio_generator import generar_docx_convenio_modificatorio
 from .docx_prenda_generator import generar_docx_prenda
-from django.http import HttpResponse
 from django.shortcuts import get_object_or_404, redirect
 from django.contrib import messages
 from django.contrib.auth.decorators import login_required
@@ -16,20 +17,18 @@ from django.conf import settings
 
 # ReportLab imports
 from reportlab.lib.pagesizes import A4, letter
-from reportlab.lib.styles import getSampleStyleSheet, ParagraphStyle
 from reportlab.lib.units import inch, cm, mm
-from reportlab.lib.enums import TA_CENTER, TA_JUSTIFY, TA_LEFT
 from reportlab.platypus import (
     SimpleDocTemplate,
     Paragraph,
     Spacer,
     Table,
+    LongTable,
     TableStyle,
     HRFlowable,
     PageBreak,
 )
 from reportlab.lib import colors
-from num2words import num2words
 
 # DOCX imports
 try:
@@ -55,21 +54,28 @@ try:
 except ImportError:
     DOC_AVAILABLE = False
 
+from .cartera import tabla_del_pagare
+from .condicional import descarga_condicional
+from .descargas import archivo_temporal, copiar_a_temporal, guardar_docx, respuesta_docx, respuesta_pdf
 from .docx_blocks import build_ordenes_con_resoluciones, inject_ordenes_y_resoluciones
-
-
-def to_roman(num):
-    """Convierte un número entero a numeración romana"""
-    val = [1000, 900, 500, 400, 100, 90, 50, 40, 10, 9, 5, 4, 1]
-    syms = ["M", "CM", "D", "CD", "C", "XC", "L", "XL", "X", "IX", "V", "IV", "I"]
-    roman = ''
-    i = 0
-    while num > 0:
-        for _ in range(num // val[i]):
-            roman += syms[i]
-            num -= val[i]
-        i += 1
-    return roman
+from .docx_reemplazos import reemplazar_en_documento
+from .formatting import formatear_fecha, to_roman
+from .mapeos import construir_contexto
+from .pdf_styles import estilo, estilo_tabla_amortizacion, estilo_tabla_firmas, fuente_legal
+from .pdf_nativo import bloque_ordenes_y_resoluciones, motor_pdf, renderizar_docx_a_pdf
+from .docx_tablas import agregar_filas, aplicar_cuadricula, fila_plantilla, paginar_tabla, quitar_filas
+
+from .plantillas import abrir_plantilla, plantilla_compilada, ruta_plantilla
+
+# Templates DOCX de actas
+RUTA_PLANTILLA_CONSEJO = ruta_plantilla('acta_consejo')
+RUTA_PLANTILLA_ASAMBLEA = ruta_plantilla('acta_asamblea')
+
+# Texto que precede al desarrollo de los puntos del orden del día
+TEXTO_CONSTANTE_CONSEJO = "Los señores consejeros después de escuchar el orden del día antes transcrito procedieron a discutir ampliamente todos y cada uno de los asuntos contenidos en el mismo, desahogándose de la siguiente manera:"
+TEXTO_CONSTANTE_ASAMBLEA = (
+    "Los Asambleístas después de escuchar el Orden del Día antes trascrito y de haberlo aprobado por unanimidad, procedieron a discutir ampliamente todos y cada uno de los asuntos contenidos en el mismo, como sigue:"
+)
 
 
 def generar_pdf_acta_consejo(acta):
@@ -83,34 +89,13 @@ def generar_pdf_acta_consejo(acta):
         bottomMargin=2*cm
     )
 
-    # Definir estilos
-    styles = getSampleStyleSheet()
-    title_style = ParagraphStyle(
-        'CustomTitle', parent=styles['Heading1'], alignment=TA_CENTER,
-        fontSize=14, fontName='Times-Bold', spaceBefore=6, spaceAfter=6
-    )
-    normal_style = ParagraphStyle(
-        'CustomNormal', parent=styles['Normal'], alignment=TA_JUSTIFY,
-        fontSize=11, fontName='Times-Roman', leading=16, spaceAfter=12
-    )
-    section_title_style = ParagraphStyle(
-        'SectionTitle', parent=styles['Heading2'], alignment=TA_CENTER,
-        fontSize=12, fontName='Times-Bold', spaceBefore=12, spaceAfter=12
-    )
-    agenda_item_style = ParagraphStyle(
-        'AgendaItem', parent=styles['Normal'], alignment=TA_LEFT,
-        fontSize=11, fontName='Times-Roman',
-        leftIndent=1.5*cm, firstLineIndent=-0.5*cm,
-        spaceBefore=8, spaceAfter=8
-    )
-    resolution_title_style = ParagraphStyle(
-        'ResolutionTitle', parent=styles['Normal'], alignment=TA_CENTER,
-        fontSize=11, fontName='Times-Bold', spaceBefore=12, spaceAfter=6
-    )
-    resolution_text_style = ParagraphStyle(
-        'ResolutionText', parent=styles['Normal'], alignment=TA_JUSTIFY,
-        fontSize=11, fontName='Times-Roman', leftIndent=2*cm, spaceAfter=8
-    )
+    # Estilos compartidos (se construyen una sola vez por proceso)
+    title_style = estilo('consejo_titulo')
+    normal_style = estilo('consejo_normal')
+    section_title_style = estilo('consejo_seccion')
+    agenda_item_style = estilo('consejo_orden')
+    resolution_title_style = estilo('consejo_resolucion_titulo')
+    resolution_text_style = estilo('consejo_resolucion_texto')
 
     story = []
 
@@ -119,9 +104,7 @@ def generar_pdf_acta_consejo(acta):
     story.append(Paragraph(acta.razon_social.upper(), title_style))
 
     # Fecha
-    meses = {1: "enero", 2: "febrero", 3: "marzo", 4: "abril", 5: "mayo", 6: "junio",
-             7: "julio", 8: "agosto", 9: "septiembre", 10: "octubre", 11: "noviembre", 12: "diciembre"}
-    fecha = f"{acta.fecha.day} de {meses[acta.fecha.month]} de {acta.fecha.year}"
+    fecha = formatear_fecha(acta.fecha, relleno=False)
     story.append(Paragraph(f"DEL DÍA {fecha.upper()}", title_style))
     story.append(Spacer(1, 12))
 
@@ -226,7 +209,7 @@ def generar_pdf_acta_consejo(acta):
     firma_tbl = Table(firma_data, colWidths=[7*cm, 7*cm], hAlign='CENTER')
     firma_tbl.setStyle(TableStyle([
         ('ALIGN', (0,0), (-1,-1), 'CENTER'),
-        ('FONTNAME', (1,1), (-1,-1), 'Times-Roman'),
+        ('FONTNAME', (1,1), (-1,-1), fuente_legal()['normal']),
         ('FONTSIZE', (0,0), (-1,-1), 11),
         ('TOPPADDING', (1,1), (-1,-1), 6)
     ]))
@@ -239,9 +222,41 @@ def generar_pdf_acta_consejo(acta):
     return pdf
 
 
+ENCABEZADO_AMORTIZACION_PDF = ['No.', 'Fecha', 'Capital', 'Intereses', 'Total', 'Saldo']
+ANCHOS_AMORTIZACION_PDF = [1*cm, 2.5*cm, 2.5*cm, 2.5*cm, 2.5*cm, 2.5*cm]
+
+
+def tabla_amortizacion_pdf(cuotas):
+    """
+    Tabla de amortización completa como LongTable: ReportLab la parte fila por
+    fila entre páginas y repite el encabezado en cada una, de modo que soporta
+    calendarios largos (p. ej. 360 cuotas mensuales) sin calcular todo el
+    layout de una sola vez.
+    """
+    tabla_data = [ENCABEZADO_AMORTIZACION_PDF]
+    tabla_data.extend(
+        [
+            str(cuota['numero']),
+            cuota['fecha'][:10] if isinstance(cuota['fecha'], str) else str(cuota['fecha']),
+            f"${cuota['capital']:,.2f}",
+            f"${cuota['interes']:,.2f}",
+            f"${cuota['total']:,.2f}",
+            f"${cuota['saldo']:,.2f}",
+        ]
+        for cuota in cuotas
+    )
+    tabla = LongTable(tabla_data, colWidths=ANCHOS_AMORTIZACION_PDF, repeatRows=1, splitByRow=1)
+    tabla.setStyle(estilo_tabla_amortizacion())
+    return tabla
+
+
 def generar_pdf_pagare(pagare):
-    """Genera PDF para Pagaré con formato legal profesional"""
-    buffer = BytesIO()
+    """
+    Genera PDF para Pagaré con formato legal profesional directamente con
+    ReportLab (motor 'nativo' del pagaré), con la tabla de amortización completa
+    paginada. Regresa un archivo temporal posicionado al inicio.
+    """
+    buffer = archivo_temporal()
     
     # Configurar documento con márgenes específicos
     doc = SimpleDocTemplate(
@@ -253,49 +268,11 @@ def generar_pdf_pagare(pagare):
         bottomMargin=2*cm
     )
     
-    # Crear estilos personalizados
-    styles = getSampleStyleSheet()
-    
-    # Estilo para título principal (centrado, negrita, 14pt)
-    title_style = ParagraphStyle(
-        'PagareTitle',
-        parent=styles['Heading1'],
-        fontSize=14,
-        spaceAfter=20,
-        alignment=TA_CENTER,
-        fontName='Times-Bold'
-    )
-    
-    # Estilo para subtítulos (centrado, negrita, 12pt)
-    subtitle_style = ParagraphStyle(
-        'PagareSubtitle',
-        parent=styles['Heading2'],
-        fontSize=12,
-        spaceAfter=12,
-        alignment=TA_CENTER,
-        fontName='Times-Bold'
-    )
-    
-    # Estilo para párrafos justificados (11pt)
-    justified_style = ParagraphStyle(
-        'PagareJustified',
-        parent=styles['Normal'],
-        fontSize=11,
-        spaceAfter=12,
-        alignment=TA_JUSTIFY,
-        fontName='Times-Roman',
-        leading=14
-    )
-    
-    # Estilo para texto centrado
-    center_style = ParagraphStyle(
-        'PagareCenter',
-        parent=styles['Normal'],
-        fontSize=11,
-        spaceAfter=12,
-        alignment=TA_CENTER,
-        fontName='Times-Roman'
-    )
+    # Estilos compartidos (se construyen una sola vez por proceso)
+    title_style = estilo('pagare_titulo')
+    subtitle_style = estilo('pagare_subtitulo')
+    justified_style = estilo('pagare_justificado')
+    center_style = estilo('pagare_centrado')
     
     story = []
     
@@ -305,16 +282,7 @@ def generar_pdf_pagare(pagare):
     story.append(Spacer(1, 20))
     
     # Lugar y fecha de emisión
-    lugar_fecha = f"{pagare.lugar_emision}, {pagare.fecha_emision.strftime('%d de %B de %Y')}"
-    # Convertir mes a español
-    meses = {
-        'January': 'enero', 'February': 'febrero', 'March': 'marzo',
-        'April': 'abril', 'May': 'mayo', 'June': 'junio',
-        'July': 'julio', 'August': 'agosto', 'September': 'septiembre',
-        'October': 'octubre', 'November': 'noviembre', 'December': 'diciembre'
-    }
-    for eng, esp in meses.items():
-        lugar_fecha = lugar_fecha.replace(eng, esp)
+    lugar_fecha = f"{pagare.lugar_emision}, {formatear_fecha(pagare.fecha_emision)}"
     
     story.append(Paragraph(lugar_fecha, center_style))
     story.append(Spacer(1, 20))
@@ -376,38 +344,21 @@ def generar_pdf_pagare(pagare):
         story.append(Paragraph(garantia_texto, justified_style))
         story.append(Spacer(1, 15))
     
-    # TABLA DE AMORTIZACIÓN (si existe)
-    if pagare.tabla_amortizacion:
+    # TABLA DE AMORTIZACIÓN (la guardada o la automática, como en el DOCX)
+    cuotas = tabla_del_pagare(pagare)
+    if cuotas:
         story.append(Paragraph("TABLA DE AMORTIZACIÓN", subtitle_style))
         
-        # Crear tabla con los pagos
-        tabla_data = [['No.', 'Fecha', 'Capital', 'Intereses', 'Total', 'Saldo']]
-        
+        # Todas las cuotas; la LongTable se parte por páginas repitiendo el encabezado
         try:
-            cuotas = pagare.obtener_cuotas()
-            for cuota in cuotas[:10]:  # Mostrar máximo 10 cuotas en PDF
-                tabla_data.append([
-                    str(cuota['numero']),
-                    cuota['fecha'][:10] if isinstance(cuota['fecha'], str) else str(cuota['fecha']),
-                    f"${cuota['capital']:,.2f}",
-                    f"${cuota['interes']:,.2f}",
-                    f"${cuota['total']:,.2f}",
-                    f"${cuota['saldo']:,.2f}"
-                ])
-        except:
-            tabla_data.append(['1', '[FECHA]', '[CAPITAL]', '[INTERESES]', '[TOTAL]', '[SALDO]'])
-        
-        tabla = Table(tabla_data, colWidths=[1*cm, 2.5*cm, 2.5*cm, 2.5*cm, 2.5*cm, 2.5*cm])
-        tabla.setStyle(TableStyle([
-            ('BACKGROUND', (0, 0), (-1, 0), colors.grey),
-            ('TEXTCOLOR', (0, 0), (-1, 0), colors.whitesmoke),
-            ('ALIGN', (0, 0), (-1, -1), 'CENTER'),
-            ('FONTNAME', (0, 0), (-1, 0), 'Times-Bold'),
-            ('FONTSIZE', (0, 0), (-1, -1), 9),
-            ('BOTTOMPADDING', (0, 0), (-1, 0), 12),
-            ('BACKGROUND', (0, 1), (-1, -1), colors.beige),
-            ('GRID', (0, 0), (-1, -1), 1, colors.black)
-        ]))
+            tabla = tabla_amortizacion_pdf(sorted(cuotas, key=lambda cuota: cuota['numero']))
+        except (KeyError, TypeError, ValueError) as e:
+            print(f"DEBUG: Error al construir tabla de amortización PDF: {e}")
+            tabla = LongTable(
+                [ENCABEZADO_AMORTIZACION_PDF, ['1', '[FECHA]', '[CAPITAL]', '[INTERESES]', '[TOTAL]', '[SALDO]']],
+                colWidths=ANCHOS_AMORTIZACION_PDF, repeatRows=1
+            )
+            tabla.setStyle(estilo_tabla_amortizacion())
         story.append(tabla)
         story.append(Spacer(1, 15))
     
@@ -444,14 +395,7 @@ def generar_pdf_pagare(pagare):
         firmas_data.append(["AVAL", ""])
     
     firmas_table = Table(firmas_data, colWidths=[8*cm, 8*cm])
-    firmas_table.setStyle(TableStyle([
-        ('ALIGN', (0, 0), (-1, -1), 'CENTER'),
-        ('VALIGN', (0, 0), (-1, -1), 'MIDDLE'),
-        ('FONTNAME', (0, 0), (-1, -1), 'Times-Roman'),
-        ('FONTSIZE', (0, 0), (-1, -1), 10),
-        ('TOPPADDING', (0, 0), (-1, -1), 12),
-        ('BOTTOMPADDING', (0, 0), (-1, -1), 12),
-    ]))
+    firmas_table.setStyle(estilo_tabla_firmas())
     
     story.append(firmas_table)
     story.append(Spacer(1, 20))
@@ -461,42 +405,32 @@ def generar_pdf_pagare(pagare):
     
     # Construir PDF
     doc.build(story)
-    pdf = buffer.getvalue()
-    buffer.close()
-    return pdf
+    buffer.seek(0)
+    return buffer
 
 
 @login_required
+@descarga_condicional(Pagare, 'pagare', 'pdf')
 def descargar_pdf_pagare(request, pk):
-    """Vista para descargar PDF de Pagaré - Convierte DOCX a PDF"""
+    """Vista para descargar PDF de Pagaré (DOCX del template convertido, o el layout ReportLab con el motor 'nativo')"""
     pagare = get_object_or_404(Pagare, pk=pk, usuario=request.user)
     try:
-        # Generar DOCX primero usando la función existente
-        temp_response = descargar_docx_pagare(request, pk)
-        docx_content = temp_response.content
-        
-        # Convertir DOCX a PDF manteniendo formato
-        pdf_content = convertir_docx_a_pdf(docx_content)
+        if motor_pdf('pagare') == 'nativo':
+            pdf_archivo = generar_pdf_pagare(pagare)
+        else:
+            # Generar DOCX primero y convertirlo a PDF manteniendo formato
+            pdf_archivo = convertir_docx_a_pdf(generar_docx_pagare(pagare))
         
-        response = HttpResponse(pdf_content, content_type='application/pdf')
         filename = f'pagare_{pagare.pk}_{pagare.fecha_emision.strftime("%Y%m%d")}.pdf'
-        response['Content-Disposition'] = f'attachment; filename="{filename}"'
-        return response
+        return respuesta_pdf(pdf_archivo, filename)
     except Exception as e:
         messages.error(request, f'Error al generar PDF: {e}')
         return redirect('documentos:detalle_pagare', pk=pk)
 
 
-def replace_in_xml_textnodes(part, mapping):
-    """
-    Reemplaza en todos los nodos <w:t> de un part (documento, header, footer, etc.)
-    """
-    # Selecciona todos los nodos de texto
-    for t in part.element.xpath(".//w:t"):
-        if t.text:
-            for k, v in mapping.items():
-                if k in t.text:
-                    t.text = t.text.replace(k, v)
+def construir_reemplazos_consejo(acta):
+    """Diccionario de placeholders del template de Acta de Sesión de Consejo (DOCX y PDF nativo)"""
+    return construir_contexto('acta_consejo', acta, RUTA_PLANTILLA_CONSEJO)
 
 
 def generar_docx_acta_consejo(acta):
@@ -504,232 +438,18 @@ def generar_docx_acta_consejo(acta):
     if not DOCX_AVAILABLE:
         raise ImportError("La librería python-docx no está disponible")
     
-    # Ruta del template
-    template_path = os.path.join(
-        settings.BASE_DIR.parent, 
-        "DOCUMENTOS OLEA ABOGADOS", 
-        "Actas Sesiones de Consejo", 
-        "Acta de Sesion de Consejo de Administración PLACE.docx"
-    )
+    template_path = RUTA_PLANTILLA_CONSEJO
     
     if not os.path.exists(template_path):
         raise FileNotFoundError(f"Template no encontrado en: {template_path}")
     
     # Cargar el template
-    doc = Document(template_path)
-    
-    # Preparar datos para reemplazo
-    fecha_formateada = acta.fecha.strftime("%d de %B de %Y") if acta.fecha else "[FECHA]"
-    # Convertir mes a español
-    meses = {
-        'January': 'enero', 'February': 'febrero', 'March': 'marzo',
-        'April': 'abril', 'May': 'mayo', 'June': 'junio',
-        'July': 'julio', 'August': 'agosto', 'September': 'septiembre',
-        'October': 'octubre', 'November': 'noviembre', 'December': 'diciembre'
-    }
-    for eng, esp in meses.items():
-        fecha_formateada = fecha_formateada.replace(eng, esp)
-    
-    def formatear_invitado(inv):
-        """
-        Devuelve 'el ingeniero Juan Pérez', 'la licenciada Ana Ruiz' o solo 'Juan Pérez (Contador Público)'.
-        Si no hay cargo/título, solo usa el nombre.
-        """
-        nombre = inv.get("nombre", "").strip()
-        cargo  = (inv.get("cargo") or "").strip().lower()
-
-        # Heurística simple para artículos (ajústala a tu dataset)
-        femeninos = {"licenciada", "ingeniera", "abogada", "contadora", "doctora", "arquitecta"}
-        masculinos = {"licenciado", "ingeniero", "abogado", "contador", "doctor", "arquitecto"}
-
-        if cargo in femeninos:
-            return f"la {cargo} {nombre}"
-        elif cargo in masculinos:
-            return f"el {cargo} {nombre}"
-        elif cargo:
-            # Cargo sin género marcado: lo dejamos pospuesto y entre paréntesis
-            return f"{nombre} ({inv.get('cargo')})"
-        else:
-            return nombre or "Invitado"
-
-    def unir_conyuncion(nombres):
-        """
-        Une con comas y 'y' antes del último:
-        ['A'] -> 'A'
-        ['A','B'] -> 'A y B'
-        ['A','B','C'] -> 'A, B y C'
-        """
-        if not nombres:
-            return ""
-        if len(nombres) == 1:
-            return nombres[0]
-        if len(nombres) == 2:
-            return f"{nombres[0]} y {nombres[1]}"
-        return f"{', '.join(nombres[:-1])} y {nombres[-1]}"
-
-    def oracion_invitados(invitados):
-        """
-        Genera la oración completa, variando singular/plural y posición de 'asimismo'.
-        Ejemplos:
-          0 -> '' (o una línea neutra si prefieres)
-          1 -> 'Se hace constar la presencia a la sesión de la licenciada Ana Ruiz, quien comparece en calidad de invitada.'
-          2 -> 'Se hace constar la presencia a la sesión del ingeniero Juan Pérez y la licenciada Ana Ruiz, quienes comparecen en calidad de invitados.'
-          3+-> 'Se hace constar la presencia a la sesión de Juan, Ana y Carlos, quienes comparecen en calidad de invitados.'
-        """
-        lista = [formatear_invitado(i) for i in (invitados or []) if i.get("nombre")]
-
-        if not lista:
-            return ""  # o: "Se hace constar que no hubo invitados a la sesión."
-
-        # Artículo inicial: si el primero ya trae 'el/la', usa 'de'; si no, también 'de'
-        sujetos = unir_conyuncion(lista)
-
-        if len(lista) == 1:
-            # Ajusta 'invitado/a' según heurística del formateo (muy simple):
-            texto = lista[0]
-            invitadx = "invitada" if texto.startswith("la ") else "invitado"
-            return f"Se hace constar la presencia a la sesión de {texto}, quien comparece en calidad de {invitadx}."
-        else:
-            return f"Se hace constar la presencia a la sesión de {sujetos}, quienes comparecen en calidad de invitados."
-
-    # Obtener invitados con debugging
-    invitados = []
-    invitados_data_raw = []
-    print(f"DEBUG: acta.invitados_json = {acta.invitados_json}")
-    print(f"DEBUG: type(acta.invitados_json) = {type(acta.invitados_json)}")
+    doc = Document(abrir_plantilla('acta_consejo'))
     
-    if acta.invitados_json:
-        try:
-            invitados_data = acta.invitados_json
-            if isinstance(invitados_data, str):
-                invitados_data = json.loads(invitados_data)
-            
-            print(f"DEBUG: invitados_data after parsing = {invitados_data}")
-            print(f"DEBUG: type(invitados_data) = {type(invitados_data)}")
-            
-            if isinstance(invitados_data, list):
-                invitados_data_raw = invitados_data  # Keep raw data for oracion_invitados
-                for inv in invitados_data:
-                    if isinstance(inv, dict) and 'nombre' in inv:
-                        nombre = inv.get('nombre', '').strip()
-                        if nombre:
-                            invitados.append(nombre)
-                            print(f"DEBUG: Added invitado: {nombre}")
-            
-            print(f"DEBUG: Final invitados list = {invitados}")
-        except Exception as e:
-            print(f"DEBUG: Error processing invitados_json: {e}")
-            pass
+    replacements = construir_reemplazos_consejo(acta)
     
-    # Generate proper invitados sentence
-    oracion_completa_invitados = oracion_invitados(invitados_data_raw)
-    
-    # Crear diccionario de reemplazos con manejo de campos vacíos y verificación de atributos
-    replacements = {
-        "{{SOCIEDAD}}": acta.razon_social or "[SOCIEDAD]",
-        "{{RAZON_SOCIAL}}": acta.razon_social or "[RAZON_SOCIAL]",
-        "{{ABREVIATURA SOCIEDAD}}": (getattr(acta, 'abreviatura_sociedad', '').strip().upper() if hasattr(acta, 'abreviatura_sociedad') and getattr(acta, 'abreviatura_sociedad', '').strip() else 
-                                    (acta.razon_social[:3].upper() if acta.razon_social else "CAS")),
-        "{{FECHA}}": fecha_formateada,
-        "{{HORA}}": acta.hora_inicio.strftime("%H:%M") if acta.hora_inicio else "[HORA]",
-        "{{CIUDAD}}": (getattr(acta, 'ciudad', '').strip() if hasattr(acta, 'ciudad') and getattr(acta, 'ciudad', '').strip() else "Ciudad de México"),
-        "{{LUGAR}}": acta.lugar or "[LUGAR]",
-        "{{DOMICILIO_SOCIAL}}": acta.lugar or "[DOMICILIO SOCIAL]",
-        "{{PLATAFORMA_REMOTA}}": (getattr(acta, 'plataforma_remota', '').strip() if hasattr(acta, 'plataforma_remota') and getattr(acta, 'plataforma_remota', '').strip() else "Zoom"),
-        "{{INVITADO_1}}": invitados[0] if len(invitados) > 0 else "{{INVITADO_1}}",
-        "{{INVITADO_2}}": invitados[1] if len(invitados) > 1 else "{{INVITADO_2}}",
-        "{{INVITADO_3}}": invitados[2] if len(invitados) > 2 else "{{INVITADO_3}}",
-        "{{ORACION_INVITADOS}}": oracion_completa_invitados,
-        "{{PRESIDENTE}}": acta.presidente or "[PRESIDENTE]",
-        "{{SECRETARIO}}": acta.secretario or "[SECRETARIO]",
-        "{{HORA_CIERRE}}": acta.hora_cierre.strftime("%H:%M") if acta.hora_cierre else "[HORA CIERRE]"
-    }
-    
-    # Agregar lógica condicional para CONVOCATORIA_REALIZADA
-    if acta.convocatoria_realizada:
-        replacements["{{CONVOCATORIA_TEXTO}}"] = (
-            "a la cual fueron debidamente convocados según consta en la convocatoria "
-            "que se adjunta a la presente como Anexo Dos."
-        )
-    else:
-        replacements["{{CONVOCATORIA_TEXTO}}"] = (
-            "a la cual asistieron sin necesidad de convocatoria formal, dejando constancia de lo anterior."
-        )
-    
-    # Formatear resoluciones para el campo {{RESOLUCIONES}}
-    resoluciones_texto = ""
-    if acta.resoluciones_json:
-        try:
-            resoluciones_data = acta.resoluciones_json
-            if isinstance(resoluciones_data, str):
-                resoluciones_data = json.loads(resoluciones_data)
-            
-            if isinstance(resoluciones_data, list):
-                resoluciones_lines = []
-                for i, resolucion in enumerate(resoluciones_data, 1):
-                    if isinstance(resolucion, dict):
-                        clave = resolucion.get('clave', f'R{i}')
-                        texto = resolucion.get('texto', '')
-                        if texto:
-                            resoluciones_lines.append(f"{texto}")
-                    else:
-                        resoluciones_lines.append(f"{str(resolucion)}")
-                
-                resoluciones_texto = '\n\n'.join(resoluciones_lines)
-            else:
-                resoluciones_texto = str(resoluciones_data)
-        except Exception as e:
-            print(f"DEBUG: Error processing resoluciones_json: {e}")
-            resoluciones_texto = "[Error al procesar resoluciones]"
-    
-    if not resoluciones_texto:
-        resoluciones_texto = "[No hay resoluciones registradas]"
-    
-    replacements["{{RESOLUCIONES}}"] = resoluciones_texto
-    
-    # Enhanced debugging for placeholder detection
-    placeholder_found = False
-    placeholder_locations = []
-    
-    # Check main document paragraphs
-    for i, paragraph in enumerate(doc.paragraphs):
-        if "{{ORDENES_Y_RESOLUCIONES}}" in paragraph.text:
-            placeholder_found = True
-            placeholder_locations.append(f"Main doc paragraph {i}: '{paragraph.text[:100]}...'")
-    
-    # Check tables
-    for t_idx, table in enumerate(doc.tables):
-        for r_idx, row in enumerate(table.rows):
-            for c_idx, cell in enumerate(row.cells):
-                for p_idx, paragraph in enumerate(cell.paragraphs):
-                    if "{{ORDENES_Y_RESOLUCIONES}}" in paragraph.text:
-                        placeholder_found = True
-                        placeholder_locations.append(f"Table {t_idx}, Row {r_idx}, Cell {c_idx}, Para {p_idx}: '{paragraph.text[:100]}...'")
-    
-    print(f"DEBUG: Placeholder {{{{ORDENES_Y_RESOLUCIONES}}}} found: {placeholder_found}")
-    if placeholder_locations:
-        print("DEBUG: Placeholder locations:")
-        for loc in placeholder_locations:
-            print(f"  - {loc}")
-    
-    # Also check for similar placeholders that might be typos
-    similar_placeholders = []
-    all_text = ""
-    for paragraph in doc.paragraphs:
-        all_text += paragraph.text + " "
-    for table in doc.tables:
-        for row in table.rows:
-            for cell in row.cells:
-                for paragraph in cell.paragraphs:
-                    all_text += paragraph.text + " "
-    
-    # Look for any placeholder that contains "ORDEN" or "RESOLUCION"
-    import re
-    orden_matches = re.findall(r'\{\{[^}]*ORDEN[^}]*\}\}', all_text, re.IGNORECASE)
-    resol_matches = re.findall(r'\{\{[^}]*RESOLUCI[^}]*\}\}', all_text, re.IGNORECASE)
-    
-    if orden_matches or resol_matches:
-        print(f"DEBUG: Found similar placeholders - ORDEN: {orden_matches}, RESOLUCION: {resol_matches}")
+    # La presencia del bloque se conoce desde la compilación del template (ver documentos.plantillas)
+    placeholder_found = plantilla_compilada('acta_consejo').contiene("{{ORDENES_Y_RESOLUCIONES}}")
     
     # Inject "Orden del Día + Resoluciones" section with proper formatting
     if placeholder_found:
@@ -744,13 +464,11 @@ def generar_docx_acta_consejo(acta):
             if ordenes:
                 print(f"DEBUG: First orden: {ordenes[0]}")
             
-            texto_constante = "Los señores consejeros después de escuchar el orden del día antes transcrito procedieron a discutir ampliamente todos y cada uno de los asuntos contenidos en el mismo, desahogándose de la siguiente manera:"
-            
             inject_ordenes_y_resoluciones(
                 doc,
                 placeholder="{{ORDENES_Y_RESOLUCIONES}}",
                 ordenes=ordenes,
-                texto_constante=texto_constante
+                texto_constante=TEXTO_CONSTANTE_CONSEJO
             )
             print("DEBUG: Successfully injected ORDENES_Y_RESOLUCIONES section with proper formatting")
         except ValueError as e:
@@ -776,197 +494,131 @@ def generar_docx_acta_consejo(acta):
     print(f"DEBUG: acta.razon_social = '{acta.razon_social}'")
     print(f"DEBUG: acta.lugar = '{acta.lugar}'")
     
-    # Test if the XML replacement function is working
-    print("DEBUG: Testing XML replacement function...")
-    
-    # Aplicar reemplazos en documento principal
-    replace_in_xml_textnodes(doc.part, replacements)
-    
-    # Función auxiliar para reemplazar texto completo en párrafos
-    def replace_in_paragraph(paragraph, replacements):
-        # Obtener todo el texto del párrafo
-        full_text = paragraph.text
-        
-        # Debug: imprimir texto encontrado
-        if full_text.strip():
-            print(f"DEBUG: Párrafo encontrado: '{full_text}'")
-        
-        # Verificar si hay placeholders en el párrafo
-        has_placeholder = False
-        found_placeholders = []
-        for placeholder in replacements.keys():
-            if placeholder in full_text:
-                has_placeholder = True
-                found_placeholders.append(placeholder)
-        
-        if found_placeholders:
-            print(f"DEBUG: Placeholders encontrados: {found_placeholders}")
-        
-        if not has_placeholder:
-            return
-        
-        # Realizar reemplazos en el texto completo
-        new_text = full_text
-        for placeholder, value in replacements.items():
-            if placeholder in new_text:
-                print(f"DEBUG: Reemplazando '{placeholder}' con '{value}'")
-                new_text = new_text.replace(placeholder, str(value))
-        
-        print(f"DEBUG: Texto original: '{full_text}'")
-        print(f"DEBUG: Texto nuevo: '{new_text}'")
-        
-        # Si el texto cambió, reemplazar todo el párrafo
-        if new_text != full_text:
-            # Limpiar todos los runs existentes
-            for run in paragraph.runs:
-                run.text = ""
-            
-            # Agregar el nuevo texto al primer run
-            if paragraph.runs:
-                paragraph.runs[0].text = new_text
-            else:
-                paragraph.add_run(new_text)
-            print(f"DEBUG: Párrafo actualizado exitosamente")
-    
-    # Also try direct text replacement in paragraphs as backup
-    for paragraph in doc.paragraphs:
-        replace_in_paragraph(paragraph, replacements)
+    # Aplicar reemplazos en cuerpo, tablas, encabezados y pies en un solo recorrido
+    reemplazar_en_documento(doc, replacements)
     
-    # Aplicar reemplazos en headers y footers
-    for section in doc.sections:
-        for header in (section.header, section.footer):
-            replace_in_xml_textnodes(header.part, replacements)
+    # Guardar en un archivo temporal acotado en memoria
+    return guardar_docx(doc)
+
+
+def generar_pdf_nativo_acta_consejo(acta):
+    """PDF del Acta de Sesión de Consejo renderizado directamente desde el template (sin DOCX intermedio)"""
+    if not os.path.exists(RUTA_PLANTILLA_CONSEJO):
+        raise FileNotFoundError(f"Template no encontrado en: {RUTA_PLANTILLA_CONSEJO}")
     
-    # Guardar en memoria
-    buffer = BytesIO()
-    doc.save(buffer)
-    buffer.seek(0)
+    ordenes = build_ordenes_con_resoluciones(acta.orden_dia_json, acta.resoluciones_json)
+    return renderizar_docx_a_pdf(
+        abrir_plantilla("acta_consejo"),
+        construir_reemplazos_consejo(acta),
+        bloques={"{{ORDENES_Y_RESOLUCIONES}}": bloque_ordenes_y_resoluciones(ordenes, TEXTO_CONSTANTE_CONSEJO)},
+    )
+
+
+def generar_pdf_nativo_acta_asamblea(acta):
+    """PDF del Acta de Asamblea renderizado directamente desde el template (sin DOCX intermedio)"""
+    if not os.path.exists(RUTA_PLANTILLA_ASAMBLEA):
+        raise FileNotFoundError(f"Template no encontrado en: {RUTA_PLANTILLA_ASAMBLEA}")
     
-    return buffer.getvalue()
+    ordenes = build_ordenes_con_resoluciones(acta.orden_dia_json, acta.resoluciones_json)
+    return renderizar_docx_a_pdf(
+        abrir_plantilla("acta_asamblea"),
+        construir_reemplazos_asamblea(acta),
+        bloques={"{{ORDENES_Y_RESOLUCIONES}}": bloque_ordenes_y_resoluciones(ordenes, TEXTO_CONSTANTE_ASAMBLEA)},
+    )
 
 
 @login_required
+@descarga_condicional(ActaSesionConsejo, 'acta_consejo', 'pdf')
 def descargar_pdf_consejo(request, pk):
-    """Vista para descargar PDF de Acta de Sesión de Consejo - Convierte DOCX a PDF"""
+    """Vista para descargar PDF de Acta de Sesión de Consejo (motor nativo o DOCX convertido)"""
     acta = get_object_or_404(ActaSesionConsejo, pk=pk, usuario=request.user)
     try:
-        # Generar DOCX primero
-        docx_content = generar_docx_acta_consejo(acta)
-        
-        # Convertir DOCX a PDF manteniendo formato
-        pdf_content = convertir_docx_a_pdf(docx_content)
+        if motor_pdf('acta_consejo') == 'nativo':
+            pdf_archivo = generar_pdf_nativo_acta_consejo(acta)
+        else:
+            # Generar DOCX primero y convertirlo a PDF manteniendo formato
+            pdf_archivo = convertir_docx_a_pdf(generar_docx_acta_consejo(acta))
         
-        response = HttpResponse(pdf_content, content_type='application/pdf')
         filename = f'acta_consejo_{acta.pk}_{acta.fecha.strftime("%Y%m%d")}.pdf'
-        response['Content-Disposition'] = f'attachment; filename="{filename}"'
-        return response
+        return respuesta_pdf(pdf_archivo, filename)
     except Exception as e:
         messages.error(request, f'Error al generar PDF: {e}')
         return redirect('documentos:detalle_consejo', pk=pk)
 
 
 @login_required
+@descarga_condicional(ContratoCredito, 'contrato_credito', 'pdf')
 def descargar_pdf_contrato_credito(request, pk):
     """Vista para descargar PDF de Contrato de Crédito - Convierte DOCX a PDF"""
     contrato = get_object_or_404(ContratoCredito, pk=pk, usuario=request.user)
     try:
-        # Generar DOCX primero
-        from .docx_contrato_credito_generator import descargar_docx_contrato_credito
-        from django.http import HttpResponse
-        from io import BytesIO
-        
-        # Crear una respuesta temporal para obtener el contenido DOCX
-        temp_response = descargar_docx_contrato_credito(request, pk)
-        docx_content = temp_response.content
+        # Generar DOCX primero y convertirlo a PDF manteniendo formato
+        pdf_archivo = convertir_docx_a_pdf(generar_docx_contrato_credito(contrato))
         
-        # Convertir DOCX a PDF manteniendo formato
-        pdf_content = convertir_docx_a_pdf(docx_content)
-        
-        response = HttpResponse(pdf_content, content_type='application/pdf')
         filename = f'contrato_credito_{contrato.pk}_{contrato.fecha_contrato.strftime("%Y%m%d")}.pdf'
-        response['Content-Disposition'] = f'attachment; filename="{filename}"'
-        return response
+        return respuesta_pdf(pdf_archivo, filename)
     except Exception as e:
         messages.error(request, f'Error al generar PDF: {e}')
         return redirect('documentos:detalle_contrato_credito', pk=pk)
 
 
 @login_required
+@descarga_condicional(ContratoPrendaAcciones, 'contrato_prenda', 'pdf')
 def descargar_pdf_prenda(request, pk):
     """Vista para descargar PDF de Contrato de Prenda - Convierte DOCX a PDF"""
     contrato = get_object_or_404(ContratoPrendaAcciones, pk=pk, usuario=request.user)
     try:
-        # Generar DOCX primero usando la función existente
-        temp_response = descargar_docx_prenda(request, pk)
-        docx_content = temp_response.content
-        
-        # Convertir DOCX a PDF manteniendo formato
-        pdf_content = convertir_docx_a_pdf(docx_content)
+        # Generar DOCX primero y convertirlo a PDF manteniendo formato
+        pdf_archivo = convertir_docx_a_pdf(generar_docx_prenda(contrato))
         
-        response = HttpResponse(pdf_content, content_type='application/pdf')
         filename = f'contrato_prenda_{contrato.pk}_{contrato.fecha_contrato.strftime("%Y%m%d")}.pdf'
-        response['Content-Disposition'] = f'attachment; filename="{filename}"'
-        return response
+        return respuesta_pdf(pdf_archivo, filename)
     except Exception as e:
         messages.error(request, f'Error al generar PDF: {e}')
         return redirect('documentos:detalle_contrato_prenda', pk=pk)
 
 
 @login_required
+@descarga_condicional(ConvenioModificatorio, 'convenio_modificatorio', 'pdf')
 def descargar_pdf_convenio_modificatorio(request, pk):
     """Vista para descargar PDF de Convenio Modificatorio - Convierte DOCX a PDF"""
     convenio = get_object_or_404(ConvenioModificatorio, pk=pk, usuario=request.user)
     try:
-        # Generar DOCX primero usando la función existente
-        temp_response = descargar_docx_convenio_modificatorio(request, pk)
-        docx_content = temp_response.content
-        
-        # Convertir DOCX a PDF manteniendo formato
-        pdf_content = convertir_docx_a_pdf(docx_content)
+        # Generar DOCX primero y convertirlo a PDF manteniendo formato
+        pdf_archivo = convertir_docx_a_pdf(generar_docx_convenio_modificatorio(convenio))
         
-        response = HttpResponse(pdf_content, content_type='application/pdf')
         filename = f'convenio_modificatorio_{convenio.pk}_{convenio.fecha_convenio.strftime("%Y%m%d")}.pdf'
-        response['Content-Disposition'] = f'attachment; filename="{filename}"'
-        return response
+        return respuesta_pdf(pdf_archivo, filename)
     except Exception as e:
         messages.error(request, f'Error al generar PDF: {e}')
         return redirect('documentos:detalle_convenio_modificatorio', pk=pk)
 
 
 @login_required
+@descarga_condicional(EstatutosSociedad, 'estatutos_sociedad', 'pdf')
 def descargar_pdf_estatutos_sociedad(request, pk):
     """Vista para descargar PDF de Estatutos Sociales - Convierte DOCX a PDF"""
     estatutos = get_object_or_404(EstatutosSociedad, pk=pk, usuario=request.user)
     try:
-        # Generar DOCX primero usando la función existente
-        temp_response = descargar_docx_estatutos_sociedad(request, pk)
-        docx_content = temp_response.content
+        # Generar DOCX primero y convertirlo a PDF manteniendo formato
+        pdf_archivo = convertir_docx_a_pdf(generar_docx_estatutos_sociedad(estatutos))
         
-        # Convertir DOCX a PDF manteniendo formato
-        pdf_content = convertir_docx_a_pdf(docx_content)
-        
-        response = HttpResponse(pdf_content, content_type='application/pdf')
         filename = f'estatutos_sociedad_{estatutos.pk}_{estatutos.fecha_creacion.strftime("%Y%m%d")}.pdf'
-        response['Content-Disposition'] = f'attachment; filename="{filename}"'
-        return response
+        return respuesta_pdf(pdf_archivo, filename)
     except Exception as e:
         messages.error(request, f'Error al generar PDF: {e}')
         return redirect('documentos:detalle_estatutos_sociedad', pk=pk)
 
 
 @login_required
+@descarga_condicional(ActaSesionConsejo, 'acta_consejo', 'docx')
 def descargar_docx_consejo(request, pk):
     """Vista para descargar DOCX de Acta de Sesión de Consejo"""
     acta = get_object_or_404(ActaSesionConsejo, pk=pk, usuario=request.user)
     try:
-        docx_content = generar_docx_acta_consejo(acta)
-        response = HttpResponse(
-            docx_content, 
-            content_type='application/vnd.openxmlformats-officedocument.wordprocessingml.document'
-        )
+        docx_archivo = generar_docx_acta_consejo(acta)
         filename = f'acta_consejo_{acta.pk}_{acta.fecha.strftime("%Y%m%d")}.docx'
-        response['Content-Disposition'] = f'attachment; filename="{filename}"'
-        return response
+        return respuesta_docx(docx_archivo, filename)
     except Exception as e:
         messages.error(request, f'Error al generar DOCX: {e}')
         return redirect('documentos:detalle_consejo', pk=pk)
@@ -985,62 +637,14 @@ def generar_pdf_acta_asamblea(acta):
         bottomMargin=2.5*cm
     )
     
-    # Crear estilos personalizados que repliquen el HTML
-    styles = getSampleStyleSheet()
-    
-    # Estilo para título principal (centrado, negrita, 11pt)
-    title_style = ParagraphStyle(
-        'CustomTitle',
-        parent=styles['Heading1'],
-        fontSize=11,
-        spaceAfter=12,
-        alignment=TA_CENTER,
-        fontName='Helvetica-Bold'
-    )
-    
-    # Estilo para fecha (centrado, normal, 11pt)
-    date_style = ParagraphStyle(
-        'CustomDate',
-        parent=styles['Normal'],
-        fontSize=11,
-        spaceAfter=12,
-        alignment=TA_CENTER,
-        fontName='Helvetica'
-    )
-    
-    # Estilo para párrafos justificados (11pt, interlineado 150%)
-    justified_style = ParagraphStyle(
-        'CustomJustified',
-        parent=styles['Normal'],
-        fontSize=11,
-        spaceAfter=12,
-        alignment=TA_JUSTIFY,
-        fontName='Helvetica',
-        leading=16.5  # 150% de 11pt
-    )
-    
-    # Estilo para subtítulos centrados (negrita, 11pt)
-    subtitle_style = ParagraphStyle(
-        'CustomSubtitle',
-        parent=styles['Normal'],
-        fontSize=11,
-        spaceAfter=12,
-        alignment=TA_CENTER,
-        fontName='Helvetica-Bold'
-    )
-    
-    # Estilo para elementos del orden del día (con sangría)
-    order_style = ParagraphStyle(
-        'CustomOrder',
-        parent=styles['Normal'],
-        fontSize=11,
-        spaceAfter=12,
-        alignment=TA_JUSTIFY,
-        fontName='Helvetica',
-        leftIndent=1*cm,
-        firstLineIndent=-1*cm,
-        leading=16.5
-    )
+    # Estilos compartidos que replican el HTML (se construyen una sola vez por proceso)
+    title_style = estilo('asamblea_titulo')
+    date_style = estilo('asamblea_fecha')
+    justified_style = estilo('asamblea_justificado')
+    subtitle_style = estilo('asamblea_subtitulo')
+    order_style = estilo('asamblea_orden')
+    normal_style = estilo('asamblea_normal')
+    center_style = estilo('asamblea_centrado')
     
     story = []
     
@@ -1067,16 +671,7 @@ def generar_pdf_acta_asamblea(acta):
         story.append(Spacer(1, 12))
     
     # Fecha
-    fecha_formateada = acta.fecha.strftime('%d de %B de %Y')
-    # Convertir mes a español
-    meses = {
-        'January': 'enero', 'February': 'febrero', 'March': 'marzo',
-        'April': 'abril', 'May': 'mayo', 'June': 'junio',
-        'July': 'julio', 'August': 'agosto', 'September': 'septiembre',
-        'October': 'octubre', 'November': 'noviembre', 'December': 'diciembre'
-    }
-    for eng, esp in meses.items():
-        fecha_formateada = fecha_formateada.replace(eng, esp)
+    fecha_formateada = formatear_fecha(acta.fecha)
     
     story.append(Paragraph(f"De fecha {fecha_formateada}", date_style))
     
@@ -1267,14 +862,7 @@ def generar_pdf_acta_asamblea(acta):
     
     # Crear tabla de firmas
     firmas_table = Table(firmas_data, colWidths=[8*cm, 8*cm])
-    firmas_table.setStyle(TableStyle([
-        ('ALIGN', (0, 0), (-1, -1), 'CENTER'),
-        ('VALIGN', (0, 0), (-1, -1), 'MIDDLE'),
-        ('FONTNAME', (0, 0), (-1, -1), 'Helvetica'),
-        ('FONTSIZE', (0, 0), (-1, -1), 10),
-        ('TOPPADDING', (0, 0), (-1, -1), 12),
-        ('BOTTOMPADDING', (0, 0), (-1, -1), 12),
-    ]))
+    firmas_table.setStyle(estilo_tabla_firmas('Helvetica'))
     
     story.append(firmas_table)
     story.append(Spacer(1, 30))
@@ -1329,7 +917,7 @@ def generar_pdf_acta_asamblea(acta):
     
     # Pie de documento
     story.append(Paragraph("Documento generado por el Sistema de Gestión de Documentos Legales OLEA", center_style))
-    fecha_generacion = f"Generado el {fecha_completa}"
+    fecha_generacion = f"Generado el {datetime.now().strftime('%d/%m/%Y %H:%M')}"
     story.append(Paragraph(fecha_generacion, center_style))
     
     # Construir PDF
@@ -1339,16 +927,23 @@ def generar_pdf_acta_asamblea(acta):
 
 
 def convertir_docx_a_pdf(docx_content):
-    """Convierte contenido DOCX a PDF usando reportlab como fallback"""
+    """
+    Convierte un DOCX (bytes o archivo abierto) a PDF usando reportlab como fallback.
+    Regresa un archivo temporal posicionado al inicio (ver documentos.descargas).
+    """
+    import shutil
     import tempfile
     import os
     
+    if isinstance(docx_content, bytes):
+        docx_content = BytesIO(docx_content)
+    
     # Intentar primero con docx2pdf si está disponible
     if DOCX2PDF_AVAILABLE:
         try:
             # Crear archivos temporales
             with tempfile.NamedTemporaryFile(suffix='.docx', delete=False) as docx_temp:
-                docx_temp.write(docx_content)
+                shutil.copyfileobj(docx_content, docx_temp)
                 docx_path = docx_temp.name
             
             pdf_path = docx_path.replace('.docx', '.pdf')
@@ -1356,18 +951,18 @@ def convertir_docx_a_pdf(docx_content):
             # Convertir DOCX a PDF
             convert(docx_path, pdf_path)
             
-            # Leer contenido del PDF
-            with open(pdf_path, 'rb') as pdf_file:
-                pdf_content = pdf_file.read()
+            # Copiar el PDF por bloques (sin leerlo completo a memoria)
+            pdf_archivo = copiar_a_temporal(pdf_path)
             
             # Limpiar archivos temporales
             os.unlink(docx_path)
             os.unlink(pdf_path)
             
-            return pdf_content
+            return pdf_archivo
             
         except Exception as e:
             print(f"DEBUG: Error con docx2pdf: {e}")
+            docx_content.seek(0)
             # Continuar con método alternativo
             try:
                 if 'docx_path' in locals():
@@ -1380,11 +975,9 @@ def convertir_docx_a_pdf(docx_content):
     # Método alternativo: extraer texto del DOCX y generar PDF simple
     try:
         from docx import Document
-        from io import BytesIO
         
-        # Cargar DOCX desde bytes
-        docx_stream = BytesIO(docx_content)
-        doc = Document(docx_stream)
+        # Cargar DOCX desde el archivo
+        doc = Document(docx_content)
         
         # Extraer todo el texto
         full_text = []
@@ -1405,42 +998,38 @@ def convertir_docx_a_pdf(docx_content):
         # Generar PDF simple con reportlab
         from reportlab.lib.pagesizes import letter
         from reportlab.platypus import SimpleDocTemplate, Paragraph, Spacer
-        from reportlab.lib.styles import getSampleStyleSheet
-        from io import BytesIO
         
-        buffer = BytesIO()
-        doc_pdf = SimpleDocTemplate(buffer, pagesize=letter)
-        styles = getSampleStyleSheet()
+        pdf_archivo = archivo_temporal()
+        doc_pdf = SimpleDocTemplate(pdf_archivo, pagesize=letter)
         story = []
         
         for text in full_text:
             if text.strip():
-                story.append(Paragraph(text, styles['Normal']))
+                story.append(Paragraph(text, estilo('normal')))
                 story.append(Spacer(1, 12))
         
         doc_pdf.build(story)
-        buffer.seek(0)
-        return buffer.getvalue()
+        pdf_archivo.seek(0)
+        return pdf_archivo
         
     except Exception as e:
         raise ImportError(f"No se pudo convertir DOCX a PDF. Error: {e}")
 
 
+@descarga_condicional(ActaAsamblea, 'acta_asamblea', 'pdf')
 def descargar_pdf_asamblea(request, pk):
-    """Vista para descargar PDF de Acta de Asamblea - Convierte DOCX a PDF"""
+    """Vista para descargar PDF de Acta de Asamblea (motor nativo o DOCX convertido)"""
     acta = get_object_or_404(ActaAsamblea, pk=pk, usuario=request.user)
     try:
-        # Generar DOCX primero
-        docx_content = generar_docx_acta_asamblea(acta)
-        
-        # Convertir DOCX a PDF manteniendo formato
-        pdf_content = convertir_docx_a_pdf(docx_content)
+        if motor_pdf('acta_asamblea') == 'nativo':
+            pdf_archivo = generar_pdf_nativo_acta_asamblea(acta)
+        else:
+            # Generar DOCX primero y convertirlo a PDF manteniendo formato
+            pdf_archivo = convertir_docx_a_pdf(generar_docx_acta_asamblea(acta))
         
-        response = HttpResponse(pdf_content, content_type='application/pdf')
         filename = f'acta_asamblea_{acta.pk}_{acta.fecha.strftime("%Y%m%d") if acta.fecha else "sin_fecha"}.pdf'
-        response['Content-Disposition'] = f'attachment; filename="{filename}"'
         messages.success(request, f'PDF generado: {filename}')
-        return response
+        return respuesta_pdf(pdf_archivo, filename)
     except Exception as e:
         messages.error(request, f'Error al generar PDF: {e}')
         return redirect('documentos:detalle', pk=pk)
@@ -1469,124 +1058,18 @@ def generar_docx_pagare(pagare):
     
     # Cargar el template
     print("DEBUG: Cargando template...")
-    doc = Document(template_path)
+    doc = Document(abrir_plantilla('pagare'))
     print(f"DEBUG: Template cargado. Párrafos encontrados: {len(doc.paragraphs)}")
     
-    # Preparar datos para reemplazo
-    fecha_emision_formateada = pagare.fecha_emision.strftime("%d de %B de %Y") if pagare.fecha_emision else "[FECHA_EMISION]"
-    
-    # Convertir mes a español
-    meses = {
-        'January': 'enero', 'February': 'febrero', 'March': 'marzo',
-        'April': 'abril', 'May': 'mayo', 'June': 'junio',
-        'July': 'julio', 'August': 'agosto', 'September': 'septiembre',
-        'October': 'octubre', 'November': 'noviembre', 'December': 'diciembre'
-    }
-    for eng, esp in meses.items():
-        fecha_emision_formateada = fecha_emision_formateada.replace(eng, esp)
-    
-    # Generar tabla de amortización automática si no existe o está vacía
-    tabla_amortizacion = pagare.tabla_amortizacion
-    if not tabla_amortizacion and pagare.monto_numeric and pagare.num_pagos:
-        print("DEBUG: Generando tabla de amortización automática...")
-        tabla_amortizacion = pagare.generar_tabla_amortizacion_automatica()
-        print(f"DEBUG: Tabla generada con {len(tabla_amortizacion)} cuotas")
-    
-    # Diccionario de reemplazos
-    replacements = {
-        '{{lugar_emision}}': pagare.lugar_emision or '[LUGAR_EMISION]',
-        '{{fecha_emision}}': fecha_emision_formateada,
-        '{{nombre_acreedor}}': pagare.acreedor_nombre or '[NOMBRE_ACREEDOR]',
-        '{{NOMBRE_ACREEDOR}}': (pagare.acreedor_nombre.upper() if pagare.acreedor_nombre else '[NOMBRE_ACREEDOR]'),
-        '{{rfc_acreedor}}': pagare.acreedor_rfc or '[RFC_ACREEDOR]',
-        '{{domicilio_acreedor}}': pagare.acreedor_domicilio or '[DOMICILIO_ACREEDOR]',
-        '{{nombre_deudor}}': pagare.deudor_nombre or '[NOMBRE_DEUDOR]',
-        '{{NOMBRE_DEUDOR}}': (pagare.deudor_nombre.upper() if pagare.deudor_nombre else '[NOMBRE_DEUDOR]'),
-        '{{rfc_deudor}}': pagare.deudor_rfc or '[RFC_DEUDOR]',
-        '{{representante_deudor}}': pagare.deudor_representante or '[REPRESENTANTE_DEUDOR]',
-        '{{domicilio_deudor}}': pagare.deudor_domicilio or '[DOMICILIO_DEUDOR]',
-        '{{monto_principal}}': f"${pagare.monto_numeric:,.2f}" if pagare.monto_numeric else '[MONTO_PRINCIPAL]',
-        '{{moneda}}': pagare.moneda or '[MONEDA]',
-        '{{concepto_pagare}}': pagare.concepto or '[CONCEPTO_PAGARE]',
-        '{{monto_principal_texto}}': pagare.monto_literal or '[MONTO_PRINCIPAL_TEXTO]',
-        '{{tipo_pago}}': pagare.get_tipo_pago_display() if pagare.tipo_pago else '[TIPO_PAGO]',
-        '{{numero_pagos}}': str(pagare.num_pagos) if pagare.num_pagos else '[NUMERO_PAGOS]',
-        '{{numero_pagos_letra}}': (num2words(pagare.num_pagos, lang="es").capitalize()if pagare.num_pagos is not None else ''),   
-        '{{periodicidad}}': pagare.get_periodicidad_display() if pagare.periodicidad else '[PERIODICIDAD]',
-        '{{lugar_pago}}': pagare.lugar_pago or '[LUGAR_PAGO]',
-        '{{forma_pago}}': pagare.forma_pago or '[FORMA_PAGO]',
-        '{{tasa_interes_ordinario}}': f"{pagare.tasa_interes_ordinario}%" if pagare.tasa_interes_ordinario else '[TASA_INTERES_ORDINARIO]',
-        '{{tasa_interes_ordinario_letra}}': num2words(pagare.tasa_interes_ordinario, lang="es").capitalize() if pagare.tasa_interes_ordinario else '[TASA_INTERES_ORDINARIO_LETRA]',
-        '{{tasa_interes_moratorio}}': f"{pagare.tasa_interes_moratorio}%" if pagare.tasa_interes_moratorio else '[TASA_INTERES_MORATORIO]',
-        '{{tasa_interes_moratorio_letra}}': num2words(pagare.tasa_interes_moratorio, lang="es").capitalize() if pagare.tasa_interes_moratorio else '[TASA_INTERES_MORATORIO_LETRA]',
-        '{{base_calculo_dias}}': str(pagare.base_intereses) if pagare.base_intereses else '[BASE_CALCULO_DIAS]',
-        '{{base_calculo_dias_letra}}': num2words(pagare.base_intereses, lang="es").capitalize() if pagare.base_intereses else '[BASE_CALCULO_DIAS_LETRA]',
-        '{{gastos_administracion}}': f"${pagare.gastos_admon:,.2f}" if pagare.gastos_admon else '[GASTOS_ADMINISTRACION]',
-        '{{gastos_administracion_letra}}': num2words(pagare.gastos_admon, lang="es").capitalize() if pagare.gastos_admon else '[GASTOS_ADMINISTRACION_LETRA]',
-        '{{permitir_prepago}}': 'Sí' if pagare.prepago_permitido else 'No',
-        '{{dias_aviso_prepago}}': str(pagare.dias_aviso_prepago) if pagare.dias_aviso_prepago else '[DIAS_AVISO_PREPAGO]',
-        '{{dias_aviso_prepago_letra}}': num2words(pagare.dias_aviso_prepago, lang="es").capitalize() if pagare.dias_aviso_prepago else '[DIAS_AVISO_PREPAGO_LETRA]',
-        '{{condicion_prepago}}': pagare.condicion_prepago or '[CONDICION_PREPAGO]',
-        '{{tiene_garantia_aval}}': 'Sí' if pagare.tiene_garantia else 'No',
-        '{{nombre_aval}}': pagare.aval_nombre or '[NOMBRE_AVAL]',
-        '{{NOMBRE_AVAL}}': (pagare.aval_nombre.upper() if pagare.aval_nombre else '[NOMBRE_AVAL]'),
-        '{{descripcion_garantia}}': pagare.descripcion_garantia or '[DESCRIPCION_GARANTIA]',
-        '{{domicilio_aval}}': pagare.aval_domicilio or '[DOMICILIO_AVAL]',
-        '{{jurisdiccion}}': pagare.jurisdiccion or '[JURISDICCION]',
-        '{{ley_aplicable}}': pagare.ley_aplicable or '[LEY_APLICABLE]',
-        '{{eventos_incumplimiento}}': pagare.eventos_incumplimiento or '[EVENTOS_INCUMPLIMIENTO]',
-        '{{clausula_aceleracion}}': pagare.clausula_aceleracion or '[CLAUSULA_ACELERACION]',
-    }
-    
-    # Función auxiliar para reemplazar texto completo en párrafos
-    def replace_in_paragraph(paragraph, replacements):
-        # Obtener todo el texto del párrafo
-        full_text = paragraph.text
-        
-        # Debug: imprimir texto encontrado
-        if full_text.strip():
-            print(f"DEBUG: Párrafo encontrado: '{full_text}'")
-        
-        # Verificar si hay placeholders en el párrafo
-        has_placeholder = False
-        found_placeholders = []
-        for placeholder in replacements.keys():
-            if placeholder in full_text:
-                has_placeholder = True
-                found_placeholders.append(placeholder)
-        
-        if found_placeholders:
-            print(f"DEBUG: Placeholders encontrados: {found_placeholders}")
-        
-        if not has_placeholder:
-            return
-        
-        # Realizar reemplazos en el texto completo
-        new_text = full_text
-        for placeholder, value in replacements.items():
-            if placeholder in new_text:
-                print(f"DEBUG: Reemplazando '{placeholder}' con '{value}'")
-                new_text = new_text.replace(placeholder, str(value))
-        
-        print(f"DEBUG: Texto original: '{full_text}'")
-        print(f"DEBUG: Texto nuevo: '{new_text}'")
-        
-        # Si el texto cambió, reemplazar todo el párrafo
-        if new_text != full_text:
-            # Limpiar todos los runs existentes
-            for run in paragraph.runs:
-                run.text = ""
-            
-            # Agregar el nuevo texto al primer run
-            if paragraph.runs:
-                paragraph.runs[0].text = new_text
-            else:
-                paragraph.add_run(new_text)
-            print(f"DEBUG: Párrafo actualizado exitosamente")
     
-    # Reemplazar en párrafos
-    for paragraph in doc.paragraphs:
-        replace_in_paragraph(paragraph, replacements)
+    # Tabla guardada (o la automática si el pagaré aún no la tiene), la misma del PDF y la cartera
+    tabla_amortizacion = tabla_del_pagare(pagare)
+    
+    # Reemplazos del mapeo declarativo (solo los placeholders presentes en el template)
+    replacements = construir_contexto('pagare', pagare, template_path)
+    
+    # Reemplazar en cuerpo, tablas, encabezados y pies en un solo recorrido
+    reemplazar_en_documento(doc, replacements)
     
     # Buscar tabla de amortización existente para llenar
     tabla_amortizacion_encontrada = False
@@ -1614,71 +1097,37 @@ def generar_docx_pagare(pagare):
     if tabla_amortizacion_encontrada and tabla_amortizacion:
         print("DEBUG: Llenando tabla de amortización existente...")
         try:
-            # Limpiar filas existentes (excepto encabezados)
-            rows_to_remove = []
-            for i in range(len(tabla_target.rows) - 1, 0, -1):  # Empezar desde el final
-                rows_to_remove.append(i)
+            # Fila plantilla: se toma la primera fila de datos del template y se formatea
+            # una sola vez (Arial Narrow 10pt, centrado); cada cuota es una copia de su XML
+            plantilla = fila_plantilla(tabla_target, indice=1, fuente='Arial Narrow', tamano=10, alineacion=1)
             
-            # Remover filas de datos anteriores
-            for row_idx in rows_to_remove:
-                if row_idx < len(tabla_target.rows):
-                    tabla_target._element.remove(tabla_target.rows[row_idx]._element)
+            # Limpiar de una vez las filas existentes (excepto encabezados)
+            quitar_filas(tabla_target, desde=1)
             
-            # Aplicar formato de tabla con cuadrícula (bordes completos)
-            def set_table_borders(table):
-                """Aplica bordes completos a toda la tabla"""
-                tbl = table._tbl
-                tblPr = tbl.tblPr
-                
-                # Crear elemento de bordes
-                tblBorders = OxmlElement('w:tblBorders')
-                
-                # Definir todos los bordes
-                border_types = ['top', 'left', 'bottom', 'right', 'insideH', 'insideV']
-                for border_type in border_types:
-                    border = OxmlElement(f'w:{border_type}')
-                    border.set(qn('w:val'), 'single')
-                    border.set(qn('w:sz'), '4')  # Grosor del borde
-                    border.set(qn('w:space'), '0')
-                    border.set(qn('w:color'), '000000')  # Color negro
-                    tblBorders.append(border)
-                
-                tblPr.append(tblBorders)
+            # Tabla de cualquier largo: encabezado repetido en cada página, filas sin partirse
+            paginar_tabla(tabla_target, plantilla)
             
-            # Aplicar bordes a la tabla
-            set_table_borders(tabla_target)
+            # Aplicar formato de tabla con cuadrícula (bordes completos)
+            aplicar_cuadricula(tabla_target)
             
-            # Insertar datos de la tabla calculada
-            max_rows = min(len(tabla_amortizacion), 48)
-            for i, cuota in enumerate(tabla_amortizacion[:max_rows]):
-                # Agregar nueva fila
-                new_row = tabla_target.add_row()
-                
-                # Datos de la fila según formato de la derecha (sin símbolos de peso, números simples)
-                row_data = [
+            # Insertar datos de la tabla calculada (sin símbolos de peso, números simples)
+            filas = (
+                [
                     str(cuota.get('numero', i+1)),                    # Mes
-                    f"{cuota.get('capital', 0):,.2f}",               # Colegiatura (sin $)
-                    f"{cuota.get('saldo', 0):,.2f}",                 # Saldo Insoluto (sin $)
-                    f"{cuota.get('capital', 0):,.2f}",               # Capital (sin $)
-                    f"{cuota.get('costo_admon', 0):,.2f}",           # Costo Admón. (sin $)
-                    f"{cuota.get('iva_costo_admon', 0):,.2f}",       # IVA Costo Admón. (sin $)
-                    f"{cuota.get('interes', 0):,.2f}",               # Int Ordinario (sin $)
-                    f"{cuota.get('iva_interes', 0):,.2f}",           # IVA Int Ordinario (sin $)
-                    f"{cuota.get('total', 0):,.2f}",                 # Pago Total (sin $)
+                    f"{cuota.get('capital', 0):,.2f}",               # Colegiatura
+                    f"{cuota.get('saldo', 0):,.2f}",                 # Saldo Insoluto
+                    f"{cuota.get('capital', 0):,.2f}",               # Capital
+                    f"{cuota.get('costo_admon', 0):,.2f}",           # Costo Admón.
+                    f"{cuota.get('iva_costo_admon', 0):,.2f}",       # IVA Costo Admón.
+                    f"{cuota.get('interes', 0):,.2f}",               # Int Ordinario
+                    f"{cuota.get('iva_interes', 0):,.2f}",           # IVA Int Ordinario
+                    f"{cuota.get('total', 0):,.2f}",                 # Pago Total
                     cuota.get('fecha', ''),                          # Fecha Pago
                     cuota.get('etapa', 'Etapa de Estudios')         # Etapa
                 ]
-                
-                # Llenar celdas disponibles
-                for col_idx, data in enumerate(row_data):
-                    if col_idx < len(new_row.cells):
-                        new_row.cells[col_idx].text = data
-                        # Formatear texto: Arial Narrow 10pt, centrado
-                        for paragraph in new_row.cells[col_idx].paragraphs:
-                            paragraph.alignment = 1  # CENTER
-                            for run in paragraph.runs:
-                                run.font.name = 'Arial Narrow'
-                                run.font.size = Pt(10)
+                for i, cuota in enumerate(tabla_amortizacion)
+            )
+            agregar_filas(tabla_target, plantilla, filas)
             
             # También aplicar formato a los encabezados existentes
             if len(tabla_target.rows) > 0:
@@ -1691,38 +1140,20 @@ def generar_docx_pagare(pagare):
                             run.font.size = Pt(10)
                             run.bold = True
             
-            print(f"DEBUG: Tabla llenada con {max_rows} filas de datos")
+            print(f"DEBUG: Tabla llenada con {len(tabla_amortizacion)} filas de datos")
             
         except Exception as e:
             print(f"DEBUG: Error al llenar tabla de amortización: {e}")
             import traceback
             traceback.print_exc()
     
-    # Reemplazar en tablas restantes (las que no eran la tabla de amortización)
-    for table in doc.tables:
-        if table != tabla_target:  # Skip the table we already processed
-            for row in table.rows:
-                for cell in row.cells:
-                    for paragraph in cell.paragraphs:
-                        replace_in_paragraph(paragraph, replacements)
-    
-    # Reemplazar en headers y footers
-    for section in doc.sections:
-        # Header
-        header = section.header
-        for paragraph in header.paragraphs:
-            replace_in_paragraph(paragraph, replacements)
-        
-        # Footer
-        footer = section.footer
-        for paragraph in footer.paragraphs:
-            replace_in_paragraph(paragraph, replacements)
-    
-    # Guardar en BytesIO
-    buffer = BytesIO()
-    doc.save(buffer)
-    buffer.seek(0)
-    return buffer.getvalue()
+    # Guardar en un archivo temporal acotado en memoria
+    return guardar_docx(doc)
+
+
+def construir_reemplazos_asamblea(acta):
+    """Diccionario de placeholders del template de Acta de Asamblea (DOCX y PDF nativo)"""
+    return construir_contexto('acta_asamblea', acta, RUTA_PLANTILLA_ASAMBLEA)
 
 
 def generar_docx_acta_asamblea(acta):
@@ -1730,109 +1161,22 @@ def generar_docx_acta_asamblea(acta):
     if not DOCX_AVAILABLE:
         raise ImportError("La librería python-docx no está disponible")
     
-    # Ruta del template
-    template_path = os.path.join(
-        settings.BASE_DIR.parent, 
-        "DOCUMENTOS OLEA ABOGADOS", 
-        "Actas de Asambleas", 
-        "Acta de Asamblea PLACE.docx"
-    )
+    template_path = RUTA_PLANTILLA_ASAMBLEA
     
     if not os.path.exists(template_path):
         raise FileNotFoundError(f"Template no encontrado en: {template_path}")
     
     # Cargar el template
-    doc = Document(template_path)
-    
-    # Preparar datos para reemplazo
-    fecha_formateada = acta.fecha.strftime("%d de %B de %Y") if acta.fecha else "[FECHA]"
-    # Convertir mes a español
-    meses = {
-        'January': 'enero', 'February': 'febrero', 'March': 'marzo',
-        'April': 'abril', 'May': 'mayo', 'June': 'junio',
-        'July': 'julio', 'August': 'agosto', 'September': 'septiembre',
-        'October': 'octubre', 'November': 'noviembre', 'December': 'diciembre'
-    }
-    for eng, esp in meses.items():
-        fecha_formateada = fecha_formateada.replace(eng, esp)
-    
-    # Crear diccionario de reemplazos con manejo de campos vacíos
-    replacements = {
-        "{{razon_social}}": acta.razon_social or "[RAZÓN SOCIAL]",
-        "{{RAZON_SOCIAL}}": acta.razon_social.upper() if acta.razon_social else "[RAZÓN SOCIAL]",
-        "{{ABREVIATURA_SOCIEDAD}}": "".join([p[0] for p in acta.razon_social.strip().split() if p.upper() not in {"S", "S.A.", "S.A", "DE", "C.V.", "C.V", "RL", "R.L.", "R.L"}]).upper() if acta.razon_social else "CAS",
-        "{{tipo_asamblea}}": acta.get_tipo_asamblea_display() if hasattr(acta, 'get_tipo_asamblea_display') else (acta.tipo_asamblea or "[TIPO DE ASAMBLEA]"),
-        "{{TIPO_ASAMBLEA}}": acta.get_tipo_asamblea_display().upper() if hasattr(acta, 'get_tipo_asamblea_display') and acta.tipo_asamblea else (acta.tipo_asamblea.upper() if acta.tipo_asamblea else "[TIPO DE ASAMBLEA]"),
-        "{{caracter}}": acta.caracter or "[CARÁCTER]",
-        "{{CARACTER}}": acta.caracter.upper() if acta.caracter else "[CARÁCTER]",
-        "{{fecha}}": fecha_formateada,
-        "{{hora_inicio}}": acta.hora_inicio.strftime("%H:%M") if acta.hora_inicio else "[HORA DE INICIO]",
-        "{{hora_cierre}}": acta.hora_cierre.strftime("%H:%M") if acta.hora_cierre else "[HORA DE CIERRE]",
-        "{{lugar}}": acta.lugar or "[LUGAR]",
-        "{{porcentage_capital_presente}}": f"{acta.porcentaje_capital_presente}%" if acta.porcentaje_capital_presente else "[PORCENTAJE CAPITAL PRESENTE]",
-        "{{presidente}}": acta.presidente or "[PRESIDENTE]",
-        "{{secretario}}": acta.secretario or "[SECRETARIO]",
-        "{{escrutador}}": acta.escrutador or "[ESCRUTADOR]",
-        "{{comisario}}": acta.comisario or "[COMISARIO]"
-    }
-    
-    # Función auxiliar para reemplazar texto completo en párrafos
-    def replace_in_paragraph(paragraph, replacements):
-        # Obtener todo el texto del párrafo
-        full_text = paragraph.text
-        
-        # Verificar si hay placeholders en el párrafo
-        has_placeholder = False
-        for placeholder in replacements.keys():
-            if placeholder in full_text:
-                has_placeholder = True
-                break
-        
-        if not has_placeholder:
-            return
-        
-        # Realizar reemplazos en el texto completo
-        new_text = full_text
-        for placeholder, value in replacements.items():
-            if placeholder in new_text:
-                new_text = new_text.replace(placeholder, str(value))
-        
-        # Si el texto cambió, reemplazar todo el párrafo
-        if new_text != full_text:
-            # Limpiar todos los runs existentes
-            for run in paragraph.runs:
-                run.text = ""
-            
-            # Agregar el nuevo texto al primer run
-            if paragraph.runs:
-                paragraph.runs[0].text = new_text
-            else:
-                paragraph.add_run(new_text)
+    doc = Document(abrir_plantilla('acta_asamblea'))
+    
+    replacements = construir_reemplazos_asamblea(acta)
     
     # Procesar ORDENES_Y_RESOLUCIONES si existe el placeholder
     try:
         from .docx_blocks import build_ordenes_con_resoluciones, inject_ordenes_y_resoluciones
         
-        # Verificar si existe el placeholder en el documento
-        placeholder_found = False
-        for paragraph in doc.paragraphs:
-            if "{{ORDENES_Y_RESOLUCIONES}}" in paragraph.text:
-                placeholder_found = True
-                break
-        
-        if not placeholder_found:
-            # Verificar en tablas
-            for table in doc.tables:
-                for row in table.rows:
-                    for cell in row.cells:
-                        for paragraph in cell.paragraphs:
-                            if "{{ORDENES_Y_RESOLUCIONES}}" in paragraph.text:
-                                placeholder_found = True
-                                break
-                        if placeholder_found:
-                            break
-                    if placeholder_found:
-                        break
+        # La presencia del bloque se conoce desde la compilación del template
+        placeholder_found = plantilla_compilada('acta_asamblea').contiene("{{ORDENES_Y_RESOLUCIONES}}")
         
         if placeholder_found:
             # Construir las órdenes con resoluciones
@@ -1841,17 +1185,12 @@ def generar_docx_acta_asamblea(acta):
                 acta.resoluciones_json
             )
             
-            # Texto constante para Asambleas (similar al de Consejo pero adaptado)
-            texto_constante = (
-                "Los Asambleístas después de escuchar el Orden del Día antes trascrito y de haberlo aprobado por unanimidad, procedieron a discutir ampliamente todos y cada uno de los asuntos contenidos en el mismo, como sigue:"
-            )
-            
             # Inyectar el contenido formateado
             inject_ordenes_y_resoluciones(
                 doc, 
                 "{{ORDENES_Y_RESOLUCIONES}}", 
                 ordenes, 
-                texto_constante
+                TEXTO_CONSTANTE_ASAMBLEA
             )
             
             print(f"DEBUG: ORDENES_Y_RESOLUCIONES procesado exitosamente para Acta de Asamblea. {len(ordenes)} órdenes encontradas.")
@@ -1862,52 +1201,29 @@ def generar_docx_acta_asamblea(acta):
         print(f"ERROR procesando ORDENES_Y_RESOLUCIONES en Asamblea: {e}")
         # Continuar con el procesamiento normal si hay error
     
-    # Aplicar reemplazos en documento principal
-    replace_in_xml_textnodes(doc.part, replacements)
-    
-    # Reemplazar en párrafos
-    for paragraph in doc.paragraphs:
-        replace_in_paragraph(paragraph, replacements)
-    
-    # Reemplazar en tablas
-    for table in doc.tables:
-        for row in table.rows:
-            for cell in row.cells:
-                for paragraph in cell.paragraphs:
-                    replace_in_paragraph(paragraph, replacements)
+    # Aplicar reemplazos en cuerpo, tablas, encabezados y pies en un solo recorrido
+    reemplazar_en_documento(doc, replacements)
     
-    # Aplicar reemplazos en headers y footers
-    for section in doc.sections:
-        for header in (section.header, section.footer):
-            replace_in_xml_textnodes(header.part, replacements)
-    
-    # Guardar en memoria
-    buffer = BytesIO()
-    doc.save(buffer)
-    buffer.seek(0)
-    
-    return buffer.getvalue()
+    # Guardar en un archivo temporal acotado en memoria
+    return guardar_docx(doc)
 
 
 @login_required
+@descarga_condicional(ActaAsamblea, 'acta_asamblea', 'docx')
 def descargar_docx_acta_asamblea(request, pk):
     """Vista para descargar DOCX de Acta de Asamblea"""
     acta = get_object_or_404(ActaAsamblea, pk=pk, usuario=request.user)
     try:
-        docx_content = generar_docx_acta_asamblea(acta)
-        response = HttpResponse(
-            docx_content, 
-            content_type='application/vnd.openxmlformats-officedocument.wordprocessingml.document'
-        )
+        docx_archivo = generar_docx_acta_asamblea(acta)
         filename = f'acta_asamblea_{acta.pk}_{acta.fecha.strftime("%Y%m%d") if acta.fecha else "sin_fecha"}.docx'
-        response['Content-Disposition'] = f'attachment; filename="{filename}"'
-        return response
+        return respuesta_docx(docx_archivo, filename)
     except Exception as e:
         messages.error(request, f'Error al generar DOCX: {e}')
         return redirect('documentos:detalle', pk=pk)
 
 
 @login_required
+@descarga_condicional(Pagare, 'pagare', 'docx')
 def descargar_docx_pagare(request, pk):
     """Vista para descargar DOCX de Pagaré"""
     pagare = get_object_or_404(Pagare, pk=pk, usuario=request.user)
@@ -1921,15 +1237,10 @@ def descargar_docx_pagare(request, pk):
     print(f"DEBUG: Monto: '{pagare.monto_numeric}'")
     
     try:
-        docx_content = generar_docx_pagare(pagare)
-        response = HttpResponse(
-            docx_content, 
-            content_type='application/vnd.openxmlformats-officedocument.wordprocessingml.document'
-        )
+        docx_archivo = generar_docx_pagare(pagare)
         filename = f'pagare_{pagare.pk}_{pagare.fecha_emision.strftime("%Y%m%d")}.docx'
-        response['Content-Disposition'] = f'attachment; filename="{filename}"'
         print(f"DEBUG: DOCX generado exitosamente: {filename}")
-        return response
+        return respuesta_docx(docx_archivo, filename)
     except Exception as e:
         print(f"DEBUG: Error al generar DOCX: {e}")
         import traceback
@@ -1939,11 +1250,14 @@ def descargar_docx_pagare(request, pk):
 
 
 @login_required
+@descarga_condicional(ContratoPrendaAcciones, 'contrato_prenda', 'docx')
 def descargar_docx_prenda(request, pk):
     """Vista para descargar DOCX de Contrato de Prenda sobre Acciones"""
     contrato = get_object_or_404(ContratoPrendaAcciones, pk=pk, usuario=request.user)
     try:
-        return generar_docx_prenda(contrato)
+        docx_archivo = generar_docx_prenda(contrato)
+        filename = f"Contrato_de_Prenda_generado_{contrato.id}.docx"
+        return respuesta_docx(docx_archivo, filename)
     except Exception as e:
         messages.error(request, f'Error al generar DOCX: {e}')
         return redirect('documentos:detalle_contrato_prenda', pk=pk)
@@ -0,0 +1,465 @@
+"""
+Motor de PDF nativo.
+
+Renderiza un template DOCX (sus párrafos, tablas y placeholders) directamente a
+flowables de ReportLab, sin generar el DOCX intermedio ni depender de un
+convertidor externo (Word / LibreOffice). Los bloques dinámicos, como el orden
+del día con resoluciones, se insertan en lugar de su placeholder.
+
+El motor a usar se elige por tipo de documento con settings.PDF_MOTOR_POR_TIPO:
+``'nativo'`` usa este módulo y ``'docx'`` genera el DOCX y lo convierte. El
+pagaré usa por defecto ``'docx'`` (el texto legal es el de su template); su
+``'nativo'`` es un layout ReportLab propio (pdf_generator.generar_pdf_pagare),
+que no sigue el template y solo se usa si se elige en settings.
+"""
+
+import unicodedata
+from xml.sax.saxutils import escape
+
+from django.conf import settings
+from docx import Document
+from docx.enum.text import WD_ALIGN_PARAGRAPH
+from docx.oxml.ns import qn
+from docx.table import Table as DocxTable
+from docx.text.paragraph import Paragraph as DocxParagraph
+from reportlab.lib import colors
+from reportlab.lib.enums import TA_CENTER, TA_JUSTIFY, TA_LEFT, TA_RIGHT
+from reportlab.lib.units import cm
+from reportlab.platypus import (
+    PageBreak,
+    Paragraph,
+    SimpleDocTemplate,
+    Spacer,
+    Table,
+    TableStyle,
+)
+
+from .descargas import archivo_temporal
+from .docx_reemplazos import patron_placeholders
+from .formatting import to_roman
+from .pdf_styles import estilo_parrafo, fuente_legal
+
+
+MOTOR_PDF_POR_DEFECTO = {
+    'acta_asamblea': 'nativo',
+    'acta_consejo': 'nativo',
+    'pagare': 'docx',
+}
+
+ALINEACIONES = {
+    WD_ALIGN_PARAGRAPH.LEFT: TA_LEFT,
+    WD_ALIGN_PARAGRAPH.CENTER: TA_CENTER,
+    WD_ALIGN_PARAGRAPH.RIGHT: TA_RIGHT,
+    WD_ALIGN_PARAGRAPH.JUSTIFY: TA_JUSTIFY,
+    WD_ALIGN_PARAGRAPH.DISTRIBUTE: TA_JUSTIFY,
+}
+
+SALTO_PAGINA = object()
+
+
+def _texto(texto):
+    """
+    Escapa el texto para Paragraph. Normaliza a NFC porque las fuentes PDF no
+    componen acentos separados (p. ej. 'o' + U+0301 se vería como un cuadro).
+    """
+    return escape(unicodedata.normalize('NFC', texto))
+
+
+def motor_pdf(tipo):
+    """Regresa 'nativo' o 'docx' según la configuración del tipo de documento"""
+    motores = getattr(settings, 'PDF_MOTOR_POR_TIPO', None) or {}
+    return motores.get(tipo, MOTOR_PDF_POR_DEFECTO.get(tipo, 'docx'))
+
+
+class RenderizadorPDF:
+    """Convierte el cuerpo de un Document de python-docx en flowables de ReportLab"""
+
+    def __init__(self, doc, reemplazos, bloques=None):
+        self.doc = doc
+        self.reemplazos = {k: '' if v is None else str(v) for k, v in reemplazos.items()}
+        self.bloques = bloques or {}
+        self.patron = patron_placeholders(tuple(self.reemplazos)) if self.reemplazos else None
+        self.fuente = fuente_legal()['normal']
+        self._cadenas = {}
+        self.tamano_base = self._tamano_por_defecto()
+
+    # Lectura de formato ------------------------------------------------------
+
+    def _tamano_por_defecto(self):
+        normal = self.doc.styles['Normal'].font.size
+        if normal:
+            return normal.pt
+        valores = self.doc.styles.element.xpath('w:docDefaults/w:rPrDefault/w:rPr/w:sz/@w:val')
+        return int(valores[0]) / 2 if valores else 12
+
+    def _cadena_estilos(self, parrafo):
+        """Estilo del párrafo y sus estilos base (resolver parrafo.style es costoso, se memoriza por id)"""
+        estilo_id = parrafo._p.style
+        if estilo_id not in self._cadenas:
+            cadena = []
+            estilo = parrafo.style
+            while estilo is not None:
+                cadena.append(estilo)
+                estilo = estilo.base_style
+            self._cadenas[estilo_id] = cadena
+        return self._cadenas[estilo_id]
+
+    def _formato(self, parrafo, atributo):
+        """Valor del formato de párrafo, heredado del estilo si el párrafo no lo define"""
+        valor = getattr(parrafo.paragraph_format, atributo)
+        if valor is None:
+            for estilo in self._cadena_estilos(parrafo):
+                valor = getattr(estilo.paragraph_format, atributo)
+                if valor is not None:
+                    break
+        return valor
+
+    def _tamano(self, parrafo):
+        for run in parrafo.runs:
+            if run.font.size:
+                return run.font.size.pt
+        for estilo in self._cadena_estilos(parrafo):
+            if estilo.font.size:
+                return estilo.font.size.pt
+        return self.tamano_base
+
+    def _estilo(self, parrafo):
+        tamano = self._tamano(parrafo)
+        interlineado = self._formato(parrafo, 'line_spacing')
+        if interlineado is None:
+            leading = tamano * 1.15
+        elif isinstance(interlineado, float):
+            leading = tamano * 1.15 * interlineado
+        else:
+            leading = interlineado.pt
+
+        def puntos(atributo):
+            valor = self._formato(parrafo, atributo)
+            return round(valor.pt, 2) if valor is not None else 0
+
+        return estilo_parrafo(
+            alineacion=ALINEACIONES.get(self._formato(parrafo, 'alignment'), TA_LEFT),
+            tamano=tamano,
+            izquierda=puntos('left_indent'),
+            primera_linea=puntos('first_line_indent'),
+            antes=puntos('space_before'),
+            despues=puntos('space_after'),
+            interlineado=round(leading, 2),
+            fuente=self.fuente,
+        )
+
+    # Texto y placeholders ----------------------------------------------------
+
+    def _segmentos(self, parrafo):
+        """Texto del párrafo como [(texto, negrita, cursiva, subrayado)] más saltos de página"""
+        segmentos = []
+        for run in parrafo.runs:
+            formato = (bool(run.bold), bool(run.italic), bool(run.underline))
+            for hijo in run._r.iterchildren():
+                if hijo.tag == qn('w:t'):
+                    segmentos.append((hijo.text or '', *formato))
+                elif hijo.tag == qn('w:tab'):
+                    segmentos.append((' ', *formato))
+                elif hijo.tag == qn('w:cr'):
+                    segmentos.append(('\n', *formato))
+                elif hijo.tag == qn('w:br'):
+                    if hijo.get(qn('w:type')) == 'page':
+                        segmentos.append(SALTO_PAGINA)
+                    else:
+                        segmentos.append(('\n', *formato))
+        return segmentos
+
+    def _sustituir(self, segmentos):
+        """
+        Reemplaza los placeholders aunque estén partidos en varios runs; el valor
+        toma el formato del run donde empieza el placeholder.
+        """
+        texto = ''.join(s[0] for s in segmentos)
+        if self.patron is None or not self.patron.search(texto):
+            return segmentos
+
+        inicios = []
+        posicion = 0
+        for seg in segmentos:
+            inicios.append(posicion)
+            posicion += len(seg[0])
+
+        def formato_en(offset):
+            for inicio, seg in zip(reversed(inicios), reversed(segmentos)):
+                if inicio <= offset:
+                    return seg[1:]
+            return (False, False, False)
+
+        def corte(desde, hasta):
+            for inicio, seg in zip(inicios, segmentos):
+                fin = inicio + len(seg[0])
+                if fin <= desde or inicio >= hasta:
+                    continue
+                yield (seg[0][max(desde, inicio) - inicio:min(hasta, fin) - inicio], *seg[1:])
+
+        resultado = []
+        actual = 0
+        for coincidencia in self.patron.finditer(texto):
+            resultado.extend(corte(actual, coincidencia.start()))
+            resultado.append((self.reemplazos[coincidencia.group(0)], *formato_en(coincidencia.start())))
+            actual = coincidencia.end()
+        resultado.extend(corte(actual, len(texto)))
+        return resultado
+
+    @staticmethod
+    def _markup(segmentos):
+        """Convierte segmentos con formato al mini-HTML de Paragraph de ReportLab"""
+        partes = []
+        for texto, negrita, cursiva, subrayado in segmentos:
+            if not texto:
+                continue
+            fragmento = _texto(texto).replace('\n', '<br/>')
+            if subrayado:
+                fragmento = f'<u>{fragmento}</u>'
+            if cursiva:
+                fragmento = f'<i>{fragmento}</i>'
+            if negrita:
+                fragmento = f'<b>{fragmento}</b>'
+            partes.append(fragmento)
+        return ''.join(partes)
+
+    # Recorrido del documento -------------------------------------------------
+
+    def flowables(self):
+        """Recorre el cuerpo del documento en orden y regresa la lista de flowables"""
+        return self._bloque(self.doc.element.body, self.doc)
+
+    def _bloque(self, contenedor, padre):
+        story = []
+        for elemento in contenedor.iterchildren():
+            if elemento.tag == qn('w:p'):
+                story.extend(self._parrafo(DocxParagraph(elemento, padre)))
+            elif elemento.tag == qn('w:tbl'):
+                story.append(self._tabla(DocxTable(elemento, padre)))
+        return story
+
+    def _parrafo(self, parrafo):
+        estilo = self._estilo(parrafo)
+
+        texto = parrafo.text
+        for placeholder, bloque in self.bloques.items():
+            if placeholder in texto:
+                return bloque(estilo)
+
+        story = []
+        if self._formato(parrafo, 'page_break_before'):
+            story.append(PageBreak())
+
+        lineas = [[]]
+        for seg in self._segmentos(parrafo):
+            if seg is SALTO_PAGINA:
+                lineas.append(SALTO_PAGINA)
+                lineas.append([])
+            else:
+                lineas[-1].append(seg)
+
+        for linea in lineas:
+            if linea is SALTO_PAGINA:
+                story.append(PageBreak())
+                continue
+            markup = self._markup(self._sustituir(linea))
+            if markup.strip():
+                story.append(Paragraph(markup, estilo))
+            elif len(lineas) == 1:
+                # Párrafo vacío: conserva el espacio vertical de una línea
+                story.append(Spacer(1, estilo.leading + estilo.spaceBefore + estilo.spaceAfter))
+
+        # Un salto de sección en el párrafo empieza una nueva página
+        tipo_seccion = parrafo._p.xpath('./w:pPr/w:sectPr/w:type/@w:val')
+        if parrafo._p.xpath('./w:pPr/w:sectPr') and (not tipo_seccion or tipo_seccion[0] != 'continuous'):
+            story.append(PageBreak())
+        return story
+
+    def _tabla(self, tabla):
+        datos = []
+        comandos = [
+            ('VALIGN', (0, 0), (-1, -1), 'TOP'),
+            ('LEFTPADDING', (0, 0), (-1, -1), 2),
+            ('RIGHTPADDING', (0, 0), (-1, -1), 2),
+        ]
+        for r, fila in enumerate(tabla.rows):
+            celdas = []
+            anterior = None
+            for c, celda in enumerate(fila.cells):
+                if anterior is not None and celda._tc is anterior._tc:
+                    # Celda combinada horizontalmente: python-docx la repite por columna
+                    celdas.append('')
+                    comandos.append(('SPAN', (c - 1, r), (c, r)))
+                    continue
+                anterior = celda
+                celdas.append(self._bloque(celda._tc, celda) or '')
+                for borde in celda._tc.xpath('./w:tcPr/w:tcBorders/*'):
+                    if borde.get(qn('w:val')) in (None, 'nil', 'none'):
+                        continue
+                    lado = borde.tag.split('}')[1]
+                    if lado == 'top':
+                        comandos.append(('LINEABOVE', (c, r), (c, r), 0.75, colors.black))
+                    elif lado == 'bottom':
+                        comandos.append(('LINEBELOW', (c, r), (c, r), 0.75, colors.black))
+            datos.append(celdas)
+
+        anchos = []
+        for columna in tabla.columns:
+            try:
+                anchos.append(columna.width.pt if columna.width else None)
+            except Exception:
+                anchos.append(None)
+
+        tabla_pdf = Table(datos, colWidths=anchos or None, hAlign='CENTER')
+        tabla_pdf.setStyle(TableStyle(comandos))
+        return tabla_pdf
+
+    # Encabezados y pies ------------------------------------------------------
+
+    def textos_pagina(self):
+        """Textos (ya sustituidos) de encabezado y pie de la primera sección"""
+        seccion = self.doc.sections[0]
+
+        def textos(parte):
+            lineas = []
+            for parrafo in parte.paragraphs:
+                texto = ''.join(s[0] for s in self._sustituir(
+                    [s for s in self._segmentos(parrafo) if s is not SALTO_PAGINA]
+                )).strip()
+                if texto:
+                    lineas.append(texto)
+            return lineas
+
+        return textos(seccion.header), textos(seccion.footer)
+
+
+def bloque_ordenes_y_resoluciones(ordenes, texto_constante):
+    """
+    Bloque dinámico equivalente a docx_blocks.inject_ordenes_y_resoluciones:
+    regresa una función que recibe el estilo del párrafo del placeholder y
+    produce los flowables del orden del día y sus resoluciones.
+    """
+    sangria = 1.30 * cm
+
+    def construir(estilo_base):
+        def estilo(alineacion=TA_JUSTIFY, izquierda=0, primera_linea=0, despues=0):
+            return estilo_parrafo(
+                alineacion=alineacion,
+                tamano=estilo_base.fontSize,
+                izquierda=round(izquierda, 2),
+                primera_linea=round(primera_linea, 2),
+                despues=despues,
+                interlineado=estilo_base.leading,
+                fuente=estilo_base.fontName,
+            )
+
+        story = []
+        if not ordenes:
+            if texto_constante:
+                story.append(Paragraph(_texto(texto_constante), estilo()))
+            return story
+
+        # Lista de puntos del orden del día con sangría francesa
+        for orden in ordenes:
+            titulo = orden.get('titulo', f"Punto {orden['numero']}")
+            despues = 28 if orden is ordenes[-1] else 18
+            story.append(Paragraph(
+                f"{to_roman(orden['numero'])}. {_texto(titulo)}",
+                estilo(izquierda=sangria, primera_linea=-sangria, despues=despues),
+            ))
+
+        if texto_constante:
+            story.append(Paragraph(_texto(texto_constante), estilo(despues=38)))
+
+        # Desarrollo de cada punto
+        for i, orden in enumerate(ordenes):
+            if i > 0:
+                story.append(Spacer(1, estilo_base.leading))
+
+            titulo = orden.get('titulo', f"Punto {orden['numero']}")
+            story.append(Paragraph(
+                f"<b>{to_roman(orden['numero'])}. {_texto(titulo)}</b>",
+                estilo(izquierda=sangria, primera_linea=-sangria, despues=28),
+            ))
+
+            for bloque in (orden.get('descripcion') or '').strip().split('\n'):
+                bloque = bloque.strip()
+                if bloque:
+                    story.append(Paragraph(_texto(bloque), estilo(despues=25)))
+
+            story.append(Paragraph('<b>R E S O L U C I Ó N</b>', estilo(alineacion=TA_CENTER, despues=25)))
+
+            resoluciones = orden.get('resoluciones', [])
+            for resolucion in resoluciones:
+                es_ultima = resolucion is resoluciones[-1]
+                if isinstance(resolucion, dict):
+                    clave = (resolucion.get('clave') or '').strip().rstrip('.')
+                    texto = (resolucion.get('texto') or '').strip()
+                elif isinstance(resolucion, str):
+                    clave = ''
+                    texto = resolucion.strip()
+                else:
+                    continue
+                if not texto:
+                    continue
+
+                parrafos = [t.strip() for t in texto.split('\n') if t.strip()]
+                prefijo = f"{_texto(clave)}. " if clave else ''
+                story.append(Paragraph(
+                    prefijo + _texto(parrafos[0]),
+                    estilo(izquierda=sangria, primera_linea=-sangria, despues=38 if es_ultima else 18),
+                ))
+                for continuacion in parrafos[1:]:
+                    story.append(Paragraph(
+                        _texto(continuacion),
+                        estilo(izquierda=sangria, primera_linea=-sangria, despues=12),
+                    ))
+        return story
+
+    return construir
+
+
+def renderizar_docx_a_pdf(template_path, reemplazos, bloques=None):
+    """
+    Genera el PDF de un template DOCX en una sola pasada.
+
+    Args:
+        template_path: ruta o archivo abierto del template DOCX
+        reemplazos: diccionario {placeholder: valor}
+        bloques: diccionario {placeholder: función(estilo) -> flowables} para
+            los párrafos que se sustituyen por contenido estructurado
+
+    Returns:
+        archivo temporal con el PDF, posicionado al inicio (ver documentos.descargas)
+    """
+    doc = Document(template_path)
+    renderizador = RenderizadorPDF(doc, reemplazos, bloques)
+    story = renderizador.flowables()
+    encabezado, pie = renderizador.textos_pagina()
+
+    seccion = doc.sections[0]
+    archivo = archivo_temporal()
+    pdf = SimpleDocTemplate(
+        archivo,
+        pagesize=(seccion.page_width.pt, seccion.page_height.pt),
+        leftMargin=seccion.left_margin.pt,
+        rightMargin=seccion.right_margin.pt,
+        topMargin=seccion.top_margin.pt,
+        bottomMargin=seccion.bottom_margin.pt,
+    )
+
+    def dibujar_pagina(canvas, documento):
+        if not (encabezado or pie):
+            return
+        canvas.saveState()
+        canvas.setFont(renderizador.fuente, 8)
+        centro = documento.pagesize[0] / 2
+        for i, linea in enumerate(encabezado):
+            canvas.drawCentredString(centro, documento.pagesize[1] - documento.topMargin / 2 - i * 10, linea)
+        for i, linea in enumerate(reversed(pie)):
+            canvas.drawCentredString(centro, documento.bottomMargin / 2 + i * 10, linea)
+        canvas.restoreState()
+
+    pdf.build(story, onFirstPage=dibujar_pagina, onLaterPages=dibujar_pagina)
+    archivo.seek(0)
+    return archivo
@@ -0,0 +1,225 @@
+"""
+Registro de estilos ReportLab compartido por los generadores de PDF.
+
+Los estilos y la fuente TrueType legal se construyen una sola vez por proceso
+(la primera vez que se piden) y después se reutilizan en cada petición, en lugar
+de llamar a getSampleStyleSheet() y crear cada ParagraphStyle por documento.
+"""
+
+import os
+from functools import lru_cache
+
+from django.conf import settings
+from reportlab.lib import colors
+from reportlab.lib.enums import TA_CENTER, TA_JUSTIFY, TA_LEFT
+from reportlab.lib.styles import getSampleStyleSheet, ParagraphStyle
+from reportlab.lib.units import cm
+from reportlab.pdfbase import pdfmetrics
+from reportlab.pdfbase.ttfonts import TTFont
+from reportlab.platypus import TableStyle
+
+
+FAMILIA_LEGAL = 'LegalSerif'
+
+# Rutas donde se busca una fuente serif TrueType (Times New Roman o equivalente métrico).
+# Se puede fijar explícitamente con settings.PDF_FUENTE_LEGAL = {'normal': ..., 'bold': ..., ...}
+CANDIDATOS_FUENTE_LEGAL = [
+    {
+        'normal': r'C:\Windows\Fonts\times.ttf',
+        'bold': r'C:\Windows\Fonts\timesbd.ttf',
+        'italic': r'C:\Windows\Fonts\timesi.ttf',
+        'boldItalic': r'C:\Windows\Fonts\timesbi.ttf',
+    },
+    {
+        'normal': '/usr/share/fonts/truetype/liberation/LiberationSerif-Regular.ttf',
+        'bold': '/usr/share/fonts/truetype/liberation/LiberationSerif-Bold.ttf',
+        'italic': '/usr/share/fonts/truetype/liberation/LiberationSerif-Italic.ttf',
+        'boldItalic': '/usr/share/fonts/truetype/liberation/LiberationSerif-BoldItalic.ttf',
+    },
+    {
+        'normal': '/usr/share/fonts/truetype/msttcorefonts/Times_New_Roman.ttf',
+        'bold': '/usr/share/fonts/truetype/msttcorefonts/Times_New_Roman_Bold.ttf',
+        'italic': '/usr/share/fonts/truetype/msttcorefonts/Times_New_Roman_Italic.ttf',
+        'boldItalic': '/usr/share/fonts/truetype/msttcorefonts/Times_New_Roman_Bold_Italic.ttf',
+    },
+]
+
+# Fuentes estándar de PDF usadas cuando no hay TrueType disponible (no se incrustan)
+FUENTE_LEGAL_RESPALDO = {
+    'normal': 'Times-Roman',
+    'bold': 'Times-Bold',
+    'italic': 'Times-Italic',
+    'boldItalic': 'Times-BoldItalic',
+}
+
+
+@lru_cache(maxsize=None)
+def fuente_legal():
+    """
+    Registra (una sola vez por proceso) la fuente TrueType legal y regresa los
+    nombres a usar para cada variante: {'normal', 'bold', 'italic', 'boldItalic'}.
+    """
+    candidatos = CANDIDATOS_FUENTE_LEGAL
+    configurada = getattr(settings, 'PDF_FUENTE_LEGAL', None)
+    if configurada:
+        candidatos = [configurada]
+
+    for rutas in candidatos:
+        if not all(os.path.exists(rutas.get(v, '')) for v in FUENTE_LEGAL_RESPALDO):
+            continue
+        try:
+            nombres = {}
+            for variante, ruta in rutas.items():
+                nombre = FAMILIA_LEGAL if variante == 'normal' else f'{FAMILIA_LEGAL}-{variante}'
+                pdfmetrics.registerFont(TTFont(nombre, ruta))
+                nombres[variante] = nombre
+            pdfmetrics.registerFontFamily(FAMILIA_LEGAL, **nombres)
+            return nombres
+        except Exception as e:
+            print(f"DEBUG: No se pudo registrar la fuente legal {rutas.get('normal')}: {e}")
+
+    return dict(FUENTE_LEGAL_RESPALDO)
+
+
+@lru_cache(maxsize=None)
+def obtener_estilos():
+    """Construye una sola vez los ParagraphStyle de todos los generadores ReportLab"""
+    styles = getSampleStyleSheet()
+    fuente = fuente_legal()
+    serif, serif_bold = fuente['normal'], fuente['bold']
+
+    estilos = {
+        'normal': styles['Normal'],
+
+        # Acta de Sesión de Consejo
+        'consejo_titulo': ParagraphStyle(
+            'CustomTitle', parent=styles['Heading1'], alignment=TA_CENTER,
+            fontSize=14, fontName=serif_bold, spaceBefore=6, spaceAfter=6
+        ),
+        'consejo_normal': ParagraphStyle(
+            'CustomNormal', parent=styles['Normal'], alignment=TA_JUSTIFY,
+            fontSize=11, fontName=serif, leading=16, spaceAfter=12
+        ),
+        'consejo_seccion': ParagraphStyle(
+            'SectionTitle', parent=styles['Heading2'], alignment=TA_CENTER,
+            fontSize=12, fontName=serif_bold, spaceBefore=12, spaceAfter=12
+        ),
+        'consejo_orden': ParagraphStyle(
+            'AgendaItem', parent=styles['Normal'], alignment=TA_LEFT,
+            fontSize=11, fontName=serif,
+            leftIndent=1.5*cm, firstLineIndent=-0.5*cm,
+            spaceBefore=8, spaceAfter=8
+        ),
+        'consejo_resolucion_titulo': ParagraphStyle(
+            'ResolutionTitle', parent=styles['Normal'], alignment=TA_CENTER,
+            fontSize=11, fontName=serif_bold, spaceBefore=12, spaceAfter=6
+        ),
+        'consejo_resolucion_texto': ParagraphStyle(
+            'ResolutionText', parent=styles['Normal'], alignment=TA_JUSTIFY,
+            fontSize=11, fontName=serif, leftIndent=2*cm, spaceAfter=8
+        ),
+
+        # Pagaré
+        'pagare_titulo': ParagraphStyle(
+            'PagareTitle', parent=styles['Heading1'], fontSize=14, spaceAfter=20,
+            alignment=TA_CENTER, fontName=serif_bold
+        ),
+        'pagare_subtitulo': ParagraphStyle(
+            'PagareSubtitle', parent=styles['Heading2'], fontSize=12, spaceAfter=12,
+            alignment=TA_CENTER, fontName=serif_bold
+        ),
+        'pagare_justificado': ParagraphStyle(
+            'PagareJustified', parent=styles['Normal'], fontSize=11, spaceAfter=12,
+            alignment=TA_JUSTIFY, fontName=serif, leading=14
+        ),
+        'pagare_centrado': ParagraphStyle(
+            'PagareCenter', parent=styles['Normal'], fontSize=11, spaceAfter=12,
+            alignment=TA_CENTER, fontName=serif
+        ),
+
+        # Acta de Asamblea (replica el formato del HTML en Helvetica)
+        'asamblea_titulo': ParagraphStyle(
+            'AsambleaTitle', parent=styles['Heading1'], fontSize=11, spaceAfter=12,
+            alignment=TA_CENTER, fontName='Helvetica-Bold'
+        ),
+        'asamblea_fecha': ParagraphStyle(
+            'AsambleaDate', parent=styles['Normal'], fontSize=11, spaceAfter=12,
+            alignment=TA_CENTER, fontName='Helvetica'
+        ),
+        'asamblea_justificado': ParagraphStyle(
+            'AsambleaJustified', parent=styles['Normal'], fontSize=11, spaceAfter=12,
+            alignment=TA_JUSTIFY, fontName='Helvetica', leading=16.5  # 150% de 11pt
+        ),
+        'asamblea_subtitulo': ParagraphStyle(
+            'AsambleaSubtitle', parent=styles['Normal'], fontSize=11, spaceAfter=12,
+            alignment=TA_CENTER, fontName='Helvetica-Bold'
+        ),
+        'asamblea_orden': ParagraphStyle(
+            'AsambleaOrder', parent=styles['Normal'], fontSize=11, spaceAfter=12,
+            alignment=TA_JUSTIFY, fontName='Helvetica',
+            leftIndent=1*cm, firstLineIndent=-1*cm, leading=16.5
+        ),
+        'asamblea_normal': ParagraphStyle(
+            'AsambleaNormal', parent=styles['Normal'], fontSize=11, spaceAfter=12,
+            alignment=TA_LEFT, fontName='Helvetica', leading=16.5
+        ),
+        'asamblea_centrado': ParagraphStyle(
+            'AsambleaCenter', parent=styles['Normal'], fontSize=9, spaceAfter=6,
+            alignment=TA_CENTER, fontName='Helvetica'
+        ),
+    }
+    return estilos
+
+
+def estilo(nombre):
+    """Regresa un estilo del registro por nombre"""
+    return obtener_estilos()[nombre]
+
+
+@lru_cache(maxsize=512)
+def estilo_parrafo(alineacion=TA_LEFT, tamano=12, izquierda=0, primera_linea=0,
+                   antes=0, despues=0, interlineado=None, fuente=None):
+    """
+    ParagraphStyle para un formato de párrafo concreto (usado por el motor de PDF
+    nativo). Se memoriza, así que párrafos con el mismo formato comparten estilo.
+    """
+    return ParagraphStyle(
+        f'Parrafo-{alineacion}-{tamano}-{izquierda}-{primera_linea}-{antes}-{despues}-{interlineado}',
+        parent=obtener_estilos()['normal'],
+        fontName=fuente or fuente_legal()['normal'],
+        fontSize=tamano,
+        leading=interlineado or tamano * 1.2,
+        alignment=alineacion,
+        leftIndent=izquierda,
+        firstLineIndent=primera_linea,
+        spaceBefore=antes,
+        spaceAfter=despues,
+    )
+
+
+@lru_cache(maxsize=None)
+def estilo_tabla_firmas(fuente=None, tamano=10):
+    """TableStyle compartido para las tablas de firmas"""
+    return TableStyle([
+        ('ALIGN', (0, 0), (-1, -1), 'CENTER'),
+        ('VALIGN', (0, 0), (-1, -1), 'MIDDLE'),
+        ('FONTNAME', (0, 0), (-1, -1), fuente or fuente_legal()['normal']),
+        ('FONTSIZE', (0, 0), (-1, -1), tamano),
+        ('TOPPADDING', (0, 0), (-1, -1), 12),
+        ('BOTTOMPADDING', (0, 0), (-1, -1), 12),
+    ])
+
+
+@lru_cache(maxsize=None)
+def estilo_tabla_amortizacion():
+    """TableStyle compartido para la tabla de amortización del pagaré"""
+    return TableStyle([
+        ('BACKGROUND', (0, 0), (-1, 0), colors.grey),
+        ('TEXTCOLOR', (0, 0), (-1, 0), colors.whitesmoke),
+        ('ALIGN', (0, 0), (-1, -1), 'CENTER'),
+        ('FONTNAME', (0, 0), (-1, 0), fuente_legal()['bold']),
+        ('FONTSIZE', (0, 0), (-1, -1), 9),
+        ('BOTTOMPADDING', (0, 0), (-1, 0), 12),
+        ('BACKGROUND', (0, 1), (-1, -1), colors.beige),
+        ('GRID', (0, 0), (-1, -1), 1, colors.black)
+    ])
@@ -0,0 +1,244 @@
+"""
+Registro declarativo de placeholders por tipo de documento.
+
+Cada tipo de documento declara una lista de Campo (placeholder, campo de origen
+y cadena de transformaciones). La lista se compila una sola vez por tipo y por
+template en un ConstructorContexto que solo evalúa los placeholders que el
+template realmente contiene. Los generadores DOCX y el motor de PDF nativo
+obtienen su diccionario de reemplazos del mismo constructor.
+
+Las declaraciones de cada tipo viven en documentos/mapeos.py.
+"""
+
+import os
+import re
+import zipfile
+from functools import lru_cache
+from operator import attrgetter
+
+from lxml import etree
+
+from .formatting import formatear_fecha, numero_en_letra
+
+
+W_NS = 'http://schemas.openxmlformats.org/wordprocessingml/2006/main'
+W_P = f'{{{W_NS}}}p'
+W_T = f'{{{W_NS}}}t'
+
+PATRON_PLACEHOLDER = re.compile(r'\{\{[^{}]+\}\}')
+
+# Partes del paquete DOCX que pueden contener texto con placeholders
+PARTES_CON_TEXTO = re.compile(r'word/(document|header\d*|footer\d*|footnotes|endnotes)\.xml$')
+
+
+# ---------------------------------------------------------------------------
+# Transformaciones (reciben el valor ya verificado como no vacío)
+# ---------------------------------------------------------------------------
+
+def texto(valor):
+    return str(valor)
+
+
+def mayusculas(valor):
+    return str(valor).upper()
+
+
+def fecha(valor):
+    """'05 de marzo de 2025'"""
+    return formatear_fecha(valor)
+
+
+def fecha_sin_relleno(valor):
+    """'5 de marzo de 2025'"""
+    return formatear_fecha(valor, relleno=False)
+
+
+def hora(valor):
+    return valor.strftime('%H:%M')
+
+
+def moneda(valor):
+    """'$1,234.56'"""
+    return f'${valor:,.2f}'
+
+
+def miles(valor):
+    """'1,234'"""
+    return f'{valor:,}'
+
+
+def miles_sin_decimales(valor):
+    """'1,234' también para Decimal"""
+    return f'{valor:,.0f}'
+
+
+def porcentaje(valor):
+    """'24.00%' (respeta la representación del valor)"""
+    return f'{valor}%'
+
+
+def en_letra(valor):
+    return numero_en_letra(valor)
+
+
+def en_letra_capitalizada(valor):
+    return numero_en_letra(valor, capitalizar=True)
+
+
+def si_no(valor):
+    return 'Sí' if valor else 'No'
+
+
+# ---------------------------------------------------------------------------
+# Orígenes calculados (reciben el objeto completo)
+# ---------------------------------------------------------------------------
+
+def mostrar(campo):
+    """Origen que usa get_<campo>_display() de un campo con choices (vacío si el campo lo está)"""
+    def leer(obj):
+        if not getattr(obj, campo):
+            return None
+        return getattr(obj, f'get_{campo}_display')()
+    return leer
+
+
+def literal(campo):
+    """Origen que lee una forma literal guardada (ver documentos.literales)"""
+    def leer(obj):
+        return obj.literal(campo)
+    return leer
+
+
+class Campo:
+    """
+    Un placeholder y cómo se calcula su valor.
+
+    Args:
+        placeholder: texto a reemplazar ('{{fecha}}', o la variable de docxtpl)
+        origen: nombre del atributo del objeto o función obj -> valor; por
+            omisión el nombre del placeholder sin llaves
+        *transformaciones: funciones aplicadas en orden al valor no vacío
+        vacio: texto cuando el valor está vacío
+        cero: si True, 0 y False no cuentan como vacíos (solo None y '')
+    """
+
+    __slots__ = ('placeholder', 'origen', 'transformaciones', 'vacio', 'cero', '_leer')
+
+    def __init__(self, placeholder, origen=None, *transformaciones, vacio='', cero=False):
+        if origen is None:
+            origen = placeholder.strip('{} ')
+        self.placeholder = placeholder
+        self.origen = origen
+        self.transformaciones = transformaciones
+        self.vacio = vacio
+        self.cero = cero
+        self._leer = origen if callable(origen) else attrgetter(origen)
+
+    def valor(self, obj):
+        valor = self._leer(obj)
+        if valor is None or valor == '' or (not self.cero and not valor):
+            return self.vacio
+        for transformacion in self.transformaciones:
+            valor = transformacion(valor)
+        return valor
+
+    def __repr__(self):
+        return f'Campo({self.placeholder!r})'
+
+
+class ConstructorContexto:
+    """Diccionario de reemplazos compilado para un tipo de documento (y opcionalmente un template)"""
+
+    __slots__ = ('tipo', 'campos', 'placeholders')
+
+    def __init__(self, tipo, campos):
+        self.tipo = tipo
+        self.campos = tuple((campo.placeholder, campo.valor) for campo in campos)
+        self.placeholders = frozenset(placeholder for placeholder, _ in self.campos)
+
+    def __call__(self, obj):
+        return {placeholder: valor(obj) for placeholder, valor in self.campos}
+
+    def __len__(self):
+        return len(self.campos)
+
+
+MAPEOS = {}
+
+
+def registrar(tipo, campos):
+    """Registra (o reemplaza) la lista de campos de un tipo de documento"""
+    MAPEOS[tipo] = tuple(campos)
+    _compilar.cache_clear()
+
+
+def campos_de(tipo):
+    try:
+        return MAPEOS[tipo]
+    except KeyError:
+        raise KeyError(f"No hay mapeo de placeholders registrado para '{tipo}'") from None
+
+
+@lru_cache(maxsize=None)
+def _compilar(tipo, presentes):
+    campos = campos_de(tipo)
+    if presentes is not None:
+        campos = [campo for campo in campos if campo.placeholder in presentes]
+    return ConstructorContexto(tipo, campos)
+
+
+class EscaneoPlantilla:
+    """Resultado de recorrer un template: placeholders presentes y los partidos entre runs"""
+
+    __slots__ = ('placeholders', 'partidos')
+
+    def __init__(self, placeholders, partidos):
+        self.placeholders = frozenset(placeholders)
+        self.partidos = frozenset(partidos)
+
+
+@lru_cache(maxsize=64)
+def _escanear(ruta, mtime):
+    encontrados = set()
+    partidos = set()
+    with zipfile.ZipFile(ruta) as paquete:
+        for nombre in paquete.namelist():
+            if not PARTES_CON_TEXTO.match(nombre):
+                continue
+            raiz = etree.fromstring(paquete.read(nombre))
+            for parrafo in raiz.iter(W_P):
+                textos = [t.text or '' for t in parrafo.iter(W_T)]
+                # Se une el texto del párrafo: un placeholder puede estar partido en varios runs
+                contenido = ''.join(textos)
+                if '{{' not in contenido:
+                    continue
+                en_parrafo = PATRON_PLACEHOLDER.findall(contenido)
+                encontrados.update(en_parrafo)
+                partidos.update(p for p in en_parrafo if not any(p in texto for texto in textos))
+    return EscaneoPlantilla(encontrados, partidos)
+
+
+def escanear_plantilla(ruta):
+    """Recorre un template DOCX una sola vez mientras el archivo no cambie (memorizado por mtime)"""
+    return _escanear(str(ruta), os.path.getmtime(ruta))
+
+
+def placeholders_de_plantilla(ruta):
+    """Placeholders {{...}} presentes en un template DOCX"""
+    return escanear_plantilla(ruta).placeholders
+
+
+def constructor_contexto(tipo, plantilla=None):
+    """
+    Constructor compilado para un tipo de documento. Con `plantilla` solo
+    incluye los placeholders que aparecen en ese template.
+    """
+    presentes = None
+    if plantilla and os.path.exists(plantilla):
+        presentes = placeholders_de_plantilla(plantilla)
+    return _compilar(tipo, presentes)
+
+
+def construir_contexto(tipo, obj, plantilla=None):
+    """Diccionario {placeholder: valor} del objeto para el tipo de documento"""
+    return constructor_contexto(tipo, plantilla)(obj)
@@ -0,0 +1,193 @@
+"""
+Catálogo y revisión de los templates DOCX (*PLACE.docx).
+
+Cada template se compila una sola vez (memorizado por mtime): se recorren sus
+partes XML, se contrastan los placeholders encontrados con el mapeo declarado en
+documentos/mapeos.py y se guarda el resultado en una PlantillaCompilada. Los
+generadores consultan ese resultado en lugar de volver a recorrer el documento
+en cada descarga.
+
+La revisión se ejecuta al arrancar (system check de Django, ver apps.py) y bajo
+demanda con `python manage.py revisar_plantillas`.
+"""
+
+import hashlib
+import os
+import re
+from functools import lru_cache
+from io import BytesIO
+
+from django.conf import settings
+from django.core import checks
+
+from . import mapeos  # noqa: F401  (registra los tipos de documento en MAPEOS)
+from .placeholders import MAPEOS, escanear_plantilla
+
+
+CARPETA_PLANTILLAS = os.path.join(settings.BASE_DIR.parent, "DOCUMENTOS OLEA ABOGADOS")
+
+RUTAS_PLANTILLAS = {
+    'pagare': ("Pagarés", "PAGARE_PLACE.docx"),
+    'contrato_credito': ("Contratos de Crédito", "Contrato de Credito PLACE.docx"),
+    'convenio_modificatorio': ("Convenios Modificatorios", "Convenio Modificatorio PLACE.docx"),
+    'estatutos_sociedad': ("Estatutos Sociales", "Estatutos Sociales PLACE.docx"),
+    'contrato_prenda': ("Contratos de Prenda Sobre Acciones", "Contrato de Prenda PLACE.docx"),
+    'acta_consejo': ("Actas Sesiones de Consejo", "Acta de Sesion de Consejo de Administración PLACE.docx"),
+    'acta_asamblea': ("Actas de Asambleas", "Acta de Asamblea PLACE.docx"),
+}
+
+# Placeholders que no vienen del mapeo: el generador los sustituye por un bloque
+# (tabla de amortización, orden del día con resoluciones)
+BLOQUES = {
+    'pagare': frozenset({'{{TABLA_AMORTIZACION}}'}),
+    'acta_consejo': frozenset({'{{ORDENES_Y_RESOLUCIONES}}'}),
+    'acta_asamblea': frozenset({'{{ORDENES_Y_RESOLUCIONES}}'}),
+}
+
+# Templates de docxtpl: el mapeo usa nombres de variable Jinja sin llaves
+DOCXTPL = frozenset({'contrato_prenda'})
+
+PATRON_VARIABLE_JINJA = re.compile(r'\{\{\s*([A-Za-z_]\w*)')
+
+
+def ruta_plantilla(tipo):
+    """Ruta absoluta del template DOCX de un tipo de documento"""
+    try:
+        carpeta, archivo = RUTAS_PLANTILLAS[tipo]
+    except KeyError:
+        raise KeyError(f"No hay template registrado para '{tipo}'") from None
+    return os.path.join(CARPETA_PLANTILLAS, carpeta, archivo)
+
+
+class PlantillaCompilada:
+    """
+    Resultado de revisar un template contra su mapeo.
+
+    Atributos:
+        placeholders: placeholders presentes en el template
+        partidos: placeholders cuyo texto está repartido en varios runs
+        sin_mapeo: presentes en el template pero sin Campo ni bloque que los llene
+        sin_uso: declarados en el mapeo pero ausentes del template
+        huella: SHA-256 del archivo del template (para ETags de descarga)
+        modificada: mtime del template
+        contenido: bytes del archivo, para abrirlo sin volver a leer el disco
+    """
+
+    __slots__ = ('tipo', 'ruta', 'placeholders', 'partidos', 'sin_mapeo', 'sin_uso', 'huella', 'modificada',
+                 'contenido')
+
+    def __init__(self, tipo, ruta, placeholders, partidos, mapeados, huella='', modificada=0.0, contenido=b''):
+        self.tipo = tipo
+        self.ruta = ruta
+        self.huella = huella
+        self.modificada = modificada
+        self.contenido = contenido
+        self.placeholders = frozenset(placeholders)
+        self.partidos = frozenset(partidos)
+        conocidos = frozenset(mapeados) | BLOQUES.get(tipo, frozenset())
+        self.sin_mapeo = self.placeholders - conocidos
+        self.sin_uso = frozenset(mapeados) - self.placeholders
+
+    def contiene(self, placeholder):
+        return placeholder in self.placeholders
+
+    def abrir(self):
+        """Archivo en memoria con el template, listo para Document() o DocxTemplate()"""
+        return BytesIO(self.contenido)
+
+    @property
+    def correcta(self):
+        return not self.sin_mapeo
+
+    def como_dict(self):
+        return {
+            'tipo': self.tipo,
+            'ruta': self.ruta,
+            'placeholders': sorted(self.placeholders),
+            'partidos': sorted(self.partidos),
+            'sin_mapeo': sorted(self.sin_mapeo),
+            'sin_uso': sorted(self.sin_uso),
+        }
+
+
+def _nombres_jinja(placeholders):
+    """'{{ deudor.nombre|upper }}' -> 'deudor'"""
+    nombres = set()
+    for placeholder in placeholders:
+        coincidencia = PATRON_VARIABLE_JINJA.match(placeholder)
+        if coincidencia:
+            nombres.add(coincidencia.group(1))
+    return nombres
+
+
+@lru_cache(maxsize=None)
+def _compilar_plantilla(tipo, ruta, mtime):
+    escaneo = escanear_plantilla(ruta)
+    placeholders, partidos = escaneo.placeholders, escaneo.partidos
+    if tipo in DOCXTPL:
+        placeholders, partidos = _nombres_jinja(placeholders), _nombres_jinja(partidos)
+    mapeados = {campo.placeholder for campo in MAPEOS.get(tipo, ())}
+    with open(ruta, 'rb') as archivo:
+        contenido = archivo.read()
+    huella = hashlib.sha256(contenido).hexdigest()
+    return PlantillaCompilada(tipo, ruta, placeholders, partidos, mapeados, huella, mtime, contenido)
+
+
+def plantilla_compilada(tipo):
+    """
+    PlantillaCompilada del tipo de documento; se recompila solo si el template
+    cambió en disco. Lanza FileNotFoundError si el template no existe.
+    """
+    ruta = ruta_plantilla(tipo)
+    if not os.path.exists(ruta):
+        raise FileNotFoundError(f"Template no encontrado en: {ruta}")
+    return _compilar_plantilla(tipo, ruta, os.path.getmtime(ruta))
+
+
+def abrir_plantilla(tipo):
+    """
+    Template del tipo de documento como archivo en memoria. Los bytes quedan en
+    la PlantillaCompilada, así que tras el precalentamiento (ver
+    documentos.precalentar) los workers no vuelven a leer el template del disco.
+    """
+    return plantilla_compilada(tipo).abrir()
+
+
+def revisar_plantillas(tipos=None):
+    """
+    Compila los templates indicados (por defecto todos).
+
+    Returns:
+        (compiladas, faltantes): lista de PlantillaCompilada y lista de
+        (tipo, ruta) cuyos archivos no existen
+    """
+    compiladas, faltantes = [], []
+    for tipo in tipos or RUTAS_PLANTILLAS:
+        try:
+            compiladas.append(plantilla_compilada(tipo))
+        except FileNotFoundError:
+            faltantes.append((tipo, ruta_plantilla(tipo)))
+    return compiladas, faltantes
+
+
+@checks.register('plantillas')
+def revisar_plantillas_al_iniciar(app_configs=None, **kwargs):
+    """System check: compila los templates al arrancar y avisa de placeholders sin mapeo"""
+    avisos = []
+    compiladas, faltantes = revisar_plantillas()
+    for plantilla in compiladas:
+        if plantilla.sin_mapeo:
+            avisos.append(checks.Warning(
+                f"El template de '{plantilla.tipo}' tiene placeholders sin mapeo: "
+                f"{', '.join(sorted(plantilla.sin_mapeo))}",
+                hint="Declara un Campo en documentos/mapeos.py o corrige el template.",
+                obj=plantilla.ruta,
+                id='documentos.W001',
+            ))
+    for tipo, ruta in faltantes:
+        avisos.append(checks.Warning(
+            f"No se encontró el template de '{tipo}'",
+            obj=ruta,
+            id='documentos.W002',
+        ))
+    return avisos
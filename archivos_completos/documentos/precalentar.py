@@ -0,0 +1,87 @@
+"""
+Precalentamiento de los generadores de documentos.
+
+La primera descarga de cada proceso pagaba la importación de la pila de
+generación (python-docx, docxtpl, ReportLab, num2words) y la compilación de los
+templates *PLACE.docx. precalentar() hace ese trabajo al arrancar el servidor
+(lo llama el hook when_ready de gunicorn.conf.py con precalentar_servidor):
+importa los módulos, compila todos los templates
+(placeholders, huella y bytes del archivo, ver documentos.plantillas), prepara
+los constructores de contexto de cada mapeo y registra las fuentes y estilos de
+PDF.
+
+Con gunicorn y ``preload_app = True`` (ver gunicorn.conf.py) esto ocurre una
+sola vez en el proceso maestro antes del fork y los workers comparten esa
+memoria copy-on-write. No corre en DocumentosConfig.ready para que migrate,
+shell o los comandos de cron no paguen la lectura de los templates. Se
+desactiva con ``DOCUMENTOS_PRECALENTAR = False``.
+"""
+
+import importlib
+import time
+
+from django.conf import settings
+
+
+# Módulos que importan la pila de generación completa (vistas de descarga incluidas)
+MODULOS_GENERADORES = (
+    'documentos.pdf_generator',
+    'documentos.pdf_nativo',
+    'documentos.docx_contrato_credito_generator',
+    'documentos.docx_convenio_generator',
+    'documentos.docx_estatutos_generator',
+    'documentos.docx_prenda_generator',
+    'documentos.views',
+)
+
+
+def precalentamiento_activo():
+    return getattr(settings, 'DOCUMENTOS_PRECALENTAR', True)
+
+
+def precalentar():
+    """
+    Importa los generadores y compila todos los templates.
+
+    Returns:
+        diccionario con los templates compilados, los faltantes y la duración en segundos
+    """
+    inicio = time.perf_counter()
+
+    for modulo in MODULOS_GENERADORES:
+        importlib.import_module(modulo)
+
+    from .pdf_styles import fuente_legal, obtener_estilos
+    from .placeholders import MAPEOS, constructor_contexto
+    from .plantillas import revisar_plantillas
+
+    compiladas, faltantes = revisar_plantillas()
+    for plantilla in compiladas:
+        if plantilla.tipo in MAPEOS:
+            constructor_contexto(plantilla.tipo, plantilla.ruta)
+
+    fuente_legal()
+    obtener_estilos()
+
+    return {
+        'plantillas': [plantilla.tipo for plantilla in compiladas],
+        'faltantes': [tipo for tipo, _ in faltantes],
+        'segundos': time.perf_counter() - inicio,
+    }
+
+
+def precalentar_servidor(log):
+    """
+    Precalienta si DOCUMENTOS_PRECALENTAR está activo y reporta en `log` (el
+    logger de gunicorn). Un template dañado no impide que arranque el sitio:
+    se compila en la descarga.
+    """
+    if not precalentamiento_activo():
+        return
+    try:
+        resumen = precalentar()
+    except Exception as e:
+        log.warning(f"Precalentamiento de documentos falló: {e}")
+    else:
+        log.info(f"Documentos precalentados: {len(resumen['plantillas'])} templates "
+                 f"en {resumen['segundos'] * 1000:.0f} ms")
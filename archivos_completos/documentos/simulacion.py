@@ -0,0 +1,225 @@
+"""
+Simulación de condiciones de pagaré sin guardar nada.
+
+Recibe una rejilla de escenarios (tasa, número de pagos, periodicidad, gastos
+de administración y monto) y calcula para cada uno la cuota, los intereses, el
+IVA y el CAT con el mismo motor que la tabla del documento
+(documentos/amortizacion.py), de modo que lo simulado coincide al centavo con
+lo que se imprimiría. Los escenarios repetidos de la rejilla se calculan una
+sola vez; los distintos, uno por uno, porque el motor va fila por fila en
+centavos enteros y no hay un cálculo vectorizado de toda la rejilla. No lee ni
+escribe la base de datos.
+
+Formato de la petición (JSON):
+
+    {
+        "base": {"monto_numeric": 100000, "tasa_interes_ordinario": 24, "num_pagos": 12,
+                 "periodicidad": "mensual", "gastos_admon": 350},
+        "variaciones": {"tasa_interes_ordinario": [18, 24], "num_pagos": [12, 24]},
+        "escenarios": [{"periodicidad": "quincenal"}]
+    }
+
+Cada escenario es `base` con los cambios de un elemento de `escenarios` (por
+defecto uno vacío) y una combinación de `variaciones` (producto cartesiano).
+`"redondeo"` (opcional) elige la política de redondeo del interés
+(ver documentos/amortizacion.py); por defecto la de DOCUMENTOS_AMORTIZACION_REDONDEO.
+Con `fecha_emision` (AAAA-MM-DD) el interés se devenga por los días reales
+del calendario de pagos (documentos/calendario.py) sobre `base_intereses`
+(360 por defecto), como en la tabla del pagaré; sin fecha, con la tasa anual
+entre los periodos del año.
+"""
+
+import itertools
+import math
+from datetime import date
+
+from django.conf import settings
+
+from .amortizacion import (
+    IVA, PERIODOS_POR_ANIO, a_pesos, calcular_cuotas, costo_admon_por_periodo, normalizar_periodicidad,
+    politica_redondeo,
+)
+from .calendario import calendario_de_pagos, devengo_configurado
+from .models import Pagare
+
+
+CAMPOS = (
+    'monto_numeric', 'tasa_interes_ordinario', 'num_pagos', 'periodicidad', 'gastos_admon',
+    'fecha_emision', 'base_intereses',
+)
+
+# Límites de los campos del modelo Pagare
+MONTO_MAXIMO = 9999999999.99
+TASA_MAXIMA = 999.99
+PAGOS_MAXIMOS = 600
+
+MAX_ESCENARIOS_POR_DEFECTO = 1000
+
+
+def _numero(valor, campo, minimo, maximo, entero=False):
+    try:
+        numero = float(valor)
+    except (TypeError, ValueError):
+        raise ValueError(f"'{campo}' debe ser un número")
+    if not math.isfinite(numero) or not minimo <= numero <= maximo:
+        raise ValueError(f"'{campo}' debe estar entre {minimo} y {maximo}")
+    if entero:
+        if not numero.is_integer():
+            raise ValueError(f"'{campo}' debe ser un entero")
+        return int(numero)
+    return numero
+
+
+def validar_escenario(escenario):
+    """Parámetros normalizados del escenario; ValueError con el campo inválido"""
+    desconocidos = set(escenario) - set(CAMPOS)
+    if desconocidos:
+        raise ValueError(f"Campos desconocidos: {', '.join(sorted(desconocidos))}")
+    for campo in ('monto_numeric', 'tasa_interes_ordinario', 'num_pagos'):
+        if escenario.get(campo) in (None, ''):
+            raise ValueError(f"Falta '{campo}'")
+
+    periodicidad = str(escenario.get('periodicidad') or 'mensual').lower()
+    opciones = dict(Pagare.PERIODICIDAD_CHOICES)
+    if periodicidad not in opciones:
+        raise ValueError(f"'periodicidad' debe ser una de: {', '.join(opciones)}")
+    fecha_emision = escenario.get('fecha_emision') or None
+    if fecha_emision is not None:
+        try:
+            fecha_emision = date.fromisoformat(str(fecha_emision))
+        except ValueError:
+            raise ValueError("'fecha_emision' debe tener el formato AAAA-MM-DD")
+    return (
+        _numero(escenario['monto_numeric'], 'monto_numeric', 0.01, MONTO_MAXIMO),
+        _numero(escenario['tasa_interes_ordinario'], 'tasa_interes_ordinario', 0, TASA_MAXIMA),
+        _numero(escenario['num_pagos'], 'num_pagos', 1, PAGOS_MAXIMOS, entero=True),
+        # Igual que en la tabla del documento, sin tabla propia se amortiza como mensual
+        normalizar_periodicidad(periodicidad),
+        costo_admon_por_periodo(_numero(escenario.get('gastos_admon') or 0, 'gastos_admon', 0, MONTO_MAXIMO)),
+        fecha_emision,
+        _numero(escenario.get('base_intereses') or 360, 'base_intereses', 360, 365, entero=True),
+    )
+
+
+def expandir_escenarios(datos):
+    """Lista de escenarios (diccionarios) a partir de base, escenarios y variaciones"""
+    if not isinstance(datos, dict):
+        raise ValueError('Se esperaba un objeto JSON')
+    base = datos.get('base') or {}
+    cambios = datos.get('escenarios') or [{}]
+    variaciones = datos.get('variaciones') or {}
+    if not isinstance(base, dict) or not isinstance(cambios, list) or not isinstance(variaciones, dict):
+        raise ValueError("'base' y 'variaciones' deben ser objetos y 'escenarios' una lista")
+    for campo, valores in variaciones.items():
+        if not isinstance(valores, list) or not valores:
+            raise ValueError(f"La variación de '{campo}' debe ser una lista con valores")
+
+    limite = getattr(settings, 'DOCUMENTOS_SIMULACION_MAX_ESCENARIOS', None) or MAX_ESCENARIOS_POR_DEFECTO
+    total = len(cambios) * math.prod(len(valores) for valores in variaciones.values())
+    if total > limite:
+        raise ValueError(f'La rejilla tiene {total} escenarios; el máximo es {limite}')
+
+    campos = list(variaciones)
+    escenarios = []
+    for cambio in cambios:
+        if not isinstance(cambio, dict):
+            raise ValueError("Cada elemento de 'escenarios' debe ser un objeto")
+        for combinacion in itertools.product(*(variaciones[campo] for campo in campos)):
+            escenarios.append({**base, **cambio, **dict(zip(campos, combinacion))})
+    return escenarios
+
+
+def _cat(monto, flujos, periodos_por_anio):
+    """
+    Costo anual total (%): tasa que iguala el monto con los pagos sin IVA,
+    anualizada como (1 + r)^m - 1. Newton sobre el valor presente; None si
+    no es representable.
+    """
+    r = 0.01
+    for _ in range(100):
+        valor = -monto
+        derivada = 0.0
+        descuento = 1.0 / (1.0 + r)
+        factor = descuento
+        for k, flujo in enumerate(flujos, start=1):
+            valor += flujo * factor
+            derivada -= k * flujo * factor * descuento
+            factor *= descuento
+        if derivada == 0:
+            break
+        paso = valor / derivada
+        r = max(r - paso, -0.99)
+        if abs(paso) < 1e-12:
+            break
+    try:
+        cat = ((1.0 + r) ** periodos_por_anio - 1.0) * 100.0
+    except OverflowError:
+        return None
+    # Sin solución representable (montos absurdos frente a los gastos) se reporta como nulo
+    return round(cat, 1) if math.isfinite(cat) else None
+
+
+def simular_escenario(monto, tasa, num_pagos, periodicidad, costo_admon, fecha_emision=None, base=360,
+                      redondeo=None):
+    """Cuota, totales e indicadores de un escenario ya validado"""
+    dias = None
+    if fecha_emision is not None and devengo_configurado() == 'dias':
+        _, dias = calendario_de_pagos(fecha_emision, num_pagos, periodicidad)
+    pago_total, costo_admon, iva_costo_admon, filas = calcular_cuotas(
+        monto, num_pagos, tasa, periodicidad, costo_admon, redondeo, dias=dias, base=base,
+    )
+    # Sumas en centavos enteros: exactas
+    total_intereses = sum(fila[2] for fila in filas)
+    iva_intereses = sum(fila[3] for fila in filas)
+    iva_gastos = iva_costo_admon * num_pagos
+    total_pagado = sum(fila[4] for fila in filas)
+    # El CAT se calcula sin IVA; con calendario, anualizado con los días reales de los periodos
+    periodos_por_anio = PERIODOS_POR_ANIO[periodicidad] if dias is None else 365 * num_pagos / sum(dias)
+    flujos = [a_pesos(fila[4] - fila[3] - iva_costo_admon) for fila in filas]
+    return {
+        'monto_numeric': monto,
+        'tasa_interes_ordinario': tasa,
+        'num_pagos': num_pagos,
+        'periodicidad': periodicidad,
+        'fecha_emision': fecha_emision.isoformat() if fecha_emision else None,
+        'base_intereses': base,
+        'gastos_admon': a_pesos(costo_admon),
+        'cuota': a_pesos(pago_total),
+        'ultima_cuota': a_pesos(filas[-1][4]),
+        'total_capital': a_pesos(sum(fila[0] for fila in filas)),
+        'total_intereses': a_pesos(total_intereses),
+        'iva_intereses': a_pesos(iva_intereses),
+        'total_gastos': a_pesos(costo_admon * num_pagos),
+        'iva_gastos': a_pesos(iva_gastos),
+        'total_iva': a_pesos(iva_intereses + iva_gastos),
+        'total_pagado': a_pesos(total_pagado),
+        'costo_financiero': round(a_pesos(total_pagado) - monto, 2),
+        'cat': _cat(monto, flujos, periodos_por_anio),
+    }
+
+
+def simular(datos):
+    """
+    Resultados de todos los escenarios de la petición, en el mismo orden.
+    Lanza ValueError indicando el escenario inválido.
+    """
+    escenarios = expandir_escenarios(datos)
+    redondeo = datos.get('redondeo')
+    if redondeo is not None and not isinstance(redondeo, str):
+        raise ValueError("'redondeo' debe ser el nombre de una política de redondeo")
+    politica_redondeo(redondeo)  # ValueError si no existe
+    calculados = {}
+    resultados = []
+    for posicion, escenario in enumerate(escenarios):
+        try:
+            parametros = validar_escenario(escenario)
+        except ValueError as e:
+            raise ValueError(f'Escenario {posicion}: {e}')
+        if parametros not in calculados:
+            calculados[parametros] = simular_escenario(*parametros, redondeo)
+        resultados.append(calculados[parametros])
+    return {
+        'iva': IVA,
+        'num_escenarios': len(resultados),
+        'escenarios': resultados,
+    }
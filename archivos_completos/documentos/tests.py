@@ -1,3 +1,579 @@
-from django.test import TestCase
+import json
+import os
+import random
+from datetime import date, datetime, time, timedelta
+from decimal import Decimal
 
-# Create your tests here.
+from django.contrib.auth import get_user_model
+from django.db import models
+from django.test import SimpleTestCase, TestCase, override_settings
+from django.urls import reverse
+from django.utils import timezone
+from docx import Document
+
+from .amortizacion import (
+    IVA, PERIODOS_POR_ANIO, POLITICAS_REDONDEO, a_pesos, calcular_cuotas, centavos, costo_admon_por_periodo,
+)
+from .calendario import AJUSTES, Calendario, calendario_de_pagos, fechas_de_pago, sumar_meses
+from .cartera import CAMPOS_IMPORTE, cuotas_de_tabla, reconstruir_tablas, tabla_automatica
+from .condicional import etag_documento
+from .docx_reemplazos import reemplazar_en_documento, reemplazar_en_parrafo
+from .estatutos_sociedad import EstatutosSociedad
+from .literales import recalcular_literales
+from .mapeos import construir_contexto
+from .models import (
+    ActaAsamblea, ActaSesionConsejo, ContratoCredito, ContratoPrendaAcciones, ConvenioModificatorio, CuotaAmortizacion,
+    Pagare,
+)
+from .pagos import registrar_pagos
+from .plantillas import plantilla_compilada
+from .vencimientos import marcar_vencimientos
+
+
+def _calcular_cuotas_anterior(monto, num_pagos, tasa_anual_pct, periodicidad, gastos_admon):
+    """
+    Réplica del motor anterior (float, redondeo por fila con round).
+
+    Returns:
+        (pago_total, costo_admon, iva_costo_admon, filas) con (capital, saldo, interes, iva_interes) por periodo
+    """
+    P = float(monto)
+    n = int(num_pagos)
+    i = float(tasa_anual_pct) / 100.0 / PERIODOS_POR_ANIO[periodicidad]
+    costo_admon = costo_admon_por_periodo(gastos_admon)
+    iva_costo_admon = round(costo_admon * IVA, 2)
+    i_eff = i * (1.0 + IVA)
+    if i_eff > 0:
+        cuota_base_eff = P * (i_eff * (1 + i_eff) ** n) / ((1 + i_eff) ** n - 1)
+    else:
+        cuota_base_eff = P / n
+
+    filas = []
+    saldo = P
+    residuo_cap = 0.0
+    for k in range(1, n + 1):
+        interes = saldo * i
+        iva_interes = interes * IVA
+        capital_teorico = cuota_base_eff - (interes + iva_interes)
+        capital = round(capital_teorico, 2)
+        residuo_cap += capital_teorico - capital
+        if k == n:
+            ajuste = saldo - capital
+            capital = round(capital + ajuste + residuo_cap, 2)
+        saldo = round(max(0.0, saldo - capital), 2)
+        filas.append((capital, saldo, round(interes, 2), round(iva_interes, 2)))
+    return round(cuota_base_eff + costo_admon + iva_costo_admon, 2), round(costo_admon, 2), iva_costo_admon, filas
+
+
+def _tabla_anterior(pagare):
+    """Tabla JSON como la guardaba el modelo antes del motor en centavos y de la huella"""
+    total, costo_admon, iva_costo_admon, filas = _calcular_cuotas_anterior(
+        pagare.monto_numeric, pagare.num_pagos, pagare.tasa_interes_ordinario, pagare.periodicidad, pagare.gastos_admon,
+    )
+    n = int(pagare.num_pagos)
+    return [
+        {
+            'numero': k, 'fecha': sumar_meses(pagare.fecha_emision, k).strftime('%d/%m/%Y'),
+            'capital': capital, 'saldo': saldo, 'costo_admon': costo_admon, 'iva_costo_admon': iva_costo_admon,
+            'interes': interes, 'iva_interes': iva_interes, 'total': total, 'estado': 'pendiente',
+            'fecha_pago_real': None, 'etapa': 'Etapa de Estudios' if k <= n * 0.8 else 'Etapa de Egreso',
+        }
+        for k, (capital, saldo, interes, iva_interes) in enumerate(filas, start=1)
+    ]
+
+
+def _cuota_por_dias_anterior(monto, tasa_anual_pct, dias, base, gastos_admon):
+    """La misma cuota fija calculada en float con una tasa por periodo: monto / Σ_k Π_{j<=k} 1/(1+i_j(1+IVA))"""
+    costo_admon = costo_admon_por_periodo(gastos_admon)
+    tasas = [float(tasa_anual_pct) / 100.0 * d / base for d in dias]
+    if not any(tasas):
+        cuota = float(monto) / len(dias)
+    else:
+        descuento = 1.0
+        suma = 0.0
+        for tasa in tasas:
+            descuento /= 1 + tasa * (1 + IVA)
+            suma += descuento
+        cuota = float(monto) / suma
+    return round(cuota + costo_admon + round(costo_admon * IVA, 2), 2)
+
+
+class CalcularCuotasTests(SimpleTestCase):
+    """
+    Propiedades del motor en centavos sobre tablas aleatorias (semilla fija) de
+    cada política de redondeo, periodicidad y modo de devengo, contra el motor
+    anterior en float.
+    """
+
+    CASOS = 25
+    MONTOS = (Decimal('1000.00'), Decimal('45999.99'), Decimal('150000.00'), Decimal('2500000.01'))
+    PLAZOS = (1, 2, 3, 6, 12, 24, 36, 60, 120, 240, 360)
+    TASAS = (Decimal('0'), Decimal('0.5'), Decimal('9.99'), Decimal('12'), Decimal('24'), Decimal('36.5'), Decimal('60'))
+    GASTOS = (None, Decimal('0'), Decimal('100'), Decimal('350'), Decimal('1234.56'))
+    FECHA_INICIO = date(2025, 1, 31)
+
+    def casos(self, semilla):
+        azar = random.Random(semilla)
+        for _ in range(self.CASOS):
+            monto = azar.choice(self.MONTOS) + Decimal(azar.randint(0, 99999)) / 100
+            yield monto, azar.choice(self.PLAZOS), azar.choice(self.TASAS), azar.choice(self.GASTOS), azar.choice((360, 365))
+
+    def revisar_tabla(self, monto, resultado):
+        pago_total, costo_admon, iva_costo_admon, filas = resultado
+        gastos = costo_admon + iva_costo_admon
+        self.assertEqual(sum(fila[0] for fila in filas), centavos(monto))
+        self.assertEqual(filas[-1][1], 0)
+        for capital, saldo, interes, iva_interes, total in filas:
+            self.assertGreaterEqual(saldo, 0)
+            self.assertEqual(total, capital + interes + iva_interes + gastos)
+        return pago_total
+
+    def test_propiedades_por_politica_periodicidad_y_devengo(self):
+        for politica in POLITICAS_REDONDEO:
+            for periodicidad in PERIODOS_POR_ANIO:
+                for modo in ('periodo', 'dias'):
+                    semilla = f'{politica}-{periodicidad}-{modo}'
+                    for monto, n, tasa, gastos, base in self.casos(semilla):
+                        with self.subTest(politica=politica, periodicidad=periodicidad, modo=modo,
+                                          monto=monto, n=n, tasa=tasa, gastos=gastos, base=base):
+                            if modo == 'dias':
+                                _, dias = calendario_de_pagos(self.FECHA_INICIO, n, periodicidad)
+                                anterior = _cuota_por_dias_anterior(monto, tasa, dias, base, gastos)
+                            else:
+                                dias = None
+                                anterior = _calcular_cuotas_anterior(monto, n, tasa, periodicidad, gastos)[0]
+                            resultado = calcular_cuotas(monto, n, tasa, periodicidad, gastos,
+                                                        politica=politica, dias=dias, base=base)
+                            pago_total = self.revisar_tabla(monto, resultado)
+                            self.assertLessEqual(abs(Decimal(str(a_pesos(pago_total))) - Decimal(str(anterior))),
+                                                 Decimal('0.01'))
+
+    def test_periodo_largo_no_deja_saldo_negativo(self):
+        """Periodos largos con tasa alta: el interés supera la cuota y se capitaliza"""
+        dias = [400] + [1] * 11
+        for politica in POLITICAS_REDONDEO:
+            with self.subTest(politica=politica):
+                resultado = calcular_cuotas(Decimal('100000'), 12, Decimal('99.9'), 'mensual', None,
+                                            politica=politica, dias=dias, base=360)
+                self.revisar_tabla(Decimal('100000'), resultado)
+
+    def test_plazo_de_un_pago(self):
+        for politica in POLITICAS_REDONDEO:
+            with self.subTest(politica=politica):
+                _, _, _, filas = calcular_cuotas(Decimal('1234.56'), 1, Decimal('24'), 'mensual', None,
+                                                 politica=politica, dias=[31])
+                self.assertEqual(filas[0][0], 123456)
+                self.assertEqual(filas[0][1], 0)
+
+
+class CalendarioTests(SimpleTestCase):
+
+    def test_diario_paga_en_dias_habiles_consecutivos_con_cualquier_ajuste(self):
+        inicio = date(2025, 12, 19)  # viernes; el 25 es feriado
+        calendario = Calendario()
+        esperadas = fechas_de_pago(inicio, 10, 'diario', 'siguiente')
+        for ajuste in AJUSTES[1:]:
+            with self.subTest(ajuste=ajuste):
+                fechas = fechas_de_pago(inicio, 10, 'diario', ajuste)
+                self.assertEqual(fechas, esperadas)
+                self.assertTrue(all(calendario.es_habil(fecha) for fecha in fechas))
+                self.assertEqual(len(set(fechas)), len(fechas))
+        self.assertNotIn(date(2025, 12, 25), esperadas)
+        self.assertEqual(fechas_de_pago(inicio, 3, 'diario', 'ninguno'),
+                         [date(2025, 12, 20), date(2025, 12, 21), date(2025, 12, 22)])
+
+
+def crear_pagare(usuario, **campos):
+    """Pagaré guardado con datos representativos (12 pagos mensuales desde el 15/01/2025)"""
+    datos = {
+        'lugar_emision': 'Ciudad de México',
+        'fecha_emision': date(2025, 1, 15),
+        'acreedor_nombre': 'FINANCIERA EJEMPLO, S.A. DE C.V.',
+        'acreedor_domicilio': 'Av. Reforma 100, Ciudad de México',
+        'deudor_nombre': 'JUAN PÉREZ LÓPEZ',
+        'deudor_domicilio': 'Calle 5 de Mayo 20, Puebla',
+        'monto_numeric': Decimal('120000.00'),
+        'num_pagos': 12,
+        'periodicidad': 'mensual',
+        'tasa_interes_ordinario': Decimal('24.00'),
+        'tasa_interes_moratorio': Decimal('36.00'),
+        'estado': 'emitido',
+        'usuario': usuario,
+    }
+    datos.update(campos)
+    return Pagare.objects.create(**datos)
+
+
+class CarteraTestCase(TestCase):
+
+    @classmethod
+    def setUpTestData(cls):
+        cls.usuario = get_user_model().objects.create_user('cartera', password='x')
+
+    def assertCuotasSincronizadas(self, pagare):
+        """Las cuotas normalizadas son exactamente las filas de la tabla JSON guardada"""
+        pagare.refresh_from_db()
+        campos = ('numero', 'fecha', 'estado', 'fecha_pago_real') + CAMPOS_IMPORTE
+        esperadas = [tuple(getattr(cuota, campo) for campo in campos)
+                     for cuota in cuotas_de_tabla(pagare, pagare.tabla_amortizacion)]
+        guardadas = list(CuotaAmortizacion.objects.filter(pagare=pagare).order_by('numero').values_list(*campos))
+        self.assertEqual(guardadas, esperadas)
+
+
+class VencimientosTests(CarteraTestCase):
+
+    def test_marca_json_y_cuotas_por_igual(self):
+        pagare = crear_pagare(self.usuario)
+        ejecucion = marcar_vencimientos(corte=date(2025, 5, 1))
+
+        self.assertEqual((ejecucion.cuotas_vencidas, ejecucion.pagares_vencidos), (3, 1))
+        pagare.refresh_from_db()
+        self.assertEqual(pagare.estado, 'vencido')
+        self.assertEqual([fila['estado'] for fila in pagare.tabla_amortizacion[:4]],
+                         ['vencido', 'vencido', 'vencido', 'pendiente'])
+        self.assertCuotasSincronizadas(pagare)
+
+    def test_no_regenera_la_tabla(self):
+        """Aunque la huella quede vieja (update de la tasa), el proceso solo cambia estados"""
+        pagare = crear_pagare(self.usuario)
+        tabla = pagare.tabla_amortizacion
+        Pagare.objects.filter(pk=pagare.pk).update(tasa_interes_ordinario=Decimal('30.00'))
+        marcar_vencimientos(corte=date(2025, 3, 1))
+
+        pagare.refresh_from_db()
+        for antes, despues in zip(tabla, pagare.tabla_amortizacion):
+            self.assertEqual({**antes, 'estado': None}, {**despues, 'estado': None})
+        self.assertCuotasSincronizadas(pagare)
+
+    def test_simulacion_no_escribe(self):
+        pagare = crear_pagare(self.usuario)
+        marcar_vencimientos(corte=date(2025, 5, 1), simulacion=True)
+        pagare.refresh_from_db()
+        self.assertEqual(pagare.estado, 'emitido')
+        self.assertFalse(CuotaAmortizacion.objects.filter(pagare=pagare, estado='vencido').exists())
+
+
+class RegistrarPagosTests(CarteraTestCase):
+
+    def setUp(self):
+        self.pagare = crear_pagare(self.usuario)
+        self.tabla = self.pagare.tabla_amortizacion
+
+    def assertSinCambios(self):
+        pagare = Pagare.objects.get(pk=self.pagare.pk)
+        self.assertEqual(pagare.estado, 'emitido')
+        self.assertEqual(pagare.tabla_amortizacion, self.tabla)
+        self.assertFalse(CuotaAmortizacion.objects.filter(pagare=pagare).exclude(estado='pendiente').exists())
+
+    def test_lote_valido_liquida_el_pagare(self):
+        pagos = [(self.pagare.pk, numero, 'pagado', '2025-06-01') for numero in range(1, 13)]
+        resultado = registrar_pagos(pagos, usuario=self.usuario)
+
+        self.assertTrue(resultado.ok)
+        self.assertEqual((resultado.aplicados, resultado.pagares, resultado.liquidados), (12, 1, 1))
+        self.pagare.refresh_from_db()
+        self.assertEqual(self.pagare.estado, 'pagado')
+        self.assertEqual(self.pagare.tabla_amortizacion[0]['fecha_pago_real'], '2025-06-01')
+        self.assertCuotasSincronizadas(self.pagare)
+
+    def test_un_pago_invalido_anula_el_lote(self):
+        otro = crear_pagare(get_user_model().objects.create_user('ajeno', password='x'))
+        casos = {
+            'cuota inexistente': (self.pagare.pk, 13, 'pagado', None),
+            'estado desconocido': (self.pagare.pk, 2, 'abonado', None),
+            'fecha mal formada': (self.pagare.pk, 2, 'pagado', '01/06/2025'),
+            'pagaré inexistente': (999999, 1, 'pagado', None),
+            'pagaré de otro usuario': (otro.pk, 1, 'pagado', None),
+            'tupla incompleta': (self.pagare.pk, 2),
+        }
+        for caso, invalido in casos.items():
+            with self.subTest(caso):
+                resultado = registrar_pagos([(self.pagare.pk, 1, 'pagado', '2025-02-15'), invalido],
+                                            usuario=self.usuario)
+                self.assertFalse(resultado.ok)
+                self.assertEqual(resultado.aplicados, 0)
+                self.assertEqual([posicion for posicion, _ in resultado.errores], [1])
+                self.assertSinCambios()
+
+    def test_simulacion_no_escribe(self):
+        resultado = registrar_pagos([(self.pagare.pk, 1, 'pagado', None)], simulacion=True)
+        self.assertTrue(resultado.ok)
+        self.assertEqual(resultado.aplicados, 1)
+        self.assertSinCambios()
+
+    def test_no_regenera_la_tabla(self):
+        """Con la huella vieja (update de la tasa), pagar solo cambia estados"""
+        Pagare.objects.filter(pk=self.pagare.pk).update(tasa_interes_ordinario=Decimal('30.00'))
+        self.assertTrue(registrar_pagos([(self.pagare.pk, 1, 'pagado', '2025-02-15')]).ok)
+        self.pagare.refresh_from_db()
+        self.assertEqual(self.pagare.tabla_amortizacion[1:], self.tabla[1:])
+        self.assertEqual(self.pagare.tabla_amortizacion[0]['capital'], self.tabla[0]['capital'])
+        self.assertCuotasSincronizadas(self.pagare)
+
+
+@override_settings(DOCUMENTOS_CALENDARIO_AJUSTE='ninguno', DOCUMENTOS_CALENDARIO_DEVENGO='periodo')
+class TablaGuardadaTests(CarteraTestCase):
+    """Tablas automáticas, heredadas (sin huella) y capturadas a mano"""
+
+    def guardar_sin_huella(self, pagare, tabla):
+        Pagare.objects.filter(pk=pagare.pk).update(tabla_amortizacion=tabla, tabla_amortizacion_huella='')
+        return Pagare.objects.get(pk=pagare.pk)
+
+    def test_tabla_heredada_se_reconoce_y_se_conserva(self):
+        pagare = crear_pagare(self.usuario)
+        heredada = _tabla_anterior(pagare)
+        heredada[0].update(estado='pagado', fecha_pago_real='2025-02-15')
+        pagare = self.guardar_sin_huella(pagare, heredada)
+        self.assertTrue(tabla_automatica(pagare))
+
+        pagare.deudor_nombre = 'JUAN PÉREZ LÓPEZ Y/O'
+        pagare.save()
+        pagare.refresh_from_db()
+        self.assertEqual(pagare.tabla_amortizacion, heredada)
+        self.assertTrue(pagare.tabla_amortizacion_huella)
+
+        # Con la huella, un cambio de sus propios datos sí la regenera (conservando el pago)
+        pagare.tasa_interes_ordinario = Decimal('18.00')
+        pagare.save()
+        pagare.refresh_from_db()
+        self.assertNotEqual(pagare.tabla_amortizacion[1]['interes'], heredada[1]['interes'])
+        self.assertEqual(pagare.tabla_amortizacion[0]['estado'], 'pagado')
+        self.assertCuotasSincronizadas(pagare)
+
+    def test_tabla_editada_a_mano_no_se_toca(self):
+        pagare = crear_pagare(self.usuario)
+        casos = {
+            'interés de la primera cuota': lambda tabla: tabla[0].update(interes=tabla[0]['interes'] + 1),
+            'pago de una cuota intermedia': lambda tabla: tabla[5].update(total=tabla[5]['total'] + 5),
+            'fecha recorrida': lambda tabla: tabla[3].update(fecha='20/05/2025'),
+            'cuota de más': lambda tabla: tabla.append(dict(tabla[-1], numero=13)),
+            'fila sin etapa': lambda tabla: tabla[2].pop('etapa'),
+        }
+        for caso, editar in casos.items():
+            with self.subTest(caso):
+                tabla = _tabla_anterior(pagare)
+                editar(tabla)
+                manual = self.guardar_sin_huella(pagare, tabla)
+                self.assertFalse(tabla_automatica(manual))
+                manual.tasa_interes_ordinario = Decimal('18.00')
+                manual.save()
+                manual.refresh_from_db()
+                self.assertEqual(manual.tabla_amortizacion, tabla)
+                self.assertEqual(manual.tabla_amortizacion_huella, '')
+
+    def test_agregar_cuota_deja_la_tabla_como_manual(self):
+        pagare = crear_pagare(self.usuario, monto_numeric=Decimal('0'), num_pagos=0)
+        pagare.agregar_cuota(1, date(2025, 2, 15), Decimal('1000'), Decimal('0'))
+        pagare.monto_numeric = Decimal('1000')
+        pagare.num_pagos = 1
+        pagare.save()
+        pagare.refresh_from_db()
+        self.assertEqual(len(pagare.tabla_amortizacion), 1)
+        self.assertEqual(pagare.tabla_amortizacion[0]['capital'], 1000.0)
+        self.assertFalse(tabla_automatica(pagare))
+
+    def test_ajustes_del_motor_no_regeneran_al_guardar(self):
+        pagare = crear_pagare(self.usuario)
+        tabla = pagare.tabla_amortizacion
+        with self.settings(DOCUMENTOS_CALENDARIO_AJUSTE='siguiente', DOCUMENTOS_CALENDARIO_DEVENGO='dias',
+                           DOCUMENTOS_DIAS_INHABILES=['2025-02-17']):
+            pagare.deudor_nombre = 'OTRO NOMBRE'
+            pagare.save()
+            pagare.refresh_from_db()
+            self.assertEqual(pagare.tabla_amortizacion, tabla)
+
+            # Solo el comando explícito aplica los ajustes nuevos a la tabla guardada
+            self.assertEqual(reconstruir_tablas(Pagare.objects.filter(pk=pagare.pk)), (1, 0, 0))
+            self.assertEqual(reconstruir_tablas(Pagare.objects.filter(pk=pagare.pk), forzar=True), (1, 1, 0))
+        pagare.refresh_from_db()
+        self.assertNotEqual(pagare.tabla_amortizacion, tabla)
+        self.assertCuotasSincronizadas(pagare)
+
+
+class ExportarAmortizacionTests(CarteraTestCase):
+
+    def exportar(self, pagare):
+        self.client.force_login(self.usuario)
+        respuesta = self.client.get(reverse('documentos:exportar_amortizacion', args=[pagare.pk, 'csv']))
+        self.assertEqual(respuesta.status_code, 200)
+        filas = b''.join(respuesta.streaming_content).decode('utf-8-sig').splitlines()
+        return [fila.split(',') for fila in filas[1:]]
+
+    def test_un_pagare_sale_de_su_tabla_vigente(self):
+        pagare = crear_pagare(self.usuario)
+        tabla = [dict(fila, estado='pagada') for fila in pagare.tabla_amortizacion]
+        # QuerySet.update() no pasa por save(): CuotaAmortizacion queda atrasada
+        Pagare.objects.filter(pk=pagare.pk).update(tabla_amortizacion=tabla)
+        self.assertFalse(CuotaAmortizacion.objects.filter(pagare=pagare, estado='pagada').exists())
+
+        filas = self.exportar(pagare)
+        self.assertEqual(len(filas), len(tabla))
+        self.assertEqual({fila[9] for fila in filas}, {'pagada'})
+        self.assertEqual([fila[8] for fila in filas], [f"{Decimal(str(fila['total'])):.2f}" for fila in tabla])
+
+
+class DescargaCondicionalTests(CarteraTestCase):
+
+    def test_etag_del_pagare_cambia_con_los_ajustes_del_motor(self):
+        pagare = crear_pagare(self.usuario)
+        etag = etag_documento(pagare, 'pagare', 'docx')
+        with self.settings(DOCUMENTOS_CALENDARIO_AJUSTE='siguiente'):
+            self.assertNotEqual(etag_documento(pagare, 'pagare', 'docx'), etag)
+        self.assertEqual(etag_documento(pagare, 'pagare', 'docx'), etag)
+
+    def test_acciones_masivas_mueven_last_modified(self):
+        pagare = crear_pagare(self.usuario)
+        antes = timezone.now() - timedelta(days=1)
+        Pagare.objects.filter(pk=pagare.pk).update(
+            fecha_actualizacion=antes, monto_literal='', tasa_interes_ordinario=Decimal('30.00'),
+        )
+
+        recalcular_literales(Pagare.objects.filter(pk=pagare.pk))
+        pagare.refresh_from_db()
+        self.assertGreater(pagare.fecha_actualizacion, antes)
+
+        Pagare.objects.filter(pk=pagare.pk).update(fecha_actualizacion=antes)
+        self.assertEqual(reconstruir_tablas(Pagare.objects.filter(pk=pagare.pk)), (1, 1, 0))
+        pagare.refresh_from_db()
+        self.assertGreater(pagare.fecha_actualizacion, antes)
+
+
+class SimularPagareTests(CarteraTestCase):
+
+    def simular(self, datos):
+        self.client.force_login(self.usuario)
+        return self.client.post(reverse('documentos:simular_pagare'), data=json.dumps(datos),
+                                content_type='application/json')
+
+    def test_redondeo_que_no_es_texto_es_error_400(self):
+        base = {'monto_numeric': 100000, 'tasa_interes_ordinario': 24, 'num_pagos': 12}
+        self.assertEqual(self.simular({'base': base, 'redondeo': 'acarreo'}).status_code, 200)
+        for redondeo in (['x'], {'politica': 'acarreo'}, 5, 'inexistente'):
+            with self.subTest(redondeo=redondeo):
+                respuesta = self.simular({'base': base, 'redondeo': redondeo})
+                self.assertEqual(respuesta.status_code, 400)
+                self.assertIn('redondeo', respuesta.json()['error'])
+
+
+# Valores de los campos JSON que los mapeos interpretan
+JSON_DE_PRUEBA = {
+    'invitados_json': [{'nombre': 'Ana Ruiz', 'cargo': 'Licenciada'}, {'nombre': 'Luis Mora', 'cargo': 'Auditor'}],
+    'resoluciones_json': [{'texto': 'Se aprueba el crédito.'}, 'Se designa delegado.'],
+}
+
+
+def registro_de_prueba(modelo, vacio=False):
+    """
+    Registro sin guardar con un valor determinista por campo según su tipo; con
+    `vacio`, los campos opcionales quedan vacíos para ejercer los valores por defecto.
+    """
+    obj = modelo()
+    for campo in modelo._meta.concrete_fields:
+        if campo.primary_key or isinstance(campo, models.ForeignKey):
+            continue
+        if vacio and (campo.blank or campo.null):
+            valor = None if campo.null else ('' if not isinstance(campo, models.BooleanField) else False)
+        elif campo.choices:
+            valor = list(dict(campo.flatchoices))[-1]
+        elif isinstance(campo, models.JSONField):
+            valor = JSON_DE_PRUEBA.get(campo.name, [])
+        elif isinstance(campo, models.BooleanField):
+            valor = True
+        elif isinstance(campo, models.DecimalField):
+            valor = Decimal('1234.5').quantize(Decimal(1).scaleb(-campo.decimal_places))
+        elif isinstance(campo, models.IntegerField):
+            valor = 7
+        elif isinstance(campo, models.DateTimeField):
+            valor = datetime(2025, 3, 5, 9, 5)
+        elif isinstance(campo, models.DateField):
+            valor = date(2025, 3, 5)
+        elif isinstance(campo, models.TimeField):
+            valor = time(9, 5)
+        elif isinstance(campo, models.FileField):
+            valor = ''
+        else:
+            valor = f'Valor de {campo.name}'
+        setattr(obj, campo.attname, valor)
+    if hasattr(obj, 'actualizar_literales'):
+        obj.actualizar_literales()
+    return obj
+
+
+class MapeosTests(SimpleTestCase):
+    """
+    Los reemplazos de cada tipo de documento contra los diccionarios que armaban
+    a mano los generadores anteriores, capturados para los mismos registros de
+    prueba (testdata/reemplazos_anteriores.json), en los placeholders que
+    aparecen en cada template.
+    """
+
+    MODELOS = {
+        'pagare': Pagare,
+        'acta_consejo': ActaSesionConsejo,
+        'acta_asamblea': ActaAsamblea,
+        'contrato_prenda': ContratoPrendaAcciones,
+        'contrato_credito': ContratoCredito,
+        'convenio_modificatorio': ConvenioModificatorio,
+        'estatutos_sociedad': EstatutosSociedad,
+    }
+
+    def test_mismo_texto_que_los_generadores_anteriores(self):
+        with open(os.path.join(os.path.dirname(__file__), 'testdata', 'reemplazos_anteriores.json'),
+                  encoding='utf-8') as archivo:
+            anteriores = json.load(archivo)
+        # El generador anterior del convenio fallaba con los campos opcionales vacíos: no hay referencia
+        self.assertEqual({clave.removesuffix('_vacio') for clave in anteriores}, set(self.MODELOS))
+        for clave, esperado in anteriores.items():
+            tipo = clave.removesuffix('_vacio')
+            with self.subTest(clave):
+                obj = registro_de_prueba(self.MODELOS[tipo], vacio=clave.endswith('_vacio'))
+                presentes = plantilla_compilada(tipo).placeholders
+                contexto = construir_contexto(tipo, obj)
+                self.assertEqual({p: str(v) for p, v in contexto.items() if p in presentes}, esperado)
+
+
+class ReemplazosTests(SimpleTestCase):
+
+    def parrafo(self, *runs):
+        doc = Document()
+        parrafo = doc.add_paragraph()
+        for texto in runs:
+            parrafo.add_run(texto)
+        return parrafo
+
+    def test_placeholder_partido_conserva_los_runs(self):
+        parrafo = self.parrafo('Hola ', '{{NOM', 'BRE}}', ' y {{FECHA}}.')
+        parrafo.runs[1].bold = True
+        parrafo.runs[2].italic = True
+        reemplazos = {'{{NOMBRE}}': 'Ana', '{{FECHA}}': ' 5 de marzo '}
+        self.assertEqual(reemplazar_en_parrafo(parrafo, reemplazos), 2)
+        self.assertEqual([run.text for run in parrafo.runs], ['Hola ', 'Ana', '', ' y  5 de marzo .'])
+        self.assertTrue(parrafo.runs[1].bold)
+        self.assertTrue(parrafo.runs[2].italic)
+
+    def test_mismo_texto_que_reemplazar_el_parrafo_completo(self):
+        reemplazos = {'{{A}}': 'uno', '{{AB}}': 'dos', '{{FECHA}}': '', '{{N}}': 7}
+        piezas = ['Texto ', '{{A}}', '{{AB}}', ' y ', '{{FECHA}}', '{{N}}', ' {{SIN_MAPEO}} ', '{', '}']
+        aleatorio = random.Random(35)
+        for _ in range(200):
+            completo = ''.join(aleatorio.choice(piezas) for _ in range(8))
+            cortes = sorted(aleatorio.sample(range(1, len(completo)), min(4, len(completo) - 1)))
+            runs = [completo[i:j] for i, j in zip([0, *cortes], [*cortes, len(completo)])]
+            parrafo = self.parrafo(*runs)
+            reemplazar_en_parrafo(parrafo, reemplazos)
+            # Lo que hacían los generadores anteriores sobre paragraph.text (los más largos primero)
+            esperado = completo
+            for placeholder in sorted(reemplazos, key=len, reverse=True):
+                esperado = esperado.replace(placeholder, str(reemplazos[placeholder]))
+            self.assertEqual(parrafo.text, esperado, runs)
+
+    def test_documento_completo_con_tablas_y_encabezado(self):
+        doc = Document()
+        doc.add_paragraph('Deudor: {{DEUDOR}}')
+        doc.add_table(rows=1, cols=1).cell(0, 0).paragraphs[0].add_run('{{DEUDOR}} en tabla')
+        doc.sections[0].header.paragraphs[0].add_run('Pagaré de {{DEUDOR}}')
+        doc.add_paragraph('Sin placeholders')
+        self.assertEqual(reemplazar_en_documento(doc, {'{{DEUDOR}}': 'JUAN'}), 3)
+        self.assertEqual(doc.paragraphs[0].text, 'Deudor: JUAN')
+        self.assertEqual(doc.tables[0].cell(0, 0).text, 'JUAN en tabla')
+        self.assertEqual(doc.sections[0].header.paragraphs[0].text, 'Pagaré de JUAN')
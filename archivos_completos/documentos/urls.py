@@ -27,6 +27,9 @@ urlpatterns = [
     # Convertidor DOCX
     path('docx-converter/', views.docx_converter, name='docx_converter'),
     
+    # Paquete de cierre (varios documentos en un ZIP)
+    path('paquete-cierre/', views.paquete_cierre, name='paquete_cierre'),
+    
     # Pagaré URLs
     path('pagares/', views.PagareListView.as_view(), name='lista_pagare'),
     path('pagares/crear/', views.PagareCreateView.as_view(), name='crear_pagare'),
@@ -35,6 +38,12 @@ urlpatterns = [
     path('pagares/<int:pk>/eliminar/', views.PagareDeleteView.as_view(), name='eliminar_pagare'),
     path('pagares/<int:pk>/pdf/', views.descargar_pdf_pagare, name='descargar_pdf_pagare'),
     path('pagares/<int:pk>/docx/', views.descargar_docx_pagare, name='descargar_docx_pagare'),
+    path('pagares/cartera/', views.CarteraPagaresView.as_view(), name='cartera_pagares'),
+    path('pagares/cartera/csv/', views.cartera_pagares_csv, name='cartera_pagares_csv'),
+    path('pagares/cartera/cuotas/<str:formato>/', views.exportar_amortizacion, name='exportar_cuotas_cartera'),
+    path('pagares/simular/', views.simular_pagare, name='simular_pagare'),
+    path('pagares/pagos/', views.registrar_pagos_pagares, name='registrar_pagos_pagares'),
+    path('pagares/<int:pk>/amortizacion/<str:formato>/', views.exportar_amortizacion, name='exportar_amortizacion'),
     
     # Contrato de Crédito URLs
     path('contratos-credito/', views.ContratoCreditoListView.as_view(), name='lista_contrato_credito'),
@@ -0,0 +1,98 @@
+"""
+Detección de cuotas vencidas.
+
+Las cuotas pendientes con fecha anterior al corte se encuentran con una
+consulta sobre CuotaAmortizacion (índice estado+fecha), sin leer la tabla JSON
+de cada pagaré. Solo se cargan los pagarés afectados, por lotes: en cada uno se
+marca la cuota como 'vencido' en la tabla JSON (la fuente) y en la copia
+normalizada, y el pagaré emitido o firmado pasa a 'vencido'. Todo se guarda con
+bulk_update y cada corrida queda en EjecucionVencimientos.
+
+Pensado para correr una vez al día (cron: `python manage.py marcar_vencimientos`).
+"""
+
+import time
+from datetime import date
+
+from django.db import transaction
+from django.utils import timezone
+
+from .cartera import tabla_del_pagare
+from .models import CuotaAmortizacion, EjecucionVencimientos, Pagare
+
+
+# Los borradores aún no son exigibles y los pagados ya no lo son
+ESTADOS_EXIGIBLES = ('emitido', 'firmado', 'vencido')
+ESTADOS_QUE_VENCEN = ('emitido', 'firmado')
+
+
+def cuotas_vencidas(corte):
+    """Cuotas pendientes con fecha anterior al corte de pagarés exigibles"""
+    return CuotaAmortizacion.objects.filter(
+        estado='pendiente', fecha__lt=corte, pagare__estado__in=ESTADOS_EXIGIBLES,
+    )
+
+
+def _marcar_tabla(pagare, numeros):
+    """
+    Tabla JSON del pagaré con las cuotas `numeros` marcadas como vencidas. Solo
+    cambia estados: importes y fechas quedan como en las cuotas normalizadas.
+    """
+    tabla = [dict(fila) for fila in tabla_del_pagare(pagare)]
+    for posicion, fila in enumerate(tabla, start=1):
+        if (fila.get('numero') or posicion) in numeros and (fila.get('estado') or 'pendiente') == 'pendiente':
+            fila['estado'] = 'vencido'
+    return tabla
+
+
+def _procesar_lote(pagare_ids, cuotas_por_pagare, ejecucion, simulacion):
+    ahora = timezone.now()
+    with transaction.atomic():
+        pagares = list(Pagare.objects.select_for_update().filter(pk__in=pagare_ids))
+        cuotas = []
+        for pagare in pagares:
+            pendientes = cuotas_por_pagare[pagare.pk]
+            pagare.tabla_amortizacion = _marcar_tabla(pagare, {cuota.numero for cuota in pendientes})
+            pagare.fecha_actualizacion = ahora
+            if pagare.estado in ESTADOS_QUE_VENCEN:
+                pagare.estado = 'vencido'
+                ejecucion.pagares_vencidos += 1
+            for cuota in pendientes:
+                cuota.estado = 'vencido'
+            cuotas.extend(pendientes)
+
+        ejecucion.pagares_actualizados += len(pagares)
+        ejecucion.cuotas_vencidas += len(cuotas)
+        if not simulacion:
+            # bulk_update no pasa por Pagare.save(): las cuotas se actualizan aquí mismo
+            Pagare.objects.bulk_update(
+                pagares, ['tabla_amortizacion', 'estado', 'fecha_actualizacion'],
+            )
+            CuotaAmortizacion.objects.bulk_update(cuotas, ['estado'], batch_size=1000)
+
+
+def marcar_vencimientos(corte=None, lote=200, simulacion=False):
+    """
+    Marca como vencidas las cuotas pendientes anteriores a `corte` (por defecto hoy).
+
+    Returns:
+        EjecucionVencimientos guardada con los conteos y la duración
+    """
+    corte = corte or date.today()
+    ejecucion = EjecucionVencimientos(fecha_corte=corte, simulacion=simulacion)
+    inicio = time.perf_counter()
+    try:
+        cuotas_por_pagare = {}
+        for cuota in cuotas_vencidas(corte).only('id', 'pagare_id', 'numero', 'estado').order_by('pagare_id', 'numero'):
+            cuotas_por_pagare.setdefault(cuota.pagare_id, []).append(cuota)
+
+        pagare_ids = list(cuotas_por_pagare)
+        for i in range(0, len(pagare_ids), max(1, lote)):
+            _procesar_lote(pagare_ids[i:i + lote], cuotas_por_pagare, ejecucion, simulacion)
+    except Exception as e:
+        ejecucion.error = str(e)
+        raise
+    finally:
+        ejecucion.duracion = time.perf_counter() - inicio
+        ejecucion.save()
+    return ejecucion
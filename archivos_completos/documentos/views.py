@@ -4,7 +4,8 @@ from django.contrib.auth.mixins import LoginRequiredMixin
 from django.contrib import messages
 from django.urls import reverse_lazy
 from django.views.generic import ListView, CreateView, UpdateView, DetailView, DeleteView, TemplateView
-from django.http import JsonResponse, HttpResponse
+from django.http import JsonResponse, HttpResponse, Http404
+from django.core.exceptions import ObjectDoesNotExist
 from django.core.files.storage import default_storage
 from django.core.files.base import ContentFile
 # Importación condicional de mammoth
@@ -15,7 +16,9 @@ except ImportError:
     MAMMOTH_AVAILABLE = False
 import os
 import tempfile
+import csv
 import json
+from datetime import datetime
 from io import BytesIO
 
 # ReportLab imports
@@ -26,7 +29,7 @@ from reportlab.lib.enums import TA_CENTER, TA_LEFT, TA_JUSTIFY
 from reportlab.platypus import SimpleDocTemplate, Paragraph, Spacer, Table, TableStyle
 from reportlab.lib import colors
 from reportlab.pdfgen import canvas
-from .models import ActaAsamblea, ActaSesionConsejo, Pagare, ContratoCredito, ContratoPrendaAcciones, ConvenioModificatorio
+from .models import ActaAsamblea, ActaSesionConsejo, Pagare, ContratoCredito, ContratoPrendaAcciones, ConvenioModificatorio, CuotaAmortizacion
 from .estatutos_sociedad import EstatutosSociedad
 from .forms import ActaAsambleaForm, ActaSesionConsejoForm, RegistroForm, PagareForm, ContratoCreditoForm, ContratoPrendaAccionesForm, ConvenioModificatorioForm
 from .forms_estatutos_fixed import EstatutosSociedadForm
@@ -34,6 +37,12 @@ from .pdf_generator import descargar_pdf_consejo, descargar_pdf_asamblea, descar
 from .docx_estatutos_generator import descargar_docx_estatutos_sociedad
 from .docx_convenio_generator import descargar_docx_convenio_modificatorio
 from .docx_contrato_credito_generator import descargar_docx_contrato_credito
+from .descargas import respuesta_zip
+from .paquete import TIPOS_PAQUETE, construir_paquete, documentos_del_paquete
+from .cartera import cuotas_de_tabla, datos_cartera, tabla_del_pagare
+from .simulacion import simular
+from .pagos import registrar_pagos
+from .exportacion import COLUMNAS_AMORTIZACION, COLUMNAS_PAGARE_CUOTA, ExportarListaMixin, filas_objetos, filas_queryset, respuesta_exportacion
 
 class DashboardView(LoginRequiredMixin, TemplateView):
     template_name = 'dashboard.html'
@@ -93,7 +102,7 @@ class RegisterView(CreateView):
         messages.success(self.request, 'Usuario creado exitosamente. Ahora puedes iniciar sesión.')
         return super().form_valid(form)
 
-class ActaListView(LoginRequiredMixin, ListView):
+class ActaListView(LoginRequiredMixin, ExportarListaMixin, ListView):
     model = ActaAsamblea
     template_name = 'documentos/lista.html'
     context_object_name = 'documentos'
@@ -170,7 +179,7 @@ def vista_previa_ajax(request):
 
 # ===== VISTAS PARA ACTA DE SESIÓN DE CONSEJO =====
 
-class ConsejoListView(LoginRequiredMixin, ListView):
+class ConsejoListView(LoginRequiredMixin, ExportarListaMixin, ListView):
     model = ActaSesionConsejo
     template_name = 'documentos/lista_consejo.html'
     context_object_name = 'documentos'
@@ -316,6 +325,171 @@ def docx_converter(request):
     return render(request, 'documentos/docx_converter.html', context)
 
 
+# ===== PAQUETE DE CIERRE =====
+
+@login_required
+def paquete_cierre(request):
+    """
+    Paquete de cierre: con documentos seleccionados (?pagare=1&pagare=2&contrato_credito=3...)
+    descarga un ZIP con el DOCX y PDF de cada uno más el PDF combinado; sin selección
+    muestra los documentos del usuario para elegirlos.
+    """
+    seleccion = {tipo: request.GET.getlist(tipo) for tipo in TIPOS_PAQUETE if request.GET.getlist(tipo)}
+    if not seleccion:
+        grupos = [
+            {
+                'tipo': tipo,
+                'titulo': tipo_paquete.modelo._meta.verbose_name_plural,
+                'registros': tipo_paquete.modelo.objects.filter(usuario=request.user).order_by('-pk'),
+            }
+            for tipo, tipo_paquete in TIPOS_PAQUETE.items()
+        ]
+        return render(request, 'documentos/paquete_cierre.html', {'grupos': grupos})
+
+    try:
+        documentos = documentos_del_paquete(request.user, seleccion)
+    except (ValueError, ObjectDoesNotExist):
+        raise Http404("Documento no encontrado")
+
+    # Los documentos con error y los avisos van en manifiesto.json dentro del ZIP
+    archivo, _ = construir_paquete(documentos)
+    return respuesta_zip(archivo, f'paquete_cierre_{datetime.now().strftime("%Y%m%d_%H%M%S")}.zip')
+
+
+# ===== CARTERA DE PAGARÉS =====
+
+class CarteraPagaresView(LoginRequiredMixin, TemplateView):
+    """Tablero de la cartera: saldos, flujos por mes, devengos y morosidad (ver documentos/cartera.py)"""
+    template_name = 'documentos/cartera_pagares.html'
+
+    def get_context_data(self, **kwargs):
+        context = super().get_context_data(**kwargs)
+        context.update(datos_cartera(self.request.user))
+        context['title'] = 'Cartera de Pagarés'
+        return context
+
+
+# Columnas de cada reporte CSV: (encabezado, clave en la fila)
+COLUMNAS_CSV_CARTERA = {
+    'pagares': (
+        ('Pagaré', 'id'), ('Deudor', 'deudor_nombre'), ('Fecha de emisión', 'fecha_emision'),
+        ('Monto original', 'monto_numeric'), ('Estado', 'estado'), ('Cuotas', 'num_cuotas'),
+        ('Cuotas pendientes', 'cuotas_pendientes'), ('Saldo de capital', 'saldo_capital'),
+        ('Total vencido', 'total_vencido'), ('Días de atraso', 'dias_atraso'), ('Próximo pago', 'proximo_pago'),
+    ),
+    'flujos': (
+        ('Mes', 'mes'), ('Cuotas', 'cuotas'), ('Capital', 'capital'), ('Interés', 'interes'),
+        ('IVA interés', 'iva_interes'), ('Costo admon', 'costo_admon'), ('IVA costo admon', 'iva_costo_admon'),
+        ('Total', 'total'),
+    ),
+    'morosidad': (
+        ('Días de atraso', 'tramo'), ('Cuotas', 'cuotas'), ('Pagarés', 'pagares'),
+        ('Capital', 'capital'), ('Total', 'total'),
+    ),
+}
+
+
+@login_required
+def cartera_pagares_csv(request):
+    """CSV de la cartera: ?reporte=pagares (por defecto), flujos o morosidad"""
+    reporte = request.GET.get('reporte', 'pagares')
+    if reporte not in COLUMNAS_CSV_CARTERA:
+        raise Http404("Reporte no encontrado")
+    datos = datos_cartera(request.user)
+    columnas = COLUMNAS_CSV_CARTERA[reporte]
+
+    response = HttpResponse(content_type='text/csv; charset=utf-8')
+    response['Content-Disposition'] = (
+        f'attachment; filename="cartera_pagares_{reporte}_{datos["hoy"].strftime("%Y%m%d")}.csv"'
+    )
+    # BOM para que Excel reconozca UTF-8 (acentos en nombres)
+    response.write('\ufeff')
+    writer = csv.writer(response)
+    writer.writerow([encabezado for encabezado, _ in columnas])
+    for fila in datos[reporte]:
+        writer.writerow(['' if fila[clave] is None else fila[clave] for _, clave in columnas])
+    return response
+
+
+@login_required
+def exportar_amortizacion(request, formato, pk=None):
+    """
+    Tabla de amortización de un pagaré en CSV o XLSX; sin pk, las cuotas de
+    toda la cartera del usuario con el pagaré y deudor de cada una. La de un
+    pagaré sale de su tabla vigente (la del documento), no de CuotaAmortizacion,
+    que puede ir atrasada si la tabla se cambió sin pasar por save().
+    """
+    if pk is not None:
+        pagare = get_object_or_404(Pagare, pk=pk, usuario=request.user)
+        cuotas = cuotas_de_tabla(pagare, tabla_del_pagare(pagare))
+        return respuesta_exportacion(
+            COLUMNAS_AMORTIZACION, filas_objetos(cuotas, COLUMNAS_AMORTIZACION), formato,
+            f'amortizacion_pagare_{pagare.pk}',
+        )
+    columnas = COLUMNAS_PAGARE_CUOTA + COLUMNAS_AMORTIZACION
+    cuotas = CuotaAmortizacion.objects.filter(pagare__usuario=request.user).order_by('pagare_id', 'numero')
+    return respuesta_exportacion(columnas, filas_queryset(cuotas, columnas), formato, 'cuotas_cartera')
+
+
+@login_required
+def simular_pagare(request):
+    """
+    Simulación de condiciones de pagaré (POST JSON, ver documentos/simulacion.py):
+    cuota, intereses, IVA y CAT de cada escenario de la rejilla, sin guardar nada.
+    """
+    if request.method != 'POST':
+        return JsonResponse({'error': 'Método no permitido'}, status=405)
+    try:
+        datos = json.loads(request.body or b'{}')
+    except ValueError:
+        return JsonResponse({'error': 'El cuerpo no es JSON válido'}, status=400)
+    try:
+        return JsonResponse(simular(datos))
+    except ValueError as e:
+        return JsonResponse({'error': str(e)}, status=400)
+
+
+@login_required
+def registrar_pagos_pagares(request):
+    """
+    Registro de pagos por lote (POST JSON, ver documentos/pagos.py):
+
+        {"pagos": [{"pagare": 12, "cuota": 3, "estado": "pagado", "fecha_pago_real": "2025-03-15"}, ...]}
+
+    Se aplican todos en una transacción o ninguno; responde los saldos recalculados
+    de cada pagaré o, con estado 400, los errores por posición en la lista.
+    """
+    if request.method != 'POST':
+        return JsonResponse({'error': 'Método no permitido'}, status=405)
+    try:
+        datos = json.loads(request.body or b'{}')
+    except ValueError:
+        return JsonResponse({'error': 'El cuerpo no es JSON válido'}, status=400)
+    pagos = datos.get('pagos') if isinstance(datos, dict) else None
+    if not isinstance(pagos, list) or not pagos:
+        return JsonResponse({'error': "Se esperaba una lista 'pagos' con al menos un pago"}, status=400)
+
+    resultado = registrar_pagos(
+        [
+            (pago.get('pagare'), pago.get('cuota'), pago.get('estado'), pago.get('fecha_pago_real'))
+            if isinstance(pago, dict) else pago
+            for pago in pagos
+        ],
+        usuario=request.user,
+    )
+    if not resultado.ok:
+        return JsonResponse({
+            'error': 'No se registró ningún pago',
+            'errores': [{'posicion': posicion, 'mensaje': mensaje} for posicion, mensaje in resultado.errores],
+        }, status=400)
+    return JsonResponse({
+        'aplicados': resultado.aplicados,
+        'pagares': resultado.pagares,
+        'liquidados': resultado.liquidados,
+        'saldos': {str(pk): saldo for pk, saldo in resultado.saldos.items()},
+    })
+
+
 # ============ PAGARE VIEWS ============
 class PagareListView(LoginRequiredMixin, ListView):
     model = Pagare
@@ -396,7 +570,7 @@ class ContratoCreditoListView(LoginRequiredMixin, ListView):
         return context
 
 
-class ContratoCreditoListView(LoginRequiredMixin, ListView):
+class ContratoCreditoListView(LoginRequiredMixin, ExportarListaMixin, ListView):
     model = ContratoCredito
     template_name = 'documentos/lista_contrato_credito.html'
     context_object_name = 'contratos'
@@ -483,7 +657,7 @@ class ContratoCreditoDeleteView(LoginRequiredMixin, DeleteView):
 
 
 # ============ CONTRATO PRENDA ACCIONES VIEWS ============
-class ContratoPrendaAccionesListView(LoginRequiredMixin, ListView):
+class ContratoPrendaAccionesListView(LoginRequiredMixin, ExportarListaMixin, ListView):
     model = ContratoPrendaAcciones
     template_name = 'documentos/lista_contrato_prenda.html'
     context_object_name = 'contratos'
@@ -569,7 +743,7 @@ class ContratoPrendaAccionesDeleteView(LoginRequiredMixin, DeleteView):
 
 
 # ============ CONVENIO MODIFICATORIO VIEWS ============
-class ConvenioModificatorioListView(LoginRequiredMixin, ListView):
+class ConvenioModificatorioListView(LoginRequiredMixin, ExportarListaMixin, ListView):
     model = ConvenioModificatorio
     template_name = 'documentos/lista_convenio_modificatorio.html'
     context_object_name = 'convenios'
@@ -656,7 +830,7 @@ class ConvenioModificatorioDeleteView(LoginRequiredMixin, DeleteView):
 
 # ============ VISTAS CRUD PARA PAGARÉS ============
 
-class PagareListView(LoginRequiredMixin, ListView):
+class PagareListView(LoginRequiredMixin, ExportarListaMixin, ListView):
     model = Pagare
     template_name = 'documentos/lista_pagares.html'
     context_object_name = 'pagares'
@@ -767,7 +941,7 @@ class PagareDeleteView(LoginRequiredMixin, DeleteView):
 
 # ===== VISTAS CRUD PARA ESTATUTOS SOCIALES =====
 
-class EstatutosSociedadListView(LoginRequiredMixin, ListView):
+class EstatutosSociedadListView(LoginRequiredMixin, ExportarListaMixin, ListView):
     model = EstatutosSociedad
     template_name = 'documentos/lista_estatutos_sociedad.html'
     context_object_name = 'estatutos_list'
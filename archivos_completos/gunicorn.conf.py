@@ -0,0 +1,36 @@
+"""
+Configuración de gunicorn para producción:
+
+    gunicorn -c gunicorn.conf.py asistente_legal.wsgi
+
+preload_app carga Django en el proceso maestro y when_ready precalienta ahí los
+generadores y los templates una sola vez (ver documentos/precalentar.py); los
+workers heredan esa memoria copy-on-write en lugar de pagar la importación y
+la compilación en su primera descarga.
+"""
+
+import gc
+import multiprocessing
+import os
+
+
+bind = os.environ.get('GUNICORN_BIND', '0.0.0.0:8000')
+workers = int(os.environ.get('GUNICORN_WORKERS', multiprocessing.cpu_count() * 2 + 1))
+timeout = int(os.environ.get('GUNICORN_TIMEOUT', 120))
+
+preload_app = True
+
+# Reciclar workers acota la memoria; con preload el worker nuevo ya nace precalentado
+max_requests = int(os.environ.get('GUNICORN_MAX_REQUESTS', 1000))
+max_requests_jitter = 100
+
+
+def when_ready(server):
+    # Con preload_app la aplicación ya está cargada y los workers aún no se crean
+    from documentos.precalentar import precalentar_servidor
+
+    precalentar_servidor(server.log)
+
+    # Saca los objetos ya cargados del recolector: de lo contrario cada recolección
+    # en un worker escribe en sus encabezados y rompe las páginas compartidas
+    gc.freeze()